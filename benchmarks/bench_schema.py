@@ -0,0 +1,88 @@
+"""
+    Stack construction time of MyOutStationNew for large point maps.
+
+    For each number of Analog points, measures:
+        - python_loop_ms: configuring clazz/svariation/evariation/deadband one attribute at a time from Python,
+          i.e., the way configure_database does it
+        - schema_apply_ms: the same configuration with PointSchema.apply (one native call per range)
+        - construct_ms: MyOutStationNew(point_schema=...) end to end (stack config, database, channel, outstation)
+
+        python benchmarks/bench_schema.py --sizes 1000 10000 20000 60000
+"""
+import argparse
+import logging
+import time
+
+from pydnp3 import opendnp3, asiodnp3
+
+from dnp3_python.dnp3station.outstation_new import MyOutStationNew
+from dnp3_python.dnp3station.point_schema import PointSchema
+
+logging.getLogger("dnp3_python").setLevel(logging.WARNING)
+
+BASE_PORT = 23000
+
+
+def make_schema(num_points: int) -> PointSchema:
+    """Two ranges of Analog points, with different classes and variations."""
+    half = num_points // 2
+    schema = PointSchema()
+    schema.add_range("Analog", 0, half - 1, clazz=2, svariation="Group30Var5", evariation="Group32Var7",
+                     deadband=0.5)
+    schema.add_range("Analog", half, num_points - 1, clazz=3, svariation="Group30Var1", evariation="Group32Var1",
+                     deadband=1.0)
+    return schema
+
+
+def python_loop(db_config: asiodnp3.DatabaseConfig, num_points: int):
+    half = num_points // 2
+    for index in range(num_points):
+        point = db_config.analog[index]
+        if index < half:
+            point.clazz = opendnp3.PointClass.Class2
+            point.svariation = opendnp3.StaticAnalogVariation.Group30Var5
+            point.evariation = opendnp3.EventAnalogVariation.Group32Var7
+            point.deadband = 0.5
+        else:
+            point.clazz = opendnp3.PointClass.Class3
+            point.svariation = opendnp3.StaticAnalogVariation.Group30Var1
+            point.evariation = opendnp3.EventAnalogVariation.Group32Var1
+            point.deadband = 1.0
+
+
+def timed_ms(func, *args) -> float:
+    start = time.perf_counter()
+    func(*args)
+    return (time.perf_counter() - start) * 1000
+
+
+def run(num_points: int, port: int) -> dict:
+    schema = make_schema(num_points)
+    python_loop_ms = timed_ms(python_loop, asiodnp3.OutstationStackConfig(schema.sizes()).dbConfig, num_points)
+    schema_apply_ms = timed_ms(schema.apply, asiodnp3.OutstationStackConfig(schema.sizes()).dbConfig)
+
+    start = time.perf_counter()
+    outstation = MyOutStationNew(port=port, point_schema=schema,
+                                 channel_log_level=opendnp3.levels.NOTHING,
+                                 outstation_log_level=opendnp3.levels.NOTHING)
+    construct_ms = (time.perf_counter() - start) * 1000
+    outstation.shutdown(sleep_before_shutdown=0)
+    return {"python_loop_ms": python_loop_ms, "schema_apply_ms": schema_apply_ms, "construct_ms": construct_ms}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 20000, 60000],
+                        help="number of Analog points, at most 65535")
+    args = parser.parse_args()
+
+    print(f"{'points':>8}{'python_loop_ms':>16}{'schema_apply_ms':>17}{'speedup':>9}{'construct_ms':>14}")
+    for i, num_points in enumerate(args.sizes):
+        result = run(num_points, BASE_PORT + i)
+        speedup = result["python_loop_ms"] / result["schema_apply_ms"] if result["schema_apply_ms"] else 0
+        print(f"{num_points:>8}{result['python_loop_ms']:>16.1f}{result['schema_apply_ms']:>17.2f}"
+              f"{speedup:>9.1f}{result['construct_ms']:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+    Multi-thread throughput of master reads and outstation updates over loopback TCP.
+
+    Each worker thread drives its own master/outstation pair (one port per pair), so that the only shared resource
+    is the GIL. Run it against two builds of pydnp3 to compare them, e.g., before and after releasing the GIL
+    in the IMasterOperations / IOutstation bindings:
+
+        python benchmarks/bench_threads.py --threads 1 2 4 8 --duration 5
+
+    Expected: with the GIL released while entering the stack, ops/s keeps growing with the number of threads
+    (up to the number of cores), instead of flattening after the first thread.
+"""
+import argparse
+import logging
+import threading
+import time
+
+from pydnp3 import opendnp3
+
+from dnp3_python.dnp3station.master_new import MyMasterNew
+from dnp3_python.dnp3station.outstation_new import MyOutStationNew
+
+logging.getLogger("dnp3_python").setLevel(logging.WARNING)
+
+BASE_PORT = 21000
+NUM_POINTS = 100
+
+
+def start_pairs(num_pairs: int, base_port: int = BASE_PORT):
+    pairs = []
+    for i in range(num_pairs):
+        port = base_port + i
+        outstation = MyOutStationNew(port=port, channel_log_level=opendnp3.levels.NOTHING,
+                                     outstation_log_level=opendnp3.levels.NOTHING)
+        master = MyMasterNew(port=port, channel_log_level=opendnp3.levels.NOTHING,
+                             master_log_level=opendnp3.levels.NOTHING, enable_default_scans=False)
+        outstation.start()
+        master.start()
+        pairs.append((master, outstation))
+    # wait for the links to come up
+    deadline = time.monotonic() + 10
+    while time.monotonic() < deadline and not all(master.is_connected for master, _ in pairs):
+        time.sleep(0.1)
+    return pairs
+
+
+def stop_pairs(pairs):
+    for master, outstation in pairs:
+        master.shutdown(sleep_before_master_shutdown=0)
+        outstation.shutdown(sleep_before_shutdown=0)
+
+
+def read_worker(master: MyMasterNew, outstation: MyOutStationNew, stop: threading.Event, counts: list, slot: int):
+    gv_id = opendnp3.GroupVariationID(30, 6)
+    while not stop.is_set():
+        try:
+            master.read_async(gv_id).result(timeout=5)
+        except Exception:
+            continue
+        counts[slot] += 1
+
+
+def update_worker(master: MyMasterNew, outstation: MyOutStationNew, stop: threading.Event, counts: list, slot: int):
+    updates = [(opendnp3.Analog(float(index)), index) for index in range(NUM_POINTS)]
+    while not stop.is_set():
+        outstation.apply_updates(updates)
+        counts[slot] += 1
+
+
+WORKLOADS = {
+    "read": read_worker,
+    "update": update_worker,
+}
+
+
+def run(workload: str, num_threads: int, duration: float) -> float:
+    """:return: operations per second, summed over all threads"""
+    pairs = start_pairs(num_threads)
+    try:
+        stop = threading.Event()
+        counts = [0] * num_threads
+        threads = [threading.Thread(target=WORKLOADS[workload], args=(master, outstation, stop, counts, slot))
+                   for slot, (master, outstation) in enumerate(pairs)]
+        for thread in threads:
+            thread.start()
+        time.sleep(duration)
+        stop.set()
+        for thread in threads:
+            thread.join()
+        return sum(counts) / duration
+    finally:
+        stop_pairs(pairs)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workload", choices=list(WORKLOADS), nargs="+", default=list(WORKLOADS))
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--duration", type=float, default=5, help="seconds per run")
+    args = parser.parse_args()
+
+    print(f"{'workload':<10}{'threads':>8}{'ops/s':>12}{'speedup':>10}")
+    for workload in args.workload:
+        baseline = None
+        for num_threads in args.threads:
+            ops = run(workload, num_threads, args.duration)
+            baseline = baseline if baseline else ops
+            print(f"{workload:<10}{num_threads:>8}{ops:>12.1f}{ops / baseline if baseline else 0:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
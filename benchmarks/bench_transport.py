@@ -0,0 +1,190 @@
+"""
+    Transport benchmark of MyMasterNew / MyOutStationNew over local stand-ins of serial and TLS links.
+
+    - serial: two pseudo-terminal pairs bridged by a relay thread, i.e., the master and the outstation open
+      a serial device each (/dev/pts/N) as they would a USB-serial adapter. Measures the integrity poll latency
+      and the throughput (bytes relayed per second).
+    - tls: a loopback TLS server/client with self-signed certificates generated by the openssl command line.
+      Measures the handshake cost (time from MyMasterNew.start() to connected, compared to plain TCP)
+      and the integrity poll latency.
+    - tcp: the same measurements over plain TCP, for reference.
+
+        python benchmarks/bench_transport.py --points 100 1000 --iterations 20
+
+    Note: the pty relay does not throttle to the configured baud rate, serial results are an upper bound of what
+    the stack sustains, not of a physical line. Requires numpy, and openssl for the tls results.
+"""
+import argparse
+import logging
+import os
+import select
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+import tty
+
+import numpy as np
+
+from pydnp3 import opendnp3, openpal, asiodnp3
+from typing import Dict, List, Optional, Tuple
+
+from dnp3_python.dnp3station.master_new import MyMasterNew
+from dnp3_python.dnp3station.outstation_new import MyOutStationNew
+from dnp3_python.dnp3station.point_schema import PointSchema
+from dnp3_python.dnp3station.transport import (Transport, SerialTransport, TCPClientTransport, TCPServerTransport,
+                                               TLSClientTransport, TLSServerTransport, tls_config)
+
+logging.getLogger("dnp3_python").setLevel(logging.WARNING)
+
+BASE_PORT = 24000
+
+
+class PtyBridge:
+    """Two pseudo-terminals whose master sides are relayed to each other, i.e., a virtual null-modem cable."""
+
+    def __init__(self):
+        self._fds: List[int] = []
+        self.devices: List[str] = []
+        for _ in range(2):
+            master_fd, slave_fd = os.openpty()
+            tty.setraw(slave_fd)
+            self._fds.append(master_fd)
+            self.devices.append(os.ttyname(slave_fd))
+            # Note: keep the slave end open, otherwise the master side reports EIO until the stack opens it
+            self._fds.append(slave_fd)
+        self.bytes_relayed: int = 0
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="PtyBridge", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        a, b = self._fds[0], self._fds[2]
+        peers = {a: b, b: a}
+        while self._running:
+            readable, _, _ = select.select([a, b], [], [], 0.1)
+            for fd in readable:
+                try:
+                    data = os.read(fd, 65536)
+                except OSError:
+                    continue
+                os.write(peers[fd], data)
+                self.bytes_relayed += len(data)
+
+    def close(self):
+        self._running = False
+        self._thread.join()
+        for fd in self._fds:
+            os.close(fd)
+
+
+def self_signed(directory: str, name: str) -> Tuple[str, str]:
+    """:return: (certificate, private key) file paths"""
+    cert, key = os.path.join(directory, f"{name}.pem"), os.path.join(directory, f"{name}.key")
+    subprocess.run(["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-keyout", key, "-out", cert,
+                    "-days", "1", "-subj", f"/CN={name}"], check=True, capture_output=True)
+    return cert, key
+
+
+def make_pair(master_transport: Transport, outstation_transport: Transport,
+              num_points: int) -> Tuple[MyMasterNew, MyOutStationNew]:
+    schema = PointSchema.uniform({"Analog": num_points}, clazz=1)
+    outstation = MyOutStationNew(transport=outstation_transport, point_schema=schema,
+                                 channel_log_level=opendnp3.levels.NOTHING,
+                                 outstation_log_level=opendnp3.levels.NOTHING)
+    outstation.apply_updates(arrays={"Analog": (np.arange(num_points), np.random.rand(num_points))})
+    outstation.start()
+    stack_config = asiodnp3.MasterStackConfig()
+    stack_config.master.responseTimeout = openpal.TimeDuration().Seconds(30)
+    stack_config.link.RemoteAddr = 1
+    stack_config.link.LocalAddr = 2
+    master = MyMasterNew(transport=master_transport, stack_config=stack_config, enable_default_scans=False,
+                         channel_log_level=opendnp3.levels.NOTHING, master_log_level=opendnp3.levels.NOTHING)
+    return master, outstation
+
+
+def wait_connected(master: MyMasterNew, timeout: float = 20) -> float:
+    """:return: seconds until connected"""
+    start = time.perf_counter()
+    while not master.is_connected:
+        if time.perf_counter() - start > timeout:
+            raise RuntimeError(f"Master not connected within {timeout} seconds")
+        time.sleep(0.001)
+    return time.perf_counter() - start
+
+
+def integrity_poll_ms(master: MyMasterNew, iterations: int) -> List[float]:
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        master._scan_async(issue_scan=lambda task_config: master.master.ScanClasses(
+            opendnp3.ClassField().AllClasses(), task_config), gv_clss=[]).result(timeout=60)
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def run(master_transport: Transport, outstation_transport: Transport, num_points: int, iterations: int,
+        bridge: Optional[PtyBridge] = None) -> Dict[str, float]:
+    master, outstation = make_pair(master_transport, outstation_transport, num_points)
+    try:
+        master.start()
+        connect_s = wait_connected(master)
+        integrity_poll_ms(master, 1)  # warm up
+        relayed = bridge.bytes_relayed if bridge else 0
+        start = time.perf_counter()
+        samples = integrity_poll_ms(master, iterations)
+        elapsed = time.perf_counter() - start
+        result = {"connect_ms": connect_s * 1000, "poll_p50_ms": float(np.percentile(samples, 50)),
+                  "poll_p99_ms": float(np.percentile(samples, 99))}
+        if bridge:
+            result["bytes_per_s"] = (bridge.bytes_relayed - relayed) / elapsed
+        return result
+    finally:
+        master.shutdown(sleep_before_master_shutdown=0)
+        outstation.shutdown(sleep_before_shutdown=0)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--points", type=int, nargs="+", default=[100, 1000], help="number of Analog points")
+    parser.add_argument("--iterations", type=int, default=20, help="integrity polls per measurement")
+    parser.add_argument("--baud", type=int, default=115200, help="baud rate configured on the pty devices")
+    args = parser.parse_args()
+
+    print(f"{'transport':>10}{'points':>8}{'connect_ms':>12}{'poll_p50_ms':>13}{'poll_p99_ms':>13}{'bytes_per_s':>13}")
+    port = BASE_PORT
+    with tempfile.TemporaryDirectory() as directory:
+        tls = None
+        if shutil.which("openssl"):
+            master_cert, master_key = self_signed(directory, "master")
+            outstation_cert, outstation_key = self_signed(directory, "outstation")
+            tls = (tls_config(peer_cert=outstation_cert, local_cert=master_cert, private_key=master_key),
+                   tls_config(peer_cert=master_cert, local_cert=outstation_cert, private_key=outstation_key))
+        else:
+            print("openssl not found, skipping the tls results")
+
+        for num_points in args.points:
+            runs = {"tcp": (TCPClientTransport("127.0.0.1", port), TCPServerTransport("127.0.0.1", port))}
+            if tls:
+                runs["tls"] = (TLSClientTransport("127.0.0.1", port + 1, config=tls[0]),
+                               TLSServerTransport("127.0.0.1", port + 1, config=tls[1]))
+            port += 2
+            for name, (master_transport, outstation_transport) in runs.items():
+                result = run(master_transport, outstation_transport, num_points, args.iterations)
+                print(f"{name:>10}{num_points:>8}{result['connect_ms']:>12.1f}{result['poll_p50_ms']:>13.2f}"
+                      f"{result['poll_p99_ms']:>13.2f}{'':>13}")
+
+            bridge = PtyBridge()
+            try:
+                result = run(SerialTransport(bridge.devices[0], baud=args.baud),
+                             SerialTransport(bridge.devices[1], baud=args.baud),
+                             num_points, args.iterations, bridge=bridge)
+            finally:
+                bridge.close()
+            print(f"{'serial':>10}{num_points:>8}{result['connect_ms']:>12.1f}{result['poll_p50_ms']:>13.2f}"
+                  f"{result['poll_p99_ms']:>13.2f}{result['bytes_per_s']:>13.0f}")
+
+
+if __name__ == "__main__":
+    main()
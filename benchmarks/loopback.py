@@ -0,0 +1,310 @@
+"""
+    Loopback benchmark of MyMasterNew / MyOutStationNew, with machine-readable results.
+
+    Starts N outstations and M masters (M <= N, master i polls outstation i) on 127.0.0.1 for each database size,
+    then measures, for all masters concurrently:
+        - integrity_poll_ms: latency of a class 0/1/2/3 scan (p50/p99/mean)
+        - soe_points_per_s: event points per second, from outstation.apply_updates to the master's SOEHandler
+        - command_rtt_ms: round trip of a DirectOperate (AnalogOutputDouble64) until the outstation's response
+        - cpu_us_per_point: process CPU time per event point (both stacks run in this process)
+
+    Points are Analog (up to 65535, the DNP3 index range) then Counter, e.g., 100000 points = 65535 + 34465.
+
+    EXAMPLE:
+        python benchmarks/loopback.py --sizes 10 1000 100000 --output results.json
+        python benchmarks/loopback.py --sizes 10 1000 100000 --compare results.json  # exit code 1 on regression
+
+    Note: requires numpy.
+"""
+import argparse
+import concurrent.futures
+import datetime
+import json
+import logging
+import platform
+import subprocess
+import sys
+import threading
+import time
+
+import numpy as np
+
+from pydnp3 import opendnp3, openpal, asiodnp3
+from typing import Dict, List, Tuple
+
+from dnp3_python.dnp3station.master_new import MyMasterNew
+from dnp3_python.dnp3station.outstation_new import MyOutStationNew
+from dnp3_python.dnp3station.point_schema import PointSchema
+
+logging.getLogger("dnp3_python").setLevel(logging.WARNING)
+
+MAX_INDEX_RANGE = 65535
+BASE_PORT = 22000
+
+# metric -> True if higher is better
+METRICS = {
+    "integrity_poll_ms": False,
+    "soe_points_per_s": True,
+    "command_rtt_ms": False,
+    "cpu_us_per_point": False,
+}
+
+
+def split_points(size: int) -> Tuple[int, int]:
+    """:return: (number of Analog points, number of Counter points)"""
+    num_analog = min(size, MAX_INDEX_RANGE)
+    num_counter = min(size - num_analog, MAX_INDEX_RANGE)
+    return num_analog, num_counter
+
+
+class BenchOutstation(MyOutStationNew):
+    """MyOutStationNew without unsolicited responses, i.e., events are only reported by the event scans."""
+
+    def configure_stack(self):
+        stack_config = super().configure_stack()
+        stack_config.outstation.params.allowUnsolicited = False
+        return stack_config
+
+
+def bench_schema(num_analog: int, num_counter: int) -> PointSchema:
+    """Class 1 Analog and Counter points, plus one AnalogOutputStatus point for the commands."""
+    schema = PointSchema.uniform({"Analog": num_analog, "Counter": num_counter}, clazz=1)
+    schema.set_size("AnalogOutputStatus", 1)
+    return schema
+
+
+def percentiles(samples: List[float]) -> Dict[str, float]:
+    if not samples:
+        return {"p50": None, "p99": None, "mean": None}
+    data = np.asarray(samples)
+    return {"p50": float(np.percentile(data, 50)), "p99": float(np.percentile(data, 99)), "mean": float(data.mean())}
+
+
+class Loopback:
+    """N outstations and M masters of one database size."""
+
+    def __init__(self, size: int, num_outstations: int, num_masters: int, base_port: int):
+        if num_masters > num_outstations:
+            raise ValueError("Each master polls its own outstation, use at most as many masters as outstations")
+        self.size = size
+        self.num_analog, self.num_counter = split_points(size)
+        self.outstations: List[MyOutStationNew] = []
+        self.masters: List[MyMasterNew] = []
+        for i in range(num_outstations):
+            outstation = BenchOutstation(port=base_port + i,
+                                         channel_log_level=opendnp3.levels.NOTHING,
+                                         outstation_log_level=opendnp3.levels.NOTHING,
+                                         point_schema=bench_schema(self.num_analog, self.num_counter),
+                                         event_buffers={"Analog": max(self.num_analog, 1),
+                                                        "Counter": max(self.num_counter, 1)})
+            outstation.start()
+            self.outstations.append(outstation)
+        for i in range(num_masters):
+            stack_config = asiodnp3.MasterStackConfig()
+            # Note: large integrity polls take several fragments, allow more than the default 2 seconds
+            stack_config.master.responseTimeout = openpal.TimeDuration().Seconds(30)
+            stack_config.link.RemoteAddr = 1
+            stack_config.link.LocalAddr = 2
+            master = MyMasterNew(port=base_port + i,
+                                 stack_config=stack_config,
+                                 enable_default_scans=False,
+                                 channel_log_level=opendnp3.levels.NOTHING,
+                                 master_log_level=opendnp3.levels.NOTHING)
+            master.start()
+            self.masters.append(master)
+        self._round = 0
+
+    def wait_connected(self, timeout: float = 10):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if all(master.is_connected for master in self.masters):
+                return
+            time.sleep(0.05)
+        raise RuntimeError(f"Masters not connected within {timeout} seconds")
+
+    def shutdown(self):
+        for master in self.masters:
+            master.shutdown(sleep_before_master_shutdown=0)
+        for outstation in self.outstations:
+            outstation.shutdown(sleep_before_shutdown=0)
+
+    @staticmethod
+    def _scan(master: MyMasterNew, field: opendnp3.ClassField, timeout: float = 60):
+        master._scan_async(issue_scan=lambda task_config: master.master.ScanClasses(field, task_config),
+                           gv_clss=[]).result(timeout=timeout)
+
+    def integrity_poll(self, master: MyMasterNew, iterations: int) -> List[float]:
+        samples = []
+        for _ in range(iterations):
+            start = time.perf_counter()
+            self._scan(master, opendnp3.ClassField().AllClasses())
+            samples.append((time.perf_counter() - start) * 1000)
+        return samples
+
+    def command_rtt(self, master: MyMasterNew, iterations: int) -> List[float]:
+        samples = []
+        for i in range(iterations):
+            start = time.perf_counter()
+            master.command_queue.submit(opendnp3.AnalogOutputDouble64(float(i)), 0).result(timeout=10)
+            samples.append((time.perf_counter() - start) * 1000)
+        return samples
+
+    def soe(self, pair_index: int, timeout: float = 60) -> Tuple[int, float]:
+        """Change every point once and poll events until the master received them all.
+
+        :return: (number of points received, elapsed seconds)
+        """
+        master, outstation = self.masters[pair_index], self.outstations[pair_index]
+        expected = self.num_analog + self.num_counter
+        received = [0]
+        done = threading.Event()
+
+        def count(batch):
+            received[0] += len(batch)
+            if received[0] >= expected:
+                done.set()
+
+        subscriptions = [master.subscribe("Analog", count), master.subscribe("Counter", count)]
+        try:
+            self._round += 1
+            arrays = {"Analog": (np.arange(self.num_analog), np.full(self.num_analog, float(self._round)))}
+            if self.num_counter:
+                arrays["Counter"] = (np.arange(self.num_counter), np.full(self.num_counter, self._round))
+            start = time.perf_counter()
+            outstation.apply_updates(arrays=arrays)
+            event_classes = opendnp3.ClassField(opendnp3.ClassField.CLASS_1 | opendnp3.ClassField.CLASS_2
+                                                | opendnp3.ClassField.CLASS_3)
+            deadline = start + timeout
+            while not done.is_set() and time.perf_counter() < deadline:
+                self._scan(master, event_classes)
+            return received[0], time.perf_counter() - start
+        finally:
+            for subscription in subscriptions:
+                subscription.cancel()
+
+    def run(self, iterations: int) -> dict:
+        self.wait_connected()
+        pairs = range(len(self.masters))
+        with concurrent.futures.ThreadPoolExecutor(max_workers=len(self.masters)) as executor:
+            # warm up, i.e., the first (integrity) poll
+            list(executor.map(lambda i: self.integrity_poll(self.masters[i], 1), pairs))
+
+            polls = executor.map(lambda i: self.integrity_poll(self.masters[i], iterations), pairs)
+            integrity_ms = [sample for samples in polls for sample in samples]
+
+            cpu_start, wall_start = time.process_time(), time.perf_counter()
+            soe_results = list(executor.map(self.soe, pairs))
+            cpu = time.process_time() - cpu_start
+            wall = time.perf_counter() - wall_start
+            points = sum(received for received, _ in soe_results)
+
+            rtts = executor.map(lambda i: self.command_rtt(self.masters[i], iterations), pairs)
+            command_ms = [sample for samples in rtts for sample in samples]
+
+        return {
+            "size": self.size,
+            "integrity_poll_ms": percentiles(integrity_ms),
+            "soe_points_per_s": points / wall if wall else None,
+            "soe_points": points,
+            "command_rtt_ms": percentiles(command_ms),
+            "cpu_us_per_point": cpu / points * 1e6 if points else None,
+        }
+
+
+def metadata() -> dict:
+    try:
+        commit = subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], stderr=subprocess.DEVNULL,
+                                         text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    try:
+        from importlib.metadata import version
+        package_version = version("dnp3-python")
+    except Exception:
+        package_version = None
+    return {
+        "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+        "commit": commit,
+        "version": package_version,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "processor": platform.processor(),
+    }
+
+
+def metric_value(result: dict, metric: str):
+    value = result.get(metric)
+    return value.get("p50") if isinstance(value, dict) else value
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> List[str]:
+    """:return: regressions, i.e., metrics worse than the baseline by more than tolerance (relative)"""
+    regressions = []
+    baseline_by_size = {result["size"]: result for result in baseline["results"]}
+    for result in results["results"]:
+        reference = baseline_by_size.get(result["size"])
+        if reference is None:
+            continue
+        for metric, higher_is_better in METRICS.items():
+            value, reference_value = metric_value(result, metric), metric_value(reference, metric)
+            if not value or not reference_value:
+                continue
+            ratio = value / reference_value
+            worse = ratio < 1 - tolerance if higher_is_better else ratio > 1 + tolerance
+            if worse:
+                regressions.append(f"size={result['size']} {metric}: {value:.4g} vs {reference_value:.4g} "
+                                   f"({ratio:.2f}x)")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000, 10000, 100000],
+                        help="number of points per outstation")
+    parser.add_argument("--outstations", type=int, default=1)
+    parser.add_argument("--masters", type=int, default=1)
+    parser.add_argument("--iterations", type=int, default=20, help="samples per master for latency metrics")
+    parser.add_argument("--base-port", type=int, default=BASE_PORT)
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--compare", help="baseline JSON file, exit with code 1 on regression")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="relative tolerance of --compare")
+    args = parser.parse_args()
+
+    results = {
+        "meta": metadata(),
+        "config": {"outstations": args.outstations, "masters": args.masters, "iterations": args.iterations},
+        "results": [],
+    }
+    for run_index, size in enumerate(args.sizes):
+        # Note: fresh ports for every size, the previous listeners may linger
+        loopback = Loopback(size, args.outstations, args.masters,
+                            base_port=args.base_port + run_index * args.outstations)
+        try:
+            result = loopback.run(args.iterations)
+        finally:
+            loopback.shutdown()
+        results["results"].append(result)
+        print(f"size={size:>7}  integrity p50={result['integrity_poll_ms']['p50']:.2f}ms "
+              f"p99={result['integrity_poll_ms']['p99']:.2f}ms  "
+              f"soe={result['soe_points_per_s'] or 0:.0f} pts/s  "
+              f"command p50={result['command_rtt_ms']['p50']:.2f}ms  "
+              f"cpu={result['cpu_us_per_point'] or 0:.2f}us/pt", file=sys.stderr)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    else:
+        json.dump(results, sys.stdout, indent=2)
+        print()
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -119,6 +119,10 @@ setup(
     install_requires=[
         # 'pybind11>=2.2',
         'argcomplete'],
+    extras_require={
+        'numpy': ['numpy'],  # optional, array-backed point store (dnp3_python.dnp3station.point_store)
+        'yaml': ['pyyaml'],  # optional, PointSchema.from_yaml (dnp3_python.dnp3station.point_schema)
+    },
     ext_modules=[CMakeExtension('pydnp3')],
     cmdclass=dict(build_ext=CMakeBuild),
     zip_safe=False,
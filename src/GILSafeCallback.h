@@ -0,0 +1,105 @@
+/*
+ * -*- coding: utf-8 -*- {{{
+ * vim: set fenc=utf-8 ft=python sw=4 ts=4 sts=4 et:
+ *
+ * Copyright 2018, Kisensum.
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License");
+ * you may not use this file except in compliance with the License.
+ * You may obtain a copy of the License at
+ *
+ * http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ *
+ * Neither Kisensum, nor any of its employees, nor any jurisdiction or
+ * organization that has cooperated in the development of these materials,
+ * makes any warranty, express or implied, or assumes any legal liability
+ * or responsibility for the accuracy, completeness, or usefulness or any
+ * information, apparatus, product, software, or process disclosed, or
+ * represents that its use would not infringe privately owned rights.
+ * Reference herein to any specific commercial product, process, or service
+ * by trade name, trademark, manufacturer, or otherwise does not necessarily
+ * constitute or imply its endorsement, recommendation, or favoring by Kisensum.
+ * }}}
+ */
+
+#ifndef PYDNP3_GILSAFECALLBACK_H
+#define PYDNP3_GILSAFECALLBACK_H
+
+#include <pybind11/pybind11.h>
+#include <Python.h>
+
+#include <exception>
+#include <functional>
+#include <memory>
+#include <type_traits>
+
+namespace py = pybind11;
+
+namespace pydnp3
+{
+/**
+* Pass a copyable callback argument by value (e.g., opendnp3::RestartOperationResult),
+* i.e., the Python object stays valid after the callback.
+*/
+    template <class T, typename std::enable_if<std::is_copy_constructible<T>::value, int>::type = 0>
+    py::object CallbackArgument(const T& arg)
+    {
+        return py::cast(arg);
+    }
+
+/**
+* Pass a non-copyable callback argument (e.g., the abstract opendnp3::ICommandTaskResult) by reference.
+* Note: the Python object is only valid during the callback, copy what is needed out of it.
+*/
+    template <class T, typename std::enable_if<!std::is_copy_constructible<T>::value, int>::type = 0>
+    py::object CallbackArgument(const T& arg)
+    {
+        return py::cast(&arg, py::return_value_policy::reference);
+    }
+
+/**
+* Wrap a Python callable into a std::function that the stack can copy, invoke and destroy on its own threads
+* while the GIL is released, e.g., the callback of DirectOperate called with py::gil_scoped_release.
+*
+* Copies only share a std::shared_ptr (no Python reference count is touched), the GIL is acquired to invoke
+* the callable and to release it with the last copy. Any exception, raised by the callable or by the conversion
+* of its arguments (e.g., py::cast_error), is printed instead of unwinding into the stack thread,
+* which would end in std::terminate.
+*/
+    template <class... Args>
+    std::function<void(Args...)> GILSafeCallback(py::function callback)
+    {
+        std::shared_ptr<py::function> holder(new py::function(std::move(callback)), [](py::function* f) {
+            py::gil_scoped_acquire acquire;
+            delete f;
+        });
+        return [holder](Args... args) -> void {
+            py::gil_scoped_acquire acquire;
+            try
+            {
+                (*holder)(CallbackArgument(args)...);
+            }
+            catch (py::error_already_set& e)
+            {
+                e.restore();
+                PyErr_Print();
+            }
+            catch (const std::exception& e)
+            {
+                PySys_WriteStderr("Exception in a pydnp3 callback: %s\n", e.what());
+            }
+            catch (...)
+            {
+                PySys_WriteStderr("Unknown exception in a pydnp3 callback\n");
+            }
+        };
+    }
+}
+
+#endif
@@ -0,0 +1,155 @@
+/*
+ * -*- coding: utf-8 -*- {{{
+ * vim: set fenc=utf-8 ft=python sw=4 ts=4 sts=4 et:
+ *
+ * Copyright 2018, Kisensum.
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License");
+ * you may not use this file except in compliance with the License.
+ * You may obtain a copy of the License at
+ *
+ * http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ *
+ * Neither Kisensum, nor any of its employees, nor any jurisdiction or
+ * organization that has cooperated in the development of these materials,
+ * makes any warranty, express or implied, or assumes any legal liability
+ * or responsibility for the accuracy, completeness, or usefulness or any
+ * information, apparatus, product, software, or process disclosed, or
+ * represents that its use would not infringe privately owned rights.
+ * Reference herein to any specific commercial product, process, or service
+ * by trade name, trademark, manufacturer, or otherwise does not necessarily
+ * constitute or imply its endorsement, recommendation, or favoring by Kisensum.
+ * }}}
+ */
+
+#ifndef PYDNP3_NUMPYARRAYS_H
+#define PYDNP3_NUMPYARRAYS_H
+
+#include <pybind11/pybind11.h>
+#include <pybind11/numpy.h>
+#include <Python.h>
+
+#include <cmath>
+#include <cstdint>
+#include <limits>
+#include <string>
+#include <type_traits>
+#include <vector>
+
+namespace py = pybind11;
+
+namespace pydnp3
+{
+/**
+* Copy a 1-dimensional array (or sequence) of integers into a vector of T, checking that every value fits T.
+* py::array_t<T, py::array::forcecast> casts unsafely instead, e.g., index 70000 becomes 4464 and -1 becomes 65535.
+* Note: called with the GIL held, before the GIL is released to build the objects.
+*
+* :raise ValueError: if the array is not 1-dimensional, not of integers, or a value is out of the range of T
+*/
+    template <class T>
+    typename std::enable_if<std::is_integral<T>::value, std::vector<T>>::type
+    CheckedArray(py::handle obj, const std::string& name)
+    {
+        py::array array = py::array::ensure(obj);
+        if (!array || array.ndim() != 1)
+        {
+            throw py::value_error(name + " must be a 1-dimensional array");
+        }
+        const ssize_t count = array.shape(0);
+        std::vector<T> result(static_cast<size_t>(count));
+        if (count == 0)
+        {
+            return result;
+        }
+        const char kind = array.dtype().kind();
+        const int64_t min = static_cast<int64_t>(std::numeric_limits<T>::min());
+        const uint64_t max = static_cast<uint64_t>(std::numeric_limits<T>::max());
+        if (kind == 'u')
+        {
+            auto values = py::array_t<uint64_t, py::array::c_style | py::array::forcecast>::ensure(array);
+            const uint64_t* value = values.data();
+            for (ssize_t i = 0; i < count; ++i)
+            {
+                if (value[i] > max)
+                {
+                    throw py::value_error(name + "[" + std::to_string(i) + "] = " + std::to_string(value[i]) +
+                                          " is out of range [" + std::to_string(min) + ", " +
+                                          std::to_string(max) + "]");
+                }
+                result[i] = static_cast<T>(value[i]);
+            }
+        }
+        else if (kind == 'i' || kind == 'b')
+        {
+            auto values = py::array_t<int64_t, py::array::c_style | py::array::forcecast>::ensure(array);
+            const int64_t* value = values.data();
+            for (ssize_t i = 0; i < count; ++i)
+            {
+                if (value[i] < min || (value[i] > 0 && static_cast<uint64_t>(value[i]) > max))
+                {
+                    throw py::value_error(name + "[" + std::to_string(i) + "] = " + std::to_string(value[i]) +
+                                          " is out of range [" + std::to_string(min) + ", " +
+                                          std::to_string(max) + "]");
+                }
+                result[i] = static_cast<T>(value[i]);
+            }
+        }
+        else
+        {
+            throw py::value_error(name + " must be integers, got an array of dtype " +
+                                  std::string(py::str(array.dtype())));
+        }
+        return result;
+    }
+
+/**
+* Copy a 1-dimensional array (or sequence) of numbers into a vector of T, checking that finite values fit T,
+* e.g., 1e39 does not silently become inf as a float.
+*
+* :raise ValueError: if the array is not 1-dimensional or numeric, or a finite value is out of the range of T
+*/
+    template <class T>
+    typename std::enable_if<std::is_floating_point<T>::value, std::vector<T>>::type
+    CheckedArray(py::handle obj, const std::string& name)
+    {
+        py::array array = py::array::ensure(obj);
+        if (!array || array.ndim() != 1)
+        {
+            throw py::value_error(name + " must be a 1-dimensional array");
+        }
+        const ssize_t count = array.shape(0);
+        std::vector<T> result(static_cast<size_t>(count));
+        if (count == 0)
+        {
+            return result;
+        }
+        const char kind = array.dtype().kind();
+        if (kind != 'f' && kind != 'i' && kind != 'u' && kind != 'b')
+        {
+            throw py::value_error(name + " must be numbers, got an array of dtype " +
+                                  std::string(py::str(array.dtype())));
+        }
+        auto values = py::array_t<double, py::array::c_style | py::array::forcecast>::ensure(array);
+        const double* value = values.data();
+        const double max = static_cast<double>(std::numeric_limits<T>::max());
+        for (ssize_t i = 0; i < count; ++i)
+        {
+            if (std::isfinite(value[i]) && std::fabs(value[i]) > max)
+            {
+                throw py::value_error(name + "[" + std::to_string(i) + "] = " +
+                                      std::string(py::str(py::float_(value[i]))) + " is out of range");
+            }
+            result[i] = static_cast<T>(value[i]);
+        }
+        return result;
+    }
+}
+
+#endif
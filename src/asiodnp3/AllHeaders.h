@@ -58,6 +58,9 @@
 #include "PrintingChannelListener.h"
 #include "PrintingCommandCallback.h"
 #include "PrintingSOEHandler.h"
+#include "RingBufferLogHandler.h"
+#include "RingBufferSOEHandler.h"
+#include "StatisticsCollector.h"
 #include "UpdateBuilder.h"
 #include "Updates.h"
 #include "X509Info.h"
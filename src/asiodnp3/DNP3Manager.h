@@ -35,6 +35,7 @@
 #include <Python.h>
 
 #include <asiodnp3/DNP3Manager.h>
+#include <system_error>
 
 #ifdef PYDNP3_ASIODNP3
 
@@ -137,6 +138,7 @@ void bind_DNP3Manager(py::module &m)
             ":param settings: settings object that fully parameterizes the serial port \n"
             ":param listener: optional callback interface (can be nullptr) for info about the running channel \n"
             ":return: shared_ptr to a channel interface",
+            py::call_guard<py::gil_scoped_release>(),
             py::arg("id"), py::arg("levels"), py::arg("retry"), py::arg("settings"), py::arg("listener"),
             py::return_value_policy::reference
         )
@@ -156,6 +158,7 @@ void bind_DNP3Manager(py::module &m)
             ":param listener: optional callback interface (can be nullptr) for info about the running channel \n"
             ":param ec: An error code. If set, a nullptr will be returned \n"
             ":return: shared_ptr to a channel interface",
+            py::call_guard<py::gil_scoped_release>(),
             py::arg("id"), py::arg("levels"), py::arg("retry"), py::arg("host"), py::arg("local"), py::arg("port"), py::arg("config"), py::arg("listener"), py::arg("ec"),
             py::return_value_policy::reference
         )
@@ -174,10 +177,64 @@ void bind_DNP3Manager(py::module &m)
             ":param listener: optional callback interface (can be nullptr) for info about the running channel \n"
             ":param ec: An error code. If set, a nullptr will be returned \n"
             ":return: shared_ptr to a channel interface",
+            py::call_guard<py::gil_scoped_release>(),
             py::arg("id"), py::arg("levels"), py::arg("retry"), py::arg("endpoint"), py::arg("port"), py::arg("config"), py::arg("listener"), py::arg("ec"),
             py::return_value_policy::reference
         )
 
+        .def(
+            "AddTLSClient",
+            [](asiodnp3::DNP3Manager &self,
+               const std::string& id,
+               uint32_t levels,
+               const asiopal::ChannelRetry& retry,
+               const std::string& host,
+               const std::string& local,
+               uint16_t port,
+               const asiopal::TLSConfig& config,
+               std::shared_ptr<asiodnp3::IChannelListener> listener)
+            {
+                std::error_code ec;
+                auto channel = self.AddTLSClient(id, levels, retry, host, local, port, config, listener, ec);
+                if (ec)
+                {
+                    throw std::system_error(ec);
+                }
+                return channel;
+            },
+            "   Add a TLS client channel. \n"
+            ":throw std::system_error if the TLS configuration is invalid \n"
+            ":return: shared_ptr to a channel interface",
+            py::call_guard<py::gil_scoped_release>(),
+            py::arg("id"), py::arg("levels"), py::arg("retry"), py::arg("host"), py::arg("local"), py::arg("port"), py::arg("config"), py::arg("listener")
+        )
+
+        .def(
+            "AddTLSServer",
+            [](asiodnp3::DNP3Manager &self,
+               const std::string& id,
+               uint32_t levels,
+               const asiopal::ChannelRetry& retry,
+               const std::string& endpoint,
+               uint16_t port,
+               const asiopal::TLSConfig& config,
+               std::shared_ptr<asiodnp3::IChannelListener> listener)
+            {
+                std::error_code ec;
+                auto channel = self.AddTLSServer(id, levels, retry, endpoint, port, config, listener, ec);
+                if (ec)
+                {
+                    throw std::system_error(ec);
+                }
+                return channel;
+            },
+            "   Add a TLS server channel. \n"
+            ":throw std::system_error if the TLS configuration is invalid or the endpoint cannot be bound \n"
+            ":return: shared_ptr to a channel interface",
+            py::call_guard<py::gil_scoped_release>(),
+            py::arg("id"), py::arg("levels"), py::arg("retry"), py::arg("endpoint"), py::arg("port"), py::arg("config"), py::arg("listener")
+        )
+
         .def(
             "CreateListener", 
             (std::shared_ptr<asiopal::IListener> (asiodnp3::DNP3Manager::*)(std::string,
@@ -201,6 +258,53 @@ void bind_DNP3Manager(py::module &m)
              "   Create a TLS listener that will be used to accept incoming connections. \n"
              ":return: shared_ptr to a listener interface",
              py::arg("loggerid"), py::arg("loglevel"), py::arg("endpoint"), py::arg("config"), py::arg("callbacks"), py::arg("ec")
+        )
+
+        .def(
+            "CreateListener",
+            [](asiodnp3::DNP3Manager &self,
+               std::string loggerid,
+               openpal::LogFilters loglevel,
+               asiopal::IPEndpoint endpoint,
+               std::shared_ptr<asiodnp3::IListenCallbacks> callbacks)
+            {
+                std::error_code ec;
+                auto listener = self.CreateListener(loggerid, loglevel, endpoint, callbacks, ec);
+                if (ec)
+                {
+                    throw std::system_error(ec);
+                }
+                return listener;
+            },
+            "   Create a TCP listener that will be used to accept incoming connections. \n"
+            ":throw std::system_error if the endpoint cannot be bound \n"
+            ":return: shared_ptr to a listener interface",
+            py::call_guard<py::gil_scoped_release>(),
+            py::arg("loggerid"), py::arg("loglevel"), py::arg("endpoint"), py::arg("callbacks")
+        )
+
+        .def(
+            "CreateListener",
+            [](asiodnp3::DNP3Manager &self,
+               std::string loggerid,
+               openpal::LogFilters loglevel,
+               asiopal::IPEndpoint endpoint,
+               const asiopal::TLSConfig& config,
+               std::shared_ptr<asiodnp3::IListenCallbacks> callbacks)
+            {
+                std::error_code ec;
+                auto listener = self.CreateListener(loggerid, loglevel, endpoint, config, callbacks, ec);
+                if (ec)
+                {
+                    throw std::system_error(ec);
+                }
+                return listener;
+            },
+            "   Create a TLS listener that will be used to accept incoming connections. \n"
+            ":throw std::system_error if the endpoint cannot be bound or the TLS configuration is invalid \n"
+            ":return: shared_ptr to a listener interface",
+            py::call_guard<py::gil_scoped_release>(),
+            py::arg("loggerid"), py::arg("loglevel"), py::arg("endpoint"), py::arg("config"), py::arg("callbacks")
         );
 }
 
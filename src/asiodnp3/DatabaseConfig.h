@@ -36,10 +36,84 @@
 
 #include <asiodnp3/DatabaseConfig.h>
 
+#include <stdexcept>
+#include <string>
+
 #ifdef PYDNP3_ASIODNP3
 
 namespace py = pybind11;
 
+namespace asiodnp3
+{
+/**
+* Bulk configuration of a range [start, stop] of points, in a single native call instead of
+* one Python attribute assignment per point and field (see dnp3station.point_schema).
+*/
+    template <class Config>
+    void CheckRange(const openpal::Array<Config, uint16_t>& points, uint16_t start, uint16_t stop)
+    {
+        if (start > stop || stop >= points.Size())
+        {
+            throw std::out_of_range("Invalid point range [" + std::to_string(start) + ", " + std::to_string(stop) +
+                                    "] for a database of " + std::to_string(points.Size()) + " points");
+        }
+    }
+
+    template <class Config>
+    void ConfigureStaticRange(openpal::Array<Config, uint16_t>& points,
+                              uint16_t start,
+                              uint16_t stop,
+                              decltype(Config::svariation) svariation)
+    {
+        CheckRange(points, start, stop);
+        py::gil_scoped_release release;
+        for (uint32_t i = start; i <= stop; ++i)
+        {
+            points[static_cast<uint16_t>(i)].svariation = svariation;
+        }
+    }
+
+    template <class Config>
+    void ConfigureEventRange(openpal::Array<Config, uint16_t>& points,
+                             uint16_t start,
+                             uint16_t stop,
+                             opendnp3::PointClass clazz,
+                             decltype(Config::svariation) svariation,
+                             decltype(Config::evariation) evariation)
+    {
+        CheckRange(points, start, stop);
+        py::gil_scoped_release release;
+        for (uint32_t i = start; i <= stop; ++i)
+        {
+            Config& point = points[static_cast<uint16_t>(i)];
+            point.clazz = clazz;
+            point.svariation = svariation;
+            point.evariation = evariation;
+        }
+    }
+
+    template <class Config>
+    void ConfigureDeadbandRange(openpal::Array<Config, uint16_t>& points,
+                                uint16_t start,
+                                uint16_t stop,
+                                opendnp3::PointClass clazz,
+                                decltype(Config::svariation) svariation,
+                                decltype(Config::evariation) evariation,
+                                decltype(Config::deadband) deadband)
+    {
+        CheckRange(points, start, stop);
+        py::gil_scoped_release release;
+        for (uint32_t i = start; i <= stop; ++i)
+        {
+            Config& point = points[static_cast<uint16_t>(i)];
+            point.clazz = clazz;
+            point.svariation = svariation;
+            point.evariation = evariation;
+            point.deadband = deadband;
+        }
+    }
+}
+
 void bind_DatabaseConfig(py::module &m)
 {
 	// ----- class: asiodnp3::DatabaseConfig -----
@@ -101,6 +175,105 @@ void bind_DatabaseConfig(py::module &m)
             "timeAndInterval",
             [](const asiodnp3::DatabaseConfig &self) { return &self.timeAndInterval;},
             py::return_value_policy::reference
+        )
+
+        .def(
+            "ConfigureBinary",
+            [](asiodnp3::DatabaseConfig &self, uint16_t start, uint16_t stop, opendnp3::PointClass clazz,
+               opendnp3::StaticBinaryVariation svariation, opendnp3::EventBinaryVariation evariation)
+            {
+                asiodnp3::ConfigureEventRange(self.binary, start, stop, clazz, svariation, evariation);
+            },
+            "Configure the binary points [start, stop] (inclusive) in a single call.",
+            py::arg("start"), py::arg("stop"), py::arg("clazz"), py::arg("svariation"), py::arg("evariation")
+        )
+
+        .def(
+            "ConfigureDoubleBinary",
+            [](asiodnp3::DatabaseConfig &self, uint16_t start, uint16_t stop, opendnp3::PointClass clazz,
+               opendnp3::StaticDoubleBinaryVariation svariation, opendnp3::EventDoubleBinaryVariation evariation)
+            {
+                asiodnp3::ConfigureEventRange(self.doubleBinary, start, stop, clazz, svariation, evariation);
+            },
+            "Configure the double-bit binary points [start, stop] (inclusive) in a single call.",
+            py::arg("start"), py::arg("stop"), py::arg("clazz"), py::arg("svariation"), py::arg("evariation")
+        )
+
+        .def(
+            "ConfigureAnalog",
+            [](asiodnp3::DatabaseConfig &self, uint16_t start, uint16_t stop, opendnp3::PointClass clazz,
+               opendnp3::StaticAnalogVariation svariation, opendnp3::EventAnalogVariation evariation,
+               decltype(opendnp3::AnalogConfig::deadband) deadband)
+            {
+                asiodnp3::ConfigureDeadbandRange(self.analog, start, stop, clazz, svariation, evariation, deadband);
+            },
+            "Configure the analog points [start, stop] (inclusive) in a single call.",
+            py::arg("start"), py::arg("stop"), py::arg("clazz"), py::arg("svariation"), py::arg("evariation"),
+            py::arg("deadband") = 0
+        )
+
+        .def(
+            "ConfigureCounter",
+            [](asiodnp3::DatabaseConfig &self, uint16_t start, uint16_t stop, opendnp3::PointClass clazz,
+               opendnp3::StaticCounterVariation svariation, opendnp3::EventCounterVariation evariation,
+               decltype(opendnp3::CounterConfig::deadband) deadband)
+            {
+                asiodnp3::ConfigureDeadbandRange(self.counter, start, stop, clazz, svariation, evariation, deadband);
+            },
+            "Configure the counter points [start, stop] (inclusive) in a single call.",
+            py::arg("start"), py::arg("stop"), py::arg("clazz"), py::arg("svariation"), py::arg("evariation"),
+            py::arg("deadband") = 0
+        )
+
+        .def(
+            "ConfigureFrozenCounter",
+            [](asiodnp3::DatabaseConfig &self, uint16_t start, uint16_t stop, opendnp3::PointClass clazz,
+               opendnp3::StaticFrozenCounterVariation svariation, opendnp3::EventFrozenCounterVariation evariation,
+               decltype(opendnp3::FrozenCounterConfig::deadband) deadband)
+            {
+                asiodnp3::ConfigureDeadbandRange(self.frozenCounter, start, stop, clazz, svariation, evariation,
+                                                 deadband);
+            },
+            "Configure the frozen counter points [start, stop] (inclusive) in a single call.",
+            py::arg("start"), py::arg("stop"), py::arg("clazz"), py::arg("svariation"), py::arg("evariation"),
+            py::arg("deadband") = 0
+        )
+
+        .def(
+            "ConfigureBOStatus",
+            [](asiodnp3::DatabaseConfig &self, uint16_t start, uint16_t stop, opendnp3::PointClass clazz,
+               opendnp3::StaticBinaryOutputStatusVariation svariation,
+               opendnp3::EventBinaryOutputStatusVariation evariation)
+            {
+                asiodnp3::ConfigureEventRange(self.boStatus, start, stop, clazz, svariation, evariation);
+            },
+            "Configure the binary output status points [start, stop] (inclusive) in a single call.",
+            py::arg("start"), py::arg("stop"), py::arg("clazz"), py::arg("svariation"), py::arg("evariation")
+        )
+
+        .def(
+            "ConfigureAOStatus",
+            [](asiodnp3::DatabaseConfig &self, uint16_t start, uint16_t stop, opendnp3::PointClass clazz,
+               opendnp3::StaticAnalogOutputStatusVariation svariation,
+               opendnp3::EventAnalogOutputStatusVariation evariation,
+               decltype(opendnp3::AOStatusConfig::deadband) deadband)
+            {
+                asiodnp3::ConfigureDeadbandRange(self.aoStatus, start, stop, clazz, svariation, evariation, deadband);
+            },
+            "Configure the analog output status points [start, stop] (inclusive) in a single call.",
+            py::arg("start"), py::arg("stop"), py::arg("clazz"), py::arg("svariation"), py::arg("evariation"),
+            py::arg("deadband") = 0
+        )
+
+        .def(
+            "ConfigureTimeAndInterval",
+            [](asiodnp3::DatabaseConfig &self, uint16_t start, uint16_t stop,
+               opendnp3::StaticTimeAndIntervalVariation svariation)
+            {
+                asiodnp3::ConfigureStaticRange(self.timeAndInterval, start, stop, svariation);
+            },
+            "Configure the time-and-interval points [start, stop] (inclusive) in a single call.",
+            py::arg("start"), py::arg("stop"), py::arg("svariation")
         );
 }
 
@@ -43,7 +43,9 @@ namespace py = pybind11;
 void bind_DefaultListenCallbacks(py::module &m)
 {
     // ----- class: asiodnp3::DefaultListenCallbacks -----
-    py::class_<asiodnp3::DefaultListenCallbacks, asiodnp3::IListenCallbacks>(m, "DefaultListenCallbacks",
+    py::class_<asiodnp3::DefaultListenCallbacks,
+               asiodnp3::IListenCallbacks,
+               std::shared_ptr<asiodnp3::DefaultListenCallbacks>>(m, "DefaultListenCallbacks",
         "Callback interface invoked when a new connection is accepted.")
 
         .def(py::init<>())
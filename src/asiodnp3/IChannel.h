@@ -122,18 +122,21 @@ void bind_IChannel(py::module &m)
         .def(
             "GetStatistics",
             &asiodnp3::IChannel::GetStatistics,
+            py::call_guard<py::gil_scoped_release>(),
             "Synchronously read the channel statistics."
          )
 
         .def(
             "GetLogFilters",
             &asiodnp3::IChannel::GetLogFilters,
+            py::call_guard<py::gil_scoped_release>(),
             ":return: the current logger settings for this channel"
         )
 
         .def(
             "SetLogFilters", 
             &asiodnp3::IChannel::SetLogFilters,
+            py::call_guard<py::gil_scoped_release>(),
             ":param filters: adjust the filters to this value",
             py::arg("filters")
         )
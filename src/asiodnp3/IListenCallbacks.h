@@ -106,7 +106,9 @@ namespace asiodnp3
 void bind_IListenCallbacks(py::module &m)
 {
     // ----- class: asiodnp3::IListenCallbacks -----
-    py::class_<asiodnp3::IListenCallbacks, asiodnp3::PyIListenCallbacks>(m, "IListenCallbacks",
+    py::class_<asiodnp3::IListenCallbacks,
+               asiodnp3::PyIListenCallbacks,
+               std::shared_ptr<asiodnp3::IListenCallbacks>>(m, "IListenCallbacks",
         "Callback interface invoked when a new connection is accepted.")
 
         .def(py::init<>())
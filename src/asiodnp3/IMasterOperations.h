@@ -36,6 +36,8 @@
 
 #include <asiodnp3/IMasterOperations.h>
 
+#include "../GILSafeCallback.h"
+
 #ifdef PYDNP3_ASIODNP3
 
 namespace py = pybind11;
@@ -234,6 +236,7 @@ void bind_IMasterOperations(py::module &m)
         .def(
             "SetLogFilters",
             &asiodnp3::IMasterOperations::SetLogFilters,
+            py::call_guard<py::gil_scoped_release>(),
             ":param filters: Adjust the filters to this value",
             py::arg("filters")
         )
@@ -241,6 +244,7 @@ void bind_IMasterOperations(py::module &m)
         .def(
             "AddScan",
             &asiodnp3::IMasterOperations::AddScan,
+            py::call_guard<py::gil_scoped_release>(),
             "   Add a recurring user-defined scan from a vector of headers. \n"
             ":param config: defaults to opendnp3.TaskConfig.Default() \n"
             ":return: shared_ptr to asiodnp3.IMasterScan - a proxy class used to manipulate the scan",
@@ -250,6 +254,7 @@ void bind_IMasterOperations(py::module &m)
         .def(
             "AddAllObjectsScan",
             &asiodnp3::IMasterOperations::AddAllObjectsScan,
+            py::call_guard<py::gil_scoped_release>(),
             "   Add a scan that requests all objects using qualifier code 0x06. \n"
             ":param config: defaults to opendnp3.TaskConfig.Default() \n"
             ":return: shared_ptr to asiodnp3.IMasterScan - a proxy class used to manipulate the scan",
@@ -259,6 +264,7 @@ void bind_IMasterOperations(py::module &m)
         .def(
             "AddClassScan",
             &asiodnp3::IMasterOperations::AddClassScan,
+            py::call_guard<py::gil_scoped_release>(),
             "   Add a class-based scan to the master. \n"
             ":param config: defaults to opendnp3.TaskConfig.Default() \n"
             ":return: shared_ptr to asiodnp3.IMasterScan - a proxy class used to manipulate the scan",
@@ -268,6 +274,7 @@ void bind_IMasterOperations(py::module &m)
         .def(
             "AddRangeScan",
             &asiodnp3::IMasterOperations::AddRangeScan,
+            py::call_guard<py::gil_scoped_release>(),
             "   Add a start/stop (range) scan to the master. \n"
             ":param config: defaults to opendnp3.TaskConfig.Default() \n"
             ":return: shared_ptr to asiodnp3.IMasterScan - a proxy class used to manipulate the scan.",
@@ -277,6 +284,7 @@ void bind_IMasterOperations(py::module &m)
         .def(
             "Scan",
             &asiodnp3::IMasterOperations::Scan,
+            py::call_guard<py::gil_scoped_release>(),
             "   Initiate a single user defined scan via a vector of headers. \n"
             ":param config: defaults to opendnp3.TaskConfig.Default()",
             py::arg("headers"), py::arg("config") = opendnp3::TaskConfig::Default()
@@ -285,6 +293,7 @@ void bind_IMasterOperations(py::module &m)
         .def(
             "ScanAllObjects",
             &asiodnp3::IMasterOperations::ScanAllObjects,
+            py::call_guard<py::gil_scoped_release>(),
             "   Initiate a single scan that requests all objects (0x06 qualifier code) for a certain group and variation. \n"
             ":param config: defaults to opendnp3.TaskConfig.Default()",
             py::arg("gvId"), py::arg("config") = opendnp3::TaskConfig::Default()
@@ -293,6 +302,7 @@ void bind_IMasterOperations(py::module &m)
         .def(
             "ScanClasses",
             &asiodnp3::IMasterOperations::ScanClasses,
+            py::call_guard<py::gil_scoped_release>(),
             "   Initiate a single class-based scan. \n"
             ":param config: defaults to opendnp3.TaskConfig.Default()",
             py::arg("field"), py::arg("config") = opendnp3::TaskConfig::Default()
@@ -301,6 +311,7 @@ void bind_IMasterOperations(py::module &m)
         .def(
             "ScanRange",
             &asiodnp3::IMasterOperations::ScanRange,
+            py::call_guard<py::gil_scoped_release>(),
             "   Initiate a single start/stop (range) scan \n"
             ":param config: defaults to opendnp3.TaskConfig.Default()",
             py::arg("gvId"), py::arg("start"), py::arg("stop"), py::arg("config") = opendnp3::TaskConfig::Default()
@@ -309,14 +320,30 @@ void bind_IMasterOperations(py::module &m)
         .def(
             "Write",
             &asiodnp3::IMasterOperations::Write,
+            py::call_guard<py::gil_scoped_release>(),
             "   Write a time and interval object to a specific index \n"
             ":param config: defaults to opendnp3.TaskConfig.Default()",
             py::arg("value"), py::arg("index"), py::arg("config") = opendnp3::TaskConfig::Default()
         )
 
+        // Python callables: GIL-safe overload, checked before the RestartOperationCallbackT one
+        .def(
+            "Restart",
+            [](asiodnp3::IMasterOperations& self,
+               opendnp3::RestartType op,
+               py::function callback,
+               const opendnp3::TaskConfig& config) -> void {
+                auto safeCallback = pydnp3::GILSafeCallback<const opendnp3::RestartOperationResult&>(std::move(callback));
+                py::gil_scoped_release release;
+                self.Restart(op, safeCallback, config);
+            },
+            py::arg("op"), py::arg("callback"), py::arg("config") = opendnp3::TaskConfig::Default()
+        )
+
         .def(
             "Restart",
             &asiodnp3::IMasterOperations::Restart,
+            py::call_guard<py::gil_scoped_release>(),
             "   Perform a cold or warm restart and get back the time-to-complete value \n"
             ":param config: defaults to opendnp3.TaskConfig.Default()",
             py::arg("op"), py::arg("callback"), py::arg("config") = opendnp3::TaskConfig::Default()
@@ -325,6 +352,7 @@ void bind_IMasterOperations(py::module &m)
         .def(
             "PerformFunction",
             &asiodnp3::IMasterOperations::PerformFunction,
+            py::call_guard<py::gil_scoped_release>(),
             "   Perform any operation that requires just a function code \n"
             ":param config: defaults to opendnp3.TaskConfig.Default()",
             py::arg("name"), py::arg("func"), py::arg("headers"), py::arg("config") = opendnp3::TaskConfig::Default()
@@ -72,6 +72,7 @@ void bind_IMasterScan(py::module &m)
         .def(
             "Demand",
             &asiodnp3::IMasterScan::Demand,
+            py::call_guard<py::gil_scoped_release>(),
             "Request that the scan be performed as soon as possible."
         );
 }
@@ -249,12 +249,14 @@ void bind_IMasterSession(py::module &m)
 
         .def(
             "GetStackStatistics",
-            &asiodnp3::IMasterSession::GetStackStatistics
+            &asiodnp3::IMasterSession::GetStackStatistics,
+            py::call_guard<py::gil_scoped_release>()
         )
 
         .def(
             "BeginShutdown",
-            &asiodnp3::IMasterSession::BeginShutdown
+            &asiodnp3::IMasterSession::BeginShutdown,
+            py::call_guard<py::gil_scoped_release>()
         );
 }
 
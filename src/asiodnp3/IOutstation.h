@@ -124,6 +124,7 @@ void bind_IOutstation(py::module &m)
         .def(
             "SetLogFilters",
             &asiodnp3::IOutstation::SetLogFilters,
+            py::call_guard<py::gil_scoped_release>(),
             ":param filters: Adjust the filters to this value",
             py::arg("filters")
         )
@@ -131,6 +132,7 @@ void bind_IOutstation(py::module &m)
         .def(
             "SetRestartIIN",
             &asiodnp3::IOutstation::SetRestartIIN,
+            py::call_guard<py::gil_scoped_release>(),
             "Sets the restart IIN bit. \n"
             "Normally applications should not touch this bit, but it is provided for simulating restarts."
         )
@@ -138,6 +140,7 @@ void bind_IOutstation(py::module &m)
         .def(
             "Apply",
             &asiodnp3::IOutstation::Apply,
+            py::call_guard<py::gil_scoped_release>(),
             "Apply a set of measurement updates to the outstation.",
             py::arg("updates")
         );
@@ -78,6 +78,7 @@ void bind_ISessionAcceptor(py::module &m)
             "AcceptSession",
             &asiodnp3::ISessionAcceptor::AcceptSession,
             ":return: shared_ptr to asiodnp3.IMasterSession",
+            py::call_guard<py::gil_scoped_release>(),
             py::arg("sessionid"), py::arg("SOEHandler"), py::arg("application"), py::arg("config")
         );
 }
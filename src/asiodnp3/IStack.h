@@ -112,6 +112,7 @@ void bind_IStack(py::module &m)
         .def(
             "GetStackStatistics",
             &asiodnp3::IStack::GetStackStatistics,
+            py::call_guard<py::gil_scoped_release>(),
             ":return: stack statistics counters."
         );
 }
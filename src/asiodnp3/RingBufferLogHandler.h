@@ -0,0 +1,417 @@
+/*
+ * -*- coding: utf-8 -*- {{{
+ * vim: set fenc=utf-8 ft=python sw=4 ts=4 sts=4 et:
+ *
+ * Copyright 2018, Kisensum.
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License");
+ * you may not use this file except in compliance with the License.
+ * You may obtain a copy of the License at
+ *
+ * http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ *
+ * Neither Kisensum, nor any of its employees, nor any jurisdiction or
+ * organization that has cooperated in the development of these materials,
+ * makes any warranty, express or implied, or assumes any legal liability
+ * or responsibility for the accuracy, completeness, or usefulness or any
+ * information, apparatus, product, software, or process disclosed, or
+ * represents that its use would not infringe privately owned rights.
+ * Reference herein to any specific commercial product, process, or service
+ * by trade name, trademark, manufacturer, or otherwise does not necessarily
+ * constitute or imply its endorsement, recommendation, or favoring by Kisensum.
+ * }}}
+ */
+
+#ifndef PYDNP3_ASIODNP3_RINGBUFFERLOGHANDLER_H
+#define PYDNP3_ASIODNP3_RINGBUFFERLOGHANDLER_H
+
+#include <pybind11/pybind11.h>
+#include <pybind11/numpy.h>
+#include <Python.h>
+
+#include <chrono>
+#include <condition_variable>
+#include <cstring>
+#include <mutex>
+#include <string>
+#include <unordered_map>
+#include <vector>
+
+#include <openpal/logging/ILogHandler.h>
+#include <openpal/logging/LogEntry.h>
+#include <opendnp3/LogLevels.h>
+
+#ifdef PYDNP3_ASIODNP3
+
+namespace py = pybind11;
+
+namespace asiodnp3
+{
+/**
+* One log entry, see RingBufferLogHandler.
+*/
+    struct LogRecord
+    {
+        int64_t time;           // ms since epoch
+        int32_t filters;        // opendnp3::flags
+        std::string loggerid;
+        std::string location;   // file name and line, without the directory
+        std::string message;
+    };
+
+/**
+* Sampling and rate limit of the entries of one logger id, see RingBufferLogHandler::SetPolicy.
+*/
+    struct LogPolicy
+    {
+        uint32_t sampleEvery = 1;   // keep one entry out of sampleEvery
+        double maxPerSecond = 0;    // 0 for no rate limit, the burst is one second worth of entries
+        uint64_t seen = 0;
+        double tokens = 0;
+        int64_t lastRefill = 0;
+    };
+
+/**
+* ILogHandler writing the log entries into a fixed-size ring buffer, without acquiring the GIL,
+* after per logger id sampling and rate limiting. Python drains the buffer in batches from its own thread.
+* When the buffer is full, the oldest entries are overwritten, i.e., the buffer keeps the latest entries.
+* Note: the stack threads (producers) only contend on a short critical section, records are preallocated
+* and strings keep their capacity, so that logging does not allocate once warmed up.
+*/
+    class RingBufferLogHandler final : public openpal::ILogHandler
+    {
+    public:
+        RingBufferLogHandler(size_t capacity, size_t maxMessageLength) :
+            buffer(capacity > 0 ? capacity : 1),
+            maxMessageLength(maxMessageLength)
+        {
+            for (auto& record : buffer)
+            {
+                record.message.reserve(maxMessageLength);
+            }
+        }
+
+        void Log(const openpal::LogEntry& entry) override
+        {
+            const int64_t now = std::chrono::duration_cast<std::chrono::milliseconds>(
+                std::chrono::system_clock::now().time_since_epoch()).count();
+            {
+                std::lock_guard<std::mutex> lock(mutex);
+                ++received;
+                if (!Admit(entry, now))
+                {
+                    ++dropped;
+                    return;
+                }
+                if (size == buffer.size())
+                {
+                    // full: overwrite the oldest record
+                    tail = (tail + 1) % buffer.size();
+                    --size;
+                    ++overflow;
+                }
+                LogRecord& record = buffer[(tail + size) % buffer.size()];
+                record.time = now;
+                record.filters = entry.filters.GetBitfield();
+                record.loggerid.assign(entry.loggerid ? entry.loggerid : "");
+                record.location.assign(BaseName(entry.location));
+                const char* message = entry.message ? entry.message : "";
+                record.message.assign(message, strnlen(message, maxMessageLength));
+                ++size;
+            }
+            cv.notify_one();
+        }
+
+        /**
+        * Sample and rate limit the entries of a logger id (e.g., the id of a channel, master or outstation).
+        * Entries matching the exempt filters (errors and warnings by default) are always kept.
+        */
+        void SetPolicy(const std::string& loggerid, uint32_t sampleEvery, double maxPerSecond)
+        {
+            std::lock_guard<std::mutex> lock(mutex);
+            LogPolicy& policy = policies[loggerid];
+            policy.sampleEvery = sampleEvery > 0 ? sampleEvery : 1;
+            policy.maxPerSecond = maxPerSecond;
+            policy.tokens = maxPerSecond;
+        }
+
+        /* Policy of the logger ids without a policy of their own. */
+        void SetDefaultPolicy(uint32_t sampleEvery, double maxPerSecond)
+        {
+            std::lock_guard<std::mutex> lock(mutex);
+            defaultPolicy.sampleEvery = sampleEvery > 0 ? sampleEvery : 1;
+            defaultPolicy.maxPerSecond = maxPerSecond;
+            defaultPolicy.tokens = maxPerSecond;
+        }
+
+        void ClearPolicies()
+        {
+            std::lock_guard<std::mutex> lock(mutex);
+            policies.clear();
+            defaultPolicy = LogPolicy();
+        }
+
+        void SetExemptFilters(int32_t filters)
+        {
+            std::lock_guard<std::mutex> lock(mutex);
+            exemptFilters = filters;
+        }
+
+        /**
+        * Move up to maxItems records (0 for all) out of the buffer.
+        * @return tuple (time, filters, loggerid, location, message), time and filters as numpy arrays,
+        * the others as lists of str, in arrival order
+        */
+        py::tuple Drain(size_t maxItems)
+        {
+            std::vector<LogRecord> records;
+            {
+                py::gil_scoped_release release;
+                std::lock_guard<std::mutex> lock(mutex);
+                size_t count = (maxItems > 0 && size > maxItems) ? maxItems : size;
+                records.resize(count);
+                for (size_t i = 0; i < count; ++i)
+                {
+                    // swap, so that the ring keeps the preallocated strings of the copies
+                    std::swap(records[i], buffer[(tail + i) % buffer.size()]);
+                    buffer[(tail + i) % buffer.size()].message.reserve(maxMessageLength);
+                }
+                tail = (tail + count) % buffer.size();
+                size -= count;
+            }
+
+            py::array_t<int64_t> times(records.size());
+            py::array_t<int32_t> filters(records.size());
+            py::list loggerids;
+            py::list locations;
+            py::list messages;
+            int64_t* pTimes = times.mutable_data();
+            int32_t* pFilters = filters.mutable_data();
+            for (size_t i = 0; i < records.size(); ++i)
+            {
+                const LogRecord& record = records[i];
+                pTimes[i] = record.time;
+                pFilters[i] = record.filters;
+                loggerids.append(py::str(record.loggerid));
+                locations.append(py::str(record.location));
+                // Note: a message truncated within a multi-byte character is not valid UTF-8, replace it
+                messages.append(py::reinterpret_steal<py::str>(
+                    PyUnicode_DecodeUTF8(record.message.data(), record.message.size(), "replace")));
+            }
+            return py::make_tuple(times, filters, loggerids, locations, messages);
+        }
+
+        /**
+        * Block (with the GIL released) until records are available or Notify() is called.
+        * @return true if records are available
+        */
+        bool Wait(uint32_t timeoutMs)
+        {
+            py::gil_scoped_release release;
+            std::unique_lock<std::mutex> lock(mutex);
+            cv.wait_for(lock, std::chrono::milliseconds(timeoutMs), [this]() {
+                return this->size > 0 || this->notified;
+            });
+            notified = false;
+            return size > 0;
+        }
+
+        /* Wake up a consumer blocked in Wait(). */
+        void Notify()
+        {
+            {
+                std::lock_guard<std::mutex> lock(mutex);
+                notified = true;
+            }
+            cv.notify_all();
+        }
+
+        size_t Size()
+        {
+            std::lock_guard<std::mutex> lock(mutex);
+            return size;
+        }
+
+        size_t Capacity() const
+        {
+            return buffer.size();
+        }
+
+        /* @return dict of counters: received, dropped (by the policies), overflow (overwritten records) */
+        py::dict GetStatistics()
+        {
+            uint64_t received, dropped, overflow;
+            {
+                std::lock_guard<std::mutex> lock(mutex);
+                received = this->received;
+                dropped = this->dropped;
+                overflow = this->overflow;
+            }
+            py::dict stats;
+            stats["received"] = received;
+            stats["dropped"] = dropped;
+            stats["overflow"] = overflow;
+            return stats;
+        }
+
+    private:
+        static const char* BaseName(const char* location)
+        {
+            if (!location)
+            {
+                return "";
+            }
+            const char* slash = strrchr(location, '/');
+            return slash ? slash + 1 : location;
+        }
+
+        /* Called with the mutex held. */
+        bool Admit(const openpal::LogEntry& entry, int64_t now)
+        {
+            if (entry.filters.GetBitfield() & exemptFilters)
+            {
+                return true;
+            }
+            LogPolicy* policy = &defaultPolicy;
+            if (!policies.empty() && entry.loggerid)
+            {
+                auto iter = policies.find(entry.loggerid);
+                if (iter != policies.end())
+                {
+                    policy = &iter->second;
+                }
+            }
+            if (policy->sampleEvery > 1 && (policy->seen++ % policy->sampleEvery) != 0)
+            {
+                return false;
+            }
+            if (policy->maxPerSecond > 0)
+            {
+                policy->tokens += (now - policy->lastRefill) * policy->maxPerSecond / 1000.0;
+                if (policy->tokens > policy->maxPerSecond)
+                {
+                    policy->tokens = policy->maxPerSecond;
+                }
+                policy->lastRefill = now;
+                if (policy->tokens < 1)
+                {
+                    return false;
+                }
+                policy->tokens -= 1;
+            }
+            return true;
+        }
+
+        std::vector<LogRecord> buffer;
+        const size_t maxMessageLength;
+        size_t tail = 0;
+        size_t size = 0;
+
+        std::unordered_map<std::string, LogPolicy> policies;
+        LogPolicy defaultPolicy;
+        int32_t exemptFilters = opendnp3::flags::ERR | opendnp3::flags::WARN;
+
+        uint64_t received = 0;
+        uint64_t dropped = 0;
+        uint64_t overflow = 0;
+        bool notified = false;
+
+        std::mutex mutex;
+        std::condition_variable cv;
+    };
+}
+
+void bind_RingBufferLogHandler(py::module &m)
+{
+    // ----- class: asiodnp3::RingBufferLogHandler -----
+    py::class_<asiodnp3::RingBufferLogHandler,
+               openpal::ILogHandler,
+               std::shared_ptr<asiodnp3::RingBufferLogHandler>>(m, "RingBufferLogHandler",
+        "LogHandler buffering log entries in a native ring buffer, without acquiring the GIL, \n"
+        "with sampling and rate limits per logger id. Drain it from a Python thread, \n"
+        "see dnp3station.log_buffer.BufferedLogConsumer")
+
+        .def(
+            py::init<size_t, size_t>(),
+            ":param capacity: number of records, the oldest are overwritten when the buffer is full \n"
+            ":param maxMessageLength: longer messages are truncated",
+            py::arg("capacity") = 65536, py::arg("maxMessageLength") = 512
+        )
+
+        .def(
+            "SetPolicy",
+            &asiodnp3::RingBufferLogHandler::SetPolicy,
+            "   Sample and rate limit the entries of a logger id. \n"
+            ":param sampleEvery: keep one entry out of sampleEvery \n"
+            ":param maxPerSecond: maximum number of entries per second, 0 for no limit",
+            py::arg("loggerid"), py::arg("sampleEvery") = 1, py::arg("maxPerSecond") = 0
+        )
+
+        .def(
+            "SetDefaultPolicy",
+            &asiodnp3::RingBufferLogHandler::SetDefaultPolicy,
+            "Sampling and rate limit of the logger ids without a policy of their own.",
+            py::arg("sampleEvery") = 1, py::arg("maxPerSecond") = 0
+        )
+
+        .def(
+            "ClearPolicies",
+            &asiodnp3::RingBufferLogHandler::ClearPolicies
+        )
+
+        .def(
+            "SetExemptFilters",
+            &asiodnp3::RingBufferLogHandler::SetExemptFilters,
+            "Entries matching these opendnp3.flags bypass the policies, default to ERR | WARN.",
+            py::arg("filters")
+        )
+
+        .def(
+            "Drain",
+            &asiodnp3::RingBufferLogHandler::Drain,
+            "   Move up to maxItems records (0 for all) out of the buffer. \n"
+            ":return: tuple (time, filters, loggerid, location, message), in arrival order, \n"
+            "   time (ms since epoch) and filters (opendnp3.flags) as numpy arrays, the others as lists of str.",
+            py::arg("maxItems") = 0
+        )
+
+        .def(
+            "Wait",
+            &asiodnp3::RingBufferLogHandler::Wait,
+            "   Block until records are available, Notify() is called or the timeout expires. \n"
+            ":return: True if records are available",
+            py::arg("timeoutMs")
+        )
+
+        .def(
+            "Notify",
+            &asiodnp3::RingBufferLogHandler::Notify,
+            "Wake up a consumer blocked in Wait()."
+        )
+
+        .def(
+            "Size",
+            &asiodnp3::RingBufferLogHandler::Size,
+            "Number of records waiting to be drained."
+        )
+
+        .def(
+            "Capacity",
+            &asiodnp3::RingBufferLogHandler::Capacity
+        )
+
+        .def(
+            "GetStatistics",
+            &asiodnp3::RingBufferLogHandler::GetStatistics,
+            "Counters: received, dropped (by the policies) and overflow (overwritten records)."
+        );
+}
+
+#endif // PYDNP3_ASIODNP3
+#endif
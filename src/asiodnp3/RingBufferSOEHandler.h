@@ -0,0 +1,388 @@
+/*
+ * -*- coding: utf-8 -*- {{{
+ * vim: set fenc=utf-8 ft=python sw=4 ts=4 sts=4 et:
+ *
+ * Copyright 2018, Kisensum.
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License");
+ * you may not use this file except in compliance with the License.
+ * You may obtain a copy of the License at
+ *
+ * http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ *
+ * Neither Kisensum, nor any of its employees, nor any jurisdiction or
+ * organization that has cooperated in the development of these materials,
+ * makes any warranty, express or implied, or assumes any legal liability
+ * or responsibility for the accuracy, completeness, or usefulness or any
+ * information, apparatus, product, software, or process disclosed, or
+ * represents that its use would not infringe privately owned rights.
+ * Reference herein to any specific commercial product, process, or service
+ * by trade name, trademark, manufacturer, or otherwise does not necessarily
+ * constitute or imply its endorsement, recommendation, or favoring by Kisensum.
+ * }}}
+ */
+
+#ifndef PYDNP3_ASIODNP3_RINGBUFFERSOEHANDLER_H
+#define PYDNP3_ASIODNP3_RINGBUFFERSOEHANDLER_H
+
+#include <pybind11/pybind11.h>
+#include <pybind11/numpy.h>
+#include <Python.h>
+
+#include <atomic>
+#include <chrono>
+#include <condition_variable>
+#include <mutex>
+#include <vector>
+
+#include <opendnp3/app/parsing/ICollection.h>
+#include <opendnp3/master/ISOEHandler.h>
+
+#ifdef PYDNP3_ASIODNP3
+
+namespace py = pybind11;
+
+namespace asiodnp3
+{
+/**
+* One decoded measurement, see RingBufferSOEHandler.
+*/
+    struct SOERecord
+    {
+        uint16_t gv;        // opendnp3::GroupVariation
+        uint16_t index;
+        uint8_t type;       // RingBufferSOEHandler::PointType
+        uint8_t flags;
+        double value;
+        uint64_t time;      // DNP3 timestamp, ms since epoch
+    };
+
+/**
+* ISOEHandler writing the decoded measurements into a fixed-size single-producer/single-consumer ring buffer.
+* Process() runs entirely in C++ on the stack's thread, without acquiring the GIL,
+* and Python drains the buffer in batches from its own thread.
+* Note: use one handler per master, i.e., a single producer.
+*/
+    class RingBufferSOEHandler final : public opendnp3::ISOEHandler
+    {
+    public:
+        enum PointType : uint8_t
+        {
+            BINARY = 0,
+            DOUBLE_BIT_BINARY = 1,
+            ANALOG = 2,
+            COUNTER = 3,
+            FROZEN_COUNTER = 4,
+            BINARY_OUTPUT_STATUS = 5,
+            ANALOG_OUTPUT_STATUS = 6
+        };
+
+        explicit RingBufferSOEHandler(size_t capacity) : buffer(RoundUpToPowerOfTwo(capacity)), mask(buffer.size() - 1)
+        {}
+
+        void Process(const opendnp3::HeaderInfo& info,
+                     const opendnp3::ICollection<opendnp3::Indexed<opendnp3::Binary>>& values) override
+        {
+            Push(info, values, BINARY);
+        }
+        void Process(const opendnp3::HeaderInfo& info,
+                     const opendnp3::ICollection<opendnp3::Indexed<opendnp3::DoubleBitBinary>>& values) override
+        {
+            Push(info, values, DOUBLE_BIT_BINARY);
+        }
+        void Process(const opendnp3::HeaderInfo& info,
+                     const opendnp3::ICollection<opendnp3::Indexed<opendnp3::Analog>>& values) override
+        {
+            Push(info, values, ANALOG);
+        }
+        void Process(const opendnp3::HeaderInfo& info,
+                     const opendnp3::ICollection<opendnp3::Indexed<opendnp3::Counter>>& values) override
+        {
+            Push(info, values, COUNTER);
+        }
+        void Process(const opendnp3::HeaderInfo& info,
+                     const opendnp3::ICollection<opendnp3::Indexed<opendnp3::FrozenCounter>>& values) override
+        {
+            Push(info, values, FROZEN_COUNTER);
+        }
+        void Process(const opendnp3::HeaderInfo& info,
+                     const opendnp3::ICollection<opendnp3::Indexed<opendnp3::BinaryOutputStatus>>& values) override
+        {
+            Push(info, values, BINARY_OUTPUT_STATUS);
+        }
+        void Process(const opendnp3::HeaderInfo& info,
+                     const opendnp3::ICollection<opendnp3::Indexed<opendnp3::AnalogOutputStatus>>& values) override
+        {
+            Push(info, values, ANALOG_OUTPUT_STATUS);
+        }
+
+        /* The remaining types have no numeric value, they are counted but not buffered. */
+        void Process(const opendnp3::HeaderInfo& info,
+                     const opendnp3::ICollection<opendnp3::Indexed<opendnp3::OctetString>>& values) override
+        {
+            skipped.fetch_add(values.Count(), std::memory_order_relaxed);
+        }
+        void Process(const opendnp3::HeaderInfo& info,
+                     const opendnp3::ICollection<opendnp3::Indexed<opendnp3::TimeAndInterval>>& values) override
+        {
+            skipped.fetch_add(values.Count(), std::memory_order_relaxed);
+        }
+        void Process(const opendnp3::HeaderInfo& info,
+                     const opendnp3::ICollection<opendnp3::Indexed<opendnp3::BinaryCommandEvent>>& values) override
+        {
+            skipped.fetch_add(values.Count(), std::memory_order_relaxed);
+        }
+        void Process(const opendnp3::HeaderInfo& info,
+                     const opendnp3::ICollection<opendnp3::Indexed<opendnp3::AnalogCommandEvent>>& values) override
+        {
+            skipped.fetch_add(values.Count(), std::memory_order_relaxed);
+        }
+        void Process(const opendnp3::HeaderInfo& info,
+                     const opendnp3::ICollection<opendnp3::Indexed<opendnp3::SecurityStat>>& values) override
+        {
+            skipped.fetch_add(values.Count(), std::memory_order_relaxed);
+        }
+        void Process(const opendnp3::HeaderInfo& info,
+                     const opendnp3::ICollection<opendnp3::DNPTime>& values) override
+        {
+            skipped.fetch_add(values.Count(), std::memory_order_relaxed);
+        }
+
+        /**
+        * Move up to maxItems records (0 for all) out of the buffer.
+        * @return tuple of numpy arrays (gv, type, index, value, flags, time), in arrival order
+        */
+        py::tuple Drain(size_t maxItems)
+        {
+            // Note: release the GIL before taking drainMutex, i.e., never wait for the GIL while holding it,
+            // otherwise a second Python thread blocked on drainMutex (with the GIL) deadlocks with this one.
+            std::vector<SOERecord> records;
+            {
+                py::gil_scoped_release release;
+                std::lock_guard<std::mutex> lock(drainMutex);  // consumers only, the producer never takes it
+                const size_t tail = this->tail.load(std::memory_order_relaxed);
+                size_t count = this->head.load(std::memory_order_acquire) - tail;
+                if (maxItems > 0 && count > maxItems)
+                {
+                    count = maxItems;
+                }
+                records.resize(count);
+                for (size_t i = 0; i < count; ++i)
+                {
+                    records[i] = buffer[(tail + i) & mask];
+                }
+                this->tail.store(tail + count, std::memory_order_release);
+            }
+
+            const size_t count = records.size();
+            py::array_t<uint16_t> gvs(count);
+            py::array_t<uint8_t> types(count);
+            py::array_t<uint16_t> indices(count);
+            py::array_t<double> values(count);
+            py::array_t<uint8_t> flags(count);
+            py::array_t<int64_t> times(count);
+
+            uint16_t* pGvs = gvs.mutable_data();
+            uint8_t* pTypes = types.mutable_data();
+            uint16_t* pIndices = indices.mutable_data();
+            double* pValues = values.mutable_data();
+            uint8_t* pFlags = flags.mutable_data();
+            int64_t* pTimes = times.mutable_data();
+            for (size_t i = 0; i < count; ++i)
+            {
+                const SOERecord& record = records[i];
+                pGvs[i] = record.gv;
+                pTypes[i] = record.type;
+                pIndices[i] = record.index;
+                pValues[i] = record.value;
+                pFlags[i] = record.flags;
+                pTimes[i] = static_cast<int64_t>(record.time);
+            }
+            return py::make_tuple(gvs, types, indices, values, flags, times);
+        }
+
+        /**
+        * Block (with the GIL released) until records are available or Notify() is called.
+        * @return true if records are available
+        */
+        bool Wait(uint32_t timeoutMs)
+        {
+            py::gil_scoped_release release;  // before waitMutex, see Drain
+            std::unique_lock<std::mutex> lock(waitMutex);
+            cv.wait_for(lock, std::chrono::milliseconds(timeoutMs), [this]() {
+                return this->Size() > 0 || this->notified.exchange(false);
+            });
+            return this->Size() > 0;
+        }
+
+        /* Wake up a consumer blocked in Wait(). */
+        void Notify()
+        {
+            notified.store(true);
+            cv.notify_all();
+        }
+
+        size_t Size() const
+        {
+            return head.load(std::memory_order_acquire) - tail.load(std::memory_order_acquire);
+        }
+
+        size_t Capacity() const
+        {
+            return buffer.size();
+        }
+
+        uint64_t GetOverflowCount() const
+        {
+            return overflow.load(std::memory_order_relaxed);
+        }
+
+        uint64_t GetSkippedCount() const
+        {
+            return skipped.load(std::memory_order_relaxed);
+        }
+
+    protected:
+        void Start() override {}
+
+        void End() override
+        {
+            // Note: notify without holding waitMutex so that the stack thread never blocks,
+            // a missed wake-up only delays the consumer until its Wait() timeout.
+            cv.notify_all();
+        }
+
+    private:
+        static size_t RoundUpToPowerOfTwo(size_t value)
+        {
+            size_t size = 1;
+            while (size < value)
+            {
+                size <<= 1;
+            }
+            return size;
+        }
+
+        template <class T>
+        void Push(const opendnp3::HeaderInfo& info,
+                  const opendnp3::ICollection<opendnp3::Indexed<T>>& values,
+                  PointType type)
+        {
+            const uint16_t gv = static_cast<uint16_t>(info.gv);
+            auto push = [&](const opendnp3::Indexed<T>& item)
+            {
+                const size_t head = this->head.load(std::memory_order_relaxed);
+                if (head - this->tail.load(std::memory_order_acquire) >= buffer.size())
+                {
+                    // full: drop the newest record rather than wait for the consumer
+                    overflow.fetch_add(1, std::memory_order_relaxed);
+                    return;
+                }
+                SOERecord& record = buffer[head & mask];
+                record.gv = gv;
+                record.index = item.index;
+                record.type = type;
+                record.flags = item.value.flags.value;
+                record.value = static_cast<double>(item.value.value);
+                record.time = item.value.time.value;
+                this->head.store(head + 1, std::memory_order_release);
+            };
+            opendnp3::FunctorVisitor<opendnp3::Indexed<T>, decltype(push)> visitor(push);
+            values.Foreach(visitor);
+        }
+
+        std::vector<SOERecord> buffer;
+        const size_t mask;
+        std::atomic<size_t> head {0};
+        std::atomic<size_t> tail {0};
+        std::atomic<uint64_t> overflow {0};
+        std::atomic<uint64_t> skipped {0};
+        std::atomic<bool> notified {false};
+
+        std::mutex drainMutex;
+        std::mutex waitMutex;
+        std::condition_variable cv;
+    };
+}
+
+void bind_RingBufferSOEHandler(py::module &m)
+{
+    // ----- class: asiodnp3::RingBufferSOEHandler -----
+    py::class_<asiodnp3::RingBufferSOEHandler,
+               opendnp3::ISOEHandler,
+               std::shared_ptr<asiodnp3::RingBufferSOEHandler>>(m, "RingBufferSOEHandler",
+        "ISOEHandler buffering decoded measurements in a native lock-free ring buffer, \n"
+        "without acquiring the GIL on the stack's thread. Drain it from a Python thread, \n"
+        "see dnp3station.soe_buffer.BufferedSOEConsumer")
+
+        .def(
+            py::init<size_t>(),
+            ":param capacity: number of records, rounded up to a power of two",
+            py::arg("capacity") = 65536
+        )
+
+        .def(
+            "Drain",
+            &asiodnp3::RingBufferSOEHandler::Drain,
+            "   Move up to maxItems records (0 for all) out of the buffer. \n"
+            ":return: tuple of numpy arrays (gv, type, index, value, flags, time), in arrival order, \n"
+            "   gv is the opendnp3.GroupVariation value, type the RingBufferSOEHandler point type code, \n"
+            "   time the DNP3 timestamp in milliseconds since epoch.",
+            py::arg("maxItems") = 0
+        )
+
+        .def(
+            "Wait",
+            &asiodnp3::RingBufferSOEHandler::Wait,
+            "   Block until records are available, Notify() is called or the timeout expires. \n"
+            ":return: True if records are available",
+            py::arg("timeoutMs")
+        )
+
+        .def(
+            "Notify",
+            &asiodnp3::RingBufferSOEHandler::Notify,
+            "Wake up a consumer blocked in Wait()."
+        )
+
+        .def(
+            "Size",
+            &asiodnp3::RingBufferSOEHandler::Size,
+            "Number of records waiting to be drained."
+        )
+
+        .def(
+            "Capacity",
+            &asiodnp3::RingBufferSOEHandler::Capacity
+        )
+
+        .def(
+            "GetOverflowCount",
+            &asiodnp3::RingBufferSOEHandler::GetOverflowCount,
+            "Number of records dropped because the buffer was full."
+        )
+
+        .def(
+            "GetSkippedCount",
+            &asiodnp3::RingBufferSOEHandler::GetSkippedCount,
+            "Number of objects without numeric value (e.g., OctetString), which are not buffered."
+        );
+
+    py::enum_<asiodnp3::RingBufferSOEHandler::PointType>(m, "RingBufferPointType")
+        .value("BINARY", asiodnp3::RingBufferSOEHandler::PointType::BINARY)
+        .value("DOUBLE_BIT_BINARY", asiodnp3::RingBufferSOEHandler::PointType::DOUBLE_BIT_BINARY)
+        .value("ANALOG", asiodnp3::RingBufferSOEHandler::PointType::ANALOG)
+        .value("COUNTER", asiodnp3::RingBufferSOEHandler::PointType::COUNTER)
+        .value("FROZEN_COUNTER", asiodnp3::RingBufferSOEHandler::PointType::FROZEN_COUNTER)
+        .value("BINARY_OUTPUT_STATUS", asiodnp3::RingBufferSOEHandler::PointType::BINARY_OUTPUT_STATUS)
+        .value("ANALOG_OUTPUT_STATUS", asiodnp3::RingBufferSOEHandler::PointType::ANALOG_OUTPUT_STATUS);
+}
+
+#endif // PYDNP3_ASIODNP3
+#endif
@@ -0,0 +1,168 @@
+/*
+ * -*- coding: utf-8 -*- {{{
+ * vim: set fenc=utf-8 ft=python sw=4 ts=4 sts=4 et:
+ *
+ * Copyright 2018, Kisensum.
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License");
+ * you may not use this file except in compliance with the License.
+ * You may obtain a copy of the License at
+ *
+ * http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ *
+ * Neither Kisensum, nor any of its employees, nor any jurisdiction or
+ * organization that has cooperated in the development of these materials,
+ * makes any warranty, express or implied, or assumes any legal liability
+ * or responsibility for the accuracy, completeness, or usefulness or any
+ * information, apparatus, product, software, or process disclosed, or
+ * represents that its use would not infringe privately owned rights.
+ * Reference herein to any specific commercial product, process, or service
+ * by trade name, trademark, manufacturer, or otherwise does not necessarily
+ * constitute or imply its endorsement, recommendation, or favoring by Kisensum.
+ * }}}
+ */
+
+#ifndef PYDNP3_ASIODNP3_STATISTICSCOLLECTOR_H
+#define PYDNP3_ASIODNP3_STATISTICSCOLLECTOR_H
+
+#include <pybind11/pybind11.h>
+#include <pybind11/numpy.h>
+#include <pybind11/stl.h>
+#include <Python.h>
+
+#include <algorithm>
+#include <memory>
+#include <stdexcept>
+#include <unordered_map>
+#include <vector>
+
+#include <asiodnp3/IChannel.h>
+#include <asiodnp3/IStack.h>
+
+#ifdef PYDNP3_ASIODNP3
+
+namespace py = pybind11;
+
+namespace asiodnp3
+{
+/**
+* Flat layout of the channel (LinkStatistics) and stack (StackStatistics) counters, one column per counter.
+*/
+    static const char* const STATISTICS_FIELDS[] = {
+        // LinkStatistics::Channel
+        "numOpen", "numOpenFail", "numClose", "numBytesRx", "numBytesTx", "numLinkFrameTx",
+        // LinkStatistics::Parser
+        "numHeaderCrcError", "numBodyCrcError", "numLinkFrameRx", "numBadLength", "numBadFunctionCode",
+        "numBadFCV", "numBadFCB",
+        // StackStatistics::Link
+        "numUnexpectedFrame", "numBadMasterBit", "numUnknownDestination", "numUnknownSource",
+        // StackStatistics::Transport
+        "numTransportRx", "numTransportErrorRx", "numTransportBufferOverflow", "numTransportDiscard",
+        "numTransportIgnore", "numTransportTx",
+    };
+    static const size_t NUM_STATISTICS_FIELDS = sizeof(STATISTICS_FIELDS) / sizeof(STATISTICS_FIELDS[0]);
+    static const size_t NUM_CHANNEL_STATISTICS_FIELDS = 13;  // the LinkStatistics columns come first
+
+    inline void FillChannelStatistics(const opendnp3::LinkStatistics& stats, uint64_t* row)
+    {
+        row[0] = stats.channel.numOpen;
+        row[1] = stats.channel.numOpenFail;
+        row[2] = stats.channel.numClose;
+        row[3] = stats.channel.numBytesRx;
+        row[4] = stats.channel.numBytesTx;
+        row[5] = stats.channel.numLinkFrameTx;
+        row[6] = stats.parser.numHeaderCrcError;
+        row[7] = stats.parser.numBodyCrcError;
+        row[8] = stats.parser.numLinkFrameRx;
+        row[9] = stats.parser.numBadLength;
+        row[10] = stats.parser.numBadFunctionCode;
+        row[11] = stats.parser.numBadFCV;
+        row[12] = stats.parser.numBadFCB;
+    }
+
+    inline void FillStackStatistics(const opendnp3::StackStatistics& stats, uint64_t* row)
+    {
+        row[13] = stats.link.numUnexpectedFrame;
+        row[14] = stats.link.numBadMasterBit;
+        row[15] = stats.link.numUnknownDestination;
+        row[16] = stats.link.numUnknownSource;
+        row[17] = stats.transport.rx.numTransportRx;
+        row[18] = stats.transport.rx.numTransportErrorRx;
+        row[19] = stats.transport.rx.numTransportBufferOverflow;
+        row[20] = stats.transport.rx.numTransportDiscard;
+        row[21] = stats.transport.rx.numTransportIgnore;
+        row[22] = stats.transport.tx.numTransportTx;
+    }
+}
+
+void bind_StatisticsCollector(py::module &m)
+{
+    py::list fields;
+    for (size_t i = 0; i < asiodnp3::NUM_STATISTICS_FIELDS; ++i)
+    {
+        fields.append(asiodnp3::STATISTICS_FIELDS[i]);
+    }
+    m.attr("STATISTICS_FIELDS") = py::tuple(fields);
+
+    m.def(
+        "CollectStatistics",
+        [](const std::vector<std::shared_ptr<asiodnp3::IChannel>>& channels,
+           const std::vector<std::shared_ptr<asiodnp3::IStack>>& stacks)
+        {
+            if (!channels.empty() && !stacks.empty() && channels.size() != stacks.size())
+            {
+                throw std::invalid_argument("channels and stacks must have the same length");
+            }
+            const size_t rows = std::max(channels.size(), stacks.size());
+            const size_t columns = asiodnp3::NUM_STATISTICS_FIELDS;
+            py::array_t<uint64_t> result(std::vector<size_t>{rows, columns});
+            uint64_t* data = result.mutable_data();
+            std::fill(data, data + rows * columns, 0);
+            {
+                py::gil_scoped_release release;
+                // Note: GetStatistics is a blocking round trip to the channel's executor,
+                // a channel shared by several stations is read once and its counters copied to their rows.
+                std::unordered_map<const asiodnp3::IChannel*, const uint64_t*> channelRows;
+                for (size_t i = 0; i < rows; ++i)
+                {
+                    uint64_t* row = data + i * columns;
+                    if (i < channels.size() && channels[i])
+                    {
+                        auto read = channelRows.find(channels[i].get());
+                        if (read == channelRows.end())
+                        {
+                            asiodnp3::FillChannelStatistics(channels[i]->GetStatistics(), row);
+                            channelRows.emplace(channels[i].get(), row);
+                        }
+                        else
+                        {
+                            std::copy(read->second, read->second + asiodnp3::NUM_CHANNEL_STATISTICS_FIELDS, row);
+                        }
+                    }
+                    if (i < stacks.size() && stacks[i])
+                    {
+                        asiodnp3::FillStackStatistics(stacks[i]->GetStackStatistics(), row);
+                    }
+                }
+            }
+            return result;
+        },
+        "   Read the statistics of many channels and stacks in one call, without the GIL. \n"
+        "   Each distinct channel and each stack is read once (one blocking round trip to its executor). \n"
+        "   Row i holds the counters of channels[i] and stacks[i] (0 for a None or missing entry), \n"
+        "   columns follow STATISTICS_FIELDS. \n"
+        ":param channels: list of IChannel, may be empty \n"
+        ":param stacks: list of IStack (e.g., IMaster, IOutstation), empty or as long as channels \n"
+        ":return: numpy uint64 array of shape (rows, len(STATISTICS_FIELDS))",
+        py::arg("channels"), py::arg("stacks")
+    );
+}
+
+#endif // PYDNP3_ASIODNP3
+#endif
@@ -32,18 +32,84 @@
 #define PYDNP3_ASIODNP3_UPDATEBUILDER_H
 
 #include <pybind11/pybind11.h>
+#include <pybind11/numpy.h>
 #include <Python.h>
 
 #include <asiodnp3/UpdateBuilder.h>
 
+#include "../NumpyArrays.h"
+
 #ifdef PYDNP3_ASIODNP3
 
 namespace py = pybind11;
 
+/**
+* Add many measurements of the same type to an UpdateBuilder in a single call.
+* Indexes, values and flags are range checked (ValueError, e.g., index 70000 would otherwise update point 4464),
+* then the measurements are built as Meas(value) (i.e., default flags) or Meas(value, Flags(flags[i]))
+* while the GIL is released.
+*/
+template <class Meas, class V>
+asiodnp3::UpdateBuilder& UpdateArray(asiodnp3::UpdateBuilder &self,
+                                     py::object indexes,
+                                     py::object values,
+                                     py::object flags,
+                                     opendnp3::EventMode mode)
+{
+    const std::vector<uint16_t> index = pydnp3::CheckedArray<uint16_t>(indexes, "indexes");
+    const std::vector<V> value = pydnp3::CheckedArray<V>(values, "values");
+    if (index.size() != value.size())
+    {
+        throw py::value_error("indexes and values must be 1-dimensional arrays of the same length");
+    }
+    std::vector<uint8_t> flag;
+    if (!flags.is_none())
+    {
+        flag = pydnp3::CheckedArray<uint8_t>(flags, "flags");
+        if (flag.size() != index.size())
+        {
+            throw py::value_error("flags must be a 1-dimensional array of the same length as indexes");
+        }
+    }
+
+    py::gil_scoped_release release;
+    for (size_t i = 0; i < index.size(); ++i)
+    {
+        if (!flag.empty())
+        {
+            self.Update(Meas(static_cast<decltype(Meas::value)>(value[i]), opendnp3::Flags(flag[i])), index[i], mode);
+        }
+        else
+        {
+            self.Update(Meas(static_cast<decltype(Meas::value)>(value[i])), index[i], mode);
+        }
+    }
+    return self;
+}
+
+template <class Meas, class V>
+void declareUpdateArray(py::class_<asiodnp3::UpdateBuilder> &cls, const std::string &name)
+{
+    cls.def(
+        name.c_str(),
+        &UpdateArray<Meas, V>,
+        py::return_value_policy::reference_internal,
+        "Update many points of the same measurement type at once, e.g., with numpy arrays. \n"
+        ":param indexes: point indexes (unsigned short) \n"
+        ":param values: point values, same length as indexes \n"
+        ":param flags: optional quality flags (unsigned char) per point, default to the flags of Meas(value) \n"
+        ":param mode: defaults to opendnp3.EventMode.Detect",
+        py::arg("indexes"), py::arg("values"), py::arg("flags") = py::none(),
+        py::arg("mode") = opendnp3::EventMode::Detect
+    );
+}
+
 void bind_UpdateBuilder(py::module &m)
 {
     // ----- class: asiodnp3::UpdateBuilder -----
-    py::class_<asiodnp3::UpdateBuilder>(m, "UpdateBuilder")
+    py::class_<asiodnp3::UpdateBuilder> updateBuilder(m, "UpdateBuilder");
+
+    updateBuilder
 
         .def(py::init<>())
 
@@ -146,6 +212,14 @@ void bind_UpdateBuilder(py::module &m)
             "Build",
             &asiodnp3::UpdateBuilder::Build
         );
+
+    declareUpdateArray<opendnp3::Binary, bool>(updateBuilder, "UpdateBinaryArray");
+    declareUpdateArray<opendnp3::DoubleBitBinary, uint8_t>(updateBuilder, "UpdateDoubleBitBinaryArray");
+    declareUpdateArray<opendnp3::Analog, double>(updateBuilder, "UpdateAnalogArray");
+    declareUpdateArray<opendnp3::Counter, uint32_t>(updateBuilder, "UpdateCounterArray");
+    declareUpdateArray<opendnp3::FrozenCounter, uint32_t>(updateBuilder, "UpdateFrozenCounterArray");
+    declareUpdateArray<opendnp3::BinaryOutputStatus, bool>(updateBuilder, "UpdateBinaryOutputStatusArray");
+    declareUpdateArray<opendnp3::AnalogOutputStatus, double>(updateBuilder, "UpdateAnalogOutputStatusArray");
 }
 
 #endif // PYDNP3_ASIODNP3
@@ -46,6 +46,7 @@
 #include "IOpenDelayStrategy.h"
 #include "IPEndpoint.h"
 #include "IResourceManager.h"
+#include "JitteredBackoffStrategy.h"
 #include "LoggingConnectionCondition.h"
 #include "ResourceManager.h"
 #include "SerialChannel.h"
@@ -61,7 +61,8 @@ void bind_ChannelRetry(py::module &m)
             ":param maxOpenRetry: maximum connection retry interval on failure \n"
             ":param strategy: strategy to use",
             py::arg("minOpenRetry"), py::arg("maxOpenRetry"),
-            py::arg("strategy")
+            py::arg("strategy"),
+            py::keep_alive<1, 4>()
         )
 
         .def(
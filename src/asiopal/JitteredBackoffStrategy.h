@@ -0,0 +1,153 @@
+/*
+ * -*- coding: utf-8 -*- {{{
+ * vim: set fenc=utf-8 ft=python sw=4 ts=4 sts=4 et:
+ *
+ * Copyright 2018, Kisensum.
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License");
+ * you may not use this file except in compliance with the License.
+ * You may obtain a copy of the License at
+ *
+ * http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ *
+ * Neither Kisensum, nor any of its employees, nor any jurisdiction or
+ * organization that has cooperated in the development of these materials,
+ * makes any warranty, express or implied, or assumes any legal liability
+ * or responsibility for the accuracy, completeness, or usefulness or any
+ * information, apparatus, product, software, or process disclosed, or
+ * represents that its use would not infringe privately owned rights.
+ * Reference herein to any specific commercial product, process, or service
+ * by trade name, trademark, manufacturer, or otherwise does not necessarily
+ * constitute or imply its endorsement, recommendation, or favoring by Kisensum.
+ * }}}
+ */
+
+#ifndef PYDNP3_ASIOPAL_JITTEREDBACKOFFSTRATEGY_H
+#define PYDNP3_ASIOPAL_JITTEREDBACKOFFSTRATEGY_H
+
+#include <pybind11/pybind11.h>
+#include <Python.h>
+
+#include <algorithm>
+#include <random>
+#include <stdexcept>
+
+#include <asiopal/IOpenDelayStrategy.h>
+
+#ifdef PYDNP3_ASIOPAL
+
+namespace py = pybind11;
+using namespace std;
+
+namespace asiopal
+{
+/**
+* Exponential backoff with random jitter, so that channels failing together (e.g., a flapping substation network)
+* do not retry in lockstep. While growing, each delay is current * multiplier scaled by a random factor drawn
+* uniformly from [1 - jitter, 1 + jitter], kept within [current, max]. Once current * multiplier reaches
+* max * (1 - jitter), each delay is drawn uniformly from [max * (1 - jitter), max] instead, i.e., the jitter
+* applies after the cap and channels stuck at the cap keep spreading their retries.
+*
+* Implemented natively: GetNextDelay runs on the stack threads for every failed open, without the GIL.
+*/
+    class JitteredBackoffStrategy final : public IOpenDelayStrategy
+    {
+    public:
+        JitteredBackoffStrategy(double multiplier, double jitter) : multiplier(multiplier), jitter(jitter)
+        {
+            if (multiplier < 1)
+            {
+                throw std::invalid_argument("multiplier must be at least 1");
+            }
+            if (jitter < 0 || jitter > 1)
+            {
+                throw std::invalid_argument("jitter must be within [0, 1]");
+            }
+        }
+
+        openpal::TimeDuration GetNextDelay(const openpal::TimeDuration& current,
+                                           const openpal::TimeDuration& max) const override
+        {
+            const double previous = static_cast<double>(current.GetMilliseconds());
+            const double cap = static_cast<double>(max.GetMilliseconds());
+            const double low = cap * (1 - jitter);
+            double delay = cap;
+            if (previous * multiplier >= low)
+            {
+                // at the cap: a new draw every time, i.e., no feedback from the previous (jittered) delay
+                if (low < cap)
+                {
+                    delay = std::uniform_real_distribution<double>(low, cap)(Generator());
+                }
+            }
+            else
+            {
+                std::uniform_real_distribution<double> factor(1 - jitter, 1 + jitter);
+                delay = std::min(std::max(previous * multiplier * factor(Generator()), previous), cap);
+            }
+            return openpal::TimeDuration::Milliseconds(std::max<int64_t>(1, static_cast<int64_t>(delay)));
+        }
+
+        double GetMultiplier() const
+        {
+            return multiplier;
+        }
+
+        double GetJitter() const
+        {
+            return jitter;
+        }
+
+    private:
+        static std::mt19937_64& Generator()
+        {
+            // one generator per stack thread, i.e., no locking
+            thread_local std::mt19937_64 generator{std::random_device{}()};
+            return generator;
+        }
+
+        const double multiplier;
+        const double jitter;
+    };
+}
+
+void bind_JitteredBackoffStrategy(py::module &m)
+{
+    // ----- class: asiopal::JitteredBackoffStrategy -----
+    py::class_<asiopal::JitteredBackoffStrategy, asiopal::IOpenDelayStrategy>(m, "JitteredBackoffStrategy",
+        "Implements IOpenDelayStrategy using exponential-backoff with random jitter.")
+
+        .def(
+            py::init<double, double>(),
+            "   Construct a jittered exponential-backoff strategy. \n"
+            ":param multiplier: growth factor of the delay after each failure (at least 1) \n"
+            ":param jitter: in [0, 1], growing delays are scaled by a random factor within [1 - jitter, 1 + jitter], \n"
+            "   delays at the cap are drawn within [max * (1 - jitter), max]",
+            py::arg("multiplier") = 2.0, py::arg("jitter") = 0.5
+        )
+
+        .def(
+            "GetNextDelay",
+            &asiopal::JitteredBackoffStrategy::GetNextDelay,
+            py::arg("current"), py::arg("max")
+        )
+
+        .def_property_readonly(
+            "multiplier",
+            &asiopal::JitteredBackoffStrategy::GetMultiplier
+        )
+
+        .def_property_readonly(
+            "jitter",
+            &asiopal::JitteredBackoffStrategy::GetJitter
+        );
+}
+
+#endif // PYDNP3_ASIOPAL
+#endif
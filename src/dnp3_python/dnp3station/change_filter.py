@@ -0,0 +1,182 @@
+"""
+    Report-by-exception filter for the outstation, i.e., skip outstation.Apply for values that did not change
+    (or changed within their deadband) since they were last applied.
+
+    One set of preallocated NumPy arrays is kept per point type: the last applied value and flags
+    (NaN/0 if never applied), an absolute deadband and a percent deadband (relative to the last applied value).
+    A value passes the filter if
+        - the point was never applied, or its quality flags changed, or
+        - |value - last| > max(absolute deadband, percent deadband / 100 * |last|), when a deadband is set, or
+        - value != last, when report_on_change is set (otherwise every value passes).
+    Batches are filtered with a single vectorized comparison (see DBHandler.filter_changes).
+
+    Note: opendnp3 deadbands (DatabaseConfig, see point_schema) only decide whether an update creates an event,
+    this filter avoids the update altogether, i.e., the Python/native round trip and the database transaction.
+    NumPy is required, i.e., `pip install numpy` to use this module.
+"""
+from __future__ import annotations
+
+import threading
+
+from typing import Dict, Optional, Sequence, Union
+
+from .point_store import POINT_TYPES, ArrayLike
+
+try:
+    import numpy as np
+except ImportError:  # optional dependency
+    np = None
+
+FILTERED_POINT_TYPES = frozenset(POINT_TYPES)
+
+
+class ChangeFilter:
+    """
+        Per-point deadbands and change detection against the last applied values.
+
+        EXAMPLE:
+        >>> change_filter = ChangeFilter.from_sizes(opendnp3.DatabaseSizes.AllTypes(100), report_on_change=True)
+        >>> change_filter.set_deadband("Analog", absolute=0.5)  # all the Analog points
+        >>> change_filter.set_deadband("Analog", indices=[0, 1], percent=2)
+        >>> change_filter.select("Analog", [0, 1, 2], [4.8, 14.1, 27.2])
+        array([ True,  True,  True])
+        >>> change_filter.select("Analog", [0, 1, 2], [4.9, 14.1, 28.0])
+        array([False, False,  True])
+    """
+
+    def __init__(self, sizes: Optional[Dict[str, int]] = None, report_on_change: bool = True):
+        """
+        :param sizes: initial number of points per point type, arrays grow on demand
+        :param report_on_change: skip values equal to the last applied value of points without a deadband
+        """
+        if np is None:
+            raise ImportError("ChangeFilter requires numpy, i.e., `pip install numpy`")
+        sizes = sizes if sizes else {}
+        self.report_on_change = report_on_change
+        self._lock = threading.Lock()
+        self._last: Dict[str, "np.ndarray"] = {}
+        self._last_flags: Dict[str, "np.ndarray"] = {}
+        self._absolute: Dict[str, "np.ndarray"] = {}
+        self._percent: Dict[str, "np.ndarray"] = {}
+        for point_type in POINT_TYPES:
+            self._allocate(point_type, sizes.get(point_type, 0))
+        # number of values passed/suppressed, i.e., the traffic saved
+        self.passed: int = 0
+        self.suppressed: int = 0
+
+    @classmethod
+    def from_sizes(cls, sizes, report_on_change: bool = True) -> ChangeFilter:
+        """Build a filter from an opendnp3.DatabaseSizes (or an object with the same attributes)."""
+        return cls({point_type: getattr(sizes, attr) for point_type, (attr, _) in POINT_TYPES.items()},
+                   report_on_change=report_on_change)
+
+    def _allocate(self, point_type: str, size: int):
+        old = self._last.get(point_type)
+        start = len(old) if old is not None else 0
+        for columns, fill, dtype in ((self._last, np.nan, np.float64), (self._last_flags, 0, np.uint8),
+                                     (self._absolute, 0, np.float64), (self._percent, 0, np.float64)):
+            column = np.full(size, fill, dtype=dtype)
+            if start:
+                column[:start] = columns[point_type]
+            columns[point_type] = column
+
+    def _grow(self, point_type: str, size: int):
+        """Reallocate the arrays of a point type to hold at least `size` points (amortized doubling)."""
+        self._allocate(point_type, max(size, 2 * len(self._last[point_type])))
+
+    def set_deadband(self, point_type: str, indices: Optional[ArrayLike] = None,
+                     absolute: Optional[Union[float, ArrayLike]] = None,
+                     percent: Optional[Union[float, ArrayLike]] = None):
+        """Set the deadbands of some points (default to all the points of the type), 0 to disable.
+
+        :param absolute: in the unit of the value, scalar or one per index
+        :param percent: in percent of the last applied value, scalar or one per index
+        """
+        if point_type not in POINT_TYPES:
+            raise ValueError(f"Unknown point type {point_type}, use one of {list(POINT_TYPES)}")
+        with self._lock:
+            if indices is None:
+                indices = slice(None)
+            else:
+                indices = np.asarray(indices, dtype=np.intp)
+                if indices.size and indices.max() >= len(self._last[point_type]):
+                    self._grow(point_type, int(indices.max()) + 1)
+            if absolute is not None:
+                self._absolute[point_type][indices] = absolute
+            if percent is not None:
+                self._percent[point_type][indices] = percent
+
+    def select(self, point_type: str, indices: ArrayLike, values: ArrayLike,
+               flags: Optional[ArrayLike] = None, force: bool = False) -> "np.ndarray":
+        """Mask of the values to apply, and record them as the last applied values.
+
+        :param flags: optional quality flags per point, a change of flags always passes
+        :param force: pass all the values (e.g., command echoes), they are still recorded as the last applied ones
+        :return: boolean array, same length as indices
+        """
+        indices = np.asarray(indices, dtype=np.intp)
+        values = np.asarray(values, dtype=np.float64)
+        with self._lock:
+            if indices.size and indices.max() >= len(self._last[point_type]):
+                self._grow(point_type, int(indices.max()) + 1)
+            last = self._last[point_type][indices]
+            delta = np.abs(values - last)
+            threshold = np.maximum(self._absolute[point_type][indices],
+                                   self._percent[point_type][indices] * 0.01 * np.abs(last))
+            has_deadband = threshold > 0
+            if self.report_on_change:
+                mask = np.where(has_deadband, delta > threshold, delta != 0)
+            else:
+                mask = ~has_deadband | (delta > threshold)
+            mask |= np.isnan(last) | force
+            if flags is not None:
+                flags = np.asarray(flags, dtype=np.uint8)
+                mask |= flags != self._last_flags[point_type][indices]
+                self._last_flags[point_type][indices[mask]] = flags[mask]
+            self._last[point_type][indices[mask]] = values[mask]
+            passed = int(np.count_nonzero(mask))
+            self.passed += passed
+            self.suppressed += len(mask) - passed
+        return mask
+
+    def select_one(self, point_type: str, index: int, value: float, flags: Optional[int] = None,
+                   force: bool = False) -> bool:
+        """Scalar counterpart of select, e.g., for MyOutStationNew.apply_update
+
+        Note: plain Python arithmetic on single elements, i.e., no temporary arrays per call.
+        """
+        value = float(value)
+        with self._lock:
+            last_values = self._last[point_type]
+            if index >= len(last_values):
+                self._grow(point_type, index + 1)
+                last_values = self._last[point_type]
+            last = last_values.item(index)
+            passed = force or last != last  # Note: NaN, i.e., never applied
+            if not passed:
+                delta = abs(value - last)
+                threshold = max(self._absolute[point_type].item(index),
+                                self._percent[point_type].item(index) * 0.01 * abs(last))
+                if threshold > 0:
+                    passed = delta > threshold
+                else:
+                    passed = delta != 0 or not self.report_on_change
+            last_flags = self._last_flags[point_type]
+            if flags is not None and flags != last_flags.item(index):
+                passed = True
+            if passed:
+                if flags is not None:
+                    last_flags[index] = flags
+                last_values[index] = value
+                self.passed += 1
+            else:
+                self.suppressed += 1
+        return passed
+
+    def reset(self, point_type: Optional[str] = None, indices: Optional[Sequence[int]] = None):
+        """Forget the last applied values (e.g., after a restart), i.e., the next values pass the filter."""
+        for name in [point_type] if point_type else list(POINT_TYPES):
+            with self._lock:
+                selection = slice(None) if indices is None else np.asarray(indices, dtype=np.intp)
+                self._last[name][selection] = np.nan
+                self._last_flags[name][selection] = 0
@@ -0,0 +1,215 @@
+"""
+    Pipelined commands for MyMasterNew.
+
+    CommandQueue collects point commands (e.g., setpoints of many AO points), packs them into opendnp3.CommandSet
+    requests (one header per run of same-type commands, at most max_controls_per_request controls per request)
+    and keeps up to max_in_flight requests outstanding. Each point gets a future resolved
+    from ICommandTaskResult.ForeachItem, i.e., with the outstation's per-point status.
+"""
+from __future__ import annotations
+
+import concurrent.futures
+import itertools
+import logging
+import sys
+import threading
+
+from collections import deque
+from pydnp3 import opendnp3
+from typing import TYPE_CHECKING, Deque, Dict, Iterable, List, NamedTuple, Tuple, Union
+
+from .station_utils import MasterCmdType, DbPointVal, parsing_gv_to_mastercmdtype, build_command_set
+
+if TYPE_CHECKING:
+    from .master_new import MyMasterNew
+
+stdout_stream = logging.StreamHandler(sys.stdout)
+stdout_stream.setFormatter(logging.Formatter('%(asctime)s\t%(name)s\t%(levelname)s\t%(message)s'))
+
+_log = logging.getLogger(__name__)
+_log.addHandler(stdout_stream)
+_log.setLevel(logging.INFO)
+
+
+class CommandResult(NamedTuple):
+    """Outcome of a single point command, see opendnp3.CommandPointResult"""
+    index: int
+    state: opendnp3.CommandPointState
+    status: opendnp3.CommandStatus
+    summary: opendnp3.TaskCompletion  # summary of the request the command was sent in
+
+    @property
+    def ok(self) -> bool:
+        return self.state == opendnp3.CommandPointState.SUCCESS and self.status == opendnp3.CommandStatus.SUCCESS
+
+
+class _PendingCommand(NamedTuple):
+    command: MasterCmdType
+    index: int
+    future: concurrent.futures.Future
+
+
+class _PendingHeader(NamedTuple):
+    """A header prebuilt natively with build_command_set, sent in a request of its own."""
+    command_set: opendnp3.CommandSet
+    indices: List[int]
+    futures: List[concurrent.futures.Future]
+
+
+class CommandQueue:
+    """
+        EXAMPLE:
+        >>> queue = CommandQueue(master_application, max_controls_per_request=16, max_in_flight=2)
+        >>> futures = queue.submit_many((opendnp3.AnalogOutputDouble64(float(i)), i) for i in range(200))
+        >>> [future.result(timeout=10).ok for future in futures]
+        [True, True, ...]
+    """
+
+    def __init__(self, station: MyMasterNew,
+                 max_controls_per_request: int = 16,
+                 max_in_flight: int = 1,
+                 select_before_operate: bool = False,
+                 config: opendnp3.TaskConfig = None):
+        """
+        :param station: master sending the commands
+        :param max_controls_per_request: should match the outstation's OutstationParams.maxControlsPerRequest
+            (16 by default), otherwise the outstation rejects the whole request
+        :param max_in_flight: number of outstanding requests. Note: opendnp3 runs the tasks of a master one at a time,
+            a value above 1 only hides the Python round trip between two requests.
+        :param select_before_operate: use SelectAndOperate instead of DirectOperate
+        """
+        if max_controls_per_request < 1:
+            raise ValueError("max_controls_per_request must be at least 1")
+        self.station = station
+        self.max_controls_per_request = max_controls_per_request
+        self.max_in_flight = max_in_flight
+        self.select_before_operate = select_before_operate
+        self.config = config if config else opendnp3.TaskConfig().Default()
+
+        self._lock = threading.Lock()
+        self._pending: Deque[Union[_PendingCommand, _PendingHeader]] = deque()
+        self._in_flight: int = 0
+
+    def submit(self, command: MasterCmdType, index: int) -> concurrent.futures.Future:
+        """Queue a point command, the future resolves to a CommandResult."""
+        return self.submit_many([(command, index)])[0]
+
+    def submit_point(self, group: int, variation: int, index: int,
+                     val_to_set: DbPointVal) -> concurrent.futures.Future:
+        """Queue a point command with flatten arguments, see MyMasterNew.send_direct_point_command"""
+        master_cmd = parsing_gv_to_mastercmdtype(group=group, variation=variation, val_to_set=val_to_set)
+        return self.submit(master_cmd, index)
+
+    def submit_many(self, commands: Iterable[Tuple[MasterCmdType, int]]) -> List[concurrent.futures.Future]:
+        """Queue (command, index) pairs, in order. Return one future per command."""
+        futures = []
+        with self._lock:
+            for command, index in commands:
+                future = concurrent.futures.Future()
+                self._pending.append(_PendingCommand(command, index, future))
+                futures.append(future)
+        self._dispatch()
+        return futures
+
+    def submit_array(self, group: int, variation: int, indices, values) -> List[concurrent.futures.Future]:
+        """Queue commands of one group-variation given as arrays, e.g., numpy arrays of indices and values.
+
+        Each chunk of max_controls_per_request commands is built as a CommandSet header in a single native call
+        (see build_command_set), instead of one Python command object per point.
+
+        :raise ValueError: if group-variation is not a valid MasterCmdType, the lengths differ,
+            or an index or value is out of range (e.g., index 70000, or 40000 for Group41Var2)
+        """
+        if len(indices) != len(values):
+            raise ValueError(f"indices and values must have the same length, got {len(indices)} and {len(values)}")
+        headers = []
+        for start in range(0, len(indices), self.max_controls_per_request):
+            chunk_indices = indices[start:start + self.max_controls_per_request]
+            chunk_values = values[start:start + self.max_controls_per_request]
+            command_set = build_command_set(group, variation, chunk_indices, chunk_values)
+            headers.append(_PendingHeader(command_set, [int(index) for index in chunk_indices],
+                                          [concurrent.futures.Future() for _ in range(len(chunk_indices))]))
+        with self._lock:
+            self._pending.extend(headers)
+        self._dispatch()
+        return [future for header in headers for future in header.futures]
+
+    @property
+    def pending(self) -> int:
+        """Number of commands not sent yet."""
+        return sum(len(item.futures) if isinstance(item, _PendingHeader) else 1 for item in list(self._pending))
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def _dispatch(self):
+        while True:
+            with self._lock:
+                if not self._pending or self._in_flight >= self.max_in_flight:
+                    return
+                if isinstance(self._pending[0], _PendingHeader):
+                    batch = [self._pending.popleft()]
+                else:
+                    batch = []
+                    while (self._pending and len(batch) < self.max_controls_per_request
+                           and not isinstance(self._pending[0], _PendingHeader)):
+                        batch.append(self._pending.popleft())
+                self._in_flight += 1
+            self._send(batch)
+
+    def _send(self, batch: List[Union[_PendingCommand, _PendingHeader]]):
+        # (header index, point index) -> futures, in order
+        futures: Dict[Tuple[int, int], Deque[concurrent.futures.Future]] = {}
+        if isinstance(batch[0], _PendingHeader):
+            header = batch[0]
+            command_set = header.command_set
+            for index, future in zip(header.indices, header.futures):
+                futures.setdefault((0, index), deque()).append(future)
+        else:
+            command_set = opendnp3.CommandSet()
+            # one header per run of same-type commands
+            for header_index, (_, run) in enumerate(itertools.groupby(batch, key=lambda item: type(item.command))):
+                run = list(run)
+                command_set.Add([opendnp3.WithIndex(item.command, item.index) for item in run])
+                for item in run:
+                    futures.setdefault((header_index, item.index), deque()).append(item.future)
+
+        def callback(result: opendnp3.ICommandTaskResult):
+            # Note: the result is only valid during the callback, copy everything out before leaving.
+            summary = result.summary
+
+            def on_item(point: opendnp3.CommandPointResult):
+                waiting = futures.get((point.headerIndex, point.index))
+                if waiting:
+                    future = waiting.popleft()
+                    # Note: the caller may have cancelled the future, the result is dropped
+                    if not future.done():
+                        future.set_result(CommandResult(point.index, point.state, point.status, summary))
+
+            try:
+                result.ForeachItem(on_item)
+                for waiting in futures.values():
+                    for future in waiting:
+                        if not future.done():
+                            future.set_exception(
+                                RuntimeError(f"Command failed: {opendnp3.TaskCompletionToString(summary)}"))
+            finally:
+                # Note: always release the slot, otherwise the queued commands are never sent
+                with self._lock:
+                    self._in_flight -= 1
+                self._dispatch()
+
+        try:
+            if self.select_before_operate:
+                self.station.master.SelectAndOperate(command_set, callback, self.config)
+            else:
+                self.station.master.DirectOperate(command_set, callback, self.config)
+        except Exception as e:
+            _log.error(f"Failed to send {sum(len(waiting) for waiting in futures.values())} commands: {e!r}")
+            for waiting in futures.values():
+                for future in waiting:
+                    if not future.done():
+                        future.set_exception(e)
+            with self._lock:
+                self._in_flight -= 1
@@ -0,0 +1,169 @@
+"""
+    Channel reconnect policy and connection state tracking.
+
+    RetryPolicy configures how a channel retries after a failed (or lost) connection: exponential backoff from
+    min_retry to max_retry with random jitter (asiopal.JitteredBackoffStrategy), and a jittered first delay,
+    so that channels losing their connections together (e.g., a flapping substation network) spread their
+    reconnects instead of retrying in lockstep.
+
+    ConnectionTracker is a channel listener that keeps the connection state from IChannelListener.OnStateChange,
+    i.e., is_connected is an attribute read rather than GetStatistics() calls, and counts the transitions.
+
+    EXAMPLE:
+    >>> master = MyMasterNew(retry_policy=RetryPolicy(min_retry=2, max_retry=120, jitter=0.3))
+    >>> master.connection.is_connected
+    True
+    >>> master.connection.snapshot()
+    {'state': 'OPEN', 'is_connected': True, 'attempts': 1, 'opens': 1, 'closes': 0, 'uptime': 12.5, ...}
+"""
+from __future__ import annotations
+
+import random
+import threading
+import time
+
+from pydnp3 import opendnp3, openpal, asiopal, asiodnp3
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+
+from collections import deque
+
+from .station_utils import AppChannelListener
+
+STATE_HISTORY = 64  # state changes kept per tracker
+
+# Note: asiopal.ChannelRetry keeps a reference to its strategy, which must outlive every channel using it,
+# hence one strategy per (multiplier, jitter) for the lifetime of the process.
+_strategies: Dict[Tuple[float, float], asiopal.JitteredBackoffStrategy] = {}
+_strategies_lock = threading.Lock()
+
+
+def backoff_strategy(multiplier: float = 2.0, jitter: float = 0.5) -> asiopal.JitteredBackoffStrategy:
+    """Shared asiopal.JitteredBackoffStrategy of these parameters."""
+    with _strategies_lock:
+        key = (float(multiplier), float(jitter))
+        if key not in _strategies:
+            _strategies[key] = asiopal.JitteredBackoffStrategy(multiplier, jitter)
+        return _strategies[key]
+
+
+class RetryPolicy:
+    """
+        Reconnect policy of a channel, i.e., a factory of asiopal.ChannelRetry.
+
+        After a failure, the channel waits the current delay, then the delay grows by `multiplier`
+        (randomized by +/- jitter, but never shrinking) up to max_retry.
+        Once at max_retry, every delay is drawn within [max_retry * (1 - jitter), max_retry],
+        see asiopal.JitteredBackoffStrategy. The first delay is min_retry reduced by up to `jitter`.
+    """
+
+    def __init__(self, min_retry: float = 1, max_retry: float = 60, multiplier: float = 2.0, jitter: float = 0.5):
+        """
+        :param min_retry: in seconds, first delay before a reconnect
+        :param max_retry: in seconds, cap on the delay
+        :param multiplier: growth of the delay after each failure, at least 1 (1 for a fixed delay)
+        :param jitter: in [0, 1], fraction by which delays are randomized, 0 for the deterministic
+            asiopal.ChannelRetry().Default() behavior (with multiplier 2)
+        """
+        if not 0 < min_retry <= max_retry:
+            raise ValueError(f"Invalid retry delays, expected 0 < min_retry <= max_retry, got {min_retry}, {max_retry}")
+        if multiplier < 1:
+            raise ValueError(f"multiplier must be at least 1, got {multiplier}")
+        if not 0 <= jitter <= 1:
+            raise ValueError(f"jitter must be within [0, 1], got {jitter}")
+        self.min_retry = min_retry
+        self.max_retry = max_retry
+        self.multiplier = multiplier
+        self.jitter = jitter
+
+    @classmethod
+    def fixed(cls, delay: float, jitter: float = 0) -> RetryPolicy:
+        """Retry every `delay` seconds, randomized within [delay * (1 - jitter), delay], i.e., delay is the cap."""
+        return cls(min_retry=delay, max_retry=delay, multiplier=1, jitter=jitter)
+
+    @classmethod
+    def from_dict(cls, config: dict) -> RetryPolicy:
+        """e.g., {"min_retry": 1, "max_retry": 60, "multiplier": 2, "jitter": 0.5}"""
+        return cls(**config)
+
+    def channel_retry(self) -> asiopal.ChannelRetry:
+        """A new ChannelRetry, i.e., one per channel so that first delays differ."""
+        first_delay = self.min_retry * (1 - random.uniform(0, self.jitter))
+        return asiopal.ChannelRetry(openpal.TimeDuration().Milliseconds(max(1, int(first_delay * 1000))),
+                                    openpal.TimeDuration().Milliseconds(int(self.max_retry * 1000)),
+                                    backoff_strategy(self.multiplier, self.jitter))
+
+    def __repr__(self):
+        return (f"RetryPolicy(min_retry={self.min_retry}, max_retry={self.max_retry}, "
+                f"multiplier={self.multiplier}, jitter={self.jitter})")
+
+
+class ConnectionTracker(AppChannelListener):
+    """
+        Channel listener keeping the connection state and its history, optionally forwarding the state changes
+        to another listener (e.g., asiodnp3.PrintingChannelListener).
+
+        Note: OnStateChange runs on a stack thread, readers get the latest state without locking.
+    """
+
+    def __init__(self, inner: Optional[asiodnp3.IChannelListener] = None,
+                 on_state_change: Optional[Callable[[opendnp3.ChannelState], None]] = None):
+        """
+        :param inner: listener notified of every state change as well
+        :param on_state_change: optional hook invoked (on the opendnp3 worker thread) with every new channel state
+        """
+        super(ConnectionTracker, self).__init__(on_state_change=on_state_change)
+        self.inner = inner
+        self.is_connected: bool = False
+        self.attempts: int = 0  # transitions to OPENING
+        self.opens: int = 0  # transitions to OPEN
+        self.closes: int = 0  # transitions from OPEN, i.e., lost (or closed) connections
+        self.last_change: Optional[float] = None  # time.monotonic() of the last state change
+        self.connected_since: Optional[float] = None  # time.monotonic() of the last transition to OPEN
+        self.history: Deque[Tuple[float, opendnp3.ChannelState]] = deque(maxlen=STATE_HISTORY)
+        self._cond = threading.Condition()
+
+    def OnStateChange(self, state):
+        now = time.monotonic()
+        with self._cond:
+            was_connected = self.is_connected
+            self.is_connected = state == opendnp3.ChannelState.OPEN
+            if state == opendnp3.ChannelState.OPENING:
+                self.attempts += 1
+            if self.is_connected and not was_connected:
+                self.opens += 1
+                self.connected_since = now
+            elif was_connected and not self.is_connected:
+                self.closes += 1
+                self.connected_since = None
+            self.last_change = now
+            self.history.append((now, state))
+            self._cond.notify_all()
+        super(ConnectionTracker, self).OnStateChange(state)
+        if self.inner is not None:
+            self.inner.OnStateChange(state)
+
+    def wait_connected(self, timeout: Optional[float] = None) -> bool:
+        """Block until the channel is open, :return: False on timeout."""
+        with self._cond:
+            return self._cond.wait_for(lambda: self.is_connected, timeout)
+
+    def uptime(self) -> Optional[float]:
+        """Seconds since the connection opened, None if not connected."""
+        connected_since = self.connected_since
+        return time.monotonic() - connected_since if connected_since is not None else None
+
+    def flaps(self, window: float = 60) -> int:
+        """Number of connections lost within the last `window` seconds (among the recorded history)."""
+        since = time.monotonic() - window
+        history: List[Tuple[float, opendnp3.ChannelState]] = list(self.history)
+        return sum(1 for (_, previous), (at, state) in zip(history, history[1:])
+                   if at >= since and previous == opendnp3.ChannelState.OPEN and state != previous)
+
+    def snapshot(self) -> dict:
+        return {"state": opendnp3.ChannelStateToString(self.state),
+                "is_connected": self.is_connected,
+                "attempts": self.attempts,
+                "opens": self.opens,
+                "closes": self.closes,
+                "uptime": self.uptime(),
+                "since_last_change": time.monotonic() - self.last_change if self.last_change is not None else None}
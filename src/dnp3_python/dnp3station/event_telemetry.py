@@ -0,0 +1,210 @@
+"""
+    Event buffer telemetry, as seen by the master, to size the outstation's EventBufferConfig from measured bursts.
+
+    opendnp3 does not expose the outstation's event buffer, but every response carries its IIN bits:
+        - IIN2.3 (EVENT_BUFFER_OVERFLOW): the outstation dropped events, the master needs an integrity poll
+        - IIN1.1-1.3 (CLASS1/2/3_EVENTS): events of that class were still buffered after the response
+    EventTelemetry wraps the master application to count them, and is fed the event objects of each response
+    by the SOEHandler, i.e., how many events each response carried and how long they took to reach the master.
+
+    What is (and is not) measured:
+        - events per response: events carried by one response, a lower bound of the outstation's buffer depth
+          (the buffer itself is not visible from the master, IIN1.1-1.3 only tell that more events remain)
+        - latency_ms: delivery latency, from the outstation timestamp of an event to its receive time at the master,
+          split by solicited (a master task was running) and unsolicited responses.
+          This is not the unsolicited confirm latency (outstation send to master confirm), which would have to be
+          measured on the outstation side and is not available from opendnp3's outstation interfaces.
+
+    EXAMPLE:
+    >>> master = MyMasterNew(event_telemetry=True)
+    >>> outstation = MyOutStationNew(event_buffers={"Analog": 1000, "Binary": 100})
+    >>> master.event_telemetry.snapshot()["max_events_per_response"]
+    214
+
+    Note: responses received while no master task runs are counted as unsolicited. Latency requires event
+    variations with time and measurements time-stamped by the outstation (e.g., opendnp3.Analog(value, flags, time)),
+    and synchronized clocks. With MyMasterNew(soe_buffer_capacity=...), events are counted when drained,
+    so per-response counts are only approximate.
+"""
+from __future__ import annotations
+
+import logging
+import sys
+import threading
+import time
+
+from collections import deque
+from pydnp3 import opendnp3, asiodnp3
+from typing import Deque, Dict, Optional
+
+stdout_stream = logging.StreamHandler(sys.stdout)
+stdout_stream.setFormatter(logging.Formatter('%(asctime)s\t%(name)s\t%(levelname)s\t%(message)s'))
+
+_log = logging.getLogger(__name__)
+_log.addHandler(stdout_stream)
+_log.setLevel(logging.INFO)
+
+# event group-variations, i.e., binary (2), double-bit binary (4), binary output (11), counter (22),
+# frozen counter (23), analog (32) and analog output (42) events
+EVENT_GROUPS = (2, 4, 11, 22, 23, 32, 42)
+EVENT_GVS = frozenset(gv for name, gv in opendnp3.GroupVariation.__members__.items()
+                      if name.startswith(tuple(f"Group{group}Var" for group in EVENT_GROUPS)))
+
+CLASS_BITS = {
+    1: opendnp3.IINBit.CLASS1_EVENTS,
+    2: opendnp3.IINBit.CLASS2_EVENTS,
+    3: opendnp3.IINBit.CLASS3_EVENTS,
+}
+
+LATENCY_SAMPLES = 1024  # latency samples kept for the percentiles
+
+
+class LatencyStats:
+    """Running latency statistics (in ms) with a bounded window of samples for the percentiles."""
+
+    def __init__(self, max_samples: int = LATENCY_SAMPLES):
+        self.count: int = 0
+        self.total: float = 0
+        self.max: float = 0
+        self._samples: Deque[float] = deque(maxlen=max_samples)
+
+    def add(self, latency_ms: float):
+        self.count += 1
+        self.total += latency_ms
+        self.max = max(self.max, latency_ms)
+        self._samples.append(latency_ms)
+
+    def snapshot(self) -> Dict[str, Optional[float]]:
+        if not self.count:
+            return {"count": 0, "mean": None, "p50": None, "p99": None, "max": None}
+        samples = sorted(self._samples)
+        return {"count": self.count,
+                "mean": self.total / self.count,
+                "p50": samples[len(samples) // 2],
+                "p99": samples[min(len(samples) - 1, int(len(samples) * 0.99))],
+                "max": self.max}
+
+
+class EventTelemetry(opendnp3.IMasterApplication):
+    """
+        Master application counting the event-related IIN bits of every response,
+        delegating everything else to the wrapped application.
+    """
+
+    def __init__(self, application: opendnp3.IMasterApplication = None):
+        """
+        :param application: wrapped master application, default to asiodnp3.DefaultMasterApplication
+        """
+        super(EventTelemetry, self).__init__()
+        self.application = application if application is not None else asiodnp3.DefaultMasterApplication().Create()
+        self._lock = threading.Lock()
+        self._active_tasks: int = 0
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.responses: int = 0
+            self.overflow_responses: int = 0  # responses with IIN2.3 set
+            self.overflows: int = 0  # overflow episodes, i.e., IIN2.3 going from clear to set
+            self.overflow_active: bool = False
+            self.pending_responses: Dict[int, int] = dict.fromkeys(CLASS_BITS, 0)  # class -> responses
+            self.events: int = 0
+            self.events_by_type: Dict[str, int] = {}
+            self.max_events_per_response: int = 0
+            self.last_events_per_response: int = 0
+            self.latency_ms: Dict[str, LatencyStats] = {"unsolicited": LatencyStats(), "solicited": LatencyStats()}
+            self._response_events: int = 0
+
+    def record_events(self, point_type: Optional[str], times=None, received: float = None, count: int = None):
+        """Account for the event objects of one header, see SOEHandler._post_process.
+        Latency samples are taken as outstation timestamp to receive time, see the module docstring.
+
+        :param times: outstation timestamps (ms since epoch, 0 if none) of the events
+        :param received: receive time, seconds since epoch, default to now
+        :param count: number of events, default to len(times)
+        """
+        count = count if count is not None else len(times)
+        with self._lock:
+            self.events += count
+            self._response_events += count
+            self.events_by_type[point_type] = self.events_by_type.get(point_type, 0) + count
+            if times is None or len(times) == 0:
+                return
+            received_ms = (received if received is not None else time.time()) * 1000
+            stats = self.latency_ms["solicited" if self._active_tasks else "unsolicited"]
+            for timestamp in times:
+                if timestamp:
+                    stats.add(max(0.0, received_ms - timestamp))
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "responses": self.responses,
+                "overflow_responses": self.overflow_responses,
+                "overflows": self.overflows,
+                "overflow_active": self.overflow_active,
+                "pending_responses": dict(self.pending_responses),
+                "events": self.events,
+                "events_by_type": dict(self.events_by_type),
+                "max_events_per_response": self.max_events_per_response,
+                "last_events_per_response": self.last_events_per_response,
+                "latency_ms": {kind: stats.snapshot() for kind, stats in self.latency_ms.items()},
+            }
+
+    # Overridden method
+    def OnReceiveIIN(self, iin: opendnp3.IINField):
+        overflow = iin.IsSet(opendnp3.IINBit.EVENT_BUFFER_OVERFLOW)
+        with self._lock:
+            self.responses += 1
+            if overflow:
+                self.overflow_responses += 1
+                if not self.overflow_active:
+                    self.overflows += 1
+                    _log.warning("Outstation event buffer overflow (IIN2.3), events were lost")
+            self.overflow_active = overflow
+            for clazz, bit in CLASS_BITS.items():
+                if iin.IsSet(bit):
+                    self.pending_responses[clazz] += 1
+            # Note: opendnp3 reports the IIN after handing the response's objects to the SOEHandler
+            self.last_events_per_response = self._response_events
+            self.max_events_per_response = max(self.max_events_per_response, self._response_events)
+            self._response_events = 0
+        self.application.OnReceiveIIN(iin)
+
+    # Overridden method
+    def OnTaskStart(self, type, id):
+        with self._lock:
+            self._active_tasks += 1
+        self.application.OnTaskStart(type, id)
+
+    # Overridden method
+    def OnTaskComplete(self, info):
+        with self._lock:
+            self._active_tasks = max(0, self._active_tasks - 1)
+        self.application.OnTaskComplete(info)
+
+    # Overridden method
+    def OnOpen(self):
+        self.application.OnOpen()
+
+    # Overridden method
+    def OnClose(self):
+        with self._lock:
+            self._active_tasks = 0
+        self.application.OnClose()
+
+    # Overridden method
+    def AssignClassDuringStartup(self):
+        return self.application.AssignClassDuringStartup()
+
+    # Overridden method
+    def ConfigureAssignClassRequest(self, fun):
+        self.application.ConfigureAssignClassRequest(fun)
+
+    # Overridden method
+    def OnStateChange(self, value):
+        self.application.OnStateChange(value)
+
+    # Overridden method
+    def Now(self):
+        return self.application.Now()
@@ -0,0 +1,370 @@
+"""
+    Master-side TCP server for outstations that dial in (e.g., cellular RTUs).
+
+    MyMasterNew dials out (AddTCPClient), one channel per outstation. ListenerMaster instead listens on one port
+    with DNP3Manager.CreateListener: every accepted connection waits for its first link frame, whose source address
+    identifies the outstation, and an IMasterSession is created for it on the shared manager, i.e., thousands of
+    outstations are served by one thread pool and one listening socket.
+
+    Per outstation (link address), the SOE handler is taken from a pool, so that it survives reconnects (the points
+    received before a connection drop stay available) and is not rebuilt on every dial-in. The scans of a ScanPlan
+    are registered on every session and driven by the shared ScanTimer.
+
+    EXAMPLE:
+    >>> listener_master = ListenerMaster(port=20000, scan_plan=ScanPlan.event_only(event_period=60, jitter=10))
+    >>> listener_master.start()
+    >>> listener_master.get_session(1024).soe_handler.get_point(GroupVariation.Group30Var6, 0)
+    >>> len(listener_master)  # connected outstations
+    2400
+    >>> listener_master.shutdown()
+"""
+from __future__ import annotations
+
+import logging
+import os
+import sys
+import threading
+
+from pydnp3 import opendnp3, openpal, asiopal, asiodnp3
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+
+from .log_buffer import BufferedLogConsumer
+from .scan_plan import ScanPlan, ScanTimer, ScheduledScan
+from .station_utils import SOEHandler
+
+stdout_stream = logging.StreamHandler(sys.stdout)
+stdout_stream.setFormatter(logging.Formatter('%(asctime)s\t%(name)s\t%(levelname)s\t%(message)s'))
+
+_log = logging.getLogger(__name__)
+_log.addHandler(stdout_stream)
+_log.setLevel(logging.INFO)
+
+SessionCallback = Callable[["MasterSession"], None]
+
+
+class MasterSession:
+    """An outstation connected to a ListenerMaster, i.e., an asiodnp3.IMasterSession and its SOE handler."""
+
+    def __init__(self, address: int, session_id: int, ip: Optional[str],
+                 session: asiodnp3.IMasterSession, soe_handler: SOEHandler,
+                 master_application: opendnp3.IMasterApplication,
+                 stack_config: asiodnp3.MasterStackConfig):
+        self.address = address  # outstation link address
+        self.session_id = session_id
+        self.ip = ip
+        self.session = session
+        self.soe_handler = soe_handler
+        # Note: kept alive for the lifetime of the native session
+        self.master_application = master_application
+        self.stack_config = stack_config
+        self.scans: Dict[str, ScheduledScan] = {}
+
+    def demand_scan(self, name: str):
+        """Perform a scan of the plan (e.g., "slow") as soon as possible.
+
+        :raise KeyError: if there is no such scan
+        """
+        self.scans[name].demand()
+
+    def get_statistics(self) -> asiodnp3.StackStatistics:
+        return self.session.GetStackStatistics()
+
+    def __repr__(self):
+        return f"MasterSession(address={self.address}, session_id={self.session_id}, ip={self.ip!r})"
+
+
+class SOEHandlerPool:
+    """
+        SOE handlers by outstation link address, created on first use with a factory and reused by the later
+        sessions of the same outstation.
+    """
+
+    def __init__(self, factory: Callable[[int], SOEHandler] = None):
+        """
+        :param factory: builds the handler of an address, default to SOEHandler()
+        """
+        self.factory = factory if factory is not None else lambda address: SOEHandler()
+        self._lock = threading.Lock()
+        self._handlers: Dict[int, SOEHandler] = {}
+
+    def acquire(self, address: int) -> SOEHandler:
+        with self._lock:
+            handler = self._handlers.get(address)
+            if handler is None:
+                handler = self._handlers[address] = self.factory(address)
+            return handler
+
+    def preallocate(self, addresses: Iterable[int]):
+        """Build the handlers of known outstations upfront, i.e., not on the stack thread of their first frame."""
+        for address in addresses:
+            self.acquire(address)
+
+    def discard(self, address: int) -> Optional[SOEHandler]:
+        """Forget the handler (and the data) of an outstation, e.g., a decommissioned one."""
+        with self._lock:
+            return self._handlers.pop(address, None)
+
+    def get(self, address: int) -> Optional[SOEHandler]:
+        return self._handlers.get(address)
+
+    def __len__(self):
+        return len(self._handlers)
+
+
+class ListenerMaster(asiodnp3.IListenCallbacks):
+    """
+        Accept outstation connections on one port and run a master session per outstation link address.
+
+        Note: a new connection from an address that already has a session replaces it (the old one is shut down),
+        e.g., an RTU that reconnects before the master noticed the connection drop.
+    """
+
+    def __init__(self,
+                 port: int = 20000,
+                 local_ip: str = "0.0.0.0",
+                 master_id: int = 2,
+                 concurrency_hint: Optional[int] = None,
+                 manager: asiodnp3.DNP3Manager = None,
+                 log_handler=None,
+                 listener_log_level=opendnp3.levels.NORMAL,
+                 tls_config: asiopal.TLSConfig = None,
+                 allowed_addresses: Optional[Iterable[int]] = None,
+                 accept_ip: Optional[Callable[[str], bool]] = None,
+                 max_sessions: Optional[int] = None,
+                 first_frame_timeout: float = 10,
+                 scan_plan: ScanPlan = None,
+                 soe_handler_factory: Callable[[int], SOEHandler] = None,
+                 soe_handler_pool: SOEHandlerPool = None,
+                 master_application_factory: Callable[[int], opendnp3.IMasterApplication] = None,
+                 stack_config_factory: Callable[[int], asiodnp3.MasterStackConfig] = None,
+                 on_session_open: Optional[SessionCallback] = None,
+                 on_session_close: Optional[SessionCallback] = None):
+        """
+        :param port: port to listen on
+        :param local_ip: adapter to listen on, default to all adapters
+        :param master_id: link address of the master, frames to other addresses are rejected
+        :param concurrency_hint: number of threads of a dedicated manager, default to the number of CPUs
+        :param manager: optional shared DNP3Manager (e.g., MasterPool.manager), not released by shutdown
+        :param log_handler: openpal.ILogHandler of a dedicated manager, or a log_buffer.BufferedLogConsumer
+            (started here), default to asiodnp3.ConsoleLogger
+        :param listener_log_level: log filters of the listener and its sessions
+        :param tls_config: listen with TLS instead of plain TCP
+        :param allowed_addresses: outstation link addresses to accept, default to any
+        :param accept_ip: optional filter on the IP address of a connecting host, before any frame is read
+        :param max_sessions: reject connections beyond this number of open connections (sessions and connections
+            still waiting for their first frame), default to no limit
+        :param first_frame_timeout: in seconds, connections that send no link frame in time are closed
+        :param scan_plan: periodic scans of every session, default to ScanPlan.default()
+        :param soe_handler_factory: builds the SOE handler of an outstation address, default to SOEHandler()
+        :param soe_handler_pool: optional SOEHandlerPool, e.g., shared or preallocated, default to a new pool
+            built with soe_handler_factory
+        :param master_application_factory: builds the master application of an outstation address,
+            default to a single asiodnp3.DefaultMasterApplication shared by all sessions
+        :param stack_config_factory: builds the MasterStackConfig of an outstation address, default to
+            a 2-second response timeout with the link addresses set
+        :param on_session_open: called with the MasterSession once created, on a stack thread
+        :param on_session_close: called with the MasterSession once its connection is closed, on a stack thread
+        """
+        super(ListenerMaster, self).__init__()
+        self.port = port
+        self.local_ip = local_ip
+        self.master_id = master_id
+        self.listener_log_level = listener_log_level
+        self.tls_config = tls_config
+        self.allowed_addresses = frozenset(allowed_addresses) if allowed_addresses is not None else None
+        self.accept_ip = accept_ip
+        self.max_sessions = max_sessions
+        self.first_frame_timeout = first_frame_timeout
+        self.scan_plan: ScanPlan = scan_plan if scan_plan is not None else ScanPlan.default()
+        self.soe_handlers = soe_handler_pool if soe_handler_pool is not None else SOEHandlerPool(soe_handler_factory)
+        self.on_session_open = on_session_open
+        self.on_session_close = on_session_close
+        if master_application_factory is None:
+            default_application = asiodnp3.DefaultMasterApplication().Create()
+            master_application_factory = lambda address: default_application
+        self.master_application_factory = master_application_factory
+        self.stack_config_factory = stack_config_factory if stack_config_factory else self.default_stack_config
+
+        self.log_buffer: Optional[BufferedLogConsumer] = None
+        if isinstance(log_handler, BufferedLogConsumer):
+            self.log_buffer = log_handler
+            self.log_buffer.start()
+            log_handler = self.log_buffer.native
+        self._owns_manager: bool = manager is None
+        if self._owns_manager:
+            concurrency_hint = concurrency_hint if concurrency_hint else (os.cpu_count() or 1)
+            self.log_handler = log_handler if log_handler else asiodnp3.ConsoleLogger().Create()
+            _log.debug(f'Creating a DNP3Manager with concurrency hint {concurrency_hint}.')
+            manager = asiodnp3.DNP3Manager(concurrency_hint, self.log_handler)
+        self.manager = manager
+        self.listener: Optional[asiopal.IListener] = None
+
+        self._lock = threading.Lock()
+        self._ips: Dict[int, str] = {}  # session id -> IP address, until the connection closes
+        self._sessions: Dict[int, MasterSession] = {}  # outstation address -> session
+        self._by_session_id: Dict[int, MasterSession] = {}
+        # counters
+        self.accepted: int = 0
+        self.rejected: int = 0
+        self.replaced: int = 0
+
+    def default_stack_config(self, address: int) -> asiodnp3.MasterStackConfig:
+        stack_config = asiodnp3.MasterStackConfig()
+        stack_config.master.responseTimeout = openpal.TimeDuration().Seconds(2)
+        stack_config.link.RemoteAddr = address
+        stack_config.link.LocalAddr = self.master_id
+        return stack_config
+
+    def start(self):
+        """Start listening.
+
+        :raise RuntimeError: if the endpoint cannot be bound (e.g., port in use) or the TLS configuration is invalid
+        """
+        if self.listener is not None:
+            return
+        endpoint = asiopal.IPEndpoint(self.local_ip, self.port)
+        loglevel = openpal.LogFilters(self.listener_log_level)
+        loggerid = f"listener-{self.port}"
+        _log.debug(f'Listening for outstations on {self.local_ip}:{self.port}.')
+        if self.tls_config is not None:
+            self.listener = self.manager.CreateListener(loggerid, loglevel, endpoint, self.tls_config, self)
+        else:
+            self.listener = self.manager.CreateListener(loggerid, loglevel, endpoint, self)
+
+    def shutdown(self):
+        """Stop listening and shut down all the sessions.
+
+        Note: a dedicated manager is released with `del` rather than Shutdown(), see MyMasterNew.shutdown
+        """
+        if self.listener is not None:
+            self.listener.Shutdown()
+            self.listener = None
+        with self._lock:
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+            self._by_session_id.clear()
+        for master_session in sessions:
+            self._close(master_session)
+        if self._owns_manager and hasattr(self, "manager"):
+            del self.manager
+
+    @property
+    def sessions(self) -> List[MasterSession]:
+        return list(self._sessions.values())
+
+    def get_session(self, address: int) -> Optional[MasterSession]:
+        """Current session of the outstation with this link address, None if not connected."""
+        return self._sessions.get(address)
+
+    def stats(self) -> dict:
+        return {"sessions": len(self._sessions), "accepted": self.accepted, "rejected": self.rejected,
+                "replaced": self.replaced, "soe_handlers": len(self.soe_handlers)}
+
+    def __len__(self):
+        return len(self._sessions)
+
+    def __iter__(self) -> Iterator[MasterSession]:
+        return iter(self.sessions)
+
+    def __contains__(self, address: int):
+        return address in self._sessions
+
+    def _close(self, master_session: MasterSession):
+        timer = ScanTimer.shared()
+        for scheduled in master_session.scans.values():
+            timer.cancel(scheduled)
+        try:
+            master_session.session.BeginShutdown()
+        except Exception as e:
+            _log.warning(f"Failed to shut down {master_session}: {e!r}")
+
+    # Overridden method
+    def AcceptConnection(self, sessionid, ipaddress):
+        accept = self.accept_ip is None or self.accept_ip(ipaddress)
+        with self._lock:
+            # Note: counted under the lock, along with the connections accepted but not identified yet,
+            # so that a burst of connections cannot get past max_sessions
+            full = self.max_sessions is not None and len(self._ips) >= self.max_sessions
+            if accept and not full:
+                self._ips[sessionid] = ipaddress
+            else:
+                self.rejected += 1
+        if accept and full:
+            _log.warning(f"Rejecting connection from {ipaddress}, {self.max_sessions} connections are already open")
+            accept = False
+        return accept
+
+    # Overridden method
+    def AcceptCertificate(self, sessionid, info):
+        # Note: only called for certificates that passed the TLS verification
+        return True
+
+    # Overridden method
+    def GetFirstFrameTimeout(self):
+        return openpal.TimeDuration().Milliseconds(int(self.first_frame_timeout * 1000))
+
+    # Overridden method
+    def OnFirstFrame(self, sessionid, header, acceptor):
+        address = header.src
+        ip = self._ips.get(sessionid)
+        reason = None
+        if header.dest != self.master_id:
+            reason = f"first frame addressed to {header.dest} instead of {self.master_id}"
+        elif self.allowed_addresses is not None and address not in self.allowed_addresses:
+            reason = "address not in allowed_addresses"
+        if reason is not None:
+            _log.warning(f"Rejecting outstation {address} ({ip}), {reason}")
+            with self._lock:
+                self.rejected += 1
+            return  # Note: the connection is closed if no session is accepted
+
+        soe_handler = self.soe_handlers.acquire(address)
+        master_application = self.master_application_factory(address)
+        stack_config = self.stack_config_factory(address)
+        session = acceptor.AcceptSession(f"session-{address}", soe_handler, master_application, stack_config)
+        if session is None:
+            _log.warning(f"Failed to create a session for outstation {address} ({ip})")
+            return
+        master_session = MasterSession(address, sessionid, ip, session, soe_handler, master_application,
+                                       stack_config)
+        for entry in self.scan_plan:
+            master_session.scans[entry.name] = ScheduledScan(entry, entry.register(session))
+
+        with self._lock:
+            previous = self._sessions.get(address)
+            self._sessions[address] = master_session
+            self._by_session_id[sessionid] = master_session
+            if previous is not None:
+                self._by_session_id.pop(previous.session_id, None)
+                self.replaced += 1
+            self.accepted += 1
+        if previous is not None:
+            _log.info(f"Outstation {address} reconnected from {ip}, replacing {previous}")
+            self._close(previous)
+
+        timer = ScanTimer.shared()
+        for scheduled in master_session.scans.values():
+            timer.schedule(scheduled)
+        _log.debug(f"Session of outstation {address} ({ip}) open.")
+        if self.on_session_open is not None:
+            self.on_session_open(master_session)
+
+    # Overridden method
+    def OnConnectionClose(self, sessionid, session):
+        with self._lock:
+            self._ips.pop(sessionid, None)
+            master_session = self._by_session_id.pop(sessionid, None)
+            if master_session is not None and self._sessions.get(master_session.address) is master_session:
+                del self._sessions[master_session.address]
+        if master_session is None:
+            return
+        timer = ScanTimer.shared()
+        for scheduled in master_session.scans.values():
+            timer.cancel(scheduled)
+        _log.debug(f"Session of outstation {master_session.address} ({master_session.ip}) closed.")
+        if self.on_session_close is not None:
+            self.on_session_close(master_session)
+
+    # Overridden method
+    def OnCertificateError(self, sessionid, info, error):
+        _log.warning(f"TLS certificate error {error} from {self._ips.get(sessionid)} (depth {info.depth})")
@@ -0,0 +1,165 @@
+"""
+    Low-overhead opendnp3 logging.
+
+    A Python openpal.ILogHandler (e.g., station_utils.MyLogger) runs for every log entry on the stack's threads,
+    under the GIL, which dominates the CPU usage with wire-level levels (e.g., opendnp3.levels.ALL_COMMS).
+    BufferedLogConsumer uses a native asiodnp3.RingBufferLogHandler instead: entries are sampled/rate limited
+    per logger id and buffered without acquiring the GIL, and a Python thread drains them in batches
+    into the Python logging module (or any batch callback).
+
+    EXAMPLE:
+    >>> log_buffer = BufferedLogConsumer(capacity=65536)
+    >>> log_buffer.set_policy("tcpclient", sample_every=10, max_per_second=100)  # e.g., link/transport hex dumps
+    >>> master = MyMasterNew(log_handler=log_buffer, channel_log_level=opendnp3.levels.ALL_COMMS)
+    >>> log_buffer.stats()
+    {'received': 2400, 'dropped': 2100, 'overflow': 0}
+
+    Note: NumPy is required, i.e., `pip install numpy` to use this module.
+"""
+from __future__ import annotations
+
+import logging
+import sys
+import threading
+
+from pydnp3 import opendnp3, asiodnp3
+from typing import Callable, List, NamedTuple, Optional
+
+stdout_stream = logging.StreamHandler(sys.stdout)
+stdout_stream.setFormatter(logging.Formatter('%(asctime)s\t%(name)s\t%(levelname)s\t%(message)s'))
+
+_log = logging.getLogger(__name__)
+_log.addHandler(stdout_stream)
+_log.setLevel(logging.INFO)
+
+
+class LogRecord(NamedTuple):
+    time: int  # ms since epoch
+    filters: int  # opendnp3.flags
+    loggerid: str
+    location: str
+    message: str
+
+    @property
+    def level(self) -> int:
+        """Python logging level of the entry"""
+        if self.filters & opendnp3.flags.ERR:
+            return logging.ERROR
+        if self.filters & opendnp3.flags.WARN:
+            return logging.WARNING
+        if self.filters & (opendnp3.flags.INFO | opendnp3.flags.EVENT):
+            return logging.INFO
+        return logging.DEBUG
+
+
+BatchCallback = Callable[[List[LogRecord]], None]
+
+
+class BufferedLogConsumer:
+    """
+        Python consumer of an asiodnp3.RingBufferLogHandler, forwarding the entries from its own thread.
+    """
+
+    def __init__(self, capacity: int = 65536,
+                 batch_size: int = 4096,
+                 poll_interval: float = 0.2,
+                 max_message_length: int = 512,
+                 logger: Optional[logging.Logger] = None):
+        """
+        :param capacity: size of the native ring buffer (number of entries), the oldest entries are overwritten
+            when it is full, see stats()["overflow"]
+        :param batch_size: maximum number of entries drained at once
+        :param poll_interval: in seconds, maximum wait of the consumer thread between two drains
+        :param max_message_length: longer messages are truncated
+        :param logger: where the entries go, default to the "opendnp3" logger. Set to None with
+            add_callback to handle the batches only.
+        """
+        self.native = asiodnp3.RingBufferLogHandler(capacity, max_message_length)
+        self.logger: Optional[logging.Logger] = logger if logger is not None else logging.getLogger("opendnp3")
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+
+        self._lock = threading.Lock()  # one drain at a time
+        self._callbacks: List[BatchCallback] = []
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def set_policy(self, loggerid: str, sample_every: int = 1, max_per_second: float = 0):
+        """Keep one entry out of sample_every, and at most max_per_second entries per second (0 for no limit),
+        of a logger id, e.g., the id of a channel ("tcpclient"), a master ("master") or an outstation.
+
+        Note: errors and warnings are always kept, see set_exempt_filters.
+        """
+        self.native.SetPolicy(loggerid, sample_every, max_per_second)
+
+    def set_default_policy(self, sample_every: int = 1, max_per_second: float = 0):
+        """Policy of the logger ids without a policy of their own."""
+        self.native.SetDefaultPolicy(sample_every, max_per_second)
+
+    def set_exempt_filters(self, filters: int):
+        """Entries matching these opendnp3.flags bypass the policies, default to ERR | WARN."""
+        self.native.SetExemptFilters(filters)
+
+    def stats(self) -> dict:
+        """Counters: received, dropped (by the policies) and overflow (overwritten entries)."""
+        return self.native.GetStatistics()
+
+    @property
+    def backlog(self) -> int:
+        """Number of entries waiting to be drained."""
+        return self.native.Size()
+
+    def add_callback(self, callback: BatchCallback):
+        """Call callback with each drained batch (a list of LogRecord), on the consumer thread."""
+        self._callbacks.append(callback)
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, name="BufferedLogConsumer", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = None):
+        """Stop the consumer thread, after draining what is left in the buffer."""
+        self._stopped.set()
+        self.native.Notify()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def drain(self, max_items: int = None) -> List[LogRecord]:
+        """Move up to max_items (default to all) buffered entries out of the buffer, without forwarding them."""
+        with self._lock:
+            times, filters, loggerids, locations, messages = self.native.Drain(max_items or 0)
+        return [LogRecord(*fields) for fields in zip(times.tolist(), filters.tolist(), loggerids, locations,
+                                                     messages)]
+
+    def _forward(self, records: List[LogRecord]):
+        if self.logger is not None:
+            for record in records:
+                level = record.level
+                if self.logger.isEnabledFor(level):
+                    self.logger.log(level, "%s\t%s\t%s", record.loggerid, record.location, record.message)
+        for callback in list(self._callbacks):
+            try:
+                callback(records)
+            except Exception as e:
+                _log.error(f"Log batch callback failed: {e!r}")
+
+    def _run(self):
+        while True:
+            stopped = self._stopped.is_set()
+            if not stopped:
+                self.native.Wait(int(self.poll_interval * 1000))
+            try:
+                while True:
+                    records = self.drain(self.batch_size)
+                    if records:
+                        self._forward(records)
+                    if len(records) < self.batch_size:
+                        break
+            except Exception as e:
+                _log.error(f"Failed to drain the log buffer: {e!r}")
+            if stopped:
+                return
@@ -1,3 +1,4 @@
+import concurrent.futures
 import logging
 import sys
 import time
@@ -5,7 +6,7 @@ import time
 from pydnp3 import opendnp3, openpal, asiopal, asiodnp3
 # from visitors import *
 from .visitors import *
-from typing import Callable, Union, Dict, List, Optional, Tuple
+from typing import Callable, Union, Dict, Iterable, List, Optional, Tuple
 from pydnp3.opendnp3 import GroupVariation, GroupVariationID
 
 FILTERS = opendnp3.levels.NORMAL | opendnp3.levels.ALL_COMMS
@@ -23,9 +24,18 @@ _log = logging.getLogger(__name__)
 # _log.setLevel(logging.ERROR)
 _log.setLevel(logging.INFO)
 
-from .station_utils import MyLogger, AppChannelListener, SOEHandler
+from .station_utils import MyLogger, AppChannelListener, SOEHandler, TaskCallback, PointRecord
 from .station_utils import parsing_gvid_to_gvcls, parsing_gv_to_mastercmdtype
 from .station_utils import collection_callback, command_callback, restart_callback
+from .subscriptions import Subscription
+from .scan_plan import ScanEntry, ScanPlan, ScanTimer, ScheduledScan
+from .command_queue import CommandQueue
+from .soe_buffer import BufferedSOEConsumer
+from .event_telemetry import EventTelemetry, EVENT_GVS
+from .log_buffer import BufferedLogConsumer
+from .transport import Transport
+from .connection import ConnectionTracker, RetryPolicy
+from .stats import StatsCache, StatsSnapshot
 import datetime
 
 # alias DbPointVal
@@ -63,7 +73,7 @@ class MyMasterNew:
                  log_handler=asiodnp3.ConsoleLogger().Create(),
                  listener=asiodnp3.PrintingChannelListener().Create(),
 
-                 soe_handler=SOEHandler(),
+                 soe_handler: SOEHandler = None,
                  master_application=asiodnp3.DefaultMasterApplication().Create(),
                  channel_log_level=opendnp3.levels.NORMAL,
                  master_log_level=7,  # wild guess, 7: warning, 15 (opendnp3.levels.NORMAL): info
@@ -74,9 +84,44 @@ class MyMasterNew:
                  stack_config=None,
 
                  # manager = asiodnp3.DNP3Manager(2, asiodnp3.ConsoleLogger().Create())
+                 manager: asiodnp3.DNP3Manager = None,
+                 channel: asiodnp3.IChannel = None,
+                 enable_default_scans: bool = True,
+                 scan_plan: ScanPlan = None,
+                 soe_buffer_capacity: int = None,
+                 event_telemetry: bool = False,
+                 transport: Transport = None,
+                 retry_policy: RetryPolicy = None,
+                 scan_timer: Optional[ScanTimer] = None,
                  *args, **kwargs):
         """
         TODO: docstring here
+
+        :param log_handler: handler of the opendnp3 log entries of a dedicated manager, or a
+            log_buffer.BufferedLogConsumer (started here, not stopped by shutdown since it may be shared)
+        :param soe_handler: default to a new SOEHandler per master
+        :param manager: optional shared DNP3Manager (e.g., from MasterPool), default to a dedicated one
+        :param channel: optional shared TCP client channel, several masters can share a channel
+            (e.g., multi-drop) as long as the outstation link addresses differ.
+            The channel is not shut down with the master.
+        :param enable_default_scans: register the default slow/fast class scans (see ScanPlan.default)
+        :param scan_plan: periodic scans of this master, e.g., ScanPlan.from_dict(config),
+            default to ScanPlan.default() (or no scan if enable_default_scans is False)
+        :param scan_timer: timer performing the scans of scan_plan, e.g., ScanTimer.shared() to support jitter
+            and set_scan_period, or the one of MasterPool to cap the scans in flight.
+            Default to None, i.e., opendnp3 performs the scans natively with their period (jitter is ignored).
+        :param soe_buffer_capacity: decode measurements into a native ring buffer of this size,
+            drained into soe_handler by a Python thread (see soe_buffer.BufferedSOEConsumer),
+            instead of running soe_handler on the stack thread. Requires numpy.
+        :param event_telemetry: wrap master_application in an event_telemetry.EventTelemetry, i.e., count
+            the outstation's event buffer overflows (IIN2.3), events per response and event latency
+        :param transport: channel to open instead of a TCP client to outstation_ip:port, e.g.,
+            transport.SerialTransport or transport.TLSClientTransport
+        :param retry_policy: reconnect backoff of the channel, default to connection.RetryPolicy(), i.e.,
+            exponential backoff from 1 second to 1 minute with jitter
+        :param listener: channel listener, wrapped into a connection.ConnectionTracker (self.connection) that
+            tracks the connection state, unless it is one already. With a shared channel, pass the
+            ConnectionTracker of that channel (e.g., MasterPool does) to track its state.
         """
         # TODO: refactor to apply factory pattern, allow further config
         # - the init parameter list is a bit long.
@@ -89,15 +134,39 @@ class MyMasterNew:
         # Note: not recommend to change masterstation_id_int and outstation_id_int,
         # if they need to be changed, make sure to match the outstation configuration.
 
+        self.log_buffer: Optional[BufferedLogConsumer] = None
+        if isinstance(log_handler, BufferedLogConsumer):
+            self.log_buffer = log_handler
+            self.log_buffer.start()
+            log_handler = self.log_buffer.native
         self.log_handler = log_handler
+        self.connection: Optional[ConnectionTracker] = None
+        if isinstance(listener, ConnectionTracker):
+            self.connection = listener
+        elif channel is None:
+            self.connection = ConnectionTracker(inner=listener)
+            listener = self.connection
         self.listener = listener
-        self.soe_handler: SOEHandler = soe_handler
+        # Note: do not share a default SOEHandler among masters, otherwise they would mix up their data.
+        self.soe_handler: SOEHandler = soe_handler if soe_handler is not None else SOEHandler()
+        self.soe_buffer: Optional[BufferedSOEConsumer] = None
+        if soe_buffer_capacity:
+            self.soe_buffer = BufferedSOEConsumer(self.soe_handler, capacity=soe_buffer_capacity)
+        self.event_telemetry: Optional[EventTelemetry] = None
+        if event_telemetry:
+            self.event_telemetry = EventTelemetry(master_application)
+            self.soe_handler.event_telemetry = self.event_telemetry
+            master_application = self.event_telemetry
         self.master_application = master_application
 
         self.num_polling_retry = num_polling_retry
         self.delay_polling_retry = delay_polling_retry  # in seconds
         self.stale_if_longer_than = stale_if_longer_than  # in seconds
 
+        # task callbacks of in-flight requests, kept alive until opendnp3 destroys the task
+        self._task_callbacks = set()
+        self._command_queue: Optional[CommandQueue] = None
+
         _log.debug('Configuring the DNP3 stack.')
         self.stack_config = stack_config
         if not self.stack_config:
@@ -108,39 +177,60 @@ class MyMasterNew:
 
         # init steps: DNP3Manager(manager) -> TCPClient(channel) -> Master(master)
         # init DNP3Manager(manager)
-        _log.debug('Creating a DNP3Manager.')
-        self.manager = asiodnp3.DNP3Manager(concurrency_hint, self.log_handler)
-        # self.manager = manager
+        # Note: a shared manager (and its thread pool) can serve many masters, see MasterPool
+        if manager is None and channel is None:
+            _log.debug('Creating a DNP3Manager.')
+            manager = asiodnp3.DNP3Manager(concurrency_hint, self.log_handler)
+        self.manager = manager
 
         # init TCPClient(channel)
-        _log.debug('Creating the DNP3 channel, a TCP client.')
-        self.retry = asiopal.ChannelRetry().Default()
-        level = opendnp3.levels.NORMAL | opendnp3.levels.ALL_COMMS  # TODO: check why this seems not working
-        self.channel = self.manager.AddTCPClient(id="tcpclient",
-                                                 levels=level,
-                                                 retry=self.retry,
-                                                 host=outstation_ip,
-                                                 local=master_ip,
-                                                 port=port,
-                                                 listener=self.listener)
+        self.retry_policy: RetryPolicy = retry_policy if retry_policy is not None else RetryPolicy()
+        self.retry = self.retry_policy.channel_retry()
+        self._owns_channel: bool = channel is None
+        self.transport: Optional[Transport] = transport
+        if self._owns_channel and transport is not None:
+            _log.debug(f'Creating the DNP3 channel, {transport}.')
+            channel = transport.create_channel(self.manager, id=transport.kind.replace("_", ""),
+                                               levels=opendnp3.levels.NORMAL | opendnp3.levels.ALL_COMMS,
+                                               retry=self.retry,
+                                               listener=self.listener)
+        elif self._owns_channel:
+            _log.debug('Creating the DNP3 channel, a TCP client.')
+            level = opendnp3.levels.NORMAL | opendnp3.levels.ALL_COMMS  # TODO: check why this seems not working
+            channel = self.manager.AddTCPClient(id="tcpclient",
+                                                levels=level,
+                                                retry=self.retry,
+                                                host=outstation_ip,
+                                                local=master_ip,
+                                                port=port,
+                                                listener=self.listener)
+        self.channel = channel
 
         # init Master(master)
         _log.debug('Adding the master to the channel.')
         self.master = self.channel.AddMaster(id="master",
-                                             SOEHandler=self.soe_handler,
+                                             SOEHandler=self.soe_buffer.native if self.soe_buffer
+                                             else self.soe_handler,
                                              # SOEHandler=asiodnp3.PrintingSOEHandler().Create(),
                                              application=self.master_application,
                                              config=self.stack_config)
+        self._stats = StatsCache(self.channel, self.master, connection=self.connection)
 
         _log.debug('Configuring some scans (periodic reads).')
-        # Set up a "slow scan", an infrequent integrity poll that requests events and static data for all classes.
-        self.slow_scan = self.master.AddClassScan(opendnp3.ClassField().AllClasses(),  # TODO: add interface entrypoint
-                                                  openpal.TimeDuration().Minutes(30),
-                                                  opendnp3.TaskConfig().Default())
-        # Set up a "fast scan", a relatively-frequent exception poll that requests events and class 1 static data.
-        self.fast_scan = self.master.AddClassScan(opendnp3.ClassField(opendnp3.ClassField.CLASS_1),
-                                                  openpal.TimeDuration().Minutes(1),
-                                                  opendnp3.TaskConfig().Default())
+        if scan_plan is None:
+            # Note: "slow" is an infrequent integrity poll that requests events and static data for all classes,
+            # "fast" a relatively-frequent exception poll that requests events and class 1 static data.
+            scan_plan = ScanPlan.default() if enable_default_scans else ScanPlan()
+        self.scan_plan: ScanPlan = scan_plan
+        self.scan_timer: Optional[ScanTimer] = scan_timer
+        self.scans: Dict[str, ScheduledScan] = {}
+        self._is_started = False
+        self._is_shutdown = False
+        for entry in self.scan_plan:
+            self._bind_scan(entry)
+        # kept for backward compatibility
+        self.slow_scan: Optional[asiodnp3.IMasterScan] = self.scans["slow"].scan if "slow" in self.scans else None
+        self.fast_scan: Optional[asiodnp3.IMasterScan] = self.scans["fast"].scan if "fast" in self.scans else None
 
         # Configure log level for channel(server) and master
         # note: one of the following
@@ -153,7 +243,9 @@ class MyMasterNew:
         self.channel_log_level: opendnp3.levels = channel_log_level
         self.master_log_level: opendnp3.levels = master_log_level
 
-        self.channel.SetLogFilters(openpal.LogFilters(self.channel_log_level))
+        # Note: a shared channel keeps the filters of its owner, e.g., MasterPool(channel_log_level=...)
+        if self._owns_channel:
+            self.channel.SetLogFilters(openpal.LogFilters(self.channel_log_level))
         self.master.SetLogFilters(openpal.LogFilters(self.master_log_level))
         # self.channel.SetLogFilters(openpal.LogFilters(opendnp3.levels.ALL_COMMS))
         # self.master.SetLogFilters(openpal.LogFilters(opendnp3.levels.ALL_COMMS))
@@ -184,23 +276,39 @@ class MyMasterNew:
         numOpen - numClose == 1 => SUCCESS
         numOpen - numClose == 0 => FAIL
         """
+        statistics = self.channel.GetStatistics().channel
         return {
-            "numOpen": self.channel.GetStatistics().channel.numOpen,
-            "numOpenFail": self.channel.GetStatistics().channel.numOpenFail,
-            "numClose": self.channel.GetStatistics().channel.numClose}
+            "numOpen": statistics.numOpen,
+            "numOpenFail": statistics.numOpenFail,
+            "numClose": statistics.numClose}
 
     @property
     def is_connected(self):
         """
+        Connection state of the channel as last reported by IChannelListener.OnStateChange (see self.connection),
+        or from the channel statistics if the channel is not tracked.
+
         Note: when there is 1-to-1 mapping from channel to station, then
         numOpen - numClose == 1 => SUCCESS
         numOpen - numClose == 0 => FAIL
         """
-        if self.channel_statistic.get("numOpen") - self.channel_statistic.get("numClose") == 1:
+        if self.connection is not None:
+            return self.connection.is_connected
+        channel_statistic = self.channel_statistic
+        if channel_statistic.get("numOpen") - channel_statistic.get("numClose") == 1:
             return True
         else:
             return False
 
+    def stats(self, max_age: float = 0) -> StatsSnapshot:
+        """
+        Channel and stack counters (e.g., numBytesRx, numTransportRx, numUnknownDestination) in one call.
+
+        :param max_age: in seconds, reuse the previous snapshot if not older (and the connection state did not
+            change since), 0 to always read fresh counters
+        """
+        return self._stats.get(max_age)
+
     def get_config(self):
         """print out the configuration
         example"""
@@ -285,9 +393,9 @@ class MyMasterNew:
                       # GroupVariationID(11, 2),
                       ]
         filtered_db_w_ts = {}
+        # Note: stale group-variations are refreshed with a single batched request, i.e., one round trip.
+        self.retrieve_db_by_gvids(gv_ids=gv_ids)
         for gv_id in gv_ids:
-            # self.retrieve_all_obj_by_gvid(gv_id=gv_id, config=config)
-            self.retrieve_db_by_gvid(gv_id=gv_id)
             gv_cls: opendnp3.GroupVariation = parsing_gvid_to_gvcls(gv_id)
             # filtered_db_w_ts.update({gv_cls: self.soe_handler.gv_ts_ind_val_dict.get(gv_cls)})
             filtered_db_w_ts.update({gv_cls: (self.soe_handler.gv_last_poll_dict.get(gv_cls),
@@ -307,6 +415,32 @@ class MyMasterNew:
     #     val: DbPointVal = self.soe_handler.gv_index_value_nested_dict.get(gv_cls).get(index)
     #     return val
 
+    def _is_fresh(self, gv_cls: opendnp3.GroupVariation, now: datetime.datetime = None,
+                  index: Optional[int] = None) -> bool:
+        """Whether the cached values of a group-variation (or of a single point) can be used without polling,
+        i.e., received less than stale_if_longer_than seconds ago.
+
+        Note: freshness is tracked per point, a group-variation is fresh only if its least recently updated point is.
+        A failed poll (cached as None, see _get_updated_val_storages) counts as fresh as well to avoid re-polling.
+        Event group-variations (e.g., Group32) are fresh once received: a read only returns events not reported yet,
+        so their cache is kept up to date by the event scans and unsolicited responses instead.
+        """
+        if gv_cls in EVENT_GVS:
+            return gv_cls in self.soe_handler.gv_index_value_nested_dict
+        now = now if now else datetime.datetime.now()
+        ts = self.soe_handler.gv_last_poll_dict.get(gv_cls)
+        if not ts or (now - ts).total_seconds() >= self.stale_if_longer_than:
+            return False
+        if self.soe_handler.gv_index_value_nested_dict.get(gv_cls) is None:
+            return True
+        if index is None:
+            ts = self.soe_handler.gv_oldest_received(gv_cls)
+        else:
+            ts = self.soe_handler.point_received(gv_cls, index)
+        if ts is None:  # Note: the group-variation was polled recently, but did not include the point
+            return True
+        return (now - ts).total_seconds() < self.stale_if_longer_than
+
     def retrieve_db_by_gvid(self, gv_id: opendnp3.GroupVariationID) -> DbStorage:
         """Retrieve point value based on group-variation id, e.g., GroupVariationID(30, 6)
 
@@ -326,9 +460,7 @@ class MyMasterNew:
         #     gv_cls)
         ret_val: {opendnp3.GroupVariation: Dict[int, DbPointVal]}
 
-        ts = self.soe_handler.gv_last_poll_dict.get(gv_cls)
-        stale_if_longer_than = self.stale_if_longer_than
-        if ts and (datetime.datetime.now() - ts).total_seconds() < stale_if_longer_than:
+        if self._is_fresh(gv_cls):
             # Note: there is caching logic to prevent overuse self.master.ScanAllObjects.
             # The stale checking logic is to prevent extensive caching
             val_body = self.soe_handler.gv_index_value_nested_dict.get(gv_cls)
@@ -340,61 +472,221 @@ class MyMasterNew:
 
         return ret_val
 
+    def retrieve_db_by_gvids(self, gv_ids: List[opendnp3.GroupVariationID]) -> DbStorage:
+        """Retrieve point values of several group-variations, e.g., [GroupVariationID(30, 6), GroupVariationID(1, 2)]
+
+        Cached values are reused (see retrieve_db_by_gvid), the stale ones are refreshed
+        with a single READ request carrying one object header per group-variation.
+
+        EXAMPLE:
+        >>> master_application.retrieve_db_by_gvids(gv_ids=[opendnp3.GroupVariationID(30, 6),
+        ...                                                 opendnp3.GroupVariationID(1, 2)])
+        {GroupVariation.Group30Var6: {0: 7.8, 1: 14.1, 2: 22.2}, GroupVariation.Group1Var2: {0: True, 1: False, 2: True}}
+        """
+        ret_val: DbStorage = {}
+        stale_gv_ids: List[opendnp3.GroupVariationID] = []
+        now = datetime.datetime.now()
+        for gv_id in gv_ids:
+            gv_cls: opendnp3.GroupVariation = parsing_gvid_to_gvcls(gv_id)
+            if self._is_fresh(gv_cls, now):
+                ret_val[gv_cls] = self.soe_handler.gv_index_value_nested_dict.get(gv_cls)
+            else:
+                stale_gv_ids.append(gv_id)
+
+        if stale_gv_ids:
+            ret_val.update(self._get_updated_val_storages(stale_gv_ids))
+        _log.debug(f"Retrieve {ret_val} at {datetime.datetime.now()}")
+
+        return ret_val
+
     def _get_updated_val_storage(self, gv_id: opendnp3.GroupVariationID) -> DbStorage:
         """
-        Wrap on self.master.ScanAllObjects with retry logic
+        Wrap on self.read_async with retry logic
         """
+        return self._get_updated_val_storages([gv_id])
 
-        gv_cls: opendnp3.GroupVariation = parsing_gvid_to_gvcls(gv_id)
+    def _get_updated_val_storages(self, gv_ids: List[opendnp3.GroupVariationID]) -> DbStorage:
+        """
+        Wrap on self.read_many_async with retry logic, only the group-variations still missing are retried.
+        """
 
-        # Start from fresh--Set val_storage to None
-        self.soe_handler.gv_index_value_nested_dict[gv_cls] = None
-        self.soe_handler.gv_ts_ind_val_dict[gv_cls] = None
-        self.soe_handler.gv_last_poll_dict[gv_cls] = None
-        # perform scan
-        config = opendnp3.TaskConfig().Default()
-        # TODO: "prettify" the following while loop workflow. e.g., helper function + recurrent function
-        self.master.ScanAllObjects(gvId=gv_id,
-                                   config=config)
-        # gv_cls: opendnp3.GroupVariation = parsing_gvid_to_gvcls(gv_id)
-        # # update stale logic to improve performance
-        # self.soe_handler.update_stale_db()
-        gv_db_val = self.soe_handler.gv_index_value_nested_dict.get(gv_cls)
-
-        # retry logic to improve performance
         retry_max = self.num_polling_retry
-        n_retry = 0
-        sleep_delay = self.delay_polling_retry  # in seconds
-        while gv_db_val is None and n_retry < retry_max:
-            self.master.ScanAllObjects(gvId=gv_id,
-                                       config=config)
-            # gv_cls: opendnp3.GroupVariation = parsing_gvid_to_gvcls(gv_id)
-            time.sleep(sleep_delay)
-            gv_db_val = self.soe_handler.gv_index_value_nested_dict.get(gv_cls)
-            if gv_db_val is None:
-                _log.debug(f"No value returned when polling {gv_cls}. "
-                           f"Starting retry No. {n_retry + 1} (of {retry_max}) after {sleep_delay} sec.")
-            n_retry += 1
-            # print("=======n_retry, gv_db_val, gv_cls", n_retry, gv_db_val, gv_cls)
-            # print("=======self.soe_handler", self.soe_handler)
-            # print("=======self.soe_handler.gv_index_value_nested_dict id", self.soe_handler.gv_index_value_nested_dict,
-            #       id(self.soe_handler.gv_index_value_nested_dict))
-            # print("======gv_db_val", gv_db_val)
-
-            if n_retry >= retry_max:
+        timeout = self.delay_polling_retry  # in seconds
+        gv_db_vals: DbStorage = {parsing_gvid_to_gvcls(gv_id): None for gv_id in gv_ids}
+        pending_gv_ids = list(gv_ids)
+        for n_retry in range(retry_max + 1):
+            # Note: the future resolves as soon as the response is processed, i.e., no fixed sleep.
+            if len(pending_gv_ids) == 1:
+                future = self.read_async(pending_gv_ids[0])
+            else:
+                future = self.read_many_async(pending_gv_ids)
+            try:
+                gv_db_vals.update(future.result(timeout=timeout))
+            except concurrent.futures.TimeoutError:
+                _log.debug(f"No response within {timeout} sec when polling {pending_gv_ids}.")
+            except RuntimeError as e:
+                _log.debug(e)
+            pending_gv_ids = [gv_id for gv_id in pending_gv_ids
+                              if gv_db_vals.get(parsing_gvid_to_gvcls(gv_id)) is None]
+            if not pending_gv_ids:
+                break
+            if n_retry < retry_max:
+                _log.debug(f"No value returned when polling {pending_gv_ids}. "
+                           f"Starting retry No. {n_retry + 1} (of {retry_max}).")
+        else:
+            for gv_id in pending_gv_ids:
+                gv_cls: opendnp3.GroupVariation = parsing_gvid_to_gvcls(gv_id)
                 _log.warning("==Retry numbers hit retry limit {}, when polling {}==".format(retry_max, gv_cls))
-                # info_gv: GroupVariation = gv_cls
-                # Note: this is method is penetrating (intuitively it should belong to SOEHandler instead)
-                # but SOEHandler is blind to retry logic at current version
-                # self.soe_handler.gv_ts_ind_val_dict[gv_cls] = (datetime.datetime.now(),
-                #                                                 self.soe_handler.gv_ts_ind_val_dict.get(gv_cls))
-
                 # Action: set polling attempt timestamp, set db value associated to gv_cls to None.
                 self.soe_handler.gv_last_poll_dict[gv_cls] = datetime.datetime.now()
-                self.soe_handler.gv_index_value_nested_dict[
-                    gv_cls] = None  # Note: redundant, but explicitly define again.
+                self.soe_handler.gv_index_value_nested_dict[gv_cls] = None
+
+        return gv_db_vals
+
+    def read_async(self, gv_id: opendnp3.GroupVariationID,
+                   config: opendnp3.TaskConfig = None) -> concurrent.futures.Future:
+        """Scan all objects of a group-variation without blocking the caller.
+
+        The returned future resolves once the scan task completes, i.e., right after the matching
+        SOEHandler.Process headers have been handled. Several reads can be in flight at the same time.
+
+        :param opendnp3.GroupVariationID gv_id: group-variation Id, e.g., GroupVariationID(30, 6)
+        :param opendnp3.TaskConfig config: only its taskId is used, the callback is provided by this method.
 
-        return {gv_cls: gv_db_val}
+        :return: future of the retrieved point values, e.g., {GroupVariation.Group30Var6: {0: 4.8, 1: 14.1}};
+            the values are None if the response did not include the group-variation.
+            The future raises RuntimeError if the scan task failed (e.g., FAILURE_NO_COMMS).
+
+        EXAMPLE:
+        >>> future = master_application.read_async(opendnp3.GroupVariationID(30, 6))
+        >>> future.result(timeout=2)
+        {GroupVariation.Group30Var6: {0: 7.8, 1: 14.1, 2: 22.2, 3: 0.0, 4: 0.0}}
+        """
+        task_id = config.taskId if config else opendnp3.TaskId.Undefined()
+        return self._scan_async(issue_scan=lambda task_config: self.master.ScanAllObjects(gvId=gv_id,
+                                                                                          config=task_config),
+                                gv_clss=[parsing_gvid_to_gvcls(gv_id)],
+                                task_id=task_id)
+
+    def read_many_async(self, gv_ids: List[opendnp3.GroupVariationID],
+                        config: opendnp3.TaskConfig = None) -> concurrent.futures.Future:
+        """Scan all objects of several group-variations in a single READ request (one round trip).
+
+        The response is demultiplexed by SOEHandler, the future resolves to one entry per group-variation.
+
+        :param gv_ids: group-variation Ids, e.g., [GroupVariationID(30, 6), GroupVariationID(1, 2)]
+        :param opendnp3.TaskConfig config: only its taskId is used, the callback is provided by this method.
+
+        :return: future of the retrieved point values, e.g.,
+            {GroupVariation.Group30Var6: {0: 4.8, 1: 14.1}, GroupVariation.Group1Var2: {0: True, 1: False}}
+        """
+        headers = [opendnp3.Header.AllObjects(gv_id.group, gv_id.variation) for gv_id in gv_ids]
+        task_id = config.taskId if config else opendnp3.TaskId.Undefined()
+        return self._scan_async(issue_scan=lambda task_config: self.master.Scan(headers=headers,
+                                                                                config=task_config),
+                                gv_clss=[parsing_gvid_to_gvcls(gv_id) for gv_id in gv_ids],
+                                task_id=task_id)
+
+    def scan_classes_async(self, field: opendnp3.ClassField = None,
+                           config: opendnp3.TaskConfig = None) -> concurrent.futures.Future:
+        """Class-based scan without blocking the caller, default to all classes (i.e., integrity poll).
+
+        :param field: classes to scan, e.g., opendnp3.ClassField(opendnp3.ClassField.CLASS_1)
+        :param opendnp3.TaskConfig config: only its taskId is used, the callback is provided by this method.
+
+        :return: future resolved (to an empty dict) once the scan task completes, the values are in soe_handler.
+            The future raises RuntimeError if the scan task failed.
+        """
+        field = field if field is not None else opendnp3.ClassField().AllClasses()
+        task_id = config.taskId if config else opendnp3.TaskId.Undefined()
+        return self._scan_async(issue_scan=lambda task_config: self.master.ScanClasses(field, task_config),
+                                gv_clss=[],
+                                task_id=task_id)
+
+    def _scan_async(self,
+                    issue_scan: Callable[[opendnp3.TaskConfig], None],
+                    gv_clss: List[opendnp3.GroupVariation],
+                    task_id: opendnp3.TaskId = None) -> concurrent.futures.Future:
+        """Issue a scan with a TaskCallback attached and resolve the returned future on task completion.
+
+        :param issue_scan: function that sends the scan request using the given TaskConfig
+        :param gv_clss: group-variations expected in the response
+        """
+        future = concurrent.futures.Future()
+        requested_at = datetime.datetime.now()
+
+        def on_complete(result: opendnp3.TaskCompletion):
+            if future.done():
+                return
+            if result != opendnp3.TaskCompletion.SUCCESS:
+                future.set_exception(RuntimeError(f"Scan of {gv_clss} failed: "
+                                                  f"{opendnp3.TaskCompletionToString(result)}"))
+                return
+            ret_val = {}
+            for gv_cls in gv_clss:
+                # only report values updated by this scan, i.e., not staled ones.
+                ts = self.soe_handler.gv_last_poll_dict.get(gv_cls)
+                if ts and ts >= requested_at:
+                    ret_val[gv_cls] = self.soe_handler.gv_index_value_nested_dict.get(gv_cls)
+                else:
+                    ret_val[gv_cls] = None
+            future.set_result(ret_val)
+
+        if self.soe_buffer is not None:
+            # Note: resolve once the response has been drained from the native buffer into soe_handler
+            resolve = on_complete
+
+            def on_complete(result: opendnp3.TaskCompletion):
+                self.soe_buffer.call_after_drain(lambda: resolve(result))
+
+        def on_destroyed(callback: TaskCallback):
+            self._task_callbacks.discard(callback)
+            # Note: a task can be dropped without OnComplete (e.g., on shutdown), do not leave the future pending
+            if not callback.completed and not future.done():
+                future.set_exception(RuntimeError(f"Scan of {gv_clss} ended without completion"))
+
+        task_callback = TaskCallback(on_complete=on_complete, on_destroyed=on_destroyed)
+        self._task_callbacks.add(task_callback)
+        if task_id is None:
+            task_id = opendnp3.TaskId.Undefined()
+        try:
+            issue_scan(opendnp3.TaskConfig(task_id, task_callback))
+        except Exception:
+            self._task_callbacks.discard(task_callback)
+            raise
+        return future
+
+    def subscribe(self, gv: Union[opendnp3.GroupVariationID, opendnp3.GroupVariation, str],
+                  callback: Callable[[Dict[int, DbPointVal]], None],
+                  indices: Optional[List[int]] = None,
+                  coalesce_ms: float = 0,
+                  changes_only: bool = False) -> Subscription:
+        """Get notified of point updates from the SOE stream (responses to scans, unsolicited responses, etc.)
+        instead of polling.
+
+        :param gv: group-variation, e.g., GroupVariationID(30, 6),
+            or point type, e.g., "Analog" to receive both static (Group30) and event (Group32) objects.
+        :param callback: invoked with a change batch, i.e., {index: value}
+        :param indices: point indices of interest, default to all
+        :param coalesce_ms: coalesce bursts of updates within a window (in milliseconds), latest value per index wins.
+            0 (default) to deliver every SOE header as is.
+        :param changes_only: skip values equal to the last delivered value of the same index
+
+        :return: Subscription, use subscription.cancel() (or unsubscribe) to stop receiving updates.
+
+        EXAMPLE:
+        >>> sub = master_application.subscribe("Analog", callback=print, indices=[0, 1], coalesce_ms=100)
+        >>> # outstation side: outstation_application.apply_update(opendnp3.Analog(7.8), 0)
+        {0: 7.8}
+        >>> master_application.unsubscribe(sub)
+        """
+        if isinstance(gv, opendnp3.GroupVariationID):
+            gv = parsing_gvid_to_gvcls(gv)
+        return self.soe_handler.subscriptions.subscribe(gv, callback, indices=indices, coalesce_ms=coalesce_ms,
+                                                        changes_only=changes_only)
+
+    def unsubscribe(self, subscription: Subscription):
+        subscription.cancel()
 
     def get_db_by_group_variation(self, group: int, variation: int) -> DbStorage:
         """Retrieve point value (from an outstation databse) based on Group-Variation pair.
@@ -445,9 +737,7 @@ class MyMasterNew:
         gv_id = opendnp3.GroupVariationID(group, variation)
         gv_cls: opendnp3.GroupVariation = parsing_gvid_to_gvcls(gv_id)
 
-        ts = self.soe_handler.gv_last_poll_dict.get(gv_cls)
-        stale_if_longer_than = self.stale_if_longer_than
-        if ts and (datetime.datetime.now() - ts).total_seconds() < stale_if_longer_than:  # Use aggressive caching
+        if self._is_fresh(gv_cls, index=index):  # Use aggressive caching
             vals: Dict[int, DbPointVal] = self.soe_handler.gv_index_value_nested_dict.get(gv_cls)
         else:  # Use normal routine
             vals: Dict[int, DbPointVal] = self.get_db_by_group_variation(group, variation).get(gv_cls)
@@ -457,6 +747,18 @@ class MyMasterNew:
         else:
             return {gv_cls: {index: None}}
 
+    def get_point_by_group_variation_index(self, group: int, variation: int, index: int) -> Optional[PointRecord]:
+        """Retrieve a point with its quality flags, outstation timestamp and receive time,
+        polling only if the point is stale (see get_db_by_group_variation_index).
+
+        EXAMPLE:
+        >>> master_application.get_point_by_group_variation_index(group=30, variation=6, index=0)
+        PointRecord(value=7.8, flags=1, time=0, received=datetime.datetime(2022, 9, 8, 22, 3, 50, 591742))
+        """
+        self.get_db_by_group_variation_index(group, variation, index)
+        gv_cls: opendnp3.GroupVariation = parsing_gvid_to_gvcls(opendnp3.GroupVariationID(group, variation))
+        return self.soe_handler.get_point(gv_cls, index)
+
     def get_val_by_group_variation_index(self, group: int, variation: int, index: int) -> DbPointVal:
         val_w_meta = self.get_db_by_group_variation_index(group, variation, index)
         gv_id = opendnp3.GroupVariationID(group, variation)
@@ -489,6 +791,30 @@ class MyMasterNew:
                                          callback=call_back,
                                          config=config)
 
+    @property
+    def command_queue(self) -> CommandQueue:
+        """Default CommandQueue of this master, created on first use (see send_point_commands)"""
+        if self._command_queue is None:
+            self._command_queue = CommandQueue(self)
+        return self._command_queue
+
+    def send_point_commands(self, points: Iterable[Tuple[int, int, int, DbPointVal]]
+                            ) -> List[concurrent.futures.Future]:
+        """Send many point commands through the command queue, i.e., packed into CommandSet requests
+        (at most maxControlsPerRequest controls each) instead of one DirectOperate per point.
+
+        :param points: (group, variation, index, val_to_set) tuples
+        :return: one future per point, resolving to a CommandResult
+
+        EXAMPLE:
+        >>> futures = master_application.send_point_commands([(40, 4, i, float(i)) for i in range(100)])
+        >>> all(future.result(timeout=10).ok for future in futures)
+        True
+        """
+        return self.command_queue.submit_many(
+            (parsing_gv_to_mastercmdtype(group=group, variation=variation, val_to_set=val_to_set), index)
+            for group, variation, index, val_to_set in points)
+
     def send_select_and_operate_point_command(self, group: int, variation: int, index: int, val_to_set: DbPointVal,
                                               call_back: Callable[[opendnp3.ICommandTaskResult], None] = None,
                                               config: opendnp3.TaskConfig = None
@@ -498,15 +824,79 @@ class MyMasterNew:
         """
         pass
 
+    def _bind_scan(self, entry: ScanEntry) -> ScheduledScan:
+        native_period = self.scan_timer is None
+        if native_period and entry.period and entry.jitter:
+            _log.warning(f"Scan {entry.name} is performed natively, its jitter is ignored (pass a scan_timer).")
+        scheduled = ScheduledScan(entry, entry.register(self.master, native_period=native_period),
+                                  issue=self._issue_scan,
+                                  channel_key=self.channel)
+        self.scans[entry.name] = scheduled
+        return scheduled
+
+    def _issue_scan(self, entry: ScanEntry) -> concurrent.futures.Future:
+        """Perform a scan of the plan as a one-shot task, i.e., the ScanTimer knows when it completes."""
+        return self._scan_async(issue_scan=lambda task_config: entry.issue(self.master, task_config), gv_clss=[])
+
+    def add_scan(self, entry: ScanEntry) -> ScheduledScan:
+        """Add a scan at runtime, e.g., add_scan(ScanEntry("range-ai", "range", period=10, gv_id=..., stop=9))
+
+        :raise ValueError: if a scan with the same name exists
+        """
+        self.scan_plan.add(entry)
+        scheduled = self._bind_scan(entry)
+        if self._is_started and self.scan_timer is not None:
+            self.scan_timer.schedule(scheduled)
+        return scheduled
+
+    def add_range_scan(self, gv_id: opendnp3.GroupVariationID, start: int, stop: int,
+                       period: Optional[float], jitter: float = 0, name: str = None) -> ScheduledScan:
+        """Add a periodic start/stop (range) scan at runtime, see ScanPlan.add_range_scan"""
+        name = name if name else f"range-{gv_id.group}-{gv_id.variation}-{start}-{stop}"
+        return self.add_scan(ScanEntry(name, "range", period, jitter, gv_id=gv_id, start=start, stop=stop))
+
+    def set_scan_period(self, name: str, period: Optional[float], jitter: float = None):
+        """Change the period (in seconds) of a scan at runtime, None/0 to make it on-demand only.
+
+        :raise KeyError: if there is no such scan
+        :raise ValueError: if the scans are performed natively, i.e., the master has no scan_timer
+        """
+        scheduled = self.scans[name]
+        if self.scan_timer is None:
+            raise ValueError(f"Cannot change the period of scan {name} performed natively, "
+                             f"create the master with a scan_timer, e.g., scan_timer=ScanTimer.shared()")
+        scheduled.entry.period = period
+        if jitter is not None:
+            scheduled.entry.jitter = jitter
+        if self._is_started:
+            self.scan_timer.schedule(scheduled)
+
+    def demand_scan(self, name: str):
+        """Perform a scan as soon as possible (IMasterScan.Demand), e.g., demand_scan("slow") for an integrity poll
+
+        :raise KeyError: if there is no such scan
+        """
+        self.scans[name].demand()
+
     def start(self):
         _log.debug('Enabling the master.')
+        if self.soe_buffer is not None:
+            self.soe_buffer.start()
         self.master.Enable()
+        if not self._is_started:
+            self._is_started = True
+            if self.scan_timer is not None:
+                for scheduled in self.scans.values():
+                    self.scan_timer.schedule(scheduled)
 
-    def shutdown(self):
+    def shutdown(self, sleep_before_master_shutdown: float = 2):
         """
         Execute an orderly shutdown of the Master.
         The debug messages may be helpful if errors occur during shutdown.
 
+        :param sleep_before_master_shutdown: delay (in seconds) before releasing the stack,
+            callers that already waited (e.g., AsyncMaster) can pass 0.
+
         Expected:
             channel state change: SHUTDOWN
             ms(1667103120775) INFO    manager - Exiting thread (0)
@@ -519,7 +909,9 @@ class MyMasterNew:
             Process hanging
         """
 
-        sleep_before_master_shutdown = 2
+        if self._is_shutdown:
+            return
+        self._is_shutdown = True
         _log.info(f"Master station shutting down in {sleep_before_master_shutdown} seconds...")
         time.sleep(sleep_before_master_shutdown)  # Note: hard-coded sleep to avoid hanging process
         # del self.master
@@ -528,11 +920,20 @@ class MyMasterNew:
         #
         # self.manager.Shutdown()
 
+        if self.scan_timer is not None:
+            self.scan_timer.cancel(*self.scans.values())
+        self.scans = {}
         del self.slow_scan
         del self.fast_scan
+        if not self._owns_channel:
+            # Note: the shared channel keeps the master session alive, stop it explicitly.
+            self.master.Shutdown()
+        del self._stats  # Note: it holds the master and the channel as well
         del self.master
         del self.channel
         del self.manager
+        if self.soe_buffer is not None:
+            self.soe_buffer.stop()
 
         # del self.slow_scan
         # del self.fast_scan
@@ -547,13 +948,14 @@ class MyMasterNew:
             pass
 
     def send_scan_all_request(self, gv_ids: List[opendnp3.GroupVariationID] = None):
-        """send requests to retrieve all point values, if gv_ids not provided then use default """
+        """send a (single, batched) request to retrieve all point values, if gv_ids not provided then use default """
         config = opendnp3.TaskConfig().Default()
         if gv_ids is None:
             gv_ids = [GroupVariationID(group=30, variation=6),
                       GroupVariationID(group=40, variation=4),
                       GroupVariationID(group=1, variation=2),
                       GroupVariationID(group=10, variation=2)]
-        for gv_id in gv_ids:
-            self.master.ScanAllObjects(gvId=gv_id,
-                                       config=config)
+        # Note: a single READ request with one object header per group-variation
+        headers = [opendnp3.Header.AllObjects(gv_id.group, gv_id.variation) for gv_id in gv_ids]
+        self.master.Scan(headers=headers,
+                         config=config)
@@ -0,0 +1,239 @@
+"""
+    Poll many outstations from one process.
+
+    MyMasterNew creates a DNP3Manager (i.e., a thread pool) and a TCP client per instance by default.
+    MasterPool shares a single DNP3Manager across all its masters, shares TCP client channels among masters
+    polling the same endpoint (told apart by link address), and performs the scan plans of all its masters
+    from a single scan_plan.ScanTimer that staggers the scans and caps the number of in-flight scans.
+
+    Note: the caps only apply to the periodic scans of the scan plans. On-demand requests (e.g., read_async,
+    demand_scan or commands) are sent right away, opendnp3 queues them with the other tasks of their master.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import sys
+import threading
+
+from pydnp3 import opendnp3, openpal, asiopal, asiodnp3
+from typing import Dict, Iterator, Optional, Tuple
+
+from .master_new import MyMasterNew
+from .scan_plan import ScanPlan, ScanTimer
+from .connection import ConnectionTracker, RetryPolicy
+from .transport import Transport
+from .stats import StatsTable
+
+stdout_stream = logging.StreamHandler(sys.stdout)
+stdout_stream.setFormatter(logging.Formatter('%(asctime)s\t%(name)s\t%(levelname)s\t%(message)s'))
+
+_log = logging.getLogger(__name__)
+_log.addHandler(stdout_stream)
+_log.setLevel(logging.INFO)
+
+StationKey = Tuple[str, int, int]  # (outstation_ip, port, outstation_id)
+
+
+class MasterPool:
+    """
+        A set of masters sharing one DNP3Manager and one ScanTimer. Masters can be added and removed at runtime.
+
+        EXAMPLE:
+        >>> pool = MasterPool(concurrency_hint=8, max_in_flight=32)
+        >>> for i, rtu_ip in enumerate(rtu_ips):
+        ...     pool.add_master(outstation_ip=rtu_ip, port=20000)
+        >>> pool.get_master(outstation_ip=rtu_ips[0], port=20000).get_db_by_group_variation(30, 6)
+        >>> pool.shutdown()
+    """
+
+    def __init__(self,
+                 concurrency_hint: Optional[int] = None,
+                 log_handler=None,
+                 channel_log_level=opendnp3.levels.NORMAL,
+                 integrity_period: float = 30 * 60,
+                 event_period: float = 60,
+                 max_in_flight: int = 64,
+                 max_in_flight_per_channel: int = 1,
+                 retry_policy: Optional[RetryPolicy] = None):
+        """
+        :param concurrency_hint: number of threads of the shared DNP3Manager, default to the number of CPUs
+        :param log_handler: openpal.ILogHandler of the shared DNP3Manager, default to asiodnp3.ConsoleLogger
+        :param channel_log_level: log filters of the TCP client channels created by the pool
+        :param integrity_period: default period (in seconds) of the all-class (integrity) scan, None to disable
+        :param event_period: default period (in seconds) of the event-class scan, None to disable
+        :param max_in_flight: cap on outstanding scheduled scans overall (scans of the masters' scan plans,
+            not on-demand reads or commands)
+        :param max_in_flight_per_channel: cap on outstanding scheduled scans per channel
+        :param retry_policy: reconnect backoff of the channels created by the pool, default to RetryPolicy(),
+            i.e., jittered so that channels dropped together do not reconnect in lockstep
+        """
+        self.concurrency_hint: int = concurrency_hint if concurrency_hint else (os.cpu_count() or 1)
+        self.log_handler = log_handler if log_handler else asiodnp3.ConsoleLogger().Create()
+        self.channel_log_level = channel_log_level
+        self.integrity_period = integrity_period
+        self.event_period = event_period
+        self.retry_policy: RetryPolicy = retry_policy if retry_policy is not None else RetryPolicy()
+
+        _log.debug(f'Creating a shared DNP3Manager with concurrency hint {self.concurrency_hint}.')
+        self.manager = asiodnp3.DNP3Manager(self.concurrency_hint, self.log_handler)
+        self.scan_timer = ScanTimer(max_in_flight=max_in_flight, max_in_flight_per_channel=max_in_flight_per_channel,
+                                    stagger=True)
+
+        self._lock = threading.RLock()
+        # (outstation_ip, port) -> (channel, listener)
+        self._channels: Dict[Tuple[str, int], Tuple[asiodnp3.IChannel, ConnectionTracker]] = {}
+        self._stations: Dict[StationKey, MyMasterNew] = {}
+        self._stats: Optional[StatsTable] = None
+
+    def _get_channel(self, outstation_ip: str, port: int, master_ip: str,
+                     transport: Optional[Transport] = None) -> asiodnp3.IChannel:
+        endpoint = (outstation_ip, port)
+        if endpoint not in self._channels and transport is not None:
+            _log.debug(f'Creating the DNP3 channel, {transport}.')
+            listener = ConnectionTracker()
+            channel = transport.create_channel(self.manager, id=f"{transport.kind.replace('_', '')}-{transport.name}",
+                                               levels=opendnp3.levels.NORMAL | opendnp3.levels.ALL_COMMS,
+                                               retry=self.retry_policy.channel_retry(),
+                                               listener=listener)
+            channel.SetLogFilters(openpal.LogFilters(self.channel_log_level))
+            self._channels[endpoint] = (channel, listener)
+        elif endpoint not in self._channels:
+            _log.debug(f'Creating the DNP3 channel, a TCP client to {outstation_ip}:{port}.')
+            listener = ConnectionTracker()
+            channel = self.manager.AddTCPClient(id=f"tcpclient-{outstation_ip}-{port}",
+                                                levels=opendnp3.levels.NORMAL | opendnp3.levels.ALL_COMMS,
+                                                retry=self.retry_policy.channel_retry(),
+                                                host=outstation_ip,
+                                                local=master_ip,
+                                                port=port,
+                                                listener=listener)
+            channel.SetLogFilters(openpal.LogFilters(self.channel_log_level))
+            self._channels[endpoint] = (channel, listener)
+        return self._channels[endpoint][0]
+
+    def add_master(self,
+                   outstation_ip: str = "127.0.0.1",
+                   port: int = 20000,
+                   outstation_id: int = 1,
+                   master_id: int = 2,
+                   master_ip: str = "0.0.0.0",
+                   start: bool = True,
+                   integrity_period: Optional[float] = None,
+                   event_period: Optional[float] = None,
+                   transport: Optional[Transport] = None,
+                   scan_plan: Optional[ScanPlan] = None,
+                   **kwargs) -> MyMasterNew:
+        """Add a master polling outstation_id at outstation_ip:port, on the (possibly existing) channel.
+
+        :param start: enable the master right away
+        :param integrity_period: period (in seconds) of the all-class scan, default to the pool's, 0 to disable
+        :param event_period: period (in seconds) of the event-class scan, default to the pool's, 0 to disable
+        :param scan_plan: scans of the master, instead of the integrity and event scans above,
+            performed by the pool's ScanTimer (i.e., within the max_in_flight caps)
+        :param transport: channel other than a TCP client, e.g., transport.SerialTransport, shared by the masters
+            of the same transport.endpoint, which replaces (outstation_ip, port) in the keys of the pool
+        Other arguments are passed to MyMasterNew.
+
+        :raise ValueError: if a master of the same outstation already exists
+        """
+        if transport is not None:
+            outstation_ip, port = transport.endpoint
+        key: StationKey = (outstation_ip, port, outstation_id)
+        if scan_plan is None:
+            integrity_period = self.integrity_period if integrity_period is None else integrity_period
+            event_period = self.event_period if event_period is None else event_period
+            scan_plan = ScanPlan()
+            if integrity_period:
+                scan_plan.add_class_scan([0, 1, 2, 3], period=integrity_period, name="integrity")
+            if event_period:
+                scan_plan.add_class_scan([1, 2, 3], period=event_period, name="event")
+        with self._lock:
+            if key in self._stations:
+                raise ValueError(f"Master of outstation {outstation_id} on {outstation_ip}:{port} already exists")
+            try:
+                station = MyMasterNew(master_ip=master_ip,
+                                      outstation_ip=outstation_ip,
+                                      port=port,
+                                      master_id=master_id,
+                                      outstation_id=outstation_id,
+                                      manager=self.manager,
+                                      channel=self._get_channel(outstation_ip, port, master_ip, transport),
+                                      listener=self._channels[(outstation_ip, port)][1],
+                                      scan_plan=scan_plan,
+                                      scan_timer=self.scan_timer,
+                                      **kwargs)
+            except Exception:
+                # Note: do not leave a channel (i.e., a reconnecting TCP client) that no master uses
+                self._release_channel(outstation_ip, port)
+                raise
+            self._stations[key] = station
+        if start:
+            station.start()
+        return station
+
+    def remove_master(self, outstation_ip: str, port: int = 20000, outstation_id: int = 1):
+        """Cancel the scans of a master and shut it down, its channel is shut down as well once unused.
+
+        :raise KeyError: if there is no such master
+        """
+        with self._lock:
+            station = self._stations.pop((outstation_ip, port, outstation_id))
+            station.shutdown(sleep_before_master_shutdown=0)  # cancels its scans
+            self._release_channel(outstation_ip, port)
+
+    def _release_channel(self, outstation_ip: str, port: int):
+        """Shut down the channel to outstation_ip:port if it exists and no master uses it."""
+        endpoint = (outstation_ip, port)
+        with self._lock:
+            if endpoint in self._channels and not any(key[:2] == endpoint for key in self._stations):
+                channel, _ = self._channels.pop(endpoint)
+                channel.Shutdown()
+
+    def get_master(self, outstation_ip: str, port: int = 20000, outstation_id: int = 1) -> Optional[MyMasterNew]:
+        return self._stations.get((outstation_ip, port, outstation_id))
+
+    def channel_state(self, outstation_ip: str, port: int = 20000) -> Optional[opendnp3.ChannelState]:
+        """Latest state reported by the channel to outstation_ip:port, None if there is no such channel."""
+        entry = self._channels.get((outstation_ip, port))
+        return entry[1].state if entry else None
+
+    def stats(self, max_age: float = 0) -> StatsTable:
+        """Channel and stack counters of all the masters, one row per station key, read in a single native call.
+
+        :param max_age: in seconds, reuse the previous table if not older (and no station was added or removed,
+            and no channel changed state since), 0 to always read fresh counters
+        """
+        with self._lock:
+            keys = list(self._stations)
+            table = self._stats
+            if table is None or not table.is_fresh(max_age, keys, [entry[1] for entry in self._channels.values()]):
+                stations = [self._stations[key] for key in keys]
+                table = self._stats = StatsTable.collect(keys, [station.channel for station in stations],
+                                                         [station.master for station in stations])
+            return table
+
+    def start_all(self):
+        for station in list(self._stations.values()):
+            station.start()
+
+    def shutdown(self):
+        """Stop the scan timer, shut down all the masters and channels.
+
+        Note: the shared manager is released with `del` rather than Shutdown(), see MyMasterNew.shutdown
+        """
+        self.scan_timer.stop()
+        with self._lock:
+            for key in list(self._stations):
+                self.remove_master(outstation_ip=key[0], port=key[1], outstation_id=key[2])
+            if hasattr(self, "manager"):
+                del self.manager
+
+    def __len__(self):
+        return len(self._stations)
+
+    def __iter__(self) -> Iterator[MyMasterNew]:
+        return iter(list(self._stations.values()))
+
+    def __contains__(self, key: StationKey):
+        return key in self._stations
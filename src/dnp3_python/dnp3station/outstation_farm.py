@@ -0,0 +1,201 @@
+"""
+    Serve many outstations from one process.
+
+    MyOutStationNew creates a DNP3Manager (i.e., a thread pool) and a TCP server per instance by default.
+    OutstationFarm shares a single DNP3Manager across all its outstations, and a single TCP server channel
+    across the outstations listening on the same endpoint (told apart by link address, i.e., outstation_id).
+"""
+from __future__ import annotations
+
+import logging
+import os
+import sys
+import threading
+
+from pydnp3 import opendnp3, openpal, asiopal, asiodnp3
+from typing import Dict, Iterator, Optional, Tuple
+
+from .outstation_new import MyOutStationNew
+from .connection import ConnectionTracker, RetryPolicy
+from .transport import Transport
+from .stats import StatsTable
+
+stdout_stream = logging.StreamHandler(sys.stdout)
+stdout_stream.setFormatter(logging.Formatter('%(asctime)s\t%(name)s\t%(levelname)s\t%(message)s'))
+
+_log = logging.getLogger(__name__)
+_log.addHandler(stdout_stream)
+_log.setLevel(logging.INFO)
+
+StationKey = Tuple[str, int, int]  # (outstation_ip, port, outstation_id)
+
+
+class OutstationFarm:
+    """
+        A set of outstations sharing one DNP3Manager. Outstations can be added and removed at runtime.
+
+        EXAMPLE:
+        >>> farm = OutstationFarm(concurrency_hint=4)
+        >>> for port in range(20000, 20100):
+        ...     farm.add_outstation(port=port)  # one TCP server per port
+        >>> farm.add_outstation(port=20000, outstation_id=11)  # shares the TCP server on port 20000
+        >>> farm.get_outstation(port=20000, outstation_id=11).apply_update(opendnp3.Analog(4.8), 0)
+        >>> farm.remove_outstation(port=20000, outstation_id=11)
+        >>> farm.shutdown()
+    """
+
+    def __init__(self,
+                 concurrency_hint: Optional[int] = None,
+                 log_handler=None,
+                 channel_log_level=opendnp3.levels.NORMAL,
+                 retry_policy: Optional[RetryPolicy] = None):
+        """
+        :param concurrency_hint: number of threads of the shared DNP3Manager, default to the number of CPUs
+        :param log_handler: openpal.ILogHandler of the shared DNP3Manager, default to asiodnp3.ConsoleLogger
+        :param channel_log_level: log filters of the TCP server channels created by the farm
+        :param retry_policy: reopen backoff of the channels created by the farm, default to RetryPolicy()
+        """
+        self.concurrency_hint: int = concurrency_hint if concurrency_hint else (os.cpu_count() or 1)
+        self.log_handler = log_handler if log_handler else asiodnp3.ConsoleLogger().Create()
+        self.channel_log_level = channel_log_level
+        self.retry_policy: RetryPolicy = retry_policy if retry_policy is not None else RetryPolicy()
+
+        _log.debug(f'Creating a shared DNP3Manager with concurrency hint {self.concurrency_hint}.')
+        self.manager = asiodnp3.DNP3Manager(self.concurrency_hint, self.log_handler)
+
+        self._lock = threading.RLock()
+        # (outstation_ip, port) -> (channel, listener)
+        self._channels: Dict[Tuple[str, int], Tuple[asiodnp3.IChannel, ConnectionTracker]] = {}
+        self._stations: Dict[StationKey, MyOutStationNew] = {}
+        self._stats: Optional[StatsTable] = None
+
+    def _get_channel(self, outstation_ip: str, port: int, transport: Optional[Transport] = None) -> asiodnp3.IChannel:
+        endpoint = (outstation_ip, port)
+        if endpoint not in self._channels and transport is not None:
+            _log.debug(f'Creating the DNP3 channel, {transport}.')
+            listener = ConnectionTracker()
+            channel = transport.create_channel(self.manager, id=f"{transport.kind.replace('_', '')}-{transport.name}",
+                                               levels=opendnp3.levels.NORMAL | opendnp3.levels.ALL_COMMS,
+                                               retry=self.retry_policy.channel_retry(),
+                                               listener=listener)
+            channel.SetLogFilters(openpal.LogFilters(self.channel_log_level))
+            self._channels[endpoint] = (channel, listener)
+        elif endpoint not in self._channels:
+            _log.debug(f'Creating the DNP3 channel, a TCP server on {outstation_ip}:{port}.')
+            listener = ConnectionTracker()
+            channel = self.manager.AddTCPServer(id=f"server-{outstation_ip}-{port}",
+                                                levels=opendnp3.levels.NORMAL | opendnp3.levels.ALL_COMMS,
+                                                retry=self.retry_policy.channel_retry(),
+                                                endpoint=outstation_ip,
+                                                port=port,
+                                                listener=listener)
+            channel.SetLogFilters(openpal.LogFilters(self.channel_log_level))
+            self._channels[endpoint] = (channel, listener)
+        return self._channels[endpoint][0]
+
+    def add_outstation(self,
+                       outstation_ip: str = "0.0.0.0",
+                       port: int = 20000,
+                       outstation_id: int = 1,
+                       master_id: int = 2,
+                       start: bool = True,
+                       transport: Optional[Transport] = None,
+                       **kwargs) -> MyOutStationNew:
+        """Add an outstation on the (possibly existing) TCP server channel of outstation_ip:port.
+
+        :param start: enable the outstation right away
+        :param transport: channel other than a TCP server, e.g., transport.SerialTransport, shared by the
+            outstations of the same transport.endpoint, which replaces (outstation_ip, port) in the keys of the farm
+        Other arguments are passed to MyOutStationNew.
+
+        :raise ValueError: if an outstation with the same endpoint and link address already exists
+        """
+        if transport is not None:
+            outstation_ip, port = transport.endpoint
+        key: StationKey = (outstation_ip, port, outstation_id)
+        with self._lock:
+            if key in self._stations:
+                raise ValueError(f"Outstation {outstation_id} on {outstation_ip}:{port} already exists")
+            try:
+                station = MyOutStationNew(outstation_ip=outstation_ip,
+                                          port=port,
+                                          master_id=master_id,
+                                          outstation_id=outstation_id,
+                                          manager=self.manager,
+                                          channel=self._get_channel(outstation_ip, port, transport),
+                                          listener=self._channels[(outstation_ip, port)][1],
+                                          **kwargs)
+            except Exception:
+                # Note: do not leave a channel (i.e., a listening TCP server) that no outstation uses
+                self._release_channel(outstation_ip, port)
+                raise
+            self._stations[key] = station
+        if start:
+            station.start()
+        return station
+
+    def remove_outstation(self, port: int, outstation_id: int = 1, outstation_ip: str = "0.0.0.0"):
+        """Shut down an outstation, its TCP server channel is shut down as well once no outstation uses it.
+
+        :raise KeyError: if there is no such outstation
+        """
+        with self._lock:
+            station = self._stations.pop((outstation_ip, port, outstation_id))
+            station.shutdown(sleep_before_shutdown=0)
+            self._release_channel(outstation_ip, port)
+
+    def _release_channel(self, outstation_ip: str, port: int):
+        """Shut down the channel of outstation_ip:port if it exists and no outstation uses it."""
+        endpoint = (outstation_ip, port)
+        with self._lock:
+            if endpoint in self._channels and not any(key[:2] == endpoint for key in self._stations):
+                channel, _ = self._channels.pop(endpoint)
+                channel.Shutdown()
+
+    def get_outstation(self, port: int, outstation_id: int = 1,
+                       outstation_ip: str = "0.0.0.0") -> Optional[MyOutStationNew]:
+        return self._stations.get((outstation_ip, port, outstation_id))
+
+    def channel_state(self, port: int, outstation_ip: str = "0.0.0.0") -> Optional[opendnp3.ChannelState]:
+        """Latest state reported by the TCP server channel of outstation_ip:port, None if there is no such channel."""
+        entry = self._channels.get((outstation_ip, port))
+        return entry[1].state if entry else None
+
+    def stats(self, max_age: float = 0) -> StatsTable:
+        """Channel and stack counters of all the outstations, one row per station key, read in a single native call.
+
+        :param max_age: in seconds, reuse the previous table if not older (and no station was added or removed,
+            and no channel changed state since), 0 to always read fresh counters
+        """
+        with self._lock:
+            keys = list(self._stations)
+            table = self._stats
+            if table is None or not table.is_fresh(max_age, keys, [entry[1] for entry in self._channels.values()]):
+                stations = [self._stations[key] for key in keys]
+                table = self._stats = StatsTable.collect(keys, [station.channel for station in stations],
+                                                         [station.outstation for station in stations])
+            return table
+
+    def start_all(self):
+        for station in list(self._stations.values()):
+            station.start()
+
+    def shutdown(self):
+        """Shut down all the outstations and channels.
+
+        Note: the shared manager is released with `del` rather than Shutdown(), see MyOutStationNew.shutdown
+        """
+        with self._lock:
+            for key in list(self._stations):
+                self.remove_outstation(port=key[1], outstation_id=key[2], outstation_ip=key[0])
+            if hasattr(self, "manager"):
+                del self.manager
+
+    def __len__(self):
+        return len(self._stations)
+
+    def __iter__(self) -> Iterator[MyOutStationNew]:
+        return iter(list(self._stations.values()))
+
+    def __contains__(self, key: StationKey):
+        return key in self._stations
@@ -7,12 +7,24 @@ import pydnp3.asiopal
 from pydnp3 import opendnp3, openpal, asiopal, asiodnp3
 import time
 
-from typing import Union, Type, Dict
+from typing import Union, Type, Dict, Iterable, List, Optional, Tuple
 
-from .station_utils import master_to_outstation_command_parser
+from .station_utils import master_to_outstation_command_parser, master_to_outstation_command_arrays
 from .station_utils import OutstationCmdType, MasterCmdType
 # from .outstation_utils import MeasurementType
 from .station_utils import DBHandler
+from .point_schema import PointSchema, event_buffer_config
+from .point_store import POINT_TYPES
+from .change_filter import ChangeFilter
+from .log_buffer import BufferedLogConsumer
+from .transport import Transport
+from .connection import ConnectionTracker, RetryPolicy
+from .stats import StatsCache, StatsSnapshot
+
+try:
+    import numpy as np
+except ImportError:  # optional dependency
+    np = None
 
 LOG_LEVELS = opendnp3.levels.NORMAL | opendnp3.levels.ALL_COMMS
 LOCAL_IP = "0.0.0.0"
@@ -28,6 +40,17 @@ _log.setLevel(logging.DEBUG)
 # _log.setLevel(logging.ERROR)
 _log.setLevel(logging.INFO)
 
+# point type -> asiodnp3.UpdateBuilder array method, see MyOutStationNew.apply_updates
+ARRAY_UPDATE_METHODS = {
+    "Binary": "UpdateBinaryArray",
+    "DoubleBitBinary": "UpdateDoubleBitBinaryArray",
+    "Analog": "UpdateAnalogArray",
+    "Counter": "UpdateCounterArray",
+    "FrozenCounter": "UpdateFrozenCounterArray",
+    "BinaryOutputStatus": "UpdateBinaryOutputStatusArray",
+    "AnalogOutputStatus": "UpdateAnalogOutputStatusArray",
+}
+
 # alias
 PointValueType = Union[opendnp3.Analog, opendnp3.Binary, opendnp3.AnalogOutputStatus, opendnp3.BinaryOutputStatus]
 
@@ -73,7 +96,46 @@ class MyOutStationNew(opendnp3.IOutstationApplication):
 
                  channel_log_level=opendnp3.levels.NORMAL,
                  outstation_log_level=opendnp3.levels.NORMAL,
+
+                 listener: asiodnp3.IChannelListener = None,
+
+                 manager: asiodnp3.DNP3Manager = None,
+                 channel: asiodnp3.IChannel = None,
+
+                 batch_commands: bool = False,
+                 point_schema: PointSchema = None,
+                 event_buffers: Union[int, Dict[str, int], opendnp3.EventBufferConfig] = None,
+                 change_filter: Union[bool, ChangeFilter] = None,
+                 log_handler: Union[openpal.ILogHandler, BufferedLogConsumer] = None,
+                 transport: Transport = None,
+                 retry_policy: RetryPolicy = None,
                  ):
+        """
+        :param manager: optional shared DNP3Manager (e.g., from OutstationFarm), default to a dedicated one
+        :param channel: optional shared TCP server channel, several outstations can share a channel
+            as long as their link addresses (outstation_id) differ. The channel is not shut down with the outstation.
+        :param batch_commands: record all the commands of a request in a single update (at ICommandHandler.End)
+            instead of one update per command, see MyOutstationCommandHandler
+        :param point_schema: database sizes and point configuration (classes, variations, deadbands),
+            applied in bulk, see dnp3station.point_schema. Default to 10 points of each type (configure_database).
+        :param event_buffers: number of events buffered until the master reads them, for every point type
+            or per point type, e.g., {"Analog": 1000, "Binary": 100}, see point_schema.event_buffer_config.
+            Default to 10 of each type. Note: events beyond it are lost and the master has to do an integrity poll,
+            use MyMasterNew(event_telemetry=True) to measure the bursts.
+        :param change_filter: skip updates equal to (or within the deadband of) the last applied value,
+            see change_filter.ChangeFilter. True for report-on-change with the deadbands of point_schema, if any.
+            Requires numpy.
+        :param log_handler: handler of the opendnp3 log entries of a dedicated manager, default to
+            asiodnp3.ConsoleLogger, or a log_buffer.BufferedLogConsumer (started here, not stopped by shutdown
+            since it may be shared)
+        :param transport: channel to open instead of a TCP server on outstation_ip:port, e.g.,
+            transport.SerialTransport or transport.TLSServerTransport
+        :param retry_policy: reopen backoff of the channel, default to connection.RetryPolicy(), i.e.,
+            exponential backoff from 1 second to 1 minute with jitter
+        :param listener: channel listener, wrapped into a connection.ConnectionTracker (self.connection) that
+            tracks the connection state, unless it is one already. With a shared channel, pass the
+            ConnectionTracker of that channel (e.g., OutstationFarm does) to track its state.
+        """
         super().__init__()
 
         # Note:
@@ -90,6 +152,12 @@ class MyOutStationNew(opendnp3.IOutstationApplication):
 
         self.master_id: int = master_id
         self.outstation_id: int = outstation_id
+        self.point_schema: PointSchema = point_schema
+        if event_buffers is None:
+            event_buffers = 10
+        if not isinstance(event_buffers, opendnp3.EventBufferConfig):
+            event_buffers = event_buffer_config(event_buffers)
+        self.event_buffers: opendnp3.EventBufferConfig = event_buffers
 
         _log.debug('Configuring the DNP3 stack.')
         _log.debug('Configuring the outstation database.')
@@ -99,49 +167,88 @@ class MyOutStationNew(opendnp3.IOutstationApplication):
         #  but needs to add docstring. Search for "intriguing" in "data_retrieval_demo.py"
         # Note: dbconfig signature at cpp/libs/include/asiodnp3/DatabaseConfig.h
         # which has sizes parameter
-        self.configure_database(self.stack_config.dbConfig)  # TODO: refactor it to outside of the class.
+        if self.point_schema is not None:
+            self.point_schema.apply(self.stack_config.dbConfig)
+        else:
+            self.configure_database(self.stack_config.dbConfig)  # TODO: refactor it to outside of the class.
 
         # self.log_handler = MyLogger()
-        self.log_handler = asiodnp3.ConsoleLogger().Create()  # (or use this during regression testing)
+        self.log_buffer: Optional[BufferedLogConsumer] = None
+        if isinstance(log_handler, BufferedLogConsumer):
+            self.log_buffer = log_handler
+            self.log_buffer.start()
+            log_handler = self.log_buffer.native
+        if log_handler is None:
+            log_handler = asiodnp3.ConsoleLogger().Create()  # (or use this during regression testing)
+        self.log_handler = log_handler
         # self.manager = asiodnp3.DNP3Manager(threads_to_allocate, self.log_handler)
         # print("====outstation self.log_handler = log_handler", self.log_handler)
 
         # init steps: DNP3Manager(manager) -> TCPClient(channel) -> Master(master)
         # init DNP3Manager(manager)
-        _log.debug('Creating a DNP3Manager.')
-        self.manager = asiodnp3.DNP3Manager(concurrency_hint, self.log_handler)  # TODO: play with concurrencyHint
+        # Note: a shared manager (and its thread pool) can serve many outstations, see OutstationFarm
+        if manager is None and channel is None:
+            _log.debug('Creating a DNP3Manager.')
+            manager = asiodnp3.DNP3Manager(concurrency_hint, self.log_handler)  # TODO: play with concurrencyHint
+        self.manager = manager
 
         # init TCPClient(channel)
-        _log.debug('Creating the DNP3 channel, a TCP server.')
-        self.retry_parameters = asiopal.ChannelRetry().Default()
-        self.listener = AppChannelListener()
+        self.retry_policy: RetryPolicy = retry_policy if retry_policy is not None else RetryPolicy()
+        self.retry_parameters = self.retry_policy.channel_retry()
+        self.connection: Optional[ConnectionTracker] = None
+        if isinstance(listener, ConnectionTracker):
+            self.connection = listener
+        elif channel is None:
+            self.connection = ConnectionTracker(inner=listener)
+            listener = self.connection
+        self.listener = listener if listener else AppChannelListener()
         # self.listener = asiodnp3.PrintingChannelListener().Create()       # (or use this during regression testing)
-        level = opendnp3.levels.NORMAL | opendnp3.levels.ALL_COMMS  # seems not working
-        self.channel = self.manager.AddTCPServer(id="server",
-                                                 levels=level,
-                                                 retry=self.retry_parameters,
-                                                 endpoint=outstation_ip,
-                                                 port=port,
-                                                 listener=self.listener)
+        self._owns_channel: bool = channel is None
+        self.transport: Optional[Transport] = transport
+        if self._owns_channel and transport is not None:
+            _log.debug(f'Creating the DNP3 channel, {transport}.')
+            channel = transport.create_channel(self.manager, id=transport.kind.replace("_", ""),
+                                               levels=opendnp3.levels.NORMAL | opendnp3.levels.ALL_COMMS,
+                                               retry=self.retry_parameters,
+                                               listener=self.listener)
+        elif self._owns_channel:
+            _log.debug('Creating the DNP3 channel, a TCP server.')
+            level = opendnp3.levels.NORMAL | opendnp3.levels.ALL_COMMS  # seems not working
+            channel = self.manager.AddTCPServer(id="server",
+                                                levels=level,
+                                                retry=self.retry_parameters,
+                                                endpoint=outstation_ip,
+                                                port=port,
+                                                listener=self.listener)
+        self.channel = channel
 
         _log.debug('Adding the outstation to the channel.')
-        self.outstation_app_id = outstation_ip + "-" + str(port)
+        self.outstation_app_id = transport.name if transport is not None else outstation_ip + "-" + str(port)
+        if not self._owns_channel:
+            # Note: outstations sharing a channel are told apart by link address
+            self.outstation_app_id += "-" + str(outstation_id)
         # self.command_handler = OutstationCommandHandler()
         self.command_handler = MyOutstationCommandHandler()
         # Note: use post init to link outstation application and OutstationCommandHandler instance(object)
-        self.command_handler.post_init(outstation_id=self.outstation_app_id)
+        self.command_handler.post_init(outstation_id=self.outstation_app_id,
+                                       outstation_app=self,
+                                       batch_commands=batch_commands)
         # self.command_handler =  opendnp3.SuccessCommandHandler().Create() # (or use this during regression testing)
-        # init outstation applicatioin, # Note: singleton for AddOutstation()
+        # init outstation applicatioin
         MyOutStationNew.set_outstation_application(outstation_application=self)
 
         # finally, init outstation
+        # Note: each outstation is its own application (instead of the class-level singleton),
+        # so that several outstations can live in the same process.
         self.outstation = self.channel.AddOutstation(id="outstation-" + self.outstation_app_id,
                                                      commandHandler=self.command_handler,
-                                                     application=MyOutStationNew.outstation_application,
+                                                     application=self,
                                                      config=self.stack_config)
+        self._stats = StatsCache(self.channel, self.outstation, connection=self.connection)
 
         MyOutStationNew.add_outstation_app(outstation_id=self.outstation_app_id,
-                                           outstation_app=self.outstation_application)
+                                           outstation_app=self)
+        self._is_shutdown = False
 
         # Configure log level for channel(tcpclient) and outstation
         # note: one of the following
@@ -163,7 +270,14 @@ class MyOutStationNew(opendnp3.IOutstationApplication):
         # Put the Outstation singleton in OutstationApplication so that it can be used to send updates to the Master.
         # MyOutStationNew.set_outstation(self.outstation)  # Note: this needs to be self.outstation (not cls.outstation)
         #
-        self.db_handler = DBHandler(stack_config=self.stack_config)
+        if change_filter is True:
+            change_filter = ChangeFilter.from_sizes(self.stack_config.dbConfig.sizes)
+            for point_range in self.point_schema.ranges if self.point_schema is not None else []:
+                if point_range.deadband:
+                    change_filter.set_deadband(point_range.point_type,
+                                               indices=range(point_range.start, point_range.stop + 1),
+                                               absolute=point_range.deadband)
+        self.db_handler = DBHandler(stack_config=self.stack_config, change_filter=change_filter or None)
         # MyOutStationNew.set_db_handler(self.db_handler)
 
         # configuration info
@@ -186,23 +300,39 @@ class MyOutStationNew(opendnp3.IOutstationApplication):
         numOpen - numClose == 1 => SUCCESS
         numOpen - numClose == 0 => FAIL
         """
+        statistics = self.channel.GetStatistics().channel
         return {
-            "numOpen": self.channel.GetStatistics().channel.numOpen,
-            "numOpenFail": self.channel.GetStatistics().channel.numOpenFail,
-            "numClose": self.channel.GetStatistics().channel.numClose}
+            "numOpen": statistics.numOpen,
+            "numOpenFail": statistics.numOpenFail,
+            "numClose": statistics.numClose}
 
     @property
     def is_connected(self):
         """
+        Connection state of the channel as last reported by IChannelListener.OnStateChange (see self.connection),
+        or from the channel statistics if the channel is not tracked.
+
         Note: when there is 1-to-1 mapping from channel to station, then
         numOpen - numClose == 1 => SUCCESS
         numOpen - numClose == 0 => FAIL
         """
-        if self.channel_statistic.get("numOpen") - self.channel_statistic.get("numClose") == 1:
+        if self.connection is not None:
+            return self.connection.is_connected
+        channel_statistic = self.channel_statistic
+        if channel_statistic.get("numOpen") - channel_statistic.get("numClose") == 1:
             return True
         else:
             return False
 
+    def stats(self, max_age: float = 0) -> StatsSnapshot:
+        """
+        Channel and stack counters (e.g., numBytesRx, numTransportRx, numUnknownDestination) in one call.
+
+        :param max_age: in seconds, reuse the previous snapshot if not older (and the connection state did not
+            change since), 0 to always read fresh counters
+        """
+        return self._stats.get(max_age)
+
     def get_config(self):
         """print out the configuration
         example"""
@@ -233,20 +363,13 @@ class MyOutStationNew(opendnp3.IOutstationApplication):
 
     def configure_stack(self):
         """Set up the OpenDNP3 configuration."""
-        stack_config = asiodnp3.OutstationStackConfig(opendnp3.DatabaseSizes.AllTypes(10))
-        # stack_config = asiodnp3.OutstationStackConfig(opendnp3.DatabaseSizes.Empty())
-        # stack_config = asiodnp3.OutstationStackConfig(dbSizes=opendnp3.DatabaseSizes.AnalogOnly(8))
-        # TODO: expose DatabaseSizes to public interface
-        # stack_config = asiodnp3.OutstationStackConfig(dbSizes=opendnp3.DatabaseSizes(numBinary=10,
-        #                                                                              numDoubleBinary=0,
-        #                                                                              numAnalog=10,
-        #                                                                              numCounter=0,
-        #                                                                              numFrozenCounter=0,
-        #                                                                              numBinaryOutputStatus=10,
-        #                                                                              numAnalogOutputStatus=10,
-        #                                                                              numTimeAndInterval=0))
-
-        stack_config.outstation.eventBufferConfig = opendnp3.EventBufferConfig().AllTypes(10)
+        if self.point_schema is not None:
+            db_sizes = self.point_schema.sizes()
+        else:
+            db_sizes = opendnp3.DatabaseSizes.AllTypes(10)
+        stack_config = asiodnp3.OutstationStackConfig(db_sizes)
+
+        stack_config.outstation.eventBufferConfig = self.event_buffers
         stack_config.outstation.params.allowUnsolicited = True  # TODO: create interface for this
         stack_config.link.LocalAddr = self.outstation_id  # meaning for outstation, use 1 to follow simulator's default
         stack_config.link.RemoteAddr = self.master_id  # meaning for master station, use 2 to follow simulator's default
@@ -300,11 +423,14 @@ class MyOutStationNew(opendnp3.IOutstationApplication):
         _log.debug('Enabling the outstation.')
         self.outstation.Enable()
 
-    def shutdown(self):
+    def shutdown(self, sleep_before_shutdown: float = 2):
         """
         Execute an orderly shutdown of the Outstation.
         The debug messages may be helpful if errors occur during shutdown.
 
+        :param sleep_before_shutdown: delay (in seconds) before shutting down the stack,
+            callers that already waited (e.g., AsyncOutstation) can pass 0.
+
         Expected:
             ms(1667102887814) INFO    server - Operation aborted.
             ms(1667102887821) INFO    manager - Exiting thread (0)
@@ -313,12 +439,17 @@ class MyOutStationNew(opendnp3.IOutstationApplication):
             Note: Don't use `self.manager.Shutdown()`, otherwise
             Process finished with exit code 134 (interrupted by signal 6: SIGABRT)
         """
-        time.sleep(2)  # Note: hard-coded sleep to avoid hanging process
+        if self._is_shutdown:
+            return
+        self._is_shutdown = True
+        time.sleep(sleep_before_shutdown)  # Note: sleep to avoid hanging process
         # _outstation = self.get_outstation()
         _outstation = self.outstation
         _outstation.Shutdown()
         # del _outstation
-        self.channel.Shutdown()
+        MyOutStationNew.outstation_application_pool.pop(self.outstation_app_id, None)
+        if self._owns_channel:
+            self.channel.Shutdown()
 
     def process_point_value(self, command_type, command, index, op_type):
         """
@@ -342,12 +473,27 @@ class MyOutStationNew(opendnp3.IOutstationApplication):
         outstation_cmd = master_to_outstation_command_parser(command)
         # then reuse apply_update
         # cls.apply_update(outstation_cmd, index)
-        self.apply_update(outstation_cmd, index)
+        # Note: bypass the change filter, e.g., an Operate within the deadband still updates the output status
+        self.apply_update(outstation_cmd, index, filtered=False)
+
+    def process_point_values(self, command_type, commands: Iterable[Tuple[MasterCmdType, int]], op_type=None):
+        """
+            Batch counterpart of process_point_value: all the (command, index) pairs received from the Master
+            (e.g., the headers of one request) are recorded in a single UpdateBuilder transaction.
+
+        :param command_type: (string) Either 'Select' or 'Operate'.
+        :param commands: (command, index) pairs, see process_point_value
+        :param op_type: An OperateType, or None if command_type == 'Select'.
+        """
+        commands = list(commands)
+        _log.debug('Processing %d received point values', len(commands))
+        self.apply_updates(arrays=master_to_outstation_command_arrays(commands), filtered=False)
 
     # @classmethod
     def apply_update(self,
                      measurement: OutstationCmdType,
-                     index):
+                     index,
+                     filtered: bool = True):
         """
             Record an opendnp3 data value (Analog, Binary, etc.) in the outstation's database.
             Note: measurement based on asiodnp3.UpdateBuilder.Update(**args)
@@ -356,11 +502,16 @@ class MyOutStationNew(opendnp3.IOutstationApplication):
 
         :param measurement: An instance of Analog, Binary, or another opendnp3 data value.
         :param index: (integer) Index of the data definition in the opendnp3 database.
+        :param filtered: skip the value if rejected by the change filter (if any),
+            False to apply it anyway (it still becomes the filter's last applied value)
         """
-        _log.debug('Recording {} measurement, index={}, '
-                   'value={}, flag={}, time={}'
-                   .format(type(measurement), index, measurement.value, measurement.flags.value,
-                           measurement.time.value))
+        if not self.db_handler.is_changed(measurement, index, force=not filtered):
+            return
+        if _log.isEnabledFor(logging.DEBUG):
+            _log.debug('Recording {} measurement, index={}, '
+                       'value={}, flag={}, time={}'
+                       .format(type(measurement), index, measurement.value, measurement.flags.value,
+                               measurement.time.value))
         # builder = asiodnp3.UpdateBuilder()
         # builder.Update(measurement, index)
         # update = builder.Build()
@@ -371,6 +522,67 @@ class MyOutStationNew(opendnp3.IOutstationApplication):
         # cls.db_handler.process(measurement, index)
         self.db_handler.process(measurement, index)
 
+    def apply_updates(self,
+                      updates: Iterable[Tuple[OutstationCmdType, int]] = (),
+                      arrays: Dict[str, tuple] = None,
+                      mode: opendnp3.EventMode = opendnp3.EventMode.Detect,
+                      filtered: bool = True):
+        """
+            Bulk counterpart of apply_update: record many data values with a single UpdateBuilder,
+            i.e., one outstation.Apply (one database transaction) instead of one per point.
+
+        :param updates: (measurement, index) pairs, e.g., [(opendnp3.Analog(4.8), 0), (opendnp3.Binary(True), 1)]
+        :param arrays: point type -> (indices, values) or (indices, values, flags), e.g., numpy arrays,
+            see ARRAY_UPDATE_METHODS for the supported point types.
+        :param mode: opendnp3.EventMode applied to all the points.
+            Note: except with EventMode.Force, values rejected by the change filter (if any) are skipped.
+        :param filtered: False to apply the values rejected by the change filter as well, see apply_update
+        :raise ValueError: if a point type is not supported, or an index, value or flag of arrays is out of range
+            (nothing is applied)
+
+        EXAMPLE:
+        >>> outstation_application.apply_updates(arrays={"Analog": (np.arange(5000), np.random.rand(5000))})
+        >>> outstation_application.apply_updates([(opendnp3.Analog(4.8), 0), (opendnp3.Analog(14.1), 1)])
+        """
+        builder = asiodnp3.UpdateBuilder()
+        num_points = 0
+        # Note: recorded in db_handler once the builder accepted every point, i.e., not on a ValueError
+        processed: List[Tuple[OutstationCmdType, int]] = []
+        processed_arrays: List[tuple] = []
+        # Note: forced values go through the change filter as well, to be recorded as the last applied values
+        has_filter = self.db_handler.change_filter is not None
+        force = not filtered or mode == opendnp3.EventMode.Force
+        for measurement, index in updates:
+            if has_filter and not self.db_handler.is_changed(measurement, index, force=force):
+                continue
+            builder.Update(measurement, index, mode)
+            processed.append((measurement, index))
+            num_points += 1
+        for point_type in (arrays or {}):
+            if point_type not in ARRAY_UPDATE_METHODS:
+                raise ValueError(f"Unsupported point type {point_type}, use one of {list(ARRAY_UPDATE_METHODS)}")
+        for point_type, columns in (arrays or {}).items():
+            method_name = ARRAY_UPDATE_METHODS[point_type]
+            indices, values, flags = (tuple(columns) + (None,))[:3]
+            if has_filter:
+                mask = self.db_handler.filter_changes(point_type, indices, values, flags, force=force)
+                if not mask.all():
+                    indices, values = np.asarray(indices)[mask], np.asarray(values)[mask]
+                    flags = np.asarray(flags)[mask] if flags is not None else None
+                if not len(indices):
+                    continue
+            getattr(builder, method_name)(indices, values, flags, mode)
+            processed_arrays.append((point_type, indices, values))
+            num_points += len(indices)
+        if num_points == 0:
+            return
+        for measurement, index in processed:
+            self.db_handler.process(measurement, index)
+        for point_type, indices, values in processed_arrays:
+            self.db_handler.process_many(point_type, indices, values)
+        _log.debug('Recording %d measurements in a single update', num_points)
+        self.outstation.Apply(builder.Build())
+
     def __del__(self):
         try:
             self.shutdown()
@@ -385,24 +597,95 @@ class MyOutstationCommandHandler(opendnp3.ICommandHandler):
         ICommandHandler implements the Outstation's handling of Select and Operate,
         which relay commands and data from the Master to the Outstation.
 
+        Every command is validated first (see _validate), an invalid one gets an error status and is not applied.
+        By default, a valid command is applied before Select/Operate returns, i.e., its status reflects the update.
+        With batch_commands, valid commands are only queued and Select/Operate returns SUCCESS right away,
+        the queue is applied at End(), after the master's response statuses have been decided:
+        a failure at that point (e.g., the outstation shutting down) cannot be reported to the master,
+        it is logged and counted in failed_commands.
+
         Note: this class CANNOT implement init
     """
 
     # outstation_application = MyOutStationNew
     outstation_id = ""
+    outstation_app: MyOutStationNew = None
+    batch_commands = False
+    failed_commands = 0
 
     # def __init__(self, outstation_id="some-id"):
     #     self.outstation_id = outstation_id
 
-    def post_init(self, outstation_id, **kwargs):
-        """helper function to pass values, e.g., outstation_id"""
+    def post_init(self, outstation_id, outstation_app: MyOutStationNew = None, batch_commands: bool = False,
+                  **kwargs):
+        """helper function to pass values, e.g., outstation_id
+
+        :param outstation_app: the outstation to update,
+            default to a lookup in MyOutStationNew.outstation_application_pool
+        :param batch_commands: gather the commands between Start() and End(), then record them in a single update
+            (one UpdateBuilder transaction per request instead of one per command).
+            Note: commands are then acknowledged before they are applied, see the class docstring
+        """
         self.outstation_id = outstation_id
+        self.outstation_app = outstation_app
+        self.batch_commands = batch_commands
+        # number of commands accepted with SUCCESS but not applied, only with batch_commands
+        self.failed_commands = 0
+        # command_type -> [(command, index)], only used with batch_commands
+        self._batch: Dict[str, list] = {}
+
+    def _get_outstation_app(self) -> MyOutStationNew:
+        if self.outstation_app is not None:
+            return self.outstation_app
+        return MyOutStationNew.outstation_application_pool.get(self.outstation_id)
+
+    def _validate(self, command, index) -> opendnp3.CommandStatus:
+        """Status of a command before it is applied: NOT_SUPPORTED for an unknown command type (or CROB code),
+        OUT_OF_RANGE for an index beyond the outstation database, SUCCESS otherwise."""
+        try:
+            measurement = master_to_outstation_command_parser(command)
+        except ValueError as e:
+            _log.warning(e)
+            return opendnp3.CommandStatus.NOT_SUPPORTED
+        sizes = self._get_outstation_app().db_handler.stack_config.dbConfig.sizes
+        if not 0 <= index < getattr(sizes, POINT_TYPES[type(measurement).__name__][0]):
+            _log.warning(f"{type(measurement).__name__} index {index} is out of range")
+            return opendnp3.CommandStatus.OUT_OF_RANGE
+        return opendnp3.CommandStatus.SUCCESS
+
+    def _handle(self, command_type, command, index, op_type) -> opendnp3.CommandStatus:
+        status = self._validate(command, index)
+        if status != opendnp3.CommandStatus.SUCCESS:
+            return status
+        if self.batch_commands:
+            # Note: commands are copied into Python, they remain valid until End()
+            self._batch.setdefault(command_type, []).append((command, index))
+            return status
+        try:
+            self._get_outstation_app().process_point_value(command_type, command, index, op_type)
+        except Exception as e:
+            _log.error(f"Failed to process {command_type} {command} at index {index}: {e!r}")
+            return opendnp3.CommandStatus.HARDWARE_ERROR
+        return status
 
     def Start(self):
         _log.debug('In OutstationCommandHandler.Start')
+        if self.batch_commands:
+            self._batch = {}
 
     def End(self):
         _log.debug('In OutstationCommandHandler.End')
+        if not self.batch_commands:
+            return
+        batch, self._batch = self._batch, {}
+        outstation_app = self._get_outstation_app()
+        for command_type, commands in batch.items():
+            try:
+                outstation_app.process_point_values(command_type, commands)
+            except Exception as e:
+                # Note: the master already got SUCCESS for these commands, see the class docstring
+                self.failed_commands += len(commands)
+                _log.error(f"Failed to process {len(commands)} {command_type} commands: {e!r}")
 
     def Select(self, command, index):
         """
@@ -414,15 +697,7 @@ class MyOutstationCommandHandler(opendnp3.ICommandHandler):
         :param index: int
         :return: CommandStatus
         """
-        outstation_application_pool = MyOutStationNew.outstation_application_pool
-        outstation_app = outstation_application_pool.get(self.outstation_id)
-
-        try:
-            outstation_app.process_point_value('Select', command, index, None)
-            return opendnp3.CommandStatus.SUCCESS
-        except Exception as e:
-            _log.error(e)
-            raise e
+        return self._handle('Select', command, index, None)
 
     def Operate(self, command, index, op_type):
         """
@@ -437,15 +712,8 @@ class MyOutstationCommandHandler(opendnp3.ICommandHandler):
         :return: CommandStatus
         """
 
-        outstation_application_pool = MyOutStationNew.outstation_application_pool
-        outstation_app = outstation_application_pool.get(self.outstation_id)
-        try:
-            # self.outstation_application.process_point_value('Operate', command, index, op_type)
-            outstation_app.process_point_value('Operate', command, index, op_type)
-            return opendnp3.CommandStatus.SUCCESS
-        except Exception as e:
-            _log.error(e)
-            raise e
+        # self.outstation_application.process_point_value('Operate', command, index, op_type)
+        return self._handle('Operate', command, index, op_type)
 
 
 class AppChannelListener(asiodnp3.IChannelListener):
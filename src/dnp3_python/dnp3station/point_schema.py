@@ -0,0 +1,314 @@
+"""
+    Declarative point configuration of MyOutStationNew, i.e., database sizes and, per range of points,
+    event class, static/event variations and deadband.
+
+    A PointSchema can be built in code or from a config dict (or a JSON/YAML file with the same content), e.g.,
+
+        {
+            "Analog": [
+                {"start": 0, "stop": 19999, "class": 2, "svariation": "Group30Var5", "evariation": "Group32Var7",
+                 "deadband": 0.5},
+                {"start": 20000, "count": 500, "class": 3},
+            ],
+            "Binary": [{"count": 1000, "class": 1, "svariation": "Group1Var2", "evariation": "Group2Var2"}],
+            "sizes": {"Counter": 10},  # optional, default to the last index + 1 of each point type
+        }
+
+    Keys are point types (see POINT_TYPES), "class" is 0 (static only) to 3, variations are the names of the
+    opendnp3 Static<X>Variation/Event<X>Variation enum values. Fields left out keep the opendnp3 defaults.
+
+    Note: each range is applied with a single native call (e.g., asiodnp3.DatabaseConfig.ConfigureAnalog),
+    instead of one Python attribute assignment per point and field, which dominates the stack construction
+    of outstations with tens of thousands of points (see benchmarks/bench_schema.py).
+"""
+from __future__ import annotations
+
+import json
+import logging
+import sys
+
+from pydnp3 import opendnp3, asiodnp3
+from typing import Dict, List, NamedTuple, Optional, Union
+
+try:
+    import yaml
+except ImportError:  # optional dependency
+    yaml = None
+
+stdout_stream = logging.StreamHandler(sys.stdout)
+stdout_stream.setFormatter(logging.Formatter('%(asctime)s\t%(name)s\t%(levelname)s\t%(message)s'))
+
+_log = logging.getLogger(__name__)
+_log.addHandler(stdout_stream)
+_log.setLevel(logging.INFO)
+
+
+class PointTypeSpec(NamedTuple):
+    size_attr: str  # opendnp3.DatabaseSizes attribute
+    config_attr: str  # asiodnp3.DatabaseConfig attribute
+    method: str  # asiodnp3.DatabaseConfig bulk method
+    static_variation: type
+    event_variation: Optional[type]  # None for static only point types
+    has_deadband: bool
+    event_buffer_attr: Optional[str]  # opendnp3.EventBufferConfig attribute
+
+
+POINT_TYPES: Dict[str, PointTypeSpec] = {
+    "Binary": PointTypeSpec("numBinary", "binary", "ConfigureBinary",
+                            opendnp3.StaticBinaryVariation, opendnp3.EventBinaryVariation,
+                            False, "maxBinaryEvents"),
+    "DoubleBitBinary": PointTypeSpec("numDoubleBinary", "doubleBinary", "ConfigureDoubleBinary",
+                                     opendnp3.StaticDoubleBinaryVariation, opendnp3.EventDoubleBinaryVariation,
+                                     False, "maxDoubleBinaryEvents"),
+    "Analog": PointTypeSpec("numAnalog", "analog", "ConfigureAnalog",
+                            opendnp3.StaticAnalogVariation, opendnp3.EventAnalogVariation,
+                            True, "maxAnalogEvents"),
+    "Counter": PointTypeSpec("numCounter", "counter", "ConfigureCounter",
+                             opendnp3.StaticCounterVariation, opendnp3.EventCounterVariation,
+                             True, "maxCounterEvents"),
+    "FrozenCounter": PointTypeSpec("numFrozenCounter", "frozenCounter", "ConfigureFrozenCounter",
+                                   opendnp3.StaticFrozenCounterVariation, opendnp3.EventFrozenCounterVariation,
+                                   True, "maxFrozenCounterEvents"),
+    "BinaryOutputStatus": PointTypeSpec("numBinaryOutputStatus", "boStatus", "ConfigureBOStatus",
+                                        opendnp3.StaticBinaryOutputStatusVariation,
+                                        opendnp3.EventBinaryOutputStatusVariation,
+                                        False, "maxBinaryOutputStatusEvents"),
+    "AnalogOutputStatus": PointTypeSpec("numAnalogOutputStatus", "aoStatus", "ConfigureAOStatus",
+                                        opendnp3.StaticAnalogOutputStatusVariation,
+                                        opendnp3.EventAnalogOutputStatusVariation,
+                                        True, "maxAnalogOutputStatusEvents"),
+    "TimeAndInterval": PointTypeSpec("numTimeAndInterval", "timeAndInterval", "ConfigureTimeAndInterval",
+                                     opendnp3.StaticTimeAndIntervalVariation, None,
+                                     False, None),
+}
+
+POINT_CLASSES = {
+    0: opendnp3.PointClass.Class0,
+    1: opendnp3.PointClass.Class1,
+    2: opendnp3.PointClass.Class2,
+    3: opendnp3.PointClass.Class3,
+}
+
+MAX_POINTS = 65535  # database sizes are uint16
+
+
+def _enum_value(enum_type: type, value):
+    """Accept an enum value or its name, e.g., "Group30Var5" for opendnp3.StaticAnalogVariation.Group30Var5"""
+    if value is None or isinstance(value, enum_type):
+        return value
+    try:
+        return getattr(enum_type, value)
+    except (AttributeError, TypeError):
+        raise ValueError(f"Unknown {enum_type.__name__} {value!r}") from None
+
+
+class PointRange:
+    """
+        Configuration shared by the points [start, stop] (inclusive) of one point type.
+        Fields left to None keep the current configuration of the database (i.e., the opendnp3 defaults).
+    """
+
+    def __init__(self, point_type: str, start: int, stop: int,
+                 clazz: Optional[int] = None,
+                 svariation=None,
+                 evariation=None,
+                 deadband: Optional[float] = None):
+        """
+        :param point_type: one of POINT_TYPES, e.g., "Analog"
+        :param clazz: event class, 0 (static only) to 3
+        :param svariation: static variation, enum value or name, e.g., "Group30Var5"
+        :param evariation: event variation, enum value or name, e.g., "Group32Var7"
+        :param deadband: only for Analog, Counter, FrozenCounter and AnalogOutputStatus
+        """
+        if point_type not in POINT_TYPES:
+            raise ValueError(f"Unknown point type {point_type}, use one of {list(POINT_TYPES)}")
+        if not 0 <= start <= stop < MAX_POINTS:
+            raise ValueError(f"Invalid {point_type} range [{start}, {stop}]")
+        if clazz is not None and clazz not in POINT_CLASSES:
+            raise ValueError(f"Invalid point class {clazz}, use 0 to 3")
+        spec = POINT_TYPES[point_type]
+        if spec.event_variation is None and (clazz is not None or evariation is not None):
+            raise ValueError(f"{point_type} points are static only, class and evariation are not supported")
+        if deadband is not None and not spec.has_deadband:
+            raise ValueError(f"{point_type} points have no deadband")
+        self.point_type = point_type
+        self.start = start
+        self.stop = stop
+        self.clazz = clazz
+        self.svariation = _enum_value(spec.static_variation, svariation)
+        self.evariation = _enum_value(spec.event_variation, evariation) if spec.event_variation else None
+        self.deadband = deadband
+
+    @classmethod
+    def from_dict(cls, point_type: str, config: dict, start: int = 0) -> PointRange:
+        """:param start: default start, i.e., right after the previous range of the same point type"""
+        unknown = set(config) - {"start", "stop", "count", "class", "svariation", "evariation", "deadband"}
+        if unknown:
+            raise ValueError(f"Unknown {point_type} range keys {sorted(unknown)}")
+        start = config.get("start", start)
+        if "stop" in config:
+            stop = config["stop"]
+        elif "count" in config:
+            stop = start + config["count"] - 1
+        else:
+            raise ValueError(f"{point_type} range needs either 'stop' or 'count'")
+        return cls(point_type, start, stop, clazz=config.get("class"), svariation=config.get("svariation"),
+                   evariation=config.get("evariation"), deadband=config.get("deadband"))
+
+    @property
+    def count(self) -> int:
+        return self.stop - self.start + 1
+
+    def apply(self, db_config: asiodnp3.DatabaseConfig):
+        """Configure the range in a single native call.
+
+        :raise IndexError: if the range exceeds the database size
+        """
+        spec = POINT_TYPES[self.point_type]
+        # the first point of the range provides the fields left out
+        first = getattr(db_config, spec.config_attr)[self.start]
+        svariation = self.svariation if self.svariation is not None else first.svariation
+        configure = getattr(db_config, spec.method)
+        if spec.event_variation is None:
+            configure(self.start, self.stop, svariation)
+            return
+        clazz = POINT_CLASSES[self.clazz] if self.clazz is not None else first.clazz
+        evariation = self.evariation if self.evariation is not None else first.evariation
+        if spec.has_deadband:
+            deadband = self.deadband if self.deadband is not None else first.deadband
+            configure(self.start, self.stop, clazz, svariation, evariation, deadband)
+        else:
+            configure(self.start, self.stop, clazz, svariation, evariation)
+
+    def __repr__(self):
+        return (f"PointRange(point_type={self.point_type!r}, start={self.start}, stop={self.stop}, "
+                f"clazz={self.clazz}, svariation={self.svariation}, evariation={self.evariation}, "
+                f"deadband={self.deadband})")
+
+
+class PointSchema:
+    """
+        Database sizes and point configuration of an outstation.
+
+        EXAMPLE:
+        >>> schema = PointSchema.from_json("points.json")
+        >>> schema.add_range("Counter", 0, 99, clazz=1, deadband=5)
+        >>> outstation = MyOutStationNew(point_schema=schema)
+
+        >>> stack_config = asiodnp3.OutstationStackConfig(schema.sizes())
+        >>> schema.apply(stack_config.dbConfig)
+    """
+
+    def __init__(self, ranges: Optional[List[PointRange]] = None, sizes: Optional[Dict[str, int]] = None):
+        """
+        :param sizes: point type -> number of points, default to the last index + 1 of the ranges of each type
+        """
+        self.ranges: List[PointRange] = []
+        self._sizes: Dict[str, int] = {}
+        for point_type, size in (sizes or {}).items():
+            self.set_size(point_type, size)
+        for point_range in ranges or []:
+            self.add(point_range)
+
+    def add(self, point_range: PointRange) -> PointRange:
+        self.ranges.append(point_range)
+        return point_range
+
+    def add_range(self, point_type: str, start: int, stop: int, clazz: Optional[int] = None,
+                  svariation=None, evariation=None, deadband: Optional[float] = None) -> PointRange:
+        return self.add(PointRange(point_type, start, stop, clazz=clazz, svariation=svariation,
+                                   evariation=evariation, deadband=deadband))
+
+    def set_size(self, point_type: str, size: int):
+        """Set the number of points of a type explicitly, e.g., to reserve points left out of the ranges."""
+        if point_type not in POINT_TYPES:
+            raise ValueError(f"Unknown point type {point_type}, use one of {list(POINT_TYPES)}")
+        if not 0 <= size <= MAX_POINTS:
+            raise ValueError(f"Invalid {point_type} size {size}")
+        self._sizes[point_type] = size
+
+    def size(self, point_type: str) -> int:
+        """Number of points of a type, i.e., the explicit size if any, otherwise the last index + 1."""
+        if point_type in self._sizes:
+            return self._sizes[point_type]
+        return max((point_range.stop + 1 for point_range in self.ranges if point_range.point_type == point_type),
+                   default=0)
+
+    def sizes(self) -> opendnp3.DatabaseSizes:
+        """:raise ValueError: if a range exceeds an explicit size"""
+        for point_range in self.ranges:
+            if point_range.stop >= self.size(point_range.point_type):
+                raise ValueError(f"{point_range} exceeds the {point_range.point_type} size "
+                                 f"{self.size(point_range.point_type)}")
+        return opendnp3.DatabaseSizes(**{spec.size_attr: self.size(point_type)
+                                         for point_type, spec in POINT_TYPES.items()})
+
+    def apply(self, db_config: asiodnp3.DatabaseConfig):
+        """Configure the points of db_config, one native call per range, in order (later ranges win)."""
+        for point_range in self.ranges:
+            point_range.apply(db_config)
+        _log.debug(f"Applied {len(self.ranges)} point ranges "
+                   f"({sum(point_range.count for point_range in self.ranges)} points)")
+
+    @classmethod
+    def from_dict(cls, config: dict) -> PointSchema:
+        """Build a schema from a config dict, see the module docstring for the format.
+
+        :raise ValueError: on unknown point types or keys
+        """
+        schema = cls(sizes=config.get("sizes"))
+        for point_type, ranges in config.items():
+            if point_type == "sizes":
+                continue
+            if point_type not in POINT_TYPES:
+                raise ValueError(f"Unknown point type {point_type}, use one of {list(POINT_TYPES)} or 'sizes'")
+            # Note: a single range can be given without the enclosing list
+            next_start = 0
+            for item in [ranges] if isinstance(ranges, dict) else ranges:
+                point_range = schema.add(PointRange.from_dict(point_type, item, start=next_start))
+                next_start = point_range.stop + 1
+        return schema
+
+    @classmethod
+    def from_json(cls, path: str) -> PointSchema:
+        with open(path) as f:
+            return cls.from_dict(json.load(f))
+
+    @classmethod
+    def from_yaml(cls, path: str) -> PointSchema:
+        if yaml is None:
+            raise ImportError("PointSchema.from_yaml requires PyYAML, i.e., `pip install pyyaml`")
+        with open(path) as f:
+            return cls.from_dict(yaml.safe_load(f))
+
+    @classmethod
+    def uniform(cls, counts: Dict[str, int], clazz: Optional[int] = None) -> PointSchema:
+        """All points of each type share the same configuration, e.g., uniform({"Analog": 20000}, clazz=2)"""
+        schema = cls()
+        for point_type, count in counts.items():
+            if point_type not in POINT_TYPES:
+                raise ValueError(f"Unknown point type {point_type}, use one of {list(POINT_TYPES)}")
+            if count:
+                static_only = POINT_TYPES[point_type].event_variation is None
+                schema.add_range(point_type, 0, count - 1, clazz=None if static_only else clazz)
+        return schema
+
+
+def event_buffer_config(max_events: Union[int, Dict[str, int]]) -> opendnp3.EventBufferConfig:
+    """Outstation event buffer capacity, per point type.
+
+    :param max_events: number of events buffered for every point type, or point type -> number of events
+        (point types left out buffer no event), e.g., {"Analog": 1000, "Binary": 100}
+    """
+    if isinstance(max_events, int):
+        return opendnp3.EventBufferConfig().AllTypes(max_events)
+    config = opendnp3.EventBufferConfig()
+    for point_type, count in max_events.items():
+        spec = POINT_TYPES.get(point_type)
+        if spec is None or spec.event_buffer_attr is None:
+            raise ValueError(f"Point type {point_type} has no events, use one of "
+                             f"{[name for name, spec in POINT_TYPES.items() if spec.event_buffer_attr]}")
+        if not 0 <= count <= MAX_POINTS:
+            raise ValueError(f"Invalid number of {point_type} events {count}")
+        setattr(config, spec.event_buffer_attr, count)
+    return config
@@ -0,0 +1,179 @@
+"""
+    Columnar (array-backed) point store, an optional alternative to the nested dict kept by SOEHandler.
+
+    One set of preallocated NumPy arrays is kept per point type (e.g., "Analog", "Binary"):
+        value, flags, time (outstation timestamp in ms since epoch, 0 if unknown),
+        received (local receive time in sec since epoch, NaN if never received) and
+        seq (sequence number of the last update, 0 if never updated).
+    Updates are vectorized writes, snapshots are zero-copy, read-only views.
+    Keys other than the point types (e.g., the GroupVariation keys of SOEHandler) get their columns on first update.
+
+    Note: NumPy is an optional dependency, i.e., `pip install numpy` to use this module.
+"""
+from __future__ import annotations
+
+import threading
+import time
+
+from typing import Dict, Hashable, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+try:
+    import numpy as np
+except ImportError:  # optional dependency
+    np = None
+
+# point type -> (DatabaseSizes attribute, value dtype)
+POINT_TYPES: Dict[str, tuple] = {
+    "Binary": ("numBinary", "bool"),
+    "DoubleBitBinary": ("numDoubleBinary", "uint8"),
+    "Analog": ("numAnalog", "float64"),
+    "Counter": ("numCounter", "uint32"),
+    "FrozenCounter": ("numFrozenCounter", "uint32"),
+    "BinaryOutputStatus": ("numBinaryOutputStatus", "bool"),
+    "AnalogOutputStatus": ("numAnalogOutputStatus", "float64"),
+}
+
+ArrayLike = Union[Sequence, "np.ndarray"]
+
+
+class PointColumns(NamedTuple):
+    """Columns of one point type, indexed by point index."""
+    value: "np.ndarray"
+    flags: "np.ndarray"
+    time: "np.ndarray"
+    received: "np.ndarray"
+    seq: "np.ndarray"
+
+
+class PointStore:
+    """
+        Preallocated NumPy arrays per point type, sized from opendnp3.DatabaseSizes.
+
+        EXAMPLE:
+        >>> store = PointStore.from_sizes(opendnp3.DatabaseSizes.AllTypes(10000))
+        >>> store.update("Analog", indices=[0, 1, 2], values=[4.8, 14.1, 27.2])
+        1
+        >>> store.snapshot("Analog").value[:3]
+        array([ 4.8, 14.1, 27.2])
+    """
+
+    def __init__(self, sizes: Optional[Dict[str, int]] = None):
+        """
+        :param sizes: initial number of points per point type, e.g., {"Analog": 100, "Binary": 20}.
+            Point types not listed start empty; arrays grow on demand if an index exceeds the size.
+        """
+        if np is None:
+            raise ImportError("PointStore requires numpy, i.e., `pip install numpy`")
+        sizes = sizes if sizes else {}
+        self._lock = threading.Lock()
+        self._seq: int = 0
+        self._columns: Dict[Hashable, PointColumns] = {}
+        # point type -> (sequence number, receive time) of its latest update
+        self._updated: Dict[Hashable, Tuple[int, float]] = {}
+        for point_type, (_, dtype) in POINT_TYPES.items():
+            self._columns[point_type] = self._allocate(sizes.get(point_type, 0), dtype)
+
+    @classmethod
+    def from_sizes(cls, sizes) -> PointStore:
+        """Build a store from an opendnp3.DatabaseSizes (or an object with the same attributes)."""
+        return cls({point_type: getattr(sizes, attr) for point_type, (attr, _) in POINT_TYPES.items()})
+
+    @staticmethod
+    def _allocate(size: int, dtype) -> PointColumns:
+        return PointColumns(value=np.zeros(size, dtype=dtype),
+                            flags=np.zeros(size, dtype=np.uint8),
+                            time=np.zeros(size, dtype=np.int64),
+                            received=np.full(size, np.nan, dtype=np.float64),
+                            seq=np.zeros(size, dtype=np.uint64))
+
+    def _grow(self, point_type: Hashable, size: int):
+        """Reallocate the columns of a point type to hold at least `size` points (amortized doubling)."""
+        old = self._columns[point_type]
+        new = self._allocate(max(size, 2 * len(old.value)), old.value.dtype)
+        for old_col, new_col in zip(old, new):
+            new_col[:len(old_col)] = old_col
+        self._columns[point_type] = new
+
+    def update(self, point_type: Hashable,
+               indices: ArrayLike,
+               values: ArrayLike,
+               flags: Optional[ArrayLike] = None,
+               times: Optional[ArrayLike] = None,
+               received: Optional[float] = None) -> int:
+        """Write a batch of points (e.g., one SOE header) with vectorized assignments.
+
+        :param point_type: one of POINT_TYPES, e.g., "Analog", or any other key (columns typed after `values`)
+        :param indices: point indices
+        :param values: point values, same length as indices
+        :param flags: optional quality flags (uint8) per point
+        :param times: optional outstation timestamps (ms since epoch) per point
+        :param received: receive time (sec since epoch), default to now
+
+        :return: sequence number assigned to this update
+        """
+        indices = np.asarray(indices, dtype=np.intp)
+        if received is None:
+            received = time.time()
+        with self._lock:
+            if point_type not in self._columns:
+                self._columns[point_type] = self._allocate(0, np.asarray(values).dtype)
+            if indices.size and indices.max() >= len(self._columns[point_type].value):
+                self._grow(point_type, int(indices.max()) + 1)
+            columns = self._columns[point_type]
+            self._seq += 1
+            columns.value[indices] = values
+            if flags is not None:
+                columns.flags[indices] = flags
+            if times is not None:
+                columns.time[indices] = times
+            columns.received[indices] = received
+            columns.seq[indices] = self._seq
+            self._updated[point_type] = (self._seq, received)
+            return self._seq
+
+    def snapshot(self, point_type: Hashable) -> PointColumns:
+        """Zero-copy, read-only views of the columns of a point type.
+
+        Note: views keep referring to the old arrays if the store grows afterwards.
+        """
+        views = []
+        for column in self._columns[point_type]:
+            view = column.view()
+            view.flags.writeable = False
+            views.append(view)
+        return PointColumns(*views)
+
+    def changed_since(self, point_type: Hashable, seq: int) -> "np.ndarray":
+        """Indices of the points updated after sequence number `seq`."""
+        return np.flatnonzero(self._columns[point_type].seq > seq)
+
+    def changes(self, point_type: Hashable, seq: int) -> Tuple["np.ndarray", PointColumns]:
+        """Indices and a copy of the columns of the points updated after sequence number `seq`,
+        taken while no update is in progress (i.e., values, flags and times of a point are consistent)."""
+        with self._lock:
+            columns = self._columns[point_type]
+            indices = np.flatnonzero(columns.seq > seq)
+            return indices, PointColumns(*(column[indices] for column in columns))
+
+    def updated_since(self, seq: int) -> List[Hashable]:
+        """Point types (or other keys) updated after sequence number `seq`."""
+        with self._lock:
+            return [point_type for point_type, (last, _) in self._updated.items() if last > seq]
+
+    def last_update(self, point_type: Hashable) -> Optional[Tuple[int, float]]:
+        """(sequence number, receive time) of the latest update of a point type, None if never updated."""
+        return self._updated.get(point_type)
+
+    def __contains__(self, point_type: Hashable) -> bool:
+        return point_type in self._columns
+
+    @property
+    def seq(self) -> int:
+        """Sequence number of the latest update."""
+        return self._seq
+
+    def to_dict(self, point_type: Hashable) -> Dict[int, Union[float, int, bool]]:
+        """Values of the points received so far, in the format of SOEHandler.gv_index_value_nested_dict values."""
+        columns = self._columns[point_type]
+        indices = np.flatnonzero(columns.seq)
+        return dict(zip(indices.tolist(), columns.value[indices].tolist()))
@@ -0,0 +1,405 @@
+"""
+    Configurable scan plans for MyMasterNew, i.e., which periodic reads a master performs and how often.
+
+    A ScanPlan lists class scans (class 0/1/2/3 periods), range scans and per group-variation (all objects) scans,
+    each with a period and an optional jitter. It can be built in code or from a config dict, e.g.,
+
+        {
+            "class0": 1800,  # integrity (static data), in seconds; None/0 to disable
+            "class1": 60, "class2": 60, "class3": 300,  # event classes
+            "range": [{"gv": [30, 6], "start": 0, "stop": 9, "period": 10, "jitter": 1}],
+            "gv": [{"gv": [1, 2], "period": 5, "jitter": 0.5}],
+        }
+
+    Classes sharing the same period are combined into a single scan (i.e., a single request).
+
+    Note: by default, the scans are registered in opendnp3 (AddClassScan/AddRangeScan/AddAllObjectsScan) with their
+    period, i.e., opendnp3 performs them natively, without jitter. Given a ScanTimer (e.g., ScanTimer.shared(), or
+    the one of MasterPool), they are registered with an infinite period and triggered with IMasterScan.Demand by the
+    timer instead, so that periods (and jitter) can change at runtime, which the native periodic scans do not support.
+    A ScanTimer with caps issues them as one-shot tasks, to know when they complete.
+"""
+from __future__ import annotations
+
+import concurrent.futures
+import heapq
+import itertools
+import logging
+import random
+import sys
+import threading
+import time
+
+from collections import deque
+from pydnp3 import opendnp3, openpal, asiodnp3
+from typing import Callable, Deque, Dict, Hashable, List, Optional, Set, Tuple
+
+stdout_stream = logging.StreamHandler(sys.stdout)
+stdout_stream.setFormatter(logging.Formatter('%(asctime)s\t%(name)s\t%(levelname)s\t%(message)s'))
+
+_log = logging.getLogger(__name__)
+_log.addHandler(stdout_stream)
+_log.setLevel(logging.INFO)
+
+CLASS_BITS = {
+    0: opendnp3.ClassField.CLASS_0,
+    1: opendnp3.ClassField.CLASS_1,
+    2: opendnp3.ClassField.CLASS_2,
+    3: opendnp3.ClassField.CLASS_3,
+}
+
+# Note: fractional parts of k * (golden ratio - 1) spread evenly over [0, 1) for any number of scans k
+_GOLDEN_RATIO_FRAC = 0.6180339887498949
+
+
+class ScanEntry:
+    """
+        One scan of a ScanPlan.
+
+        kind: "class" (field), "range" (gv_id, start, stop) or "all_objects" (gv_id)
+    """
+
+    def __init__(self, name: str, kind: str, period: Optional[float], jitter: float = 0,
+                 field: opendnp3.ClassField = None,
+                 gv_id: opendnp3.GroupVariationID = None,
+                 start: int = 0, stop: int = 0):
+        """
+        :param period: in seconds, None/0 for an on-demand only scan (see MyMasterNew.demand_scan)
+        :param jitter: in seconds, each period is randomized within [period - jitter, period + jitter]
+        """
+        if kind not in ("class", "range", "all_objects"):
+            raise ValueError(f"Unknown scan kind {kind}, use one of 'class', 'range' or 'all_objects'")
+        self.name = name
+        self.kind = kind
+        self.period = period
+        self.jitter = jitter
+        self.field = field
+        self.gv_id = gv_id
+        self.start = start
+        self.stop = stop
+
+    def register(self, master: asiodnp3.IMaster, native_period: bool = False) -> asiodnp3.IMasterScan:
+        """Bind the scan to a master, with an infinite native period (see ScanTimer).
+
+        :param native_period: register the period of the scan instead, i.e., opendnp3 performs it (without jitter)
+        """
+        period = openpal.TimeDuration().Max()
+        if native_period and self.period:
+            period = openpal.TimeDuration().Milliseconds(int(self.period * 1000))
+        if self.kind == "class":
+            return master.AddClassScan(self.field, period, opendnp3.TaskConfig().Default())
+        if self.kind == "range":
+            return master.AddRangeScan(self.gv_id, self.start, self.stop, period, opendnp3.TaskConfig().Default())
+        return master.AddAllObjectsScan(self.gv_id, period, opendnp3.TaskConfig().Default())
+
+    def issue(self, master: asiodnp3.IMaster, config: opendnp3.TaskConfig):
+        """Perform the scan once as a one-shot task, e.g., with a TaskConfig carrying a TaskCallback."""
+        if self.kind == "class":
+            master.ScanClasses(self.field, config)
+        elif self.kind == "range":
+            master.ScanRange(self.gv_id, self.start, self.stop, config)
+        else:
+            master.ScanAllObjects(self.gv_id, config)
+
+    def next_delay(self) -> Optional[float]:
+        """Delay (in seconds) until the next scan, None if on-demand only."""
+        if not self.period:
+            return None
+        return max(0.0, self.period + random.uniform(-self.jitter, self.jitter))
+
+    def __repr__(self):
+        return f"ScanEntry(name={self.name!r}, kind={self.kind!r}, period={self.period}, jitter={self.jitter})"
+
+
+class ScanPlan:
+    """
+        Set of scans of a master.
+
+        EXAMPLE:
+        >>> plan = ScanPlan.event_only(event_period=30)  # no repeated static reads
+        >>> plan.add_range_scan(opendnp3.GroupVariationID(30, 6), start=0, stop=9, period=10, jitter=1)
+        >>> master = MyMasterNew(scan_plan=plan, scan_timer=ScanTimer.shared())
+        >>> master.set_scan_period("range-30-6-0-9", 5)
+    """
+
+    def __init__(self, entries: Optional[List[ScanEntry]] = None):
+        self.entries: Dict[str, ScanEntry] = {}
+        for entry in entries or []:
+            self.add(entry)
+
+    def add(self, entry: ScanEntry) -> ScanEntry:
+        if entry.name in self.entries:
+            raise ValueError(f"Scan {entry.name} already exists")
+        self.entries[entry.name] = entry
+        return entry
+
+    def add_class_scan(self, classes: List[int], period: Optional[float], jitter: float = 0,
+                       name: str = None) -> ScanEntry:
+        """:param classes: e.g., [1, 2, 3] for an event poll, [0, 1, 2, 3] for an integrity poll"""
+        mask = 0
+        for clazz in classes:
+            mask |= CLASS_BITS[clazz]
+        name = name if name else "class" + "".join(str(clazz) for clazz in sorted(classes))
+        return self.add(ScanEntry(name, "class", period, jitter, field=opendnp3.ClassField(mask)))
+
+    def add_range_scan(self, gv_id: opendnp3.GroupVariationID, start: int, stop: int,
+                       period: Optional[float], jitter: float = 0, name: str = None) -> ScanEntry:
+        name = name if name else f"range-{gv_id.group}-{gv_id.variation}-{start}-{stop}"
+        return self.add(ScanEntry(name, "range", period, jitter, gv_id=gv_id, start=start, stop=stop))
+
+    def add_gv_scan(self, gv_id: opendnp3.GroupVariationID, period: Optional[float], jitter: float = 0,
+                    name: str = None) -> ScanEntry:
+        name = name if name else f"gv-{gv_id.group}-{gv_id.variation}"
+        return self.add(ScanEntry(name, "all_objects", period, jitter, gv_id=gv_id))
+
+    @classmethod
+    def default(cls) -> ScanPlan:
+        """The scans MyMasterNew used to hard-code: a 30-minute integrity poll and a 1-minute class 1 poll."""
+        plan = cls()
+        plan.add_class_scan([0, 1, 2, 3], period=30 * 60, name="slow")
+        plan.add_class_scan([1], period=60, name="fast")
+        return plan
+
+    @classmethod
+    def event_only(cls, event_period: float = 60, jitter: float = 0) -> ScanPlan:
+        """Poll event classes 1/2/3 only, relying on the startup integrity poll for static data."""
+        plan = cls()
+        plan.add_class_scan([1, 2, 3], period=event_period, jitter=jitter)
+        return plan
+
+    @classmethod
+    def from_dict(cls, config: dict) -> ScanPlan:
+        """Build a plan from a config dict, see the module docstring for the format.
+
+        :raise ValueError: on unknown keys
+        """
+        unknown = set(config) - {"class0", "class1", "class2", "class3", "jitter", "range", "gv"}
+        if unknown:
+            raise ValueError(f"Unknown scan plan keys {sorted(unknown)}")
+        plan = cls()
+        jitter = config.get("jitter", 0)
+        # combine classes sharing the same period into one scan
+        classes_by_period: Dict[float, List[int]] = {}
+        for clazz in range(4):
+            period = config.get(f"class{clazz}")
+            if period:
+                classes_by_period.setdefault(period, []).append(clazz)
+        for period, classes in classes_by_period.items():
+            plan.add_class_scan(classes, period=period, jitter=jitter)
+        for item in config.get("range", []):
+            plan.add_range_scan(opendnp3.GroupVariationID(*item["gv"]), start=item["start"], stop=item["stop"],
+                                period=item.get("period"), jitter=item.get("jitter", jitter), name=item.get("name"))
+        for item in config.get("gv", []):
+            plan.add_gv_scan(opendnp3.GroupVariationID(*item["gv"]), period=item.get("period"),
+                             jitter=item.get("jitter", jitter), name=item.get("name"))
+        return plan
+
+    def __iter__(self):
+        return iter(list(self.entries.values()))
+
+    def __len__(self):
+        return len(self.entries)
+
+
+class ScheduledScan:
+    """A ScanEntry bound to a master, driven by a ScanTimer."""
+
+    def __init__(self, entry: ScanEntry, scan: Optional[asiodnp3.IMasterScan] = None,
+                 issue: Optional[Callable[[ScanEntry], concurrent.futures.Future]] = None,
+                 channel_key: Hashable = None):
+        """
+        :param scan: the registered scan, triggered by demand()
+        :param issue: performs the entry as a one-shot task and returns a future resolved when the task ends,
+            used by a ScanTimer with caps
+        :param channel_key: identifies the channel of the master, see ScanTimer max_in_flight_per_channel
+        """
+        self.entry = entry
+        self.scan = scan
+        self.issue = issue
+        self.channel_key = channel_key
+        self.generation: int = 0  # bumped on every (re)schedule/cancel, older heap items are ignored
+
+    def demand(self):
+        """Perform the scan as soon as possible."""
+        self.scan.Demand()
+
+
+class ScanTimer:
+    """
+        Single thread performing the scheduled scans of many masters.
+        Use ScanTimer.shared() rather than one timer per master, or a dedicated timer to cap the scans in flight
+        (e.g., MasterPool).
+
+        Without caps, scans are triggered with ScheduledScan.demand. With caps, the scans that have an issue function
+        are performed as one-shot tasks and count as in flight until their future resolves (completion, failure or
+        destruction of the task). Due scans over a cap wait (FIFO) for a scan to complete, and a scan still waiting
+        when its next period is due is not queued twice.
+    """
+
+    _shared: Optional[ScanTimer] = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, max_in_flight: Optional[int] = None, max_in_flight_per_channel: Optional[int] = None,
+                 stagger: bool = False):
+        """
+        :param max_in_flight: cap on the scans in flight overall, None for no cap
+        :param max_in_flight_per_channel: cap on the scans in flight per ScheduledScan.channel_key, None for no cap
+        :param stagger: offset the first scan of every schedule within its period, so that the scans of masters
+            added together do not fire together, instead of one period from now
+        """
+        self.max_in_flight = max_in_flight
+        self.max_in_flight_per_channel = max_in_flight_per_channel
+        self.stagger = stagger
+        self._cond = threading.Condition()
+        # (due in time.monotonic(), tie breaker, scheduled scan, generation)
+        self._heap: List[Tuple[float, int, ScheduledScan, int]] = []
+        # due scans over a cap, (scheduled scan, generation)
+        self._deferred: Deque[Tuple[ScheduledScan, int]] = deque()
+        self._in_flight: int = 0
+        self._in_flight_per_channel: Dict[Hashable, int] = {}
+        self._counter = itertools.count()
+        self._stagger_counter = itertools.count()
+        self._thread: Optional[threading.Thread] = None
+        self._running = True
+
+    @classmethod
+    def shared(cls) -> ScanTimer:
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            return cls._shared
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @property
+    def has_caps(self) -> bool:
+        return self.max_in_flight is not None or self.max_in_flight_per_channel is not None
+
+    def schedule(self, scheduled: ScheduledScan):
+        """(Re)schedule a scan from now, according to its entry's period and jitter."""
+        with self._cond:
+            removed = self._remove({scheduled})
+            scheduled.generation += 1
+            delay = scheduled.entry.next_delay()
+            if delay is not None:
+                if self.stagger:
+                    delay = (next(self._stagger_counter) * _GOLDEN_RATIO_FRAC) % 1 * delay
+                self._push(scheduled, time.monotonic() + delay)
+            if self._thread is None and self._running:
+                self._thread = threading.Thread(target=self._run, name="ScanTimer", daemon=True)
+                self._thread.start()
+        del removed
+
+    def cancel(self, *scheduled: ScheduledScan):
+        """Stop scans, i.e., drop them from the timer. Scans in flight complete as usual."""
+        with self._cond:
+            for item in scheduled:
+                item.generation += 1
+            removed = self._remove(set(scheduled))
+        # Note: release the references (and possibly the last reference to a master) outside of the lock
+        del removed
+
+    def stop(self):
+        """Stop the timer thread and drop all the scans, e.g., on MasterPool.shutdown"""
+        with self._cond:
+            self._running = False
+            removed = self._heap, self._deferred
+            self._heap, self._deferred = [], deque()
+            self._cond.notify()
+        del removed
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _remove(self, targets: Set[ScheduledScan]) -> list:
+        """Remove the pending items of targets, :return: the removed items, to be released outside of the lock"""
+        removed = [item for item in self._heap if item[2] in targets]
+        if removed:
+            self._heap = [item for item in self._heap if item[2] not in targets]
+            heapq.heapify(self._heap)
+        deferred = [item for item in self._deferred if item[0] in targets]
+        if deferred:
+            self._deferred = deque(item for item in self._deferred if item[0] not in targets)
+        return removed + deferred
+
+    def _push(self, scheduled: ScheduledScan, due: float):
+        heapq.heappush(self._heap, (due, next(self._counter), scheduled, scheduled.generation))
+        self._cond.notify()
+
+    def _is_capped(self, scheduled: ScheduledScan) -> bool:
+        return self.has_caps and scheduled.issue is not None
+
+    def _has_capacity(self, scheduled: ScheduledScan) -> bool:
+        if not self._is_capped(scheduled):
+            return True
+        if self.max_in_flight is not None and self._in_flight >= self.max_in_flight:
+            return False
+        return (self.max_in_flight_per_channel is None or
+                self._in_flight_per_channel.get(scheduled.channel_key, 0) < self.max_in_flight_per_channel)
+
+    def _next_ready(self, now: float) -> Optional[ScheduledScan]:
+        """Pick the next scan to perform (deferred ones first), move due scans over a cap to the deferred queue."""
+        for item in list(self._deferred):
+            scheduled, generation = item
+            if generation != scheduled.generation:
+                self._deferred.remove(item)
+            elif self._has_capacity(scheduled):
+                self._deferred.remove(item)
+                return scheduled
+        while self._heap and self._heap[0][0] <= now:
+            due, _, scheduled, generation = heapq.heappop(self._heap)
+            if generation != scheduled.generation:
+                continue
+            delay = scheduled.entry.next_delay()
+            if delay is not None:
+                # reschedule from the planned time to keep the cadence (and stagger), skip missed periods
+                self._push(scheduled, due + delay if due + delay > now else now + delay)
+            if self._has_capacity(scheduled):
+                return scheduled
+            if not any(waiting is scheduled for waiting, _ in self._deferred):
+                self._deferred.append((scheduled, generation))
+        return None
+
+    def _run(self):
+        while True:
+            with self._cond:
+                if not self._running:
+                    return
+                now = time.monotonic()
+                scheduled = self._next_ready(now)
+                if scheduled is None:
+                    self._cond.wait(self._heap[0][0] - now if self._heap else None)
+                    continue
+                capped = self._is_capped(scheduled)
+                if capped:
+                    self._in_flight += 1
+                    self._in_flight_per_channel[scheduled.channel_key] = \
+                        self._in_flight_per_channel.get(scheduled.channel_key, 0) + 1
+            self._perform(scheduled, capped)
+            scheduled = None  # Note: do not hold the scan (and its master) while waiting
+
+    def _perform(self, scheduled: ScheduledScan, capped: bool):
+        if not capped:
+            try:
+                scheduled.demand()
+            except Exception as e:
+                _log.warning(f"Failed to demand scan {scheduled.entry.name}: {e!r}")
+            return
+        channel_key = scheduled.channel_key
+        try:
+            future = scheduled.issue(scheduled.entry)
+        except Exception as e:
+            _log.warning(f"Failed to issue scan {scheduled.entry.name}: {e!r}")
+            self._release(channel_key)
+            return
+        future.add_done_callback(lambda _: self._release(channel_key))
+
+    def _release(self, channel_key: Hashable):
+        with self._cond:
+            self._in_flight -= 1
+            self._in_flight_per_channel[channel_key] -= 1
+            if not self._in_flight_per_channel[channel_key]:
+                del self._in_flight_per_channel[channel_key]
+            self._cond.notify()
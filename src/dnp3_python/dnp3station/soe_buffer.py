@@ -0,0 +1,175 @@
+"""
+    Decouple measurement decoding from Python.
+
+    SOEHandler.Process runs Python (visitors, dict updates, logging) on the opendnp3 stack thread,
+    so slow Python code (or GIL contention) delays the link layer and can cause response timeouts under load.
+    With BufferedSOEConsumer, the master uses a native asiodnp3.RingBufferSOEHandler instead, which buffers
+    decoded measurements without acquiring the GIL, and a Python thread drains the buffer in batches
+    into a regular SOEHandler (i.e., the same storage, point store and subscriptions as before).
+
+    Note: NumPy is required, i.e., `pip install numpy` to use this module.
+"""
+from __future__ import annotations
+
+import logging
+import sys
+import threading
+
+from collections import deque
+from pydnp3 import opendnp3, asiodnp3
+from typing import Callable, Deque, Optional
+
+from .station_utils import SOEHandler, INT_ANALOG_GVS, INT_ANALOG_OUTPUT_STATUS_GVS
+
+try:
+    import numpy as np
+except ImportError:  # optional dependency
+    np = None
+
+stdout_stream = logging.StreamHandler(sys.stdout)
+stdout_stream.setFormatter(logging.Formatter('%(asctime)s\t%(name)s\t%(levelname)s\t%(message)s'))
+
+_log = logging.getLogger(__name__)
+_log.addHandler(stdout_stream)
+_log.setLevel(logging.INFO)
+
+# asiodnp3.RingBufferPointType value -> point type in PointStore
+POINT_TYPE_CODES = {
+    0: "Binary",
+    1: "DoubleBitBinary",
+    2: "Analog",
+    3: "Counter",
+    4: "FrozenCounter",
+    5: "BinaryOutputStatus",
+    6: "AnalogOutputStatus",
+}
+
+
+class BufferedSOEConsumer:
+    """
+        Python consumer of an asiodnp3.RingBufferSOEHandler, feeding a SOEHandler from its own thread.
+
+        EXAMPLE:
+        >>> master = MyMasterNew(soe_buffer_capacity=65536)  # drained from master.start() on
+        >>> master.soe_buffer.overflow
+        0
+
+        >>> consumer = BufferedSOEConsumer(capacity=65536)
+        >>> channel.AddMaster(id="master", SOEHandler=consumer.native, application=..., config=...)
+        >>> consumer.start()
+        >>> consumer.soe_handler.gv_index_value_nested_dict
+    """
+
+    def __init__(self, soe_handler: SOEHandler = None,
+                 capacity: int = 65536,
+                 batch_size: int = 4096,
+                 poll_interval: float = 0.1):
+        """
+        :param soe_handler: where the drained measurements go, default to a new SOEHandler
+        :param capacity: size of the native ring buffer (number of measurements), rounded up to a power of two.
+            Measurements arriving while the buffer is full are dropped and counted, see `overflow`.
+        :param batch_size: maximum number of measurements drained at once
+        :param poll_interval: in seconds, maximum wait of the consumer thread between two drains
+        """
+        if np is None:
+            raise ImportError("BufferedSOEConsumer requires numpy, i.e., `pip install numpy`")
+        self.native = asiodnp3.RingBufferSOEHandler(capacity)
+        self.soe_handler: SOEHandler = soe_handler if soe_handler is not None else SOEHandler()
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+
+        self._lock = threading.Lock()  # one drain at a time
+        self._after_drain: Deque[Callable[[], None]] = deque()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._reported_overflow: int = 0
+
+    @property
+    def overflow(self) -> int:
+        """Number of measurements dropped because the buffer was full."""
+        return self.native.GetOverflowCount()
+
+    @property
+    def backlog(self) -> int:
+        """Number of measurements waiting to be drained."""
+        return self.native.Size()
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, name="BufferedSOEConsumer", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = None):
+        """Stop the consumer thread, after draining what is left in the buffer."""
+        self._stopped.set()
+        self.native.Notify()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def call_after_drain(self, callback: Callable[[], None]):
+        """Run callback on the consumer thread once everything buffered so far has been drained,
+        e.g., to resolve a scan only after its response reached the SOEHandler.
+        """
+        self._after_drain.append(callback)
+        self.native.Notify()
+
+    def drain(self, max_items: int = None) -> int:
+        """Move up to max_items (default to all) buffered measurements into the SOEHandler.
+
+        :return: number of measurements drained
+        """
+        with self._lock:
+            gvs, types, indices, values, flags, times = self.native.Drain(max_items or 0)
+            if len(indices):
+                self._dispatch(gvs, types, indices, values, flags, times)
+        overflow = self.overflow
+        if overflow != self._reported_overflow:
+            _log.warning(f"SOE buffer overflow, {overflow - self._reported_overflow} measurements dropped "
+                         f"(capacity {self.native.Capacity()})")
+            self._reported_overflow = overflow
+        return len(indices)
+
+    def _dispatch(self, gvs, types, indices, values, flags, times):
+        """Hand one batch to the SOEHandler, one _post_process per (group-variation, point type), in order."""
+        keys = gvs.astype(np.uint32) << 8 | types
+        unique_keys, first = np.unique(keys, return_index=True)
+        for key in unique_keys[np.argsort(first)]:
+            mask = keys == key
+            info_gv = opendnp3.GroupVariation(int(key) >> 8)
+            point_type = POINT_TYPE_CODES[int(key) & 0xFF]
+            vals = values[mask]
+            if point_type in ("Binary", "BinaryOutputStatus"):
+                vals = vals.astype(bool)
+            elif point_type in ("Counter", "FrozenCounter", "DoubleBitBinary") \
+                    or info_gv in INT_ANALOG_GVS or info_gv in INT_ANALOG_OUTPUT_STATUS_GVS:
+                vals = vals.astype(np.int64)
+            arrays = (indices[mask], vals, flags[mask], times[mask])
+            visitor_ind_val = None  # Note: only written to the SOEHandler columns, see SOEHandler._post_process
+            if point_type not in SOEHandler.array_point_types:
+                visitor_ind_val = [(index, opendnp3.DoubleBit(value))
+                                   for index, value in zip(arrays[0].tolist(), vals.tolist())]
+            self.soe_handler._post_process(info_gv=info_gv, visitor_ind_val=visitor_ind_val,
+                                           point_type=point_type, arrays=arrays)
+
+    def _run(self):
+        while True:
+            stopped = self._stopped.is_set()
+            if not stopped:
+                self.native.Wait(int(self.poll_interval * 1000))
+            # Note: take the callbacks before draining, their data was buffered before they were queued.
+            callbacks = [self._after_drain.popleft() for _ in range(len(self._after_drain))]
+            try:
+                while self.drain(self.batch_size) == self.batch_size:
+                    pass
+            except Exception as e:
+                _log.error(f"Failed to drain the SOE buffer: {e!r}")
+            for callback in callbacks:
+                try:
+                    callback()
+                except Exception as e:
+                    _log.error(f"Callback after drain failed: {e!r}")
+            if stopped:
+                return
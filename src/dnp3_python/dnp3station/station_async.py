@@ -0,0 +1,221 @@
+"""
+    asyncio front-end for MyMasterNew and MyOutStationNew.
+
+    opendnp3 invokes callbacks (task completion, command results, channel state) on its own worker threads.
+    The classes below forward them into the event loop with loop.call_soon_threadsafe, so that
+    a single asyncio service can drive many stations without blocking on time.sleep.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import sys
+
+from pydnp3 import opendnp3, asiodnp3
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .master_new import MyMasterNew, DbStorage, DbPointVal
+from .outstation_new import MyOutStationNew
+from .connection import ConnectionTracker
+from .station_utils import parsing_gv_to_mastercmdtype, MasterCmdType
+from .subscriptions import Subscription
+
+stdout_stream = logging.StreamHandler(sys.stdout)
+stdout_stream.setFormatter(logging.Formatter('%(asctime)s\t%(name)s\t%(levelname)s\t%(message)s'))
+
+_log = logging.getLogger(__name__)
+_log.setLevel(logging.INFO)
+
+
+def _set_future_result(future: asyncio.Future, result):
+    if not future.done():
+        future.set_result(result)
+
+
+class _AsyncStationMixin:
+    """
+        Channel state tracking shared by AsyncMaster and AsyncOutstation.
+        Note: all the attributes below are only touched from the event loop thread.
+    """
+
+    loop: asyncio.AbstractEventLoop
+    state: opendnp3.ChannelState
+    _state_waiters: List[Tuple[opendnp3.ChannelState, asyncio.Future]]
+
+    def _init_state_tracking(self, loop: Optional[asyncio.AbstractEventLoop], kwargs: dict) -> dict:
+        """:return: the station arguments, with a listener forwarding the state changes to the event loop
+
+        :raise ValueError: if a shared channel is given, its listener cannot be replaced
+        """
+        if kwargs.get("channel") is not None:
+            raise ValueError("A shared channel= cannot report its state to the async station, "
+                             "let the station create its channel (or use the synchronous station)")
+        if loop is None:
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                raise ValueError("No running event loop, create the station from a coroutine or pass loop=")
+        self.loop = loop
+        self.state = opendnp3.ChannelState.CLOSED
+        self._state_waiters = []
+        # Note: OnStateChange runs on an opendnp3 worker thread, hop into the event loop first.
+        # A listener given by the caller is chained, i.e., still notified of every state change.
+        inner: Optional[asiodnp3.IChannelListener] = kwargs.get("listener")
+        kwargs = dict(kwargs, listener=ConnectionTracker(
+            inner=inner, on_state_change=lambda state: self.loop.call_soon_threadsafe(self._on_state_change, state)))
+        return kwargs
+
+    def _on_state_change(self, state: opendnp3.ChannelState):
+        self.state = state
+        for target, waiter in self._state_waiters:
+            if target == state:
+                _set_future_result(waiter, state)
+
+    async def wait_for_state(self, state: opendnp3.ChannelState, timeout: Optional[float] = None):
+        """Wait until the channel reaches `state`, e.g., opendnp3.ChannelState.OPEN
+
+        :raise asyncio.TimeoutError: if the state is not reached within timeout (in seconds)
+        """
+        if self.state == state:
+            return state
+        waiter = self.loop.create_future()
+        entry = (state, waiter)
+        self._state_waiters.append(entry)
+        try:
+            return await asyncio.wait_for(waiter, timeout)
+        finally:
+            self._state_waiters.remove(entry)
+
+    async def wait_connected(self, timeout: Optional[float] = None):
+        """Wait until the channel is open."""
+        return await self.wait_for_state(opendnp3.ChannelState.OPEN, timeout)
+
+    @property
+    def is_connected(self) -> bool:
+        return self.state == opendnp3.ChannelState.OPEN
+
+
+class AsyncMaster(_AsyncStationMixin):
+    """
+        asyncio wrapper of MyMasterNew. Scans and commands return awaitables that resolve
+        when opendnp3 reports completion, without blocking the event loop.
+
+        EXAMPLE:
+        >>> async def main():
+        ...     master = AsyncMaster(outstation_ip="127.0.0.1", port=20000)
+        ...     master.start()
+        ...     await master.wait_connected(timeout=10)
+        ...     print(await master.get_db_by_group_variation(group=30, variation=6))
+        ...     await master.shutdown()
+    """
+
+    def __init__(self, *args, loop: Optional[asyncio.AbstractEventLoop] = None, **kwargs):
+        """
+        :param loop: event loop to deliver results to, default to the running event loop,
+            i.e., required when created outside of a coroutine.
+        :param listener: optional channel listener, chained behind the state tracking of this class
+        Other arguments are passed to MyMasterNew, except channel (a shared channel is not supported).
+
+        :raise ValueError: if channel is given
+        """
+        self.station = MyMasterNew(*args, **self._init_state_tracking(loop, kwargs))
+
+    def start(self):
+        self.station.start()
+
+    async def read(self, gv_id: opendnp3.GroupVariationID) -> DbStorage:
+        """Scan all objects of a group-variation, see MyMasterNew.read_async
+
+        :raise RuntimeError: if the scan task failed
+        """
+        return await asyncio.wrap_future(self.station.read_async(gv_id), loop=self.loop)
+
+    async def read_many(self, gv_ids: List[opendnp3.GroupVariationID]) -> DbStorage:
+        """Scan several group-variations in a single request, see MyMasterNew.read_many_async
+
+        :raise RuntimeError: if the scan task failed
+        """
+        return await asyncio.wrap_future(self.station.read_many_async(gv_ids), loop=self.loop)
+
+    async def get_db_by_group_variation(self, group: int, variation: int) -> DbStorage:
+        return await self.read(opendnp3.GroupVariationID(group, variation))
+
+    async def scan_classes(self, field: opendnp3.ClassField = None):
+        """Perform a class-based scan, default to all classes (i.e., integrity poll)
+
+        :raise RuntimeError: if the scan task failed
+        """
+        await asyncio.wrap_future(self.station.scan_classes_async(field), loop=self.loop)
+
+    def subscribe(self, gv, callback: Callable[[Dict[int, DbPointVal]], None], **kwargs) -> Subscription:
+        """see MyMasterNew.subscribe, the callback is invoked in the event loop thread."""
+        return self.station.subscribe(gv, lambda batch: self.loop.call_soon_threadsafe(callback, batch), **kwargs)
+
+    def _command_callback(self) -> Tuple[asyncio.Future, Callable[[opendnp3.ICommandTaskResult], None]]:
+        future = self.loop.create_future()
+
+        def callback(result: opendnp3.ICommandTaskResult):
+            # Note: the result is only valid during the callback, extract the summary before leaving.
+            self.loop.call_soon_threadsafe(_set_future_result, future, result.summary)
+
+        return future, callback
+
+    async def send_direct_operate_command(self, command: MasterCmdType, index: int) -> opendnp3.TaskCompletion:
+        """Direct operate a single command and wait for the task summary."""
+        future, callback = self._command_callback()
+        self.station.send_direct_operate_command(command=command, index=index, callback=callback)
+        return await future
+
+    async def send_select_and_operate_command(self, command: MasterCmdType, index: int) -> opendnp3.TaskCompletion:
+        """Select and operate a single command and wait for the task summary."""
+        future, callback = self._command_callback()
+        self.station.send_select_and_operate_command(command=command, index=index, callback=callback)
+        return await future
+
+    async def send_direct_point_command(self, group: int, variation: int, index: int,
+                                        val_to_set: DbPointVal) -> opendnp3.TaskCompletion:
+        """Awaitable counterpart of MyMasterNew.send_direct_point_command"""
+        master_cmd = parsing_gv_to_mastercmdtype(group=group, variation=variation, val_to_set=val_to_set)
+        return await self.send_direct_operate_command(command=master_cmd, index=index)
+
+    async def shutdown(self, sleep_before_shutdown: float = 2):
+        """Non-blocking shutdown: wait in the event loop, then release the stack in the default executor."""
+        await asyncio.sleep(sleep_before_shutdown)
+        await self.loop.run_in_executor(None, self.station.shutdown, 0)
+
+
+class AsyncOutstation(_AsyncStationMixin):
+    """
+        asyncio wrapper of MyOutStationNew.
+    """
+
+    def __init__(self, *args, loop: Optional[asyncio.AbstractEventLoop] = None, **kwargs):
+        """
+        :param loop: event loop to deliver results to, default to the running event loop,
+            i.e., required when created outside of a coroutine.
+        :param listener: optional channel listener, chained behind the state tracking of this class
+        Other arguments are passed to MyOutStationNew, except channel (a shared channel is not supported).
+
+        :raise ValueError: if channel is given
+        """
+        self.station = MyOutStationNew(*args, **self._init_state_tracking(loop, kwargs))
+
+    def start(self):
+        self.station.start()
+
+    def apply_update(self, measurement, index: int):
+        """see MyOutStationNew.apply_update, the update is queued to the stack without blocking."""
+        self.station.apply_update(measurement, index)
+
+    def apply_updates(self, updates=(), arrays: Optional[dict] = None):
+        """see MyOutStationNew.apply_updates, all the points are queued to the stack in a single update."""
+        self.station.apply_updates(updates, arrays=arrays)
+
+    @property
+    def db(self) -> dict:
+        return self.station.db_handler.db
+
+    async def shutdown(self, sleep_before_shutdown: float = 2):
+        """Non-blocking shutdown: wait in the event loop, then release the stack in the default executor."""
+        await asyncio.sleep(sleep_before_shutdown)
+        await self.loop.run_in_executor(None, self.station.shutdown, 0)
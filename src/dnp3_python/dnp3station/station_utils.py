@@ -1,13 +1,25 @@
+from __future__ import annotations
+
 import datetime
 import logging
 import sys
+import threading
 import time
 
 from pydnp3 import opendnp3, openpal, asiopal, asiodnp3
 from .visitors import *
+from .point_store import PointStore
+from .change_filter import ChangeFilter, FILTERED_POINT_TYPES
+from .subscriptions import SubscriptionRegistry
+from .event_telemetry import EventTelemetry, EVENT_GVS
 from pydnp3.opendnp3 import GroupVariation, GroupVariationID
 
-from typing import Callable, Union, Dict, Tuple, List, Optional, Type, TypeVar
+from typing import Callable, Union, Dict, Tuple, List, NamedTuple, Optional, Type, TypeVar
+
+try:
+    import numpy as np
+except ImportError:  # optional dependency, enables the SOEHandler fast path
+    np = None
 
 stdout_stream = logging.StreamHandler(sys.stdout)
 stdout_stream.setFormatter(logging.Formatter('%(asctime)s\t%(name)s\t%(levelname)s\t%(message)s'))
@@ -43,9 +55,42 @@ OutstationCmdType = Union[opendnp3.Analog,
                           opendnp3.Binary,
                           opendnp3.BinaryOutputStatus]
 
+
+class PointRecord(NamedTuple):
+    """A point of the master-side cache, see SOEHandler.get_point"""
+    value: DbPointVal
+    flags: Optional[int]  # quality flags, e.g., 0x01 (ONLINE), None if not reported (e.g., TimeAndInterval)
+    time: Optional[int]  # outstation timestamp in ms since epoch, 0 if the object has no time
+    received: datetime.datetime  # local receive time
+
+
 MeasurementType = TypeVar("MeasurementType",
                           bound=opendnp3.Measurement)  # inheritance, e.g., opendnp3.Analog,
 
+# group-variations with integer values, which VisitorXXAnalog does not distinguish from float
+INT_ANALOG_GVS = [
+    # GroupVariation.Group30Var0,
+    GroupVariation.Group30Var1,
+    GroupVariation.Group30Var2,
+    GroupVariation.Group30Var3,
+    GroupVariation.Group30Var4,
+    # GroupVariation.Group32Var0,
+    GroupVariation.Group32Var1,
+    GroupVariation.Group32Var2,
+    GroupVariation.Group32Var3,
+    GroupVariation.Group32Var4
+]
+INT_ANALOG_OUTPUT_STATUS_GVS = [
+    # GroupVariation.Group40Var0,
+    GroupVariation.Group40Var1,
+    GroupVariation.Group40Var2,
+    # GroupVariation.Group42Var0,
+    GroupVariation.Group42Var1,
+    GroupVariation.Group42Var2,
+    GroupVariation.Group42Var3,
+    GroupVariation.Group42Var4
+]
+
 # TODO: add validating connection logic
 # TODO: add validating configuration logic
 #  (e.g., check if db at outstation side is configured correctly, i.e., OutstationStackConfig)
@@ -69,11 +114,47 @@ class AppChannelListener(asiodnp3.IChannelListener):
         Override IChannelListener in this manner to implement application-specific channel behavior.
     """
 
-    def __init__(self):
+    def __init__(self, on_state_change: Optional[Callable[[opendnp3.ChannelState], None]] = None):
+        """
+        :param on_state_change: optional hook invoked (on the opendnp3 worker thread) with every new channel state
+        """
         super(AppChannelListener, self).__init__()
+        self.state: opendnp3.ChannelState = opendnp3.ChannelState.CLOSED
+        self._on_state_change = on_state_change
 
     def OnStateChange(self, state):
         _log.debug('In AppChannelListener.OnStateChange: state={}'.format(opendnp3.ChannelStateToString(state)))
+        self.state = state
+        if self._on_state_change:
+            self._on_state_change(state)
+
+
+class TaskCallback(opendnp3.ITaskCallback):
+    """
+        Override ITaskCallback in this manner to get notified when a master task (e.g., a scan) completes.
+
+        The master keeps only a raw pointer to the callback, so the owner must keep the instance alive
+        until OnDestroyed is invoked.
+    """
+
+    def __init__(self,
+                 on_complete: Callable[[opendnp3.TaskCompletion], None],
+                 on_destroyed: Optional[Callable[[TaskCallback], None]] = None):
+        super(TaskCallback, self).__init__()
+        self._on_complete = on_complete
+        self._on_destroyed = on_destroyed
+        self.completed: bool = False
+
+    def OnStart(self):
+        pass
+
+    def OnComplete(self, result):
+        self.completed = True
+        self._on_complete(result)
+
+    def OnDestroyed(self):
+        if self._on_destroyed:
+            self._on_destroyed(self)
 
 
 class SOEHandler(opendnp3.ISOEHandler):
@@ -83,13 +164,50 @@ class SOEHandler(opendnp3.ISOEHandler):
         This is an interface for SequenceOfEvents (SOE) callbacks from the Master stack to the application layer.
     """
 
-    def __init__(self, soehandler_log_level=logging.INFO, *args, **kwargs):
+    # ICollection type -> point type in PointStore
+    point_types: dict = {
+        opendnp3.ICollectionIndexedBinary: "Binary",
+        opendnp3.ICollectionIndexedDoubleBitBinary: "DoubleBitBinary",
+        opendnp3.ICollectionIndexedCounter: "Counter",
+        opendnp3.ICollectionIndexedFrozenCounter: "FrozenCounter",
+        opendnp3.ICollectionIndexedAnalog: "Analog",
+        opendnp3.ICollectionIndexedBinaryOutputStatus: "BinaryOutputStatus",
+        opendnp3.ICollectionIndexedAnalogOutputStatus: "AnalogOutputStatus",
+    }
+    # point types collected with ICollection.ToArrays when numpy is available.
+    # Note: DoubleBitBinary keeps the visitor path to report opendnp3.DoubleBit values.
+    array_point_types = {"Binary", "Counter", "FrozenCounter", "Analog", "BinaryOutputStatus", "AnalogOutputStatus"}
+
+    def __init__(self, soehandler_log_level=logging.INFO, point_store: Optional[PointStore] = None, *args, **kwargs):
+        """
+        :param point_store: optional array-backed store (see point_store.PointStore), keyed by point type,
+            updated along with the storage below
+        """
         super(SOEHandler, self).__init__()
 
+        self.point_store: Optional[PointStore] = point_store
+        # change subscribers, see subscriptions.SubscriptionRegistry
+        self.subscriptions = SubscriptionRegistry()
+        # optional event counting, see event_telemetry.EventTelemetry
+        self.event_telemetry: Optional[EventTelemetry] = None
+
+        # columns of the group-variations collected as arrays (see array_point_types), keyed by group-variation.
+        # Note: the dicts below are views of these columns, brought up to date when read, see _sync_views
+        self._gv_store: Optional[PointStore] = PointStore() if np is not None else None
+        self._synced_seq: int = 0  # self._gv_store.seq of the last _sync_views
+        self._sync_lock = threading.Lock()
+
         # auxiliary database
         self._gv_index_value_nested_dict: Dict[GroupVariation, Optional[Dict[int, DbPointVal]]] = {}
         self._gv_ts_ind_val_dict: Dict[GroupVariation, Tuple[datetime.datetime, Optional[Dict[int, DbPointVal]]]] = {}
         self._gv_last_poll_dict: Dict[GroupVariation, Optional[datetime.datetime]] = {}
+        # per-point metadata, i.e., {gv: {index: ...}}
+        self._gv_point_flags: Dict[GroupVariation, Dict[int, int]] = {}  # quality flags
+        self._gv_point_time: Dict[GroupVariation, Dict[int, int]] = {}  # outstation timestamp, ms since epoch
+        self._gv_point_received: Dict[GroupVariation, Dict[int, datetime.datetime]] = {}  # local receive time
+        # number of headers received per group-variation, and the oldest receive time as of that number
+        self._gv_updates: Dict[GroupVariation, int] = {}
+        self._gv_oldest_received: Dict[GroupVariation, Tuple[int, Optional[datetime.datetime]]] = {}
 
         # logging
         self.logger = logging.getLogger(self.__class__.__name__)
@@ -112,6 +230,35 @@ class SOEHandler(opendnp3.ISOEHandler):
         :param info: HeaderInfo
         :param values: A collection of values received from the Outstation (various data types are possible).
         """
+        info_gv: GroupVariation = info.gv
+        point_type: Optional[str] = self.point_types.get(type(values))
+        arrays = None
+        if np is not None and point_type in self.array_point_types:
+            # fast path: collect the whole header in one native call, instead of one OnValue callback per point
+            arrays = values.ToArrays()  # (index, value, flags, time)
+            indices, vals = arrays[0], arrays[1]
+            if info_gv in INT_ANALOG_GVS or info_gv in INT_ANALOG_OUTPUT_STATUS_GVS:
+                vals = vals.astype(np.int64)
+                arrays = (indices, vals) + tuple(arrays[2:])
+            visitor_ind_val, flags_and_time = None, None
+        else:
+            visitor_ind_val, flags_and_time = self._visit(info, values)
+
+        if self.logger.isEnabledFor(logging.DEBUG):
+            for index, value in visitor_ind_val if visitor_ind_val is not None else self._pairs(arrays):
+                log_string = 'SOEHandler.Process {0}\theaderIndex={1}\tdata_type={2}\tindex={3}\tvalue={4}'
+                self.logger.debug(log_string.format(info.gv, info.headerIndex, type(values).__name__, index, value))
+
+        self._post_process(info_gv=info_gv, visitor_ind_val=visitor_ind_val,
+                           point_type=point_type, arrays=arrays, flags_and_time=flags_and_time)
+
+    @staticmethod
+    def _visit(info, values: ICollectionIndexedVal
+               ) -> Tuple[List[Tuple[int, DbPointVal]], Optional[List[Tuple[int, int]]]]:
+        """Collect (index, value) pairs through a Python visitor, i.e., one OnValue callback per point.
+
+        :return: (index, value) pairs and (flags, time) pairs, the latter is None for TimeAndInterval
+        """
         # print("=========Process, info.gv, values", info.gv, values)
         visitor_class_types: dict = {
             opendnp3.ICollectionIndexedBinary: VisitorIndexedBinary,
@@ -128,68 +275,122 @@ class SOEHandler(opendnp3.ISOEHandler):
         # hot-fix VisitorXXAnalog do not distinguish float and integer.
         if visitor_class == VisitorIndexedAnalog:
             # Parsing to Int
-            if info.gv in [
-                # GroupVariation.Group30Var0,
-                GroupVariation.Group30Var1,
-                GroupVariation.Group30Var2,
-                GroupVariation.Group30Var3,
-                GroupVariation.Group30Var4,
-                # GroupVariation.Group32Var0,
-                GroupVariation.Group32Var1,
-                GroupVariation.Group32Var2,
-                GroupVariation.Group32Var3,
-                GroupVariation.Group32Var4
-            ]:
+            if info.gv in INT_ANALOG_GVS:
                 visitor = VisitorIndexedAnalogInt()
         elif visitor_class == VisitorIndexedAnalogOutputStatus:
-            if info.gv in [
-                # GroupVariation.Group40Var0,
-                GroupVariation.Group40Var1,
-                GroupVariation.Group40Var2,
-                # GroupVariation.Group42Var0,
-                GroupVariation.Group42Var1,
-                GroupVariation.Group42Var2,
-                GroupVariation.Group42Var3,
-                GroupVariation.Group42Var4
-            ]:
+            if info.gv in INT_ANALOG_OUTPUT_STATUS_GVS:
                 visitor = VisitorIndexedAnalogOutputStatusInt()
         # Note: mystery method, magic side effect to update visitor.index_and_value
         values.Foreach(visitor)
 
         # visitor.index_and_value: List[Tuple[int, DbPointVal]]
-        for index, value in visitor.index_and_value:
-            log_string = 'SOEHandler.Process {0}\theaderIndex={1}\tdata_type={2}\tindex={3}\tvalue={4}'
-            self.logger.debug(log_string.format(info.gv, info.headerIndex, type(values).__name__, index, value))
-            # print(log_string.format(info.gv, info.headerIndex, type(values).__name__, index, value))
-
-        info_gv: GroupVariation = info.gv
-        visitor_ind_val: List[Tuple[int, DbPointVal]] = visitor.index_and_value
+        return visitor.index_and_value, getattr(visitor, "flags_and_time", None)
 
-        # _log.info("======== SOEHandler.Process")
-        # _log.info(f"info_gv {info_gv}")
-        # _log.info(f"visitor_ind_val {visitor_ind_val}")
-        self._post_process(info_gv=info_gv, visitor_ind_val=visitor_ind_val)
+    @staticmethod
+    def _pairs(arrays: tuple) -> List[Tuple[int, DbPointVal]]:
+        """(index, value) pairs of (index, value, flags, time) arrays."""
+        return list(zip(arrays[0].tolist(), arrays[1].tolist()))
 
-    def _post_process(self, info_gv: GroupVariation, visitor_ind_val: List[Tuple[int, DbPointVal]]):
+    def _post_process(self, info_gv: GroupVariation, visitor_ind_val: Optional[List[Tuple[int, DbPointVal]]] = None,
+                      point_type: Optional[str] = None, arrays: Optional[tuple] = None,
+                      flags_and_time: Optional[List[Tuple[int, int]]] = None):
         """
         SOEHandler post process logic to stage data at MasterStation side
         to improve performance: e.g., consistent output
 
         info_gv: GroupVariation,
-        visitor_ind_val: List[Tuple[int, DbPointVal]]
+        visitor_ind_val: List[Tuple[int, DbPointVal]], optional if arrays is given
+        point_type: point type in PointStore (e.g., "Analog"), required to update self.point_store
+        arrays: optional (index, value, flags, time) numpy arrays of the same header, see ICollection.ToArrays
+        flags_and_time: optional (flags, time) pairs matching visitor_ind_val, when arrays is not available
+
+        Note: headers of array_point_types given as arrays are only written to columns (no Python objects per point),
+        the dict views are updated from the columns when read, see _sync_views.
+        """
+        now = datetime.datetime.now()
+        self._gv_updates[info_gv] = self._gv_updates.get(info_gv, 0) + 1
+        if arrays is not None and point_type in self.array_point_types and self._gv_store is not None:
+            indices, times = arrays[0], arrays[3]
+            self._gv_store.update(info_gv, indices=indices, values=arrays[1], flags=arrays[2], times=times,
+                                  received=now.timestamp())
+            if self.point_store is not None:
+                self.point_store.update(point_type, indices=indices, values=arrays[1], flags=arrays[2], times=times,
+                                        received=now.timestamp())
+        else:
+            indices, times = self._update_dicts(info_gv, now, visitor_ind_val, point_type, arrays, flags_and_time)
+
+        if self.event_telemetry is not None and info_gv in EVENT_GVS:
+            self.event_telemetry.record_events(point_type, times=times, received=now.timestamp(), count=len(indices))
+
+        if self.subscriptions.wants(info_gv, point_type):
+            self.subscriptions.dispatch(info_gv, point_type,
+                                        visitor_ind_val if visitor_ind_val is not None else self._pairs(arrays))
+
+    def _update_dicts(self, info_gv: GroupVariation, now: datetime.datetime,
+                      visitor_ind_val: List[Tuple[int, DbPointVal]],
+                      point_type: Optional[str] = None, arrays: Optional[tuple] = None,
+                      flags_and_time: Optional[List[Tuple[int, int]]] = None) -> tuple:
+        """Visitor path of _post_process, i.e., write one header to the dicts directly.
+
+        :return: indices and outstation timestamps (None if not reported) of the header
         """
         # Use dict update method to mitigate delay due to asynchronous communication. (i.e., return None)
         # Also, capture unsolicited updated values.
         if not self._gv_index_value_nested_dict.get(info_gv):
-            self._gv_index_value_nested_dict[info_gv] = (dict(visitor_ind_val))
+            self._gv_index_value_nested_dict[info_gv] = dict(visitor_ind_val)
         else:
-            self._gv_index_value_nested_dict[info_gv].update(dict(visitor_ind_val))
+            self._gv_index_value_nested_dict[info_gv].update(visitor_ind_val)
 
         # Use another layer of storage to handle timestamp related logic
-        self._gv_ts_ind_val_dict[info_gv] = (datetime.datetime.now(),
+        self._gv_ts_ind_val_dict[info_gv] = (now,
                                              self._gv_index_value_nested_dict.get(info_gv))
         # Use another layer of storage to handle timestamp related logic
-        self._gv_last_poll_dict[info_gv] = datetime.datetime.now()
+        self._gv_last_poll_dict[info_gv] = now
+
+        # per-point quality flags, outstation timestamp and receive time
+        if arrays is not None:
+            indices, flags, times = arrays[0].tolist(), arrays[2].tolist(), arrays[3].tolist()
+        else:
+            indices = [index for index, _ in visitor_ind_val]
+            flags, times = zip(*flags_and_time) if flags_and_time else (None, None)
+        self._gv_point_received.setdefault(info_gv, {}).update(dict.fromkeys(indices, now))
+        if flags is not None:
+            self._gv_point_flags.setdefault(info_gv, {}).update(zip(indices, flags))
+            self._gv_point_time.setdefault(info_gv, {}).update(zip(indices, times))
+
+        if self.point_store is not None and point_type and arrays is not None:
+            self.point_store.update(point_type, indices=arrays[0], values=arrays[1], flags=arrays[2],
+                                    times=arrays[3], received=now.timestamp())
+        elif self.point_store is not None and point_type and visitor_ind_val:
+            values = [value for _, value in visitor_ind_val]
+            if point_type == "DoubleBitBinary":
+                values = [int(value) for value in values]  # opendnp3.DoubleBit to its integer representation
+            self.point_store.update(point_type, indices=indices, values=values, flags=flags, times=times,
+                                    received=now.timestamp())
+        return indices, times
+
+    def _sync_views(self):
+        """Bring the dict views up to date with the headers written to self._gv_store since the previous call,
+        i.e., only the points updated in between are converted to Python objects."""
+        store = self._gv_store
+        if store is None or store.seq == self._synced_seq:
+            return
+        with self._sync_lock:
+            synced_seq, seq = self._synced_seq, store.seq
+            for gv in store.updated_since(synced_seq):
+                indices, columns = store.changes(gv, synced_seq)
+                pairs = zip(indices.tolist(), columns.value.tolist())
+                vals = self._gv_index_value_nested_dict.get(gv)
+                if vals is None:  # Note: a failed poll is cached as None, see MyMasterNew._get_updated_val_storages
+                    vals = self._gv_index_value_nested_dict[gv] = dict(pairs)
+                else:
+                    vals.update(pairs)
+                received = datetime.datetime.fromtimestamp(store.last_update(gv)[1])
+                last_poll = self._gv_last_poll_dict.get(gv)
+                if last_poll is None or last_poll < received:
+                    self._gv_last_poll_dict[gv] = received
+                self._gv_ts_ind_val_dict[gv] = (received, vals)
+            self._synced_seq = seq
 
     def Start(self):
         self.logger.debug('In SOEHandler.Start====')
@@ -199,19 +400,79 @@ class SOEHandler(opendnp3.ISOEHandler):
 
     @property
     def gv_index_value_nested_dict(self) -> Dict[GroupVariation, Optional[Dict[int, DbPointVal]]]:
+        self._sync_views()
         return self._gv_index_value_nested_dict
 
     @property
     def gv_ts_ind_val_dict(self):
+        self._sync_views()
         return self._gv_ts_ind_val_dict
 
     @property
     def gv_last_poll_dict(self) -> Dict[GroupVariation, Optional[datetime.datetime]]:
+        self._sync_views()
         return self._gv_last_poll_dict
 
+    def _columns(self, gv: GroupVariation):
+        """Columns of a group-variation collected as arrays, None if it went through the visitor path."""
+        if self._gv_store is None or gv not in self._gv_store:
+            return None
+        return self._gv_store.snapshot(gv)
+
+    def get_point(self, gv: GroupVariation, index: int) -> Optional[PointRecord]:
+        """Latest value of a point with its quality flags, outstation timestamp and receive time,
+        None if the point has not been received."""
+        vals = self.gv_index_value_nested_dict.get(gv)
+        if not vals or index not in vals:
+            return None
+        columns = self._columns(gv)
+        if columns is not None:
+            return PointRecord(value=vals[index],
+                               flags=int(columns.flags[index]),
+                               time=int(columns.time[index]),
+                               received=datetime.datetime.fromtimestamp(columns.received[index]))
+        received = self._gv_point_received.get(gv, {}).get(index)
+        if received is None:
+            return None
+        return PointRecord(value=vals[index],
+                           flags=self._gv_point_flags.get(gv, {}).get(index),
+                           time=self._gv_point_time.get(gv, {}).get(index),
+                           received=received)
+
+    def point_received(self, gv: GroupVariation, index: int) -> Optional[datetime.datetime]:
+        """Local receive time of a point, None if the point has not been received."""
+        columns = self._columns(gv)
+        if columns is None:
+            return self._gv_point_received.get(gv, {}).get(index)
+        if index >= len(columns.seq) or not columns.seq[index]:
+            return None
+        return datetime.datetime.fromtimestamp(columns.received[index])
+
+    def gv_oldest_received(self, gv: GroupVariation) -> Optional[datetime.datetime]:
+        """Receive time of the least recently updated point of a group-variation,
+        i.e., a header with some of its points does not make the whole group-variation look fresh.
+
+        Note: computed once per received header, i.e., repeated reads in between do not scan the points again.
+        """
+        updates = self._gv_updates.get(gv, 0)
+        cached = self._gv_oldest_received.get(gv)
+        if cached is not None and cached[0] == updates:
+            return cached[1]
+        columns = self._columns(gv)
+        if columns is None:
+            received = self._gv_point_received.get(gv)
+            oldest = min(received.values()) if received else None
+        else:
+            received = columns.received[columns.seq > 0]
+            oldest = datetime.datetime.fromtimestamp(received.min()) if received.size else None
+        # Note: keyed by the count read beforehand, a header arriving meanwhile only invalidates it
+        self._gv_oldest_received[gv] = (updates, oldest)
+        return oldest
+
     @property
     def db(self) -> dict:
         """micmic DbHandler.db"""
+        self._sync_views()
         self._consolidate_db()
         return self._db
 
@@ -355,6 +616,39 @@ def parsing_gv_to_mastercmdtype(group: int, variation: int, val_to_set: DbPointV
 #                       opendnp3.ControlRelayOutputBlock]
 
 
+# (group, variation) -> opendnp3.CommandSet array method, consistent with parsing_gv_to_mastercmdtype
+COMMAND_SET_ARRAY_METHODS = {
+    (40, 1): "AddAOInt32Array",
+    (40, 2): "AddAOInt16Array",
+    (40, 3): "AddAOFloat32Array",
+    (40, 4): "AddAODouble64Array",
+    (10, 1): "AddCROBArray",
+    (10, 2): "AddCROBArray",
+}
+
+
+def build_command_set(group: int, variation: int, indices, values,
+                      command_set: opendnp3.CommandSet = None) -> opendnp3.CommandSet:
+    """Vectorized counterpart of parsing_gv_to_mastercmdtype: add a full command header in one native call.
+
+    :param indices: point indices, e.g., a numpy array
+    :param values: values to set, same length as indices (bool for group 10, i.e., LATCH_ON/LATCH_OFF)
+    :param command_set: command set to add the header to, default to a new one
+    :raise ValueError: if group-variation is not a valid MasterCmdType, or an index or value is out of range
+
+    EXAMPLE:
+    >>> command_set = build_command_set(40, 4, np.arange(100), np.linspace(0, 1, 100))
+    >>> master_application.send_direct_operate_command_set(command_set)
+    """
+    method_name = COMMAND_SET_ARRAY_METHODS.get((group, variation))
+    if method_name is None:
+        raise ValueError(f"Group {group}, variation {variation} is not a valid MasterCmdType.")
+    if command_set is None:
+        command_set = opendnp3.CommandSet()
+    getattr(command_set, method_name)(indices, values)
+    return command_set
+
+
 def master_to_outstation_command_parser(master_cmd: MasterCmdType) -> OutstationCmdType:
     """
     Used to parse send command to update command, e.g., opendnp3.AnalogOutputDouble64 -> AnalogOutputStatus
@@ -380,16 +674,42 @@ def master_to_outstation_command_parser(master_cmd: MasterCmdType) -> Outstation
         raise ValueError(f"master_cmd {master_cmd} with type {type(master_cmd)} is not a valid command.")
 
 
+def master_to_outstation_command_arrays(commands: List[Tuple[MasterCmdType, int]]) -> Dict[str, tuple]:
+    """Batch counterpart of master_to_outstation_command_parser, in the format of MyOutStationNew.apply_updates arrays,
+    e.g., {"AnalogOutputStatus": ([0, 1], [4.8, 14.1]), "BinaryOutputStatus": ([0], [True])}
+    """
+    arrays: Dict[str, Tuple[List[int], List[DbPointVal]]] = {}
+    for master_cmd, index in commands:
+        if type(master_cmd) is opendnp3.ControlRelayOutputBlock:
+            point_type, value = "BinaryOutputStatus", master_to_outstation_command_parser(master_cmd).value
+        elif type(master_cmd) in [opendnp3.AnalogOutputDouble64,
+                                  opendnp3.AnalogOutputFloat32,
+                                  opendnp3.AnalogOutputInt32,
+                                  opendnp3.AnalogOutputInt16]:
+            point_type, value = "AnalogOutputStatus", master_cmd.value
+        else:
+            raise ValueError(f"master_cmd {master_cmd} with type {type(master_cmd)} is not a valid command.")
+        indices, values = arrays.setdefault(point_type, ([], []))
+        indices.append(index)
+        values.append(value)
+    return arrays
+
+
 class DBHandler:
     """
         Work as an auxiliary database for outstation (Mimic SOEHAndler for master-station)
     """
 
     def __init__(self, stack_config=asiodnp3.OutstationStackConfig(opendnp3.DatabaseSizes.AllTypes(10)),
-                 dbhandler_log_level=logging.INFO, *args, **kwargs):
+                 dbhandler_log_level=logging.INFO, change_filter: Optional[ChangeFilter] = None, *args, **kwargs):
+        """
+        :param change_filter: optional deadbands/change detection against the last applied values,
+            see filter_changes
+        """
 
         self.stack_config = stack_config
         self._db: dict = self.config_db(stack_config)
+        self.change_filter: Optional[ChangeFilter] = change_filter
 
         self.logger = logging.getLogger(self.__class__.__name__)
         self.config_logger(log_level=dbhandler_log_level)
@@ -427,6 +747,38 @@ class DBHandler:
             self.db[command.__class__.__name__] = update_body
         # _log.info(f"========= self.db {self.db}")
 
+    def is_changed(self, measurement, index, force: bool = False) -> bool:
+        """Whether a measurement passes the change filter, i.e., should be applied. True without a filter.
+
+        :param force: pass the measurement anyway, it is still recorded as the last applied value
+        """
+        point_type = measurement.__class__.__name__
+        if self.change_filter is None or point_type not in FILTERED_POINT_TYPES:
+            return True
+        value = measurement.value
+        if point_type == "DoubleBitBinary":
+            value = int(value)  # opendnp3.DoubleBit to its integer representation
+        return self.change_filter.select_one(point_type, index, value, measurement.flags.value, force=force)
+
+    def filter_changes(self, point_type: str, indices, values, flags=None, force: bool = False):
+        """Vectorized counterpart of is_changed, e.g., filter_changes("Analog", np.arange(5000), values)
+
+        :return: boolean mask of the points to apply, None without a filter (i.e., apply them all)
+        """
+        if self.change_filter is None:
+            return None
+        return self.change_filter.select(point_type, indices, values, flags, force=force)
+
+    def process_many(self, point_type: str, indices, values):
+        """Bulk counterpart of process, e.g., process_many("Analog", [0, 1], [4.8, 14.1])"""
+        if hasattr(indices, "tolist"):  # numpy arrays
+            indices, values = indices.tolist(), values.tolist()
+        update_body: dict = dict(zip(indices, values))
+        if self.db.get(point_type):
+            self.db[point_type].update(update_body)
+        else:
+            self.db[point_type] = update_body
+
 
 class MyLogger(openpal.ILogHandler):
     """
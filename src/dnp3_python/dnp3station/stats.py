@@ -0,0 +1,175 @@
+"""
+    Channel and stack statistics snapshots.
+
+    IChannel.GetStatistics and IStack.GetStackStatistics each block on a round trip to the stack's executor
+    and copy a nested struct into Python objects. asiodnp3.CollectStatistics reads the counters of any number
+    of channels and stacks in one Python call into a numpy array. It still makes one round trip per distinct
+    channel and per stack (opendnp3 only offers these synchronous getters), but without holding the GIL,
+    without Python objects per counter, and reading a channel shared by several stations once.
+    This module wraps the array into
+        - StatsSnapshot: the flat counters of one station (slotted object, one attribute per counter),
+        - StatsCache: a snapshot reused for max_age seconds, and refreshed as soon as the connection state changes,
+        - StatsTable: the counters of many stations, e.g., MasterPool.stats(), as numpy columns.
+
+    EXAMPLE:
+    >>> snapshot = master.stats(max_age=1)
+    >>> snapshot.numTransportRx, snapshot.numUnknownDestination
+    (1520, 0)
+    >>> table = pool.stats()
+    >>> table.column("numOpenFail").sum()
+    12
+    >>> table[("127.0.0.1", 20000, 1)].numBytesRx
+    48210
+
+    Note: NumPy is required, i.e., `pip install numpy` to use this module.
+"""
+from __future__ import annotations
+
+import threading
+import time
+
+from pydnp3 import asiodnp3
+from typing import Dict, Hashable, Iterable, List, Optional, Sequence
+
+from .connection import ConnectionTracker
+
+# counter names, i.e., the columns of asiodnp3.CollectStatistics
+FIELDS = tuple(asiodnp3.STATISTICS_FIELDS)
+
+
+class StatsSnapshot:
+    """Channel (link) and stack (link/transport) counters of a station at a point in time."""
+
+    __slots__ = FIELDS + ("time",)
+
+    def __init__(self, values: Sequence[int], time: float):
+        """
+        :param values: one value per counter, in FIELDS order
+        :param time: time.monotonic() of the snapshot
+        """
+        for name, value in zip(FIELDS, values):
+            setattr(self, name, int(value))
+        self.time = time
+
+    @property
+    def age(self) -> float:
+        """Seconds since the snapshot was taken."""
+        return time.monotonic() - self.time
+
+    def as_dict(self) -> Dict[str, int]:
+        return {name: getattr(self, name) for name in FIELDS}
+
+    def __eq__(self, other):
+        return isinstance(other, StatsSnapshot) and self.as_dict() == other.as_dict()
+
+    def __repr__(self):
+        counters = ", ".join(f"{name}={getattr(self, name)}" for name in FIELDS)
+        return f"StatsSnapshot({counters})"
+
+
+def collect(channels: Sequence[Optional[asiodnp3.IChannel]],
+            stacks: Sequence[Optional[asiodnp3.IStack]] = ()) -> "np.ndarray":
+    """Counters of many channels and stacks, one row per entry (zeros for None), columns in FIELDS order.
+
+    :param stacks: empty, or as long as channels
+    """
+    return asiodnp3.CollectStatistics(list(channels), list(stacks))
+
+
+class StatsCache:
+    """
+        Snapshot of one station, reused until it is older than max_age or the connection state changed.
+    """
+
+    def __init__(self, channel: Optional[asiodnp3.IChannel], stack: Optional[asiodnp3.IStack],
+                 connection: Optional[ConnectionTracker] = None, max_age: float = 0):
+        """
+        :param connection: tracker of the channel, a state change since the snapshot invalidates it
+        :param max_age: default max_age of get, in seconds, 0 to always read fresh counters
+        """
+        self.channel = channel
+        self.stack = stack
+        self.connection = connection
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._snapshot: Optional[StatsSnapshot] = None
+
+    def get(self, max_age: Optional[float] = None) -> StatsSnapshot:
+        max_age = self.max_age if max_age is None else max_age
+        snapshot = self._snapshot
+        if snapshot is not None and self._is_fresh(snapshot, max_age):
+            return snapshot
+        with self._lock:
+            snapshot = self._snapshot
+            if snapshot is None or not self._is_fresh(snapshot, max_age):
+                now = time.monotonic()
+                row = collect([self.channel], [self.stack])[0]
+                snapshot = self._snapshot = StatsSnapshot(row.tolist(), now)
+            return snapshot
+
+    def _is_fresh(self, snapshot: StatsSnapshot, max_age: float) -> bool:
+        now = time.monotonic()
+        if max_age <= 0 or now - snapshot.time > max_age:
+            return False
+        last_change = self.connection.last_change if self.connection is not None else None
+        return last_change is None or last_change <= snapshot.time
+
+    def invalidate(self):
+        self._snapshot = None
+
+
+class StatsTable:
+    """
+        Counters of many stations, one row per key (e.g., MasterPool station keys), taken at once.
+    """
+
+    def __init__(self, keys: List[Hashable], values: "np.ndarray", time: float):
+        self.keys = keys
+        self.values = values  # shape (len(keys), len(FIELDS)), uint64
+        self.time = time
+        self._rows: Dict[Hashable, int] = {key: row for row, key in enumerate(keys)}
+
+    @classmethod
+    def collect(cls, keys: List[Hashable], channels: Sequence[Optional[asiodnp3.IChannel]],
+                stacks: Sequence[Optional[asiodnp3.IStack]] = ()) -> StatsTable:
+        now = time.monotonic()
+        return cls(list(keys), collect(channels, stacks), now)
+
+    def is_fresh(self, max_age: float, keys: Sequence[Hashable],
+                 connections: Iterable[ConnectionTracker] = ()) -> bool:
+        """Whether the table can be reused, i.e., not older than max_age, of the same keys (stations),
+        and none of the connections changed state since.
+        """
+        if max_age <= 0 or time.monotonic() - self.time > max_age or list(keys) != self.keys:
+            return False
+        return all(connection.last_change is None or connection.last_change <= self.time
+                   for connection in connections)
+
+    def column(self, name: str) -> "np.ndarray":
+        """One counter of all the stations, e.g., column("numOpenFail")
+
+        :raise ValueError: if there is no such counter
+        """
+        return self.values[:, FIELDS.index(name)]
+
+    def total(self) -> StatsSnapshot:
+        """Sum of each counter over all the stations.
+
+        Note: stations sharing a channel count its channel counters once per station.
+        """
+        return StatsSnapshot(self.values.sum(axis=0).tolist(), self.time)
+
+    def __getitem__(self, key: Hashable) -> StatsSnapshot:
+        return StatsSnapshot(self.values[self._rows[key]].tolist(), self.time)
+
+    def __contains__(self, key: Hashable):
+        return key in self._rows
+
+    def __len__(self):
+        return len(self.keys)
+
+    def __iter__(self):
+        return iter(self.keys)
+
+    def as_dict(self) -> Dict[Hashable, Dict[str, int]]:
+        return {key: dict(zip(FIELDS, row)) for key, row in zip(self.keys, self.values.tolist())}
@@ -0,0 +1,224 @@
+"""
+    Event-driven access to the SOE stream, as an alternative to polling SOEHandler.gv_index_value_nested_dict.
+
+    A Subscription receives the points of a group-variation (e.g., GroupVariation.Group30Var6) or of a point type
+    (e.g., "Analog", i.e., static and event group-variations alike) as change batches, i.e., {index: value}.
+    Bursts of updates (e.g., unsolicited responses) can be coalesced within a time window,
+    in which case only the latest value per index is delivered.
+
+    Note: callbacks run on the opendnp3 worker thread (coalesce_ms=0) or on the FlushTimer thread shared by all
+    the subscriptions (coalesce_ms>0), they should return quickly and hand over heavy work to another thread/event loop.
+"""
+from __future__ import annotations
+
+import heapq
+import itertools
+import logging
+import sys
+import threading
+import time
+
+from pydnp3.opendnp3 import GroupVariation
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+stdout_stream = logging.StreamHandler(sys.stdout)
+stdout_stream.setFormatter(logging.Formatter('%(asctime)s\t%(name)s\t%(levelname)s\t%(message)s'))
+
+_log = logging.getLogger(__name__)
+_log.addHandler(stdout_stream)
+_log.setLevel(logging.INFO)
+
+DbPointVal = Union[float, int, bool]
+SubscriptionKey = Union[GroupVariation, str]  # e.g., GroupVariation.Group30Var6 or "Analog"
+ChangeCallback = Callable[[Dict[int, DbPointVal]], None]
+
+
+class FlushTimer:
+    """
+        Single thread closing the coalescing windows of many subscriptions, instead of a threading.Timer
+        (i.e., a new thread) per window. Use FlushTimer.shared().
+    """
+
+    _shared: Optional[FlushTimer] = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        # (deadline in time.monotonic(), tie breaker, subscription)
+        self._heap: List[Tuple[float, int, Subscription]] = []
+        self._counter = itertools.count()
+        self._thread: Optional[threading.Thread] = None
+
+    @classmethod
+    def shared(cls) -> FlushTimer:
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            return cls._shared
+
+    def call_at(self, deadline: float, subscription: Subscription):
+        """Call subscription.expire(deadline) at deadline (in time.monotonic())."""
+        with self._cond:
+            heapq.heappush(self._heap, (deadline, next(self._counter), subscription))
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="FlushTimer", daemon=True)
+                self._thread.start()
+            self._cond.notify()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._heap or self._heap[0][0] > time.monotonic():
+                    self._cond.wait(self._heap[0][0] - time.monotonic() if self._heap else None)
+                deadline, _, subscription = heapq.heappop(self._heap)
+            # Note: outside of the lock, the callback may open a new window
+            subscription.expire(deadline)
+
+
+class Subscription:
+    """
+        A single subscriber, created by SubscriptionRegistry.subscribe (or MyMasterNew.subscribe).
+    """
+
+    def __init__(self,
+                 registry: SubscriptionRegistry,
+                 key: SubscriptionKey,
+                 callback: ChangeCallback,
+                 indices: Optional[Iterable[int]] = None,
+                 coalesce_ms: float = 0,
+                 changes_only: bool = False,
+                 flush_timer: Optional[FlushTimer] = None):
+        """
+        :param key: group-variation or point type to listen to
+        :param callback: invoked with a change batch, i.e., {index: value}
+        :param indices: point indices of interest, default to all
+        :param coalesce_ms: deliver at most one batch per window (in milliseconds), 0 to deliver every header
+        :param changes_only: skip values equal to the last delivered value of the same index
+        :param flush_timer: closes the windows, default to FlushTimer.shared()
+        """
+        self.key = key
+        self.callback = callback
+        self.indices: Optional[frozenset] = frozenset(indices) if indices is not None else None
+        self.coalesce_ms = coalesce_ms
+        self.changes_only = changes_only
+
+        self._registry = registry
+        self._lock = threading.Lock()
+        self._flush_timer: FlushTimer = flush_timer if flush_timer is not None else FlushTimer.shared()
+        self._pending: Dict[int, DbPointVal] = {}
+        self._deadline: Optional[float] = None  # end of the open window, if any
+        self._last: Dict[int, DbPointVal] = {}
+        self.active = True
+
+    def offer(self, ind_val: List[Tuple[int, DbPointVal]]):
+        """Feed (index, value) pairs of one SOE header."""
+        if self.indices is not None:
+            ind_val = [(index, value) for index, value in ind_val if index in self.indices]
+        if not ind_val:
+            return
+        if self.coalesce_ms <= 0:
+            self._deliver(dict(ind_val))
+            return
+        with self._lock:
+            self._pending.update(ind_val)  # Note: latest value per index wins within the window
+            if self._deadline is not None:
+                return
+            deadline = self._deadline = time.monotonic() + self.coalesce_ms / 1000
+        self._flush_timer.call_at(deadline, self)
+
+    def expire(self, deadline: float):
+        """End of a window, see FlushTimer. A window already closed by flush (or cancel) is ignored."""
+        with self._lock:
+            if self._deadline != deadline:
+                return
+        self.flush()
+
+    def flush(self):
+        """Deliver the pending batch (if any) right away."""
+        with self._lock:
+            self._deadline = None
+            batch, self._pending = self._pending, {}
+        if batch:
+            self._deliver(batch)
+
+    def _deliver(self, batch: Dict[int, DbPointVal]):
+        if self.changes_only:
+            with self._lock:
+                batch = {index: value for index, value in batch.items()
+                         if index not in self._last or self._last[index] != value}
+                self._last.update(batch)
+            if not batch:
+                return
+        if not self.active:
+            return
+        try:
+            self.callback(batch)
+        except Exception as e:
+            # Note: do not let a subscriber break the SOEHandler (i.e., the opendnp3 worker thread)
+            _log.exception(f"Subscription callback for {self.key} raised {e!r}")
+
+    def cancel(self):
+        """Stop receiving updates, a pending batch is dropped."""
+        self.active = False
+        with self._lock:
+            self._deadline = None
+            self._pending = {}
+        self._registry.remove(self)
+
+
+class SubscriptionRegistry:
+    """
+        Subscriptions of one SOEHandler, keyed by group-variation and by point type.
+
+        EXAMPLE:
+        >>> registry = SubscriptionRegistry()
+        >>> sub = registry.subscribe("Analog", callback=print, indices=[0, 1], coalesce_ms=50)
+        >>> registry.dispatch(GroupVariation.Group32Var5, "Analog", [(0, 4.8), (2, 14.1)])
+        {0: 4.8}  # printed ~50 ms later
+        >>> sub.cancel()
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscriptions: Dict[SubscriptionKey, Tuple[Subscription, ...]] = {}
+
+    def subscribe(self, key: SubscriptionKey, callback: ChangeCallback,
+                  indices: Optional[Iterable[int]] = None,
+                  coalesce_ms: float = 0,
+                  changes_only: bool = False) -> Subscription:
+        """see Subscription"""
+        subscription = Subscription(self, key, callback, indices=indices, coalesce_ms=coalesce_ms,
+                                    changes_only=changes_only)
+        with self._lock:
+            # Note: copy-on-write, dispatch reads the tuples without locking
+            self._subscriptions[key] = self._subscriptions.get(key, ()) + (subscription,)
+        return subscription
+
+    def remove(self, subscription: Subscription):
+        with self._lock:
+            remaining = tuple(s for s in self._subscriptions.get(subscription.key, ()) if s is not subscription)
+            if remaining:
+                self._subscriptions[subscription.key] = remaining
+            else:
+                self._subscriptions.pop(subscription.key, None)
+
+    def wants(self, gv: GroupVariation, point_type: Optional[str]) -> bool:
+        """Whether a header of gv (or point_type) has subscribers, i.e., whether its (index, value) pairs are needed."""
+        subscriptions = self._subscriptions
+        return bool(subscriptions) and (gv in subscriptions or point_type in subscriptions)
+
+    def dispatch(self, gv: GroupVariation, point_type: Optional[str], ind_val: List[Tuple[int, DbPointVal]]):
+        """Hand the (index, value) pairs of one SOE header to the matching subscriptions."""
+        if not self._subscriptions:
+            return
+        for subscription in self._subscriptions.get(gv, ()) + self._subscriptions.get(point_type, ()):
+            subscription.offer(ind_val)
+
+    def flush(self):
+        """Deliver all pending batches right away."""
+        for subscriptions in list(self._subscriptions.values()):
+            for subscription in subscriptions:
+                subscription.flush()
+
+    def __len__(self):
+        return sum(len(subscriptions) for subscriptions in self._subscriptions.values())
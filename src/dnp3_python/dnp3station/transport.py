@@ -0,0 +1,229 @@
+"""
+    Pluggable transports for the station classes, i.e., which kind of DNP3 channel MyMasterNew and MyOutStationNew
+    open on their DNP3Manager: TCP client/server (the defaults), serial port or TLS client/server.
+
+    One manager (and its thread pool) can serve channels of every kind, e.g., a MasterPool or an OutstationFarm
+    mixing serial, TCP and TLS stations.
+
+    EXAMPLE:
+    >>> master = MyMasterNew(transport=SerialTransport("/dev/ttyUSB0", baud=19200))
+    >>> tls = tls_config(peer_cert="ca.pem", local_cert="master.pem", private_key="master.key")
+    >>> master = MyMasterNew(transport=TLSClientTransport("10.0.0.5", port=20001, config=tls))
+    >>> outstation = MyOutStationNew(transport=Transport.from_dict({"type": "serial", "device": "/dev/ttyS1"}))
+
+    Note: all the channel factories release the GIL, opening a serial port or loading certificates does not stall
+    the other Python threads.
+"""
+from __future__ import annotations
+
+import abc
+
+from pydnp3 import opendnp3, openpal, asiopal, asiodnp3
+from typing import Optional, Tuple, Union
+
+PARITY = {"none": getattr(opendnp3.Parity, "None"), "even": opendnp3.Parity.Even, "odd": opendnp3.Parity.Odd}
+FLOW_CONTROL = {"none": getattr(opendnp3.FlowControl, "None"), "hardware": opendnp3.FlowControl.Hardware,
+                "xonxoff": opendnp3.FlowControl.XONXOFF}
+STOP_BITS = {1: opendnp3.StopBits.One, 1.5: opendnp3.StopBits.OnePointFive, 2: opendnp3.StopBits.Two}
+
+
+def tls_config(peer_cert: str, local_cert: str, private_key: Optional[str] = None, max_verify_depth: int = 0,
+               allow_tls_v10: bool = False, allow_tls_v11: bool = False, allow_tls_v12: bool = True,
+               cipher_list: str = "") -> asiopal.TLSConfig:
+    """Build an asiopal.TLSConfig, with TLS 1.2 allowed by default (the TLSConfig constructor does not).
+
+    :param peer_cert: certificate (or CA file) used to verify the peer
+    :param local_cert: certificate (chain) presented to the peer
+    :param private_key: private key of local_cert, default to local_cert (i.e., a PEM with both)
+    :param max_verify_depth: maximum certificate chain verification depth, 0 for a self-signed peer only
+    """
+    return asiopal.TLSConfig(peer_cert, local_cert, private_key if private_key else local_cert, max_verify_depth,
+                             allow_tls_v10, allow_tls_v11, allow_tls_v12, cipher_list)
+
+
+class Transport(abc.ABC):
+    """Base class of the transports, i.e., a factory of asiodnp3.IChannel."""
+
+    kind: str = ""
+
+    @abc.abstractmethod
+    def create_channel(self, manager: asiodnp3.DNP3Manager, id: str, levels: int,
+                       retry: asiopal.ChannelRetry, listener: asiodnp3.IChannelListener) -> asiodnp3.IChannel:
+        pass
+
+    @property
+    @abc.abstractmethod
+    def name(self) -> str:
+        """Identifies the channel, e.g., in logs and outstation ids."""
+
+    @property
+    @abc.abstractmethod
+    def endpoint(self) -> Tuple[str, int]:
+        """(address, port) of the channel, e.g., its key in MasterPool and OutstationFarm; (device, 0) if serial."""
+
+    @staticmethod
+    def from_dict(config: dict) -> Transport:
+        """Build a transport from a config dict, e.g.,
+
+            {"type": "tcp_client", "host": "10.0.0.5", "port": 20000}
+            {"type": "serial", "device": "/dev/ttyUSB0", "baud": 19200, "parity": "even"}
+            {"type": "tls_server", "port": 20001, "peer_cert": "ca.pem", "local_cert": "rtu.pem"}
+
+        :raise ValueError: if the type is unknown
+        """
+        config = dict(config)
+        kind = config.pop("type")
+        if kind not in TRANSPORTS:
+            raise ValueError(f"Unknown transport type {kind}, use one of {list(TRANSPORTS)}")
+        if kind.startswith("tls_") and "config" not in config:
+            config["config"] = tls_config(config.pop("peer_cert"), config.pop("local_cert"),
+                                          config.pop("private_key", None), config.pop("max_verify_depth", 0))
+        return TRANSPORTS[kind](**config)
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.name!r})"
+
+
+class TCPClientTransport(Transport):
+    kind = "tcp_client"
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 20000, local: str = "0.0.0.0"):
+        """
+        :param host: IP address (or host name) of the remote station
+        :param local: adapter to connect from, default to any
+        """
+        self.host = host
+        self.port = port
+        self.local = local
+
+    @property
+    def name(self) -> str:
+        return f"{self.host}-{self.port}"
+
+    @property
+    def endpoint(self) -> Tuple[str, int]:
+        return self.host, self.port
+
+    def create_channel(self, manager, id, levels, retry, listener):
+        return manager.AddTCPClient(id=id, levels=levels, retry=retry, host=self.host, local=self.local,
+                                    port=self.port, listener=listener)
+
+
+class TCPServerTransport(Transport):
+    kind = "tcp_server"
+
+    def __init__(self, address: str = "0.0.0.0", port: int = 20000):
+        """
+        :param address: adapter to listen on, default to all adapters
+        """
+        self.address = address
+        self.port = port
+
+    @property
+    def name(self) -> str:
+        return f"{self.address}-{self.port}"
+
+    @property
+    def endpoint(self) -> Tuple[str, int]:
+        return self.address, self.port
+
+    def create_channel(self, manager, id, levels, retry, listener):
+        return manager.AddTCPServer(id=id, levels=levels, retry=retry, endpoint=self.address, port=self.port,
+                                    listener=listener)
+
+
+class SerialTransport(Transport):
+    kind = "serial"
+
+    def __init__(self, device: str, baud: int = 9600, data_bits: int = 8, stop_bits: float = 1,
+                 parity: Union[str, opendnp3.Parity] = "none",
+                 flow_control: Union[str, opendnp3.FlowControl] = "none",
+                 async_open_delay: float = 0):
+        """
+        :param device: name of the port, e.g., /dev/ttyUSB0 or COM1
+        :param parity: "none", "even", "odd" or an opendnp3.Parity
+        :param flow_control: "none", "hardware", "xonxoff" or an opendnp3.FlowControl
+        :param async_open_delay: in seconds, time for the physical layer to settle before the first transmission
+        """
+        if stop_bits not in STOP_BITS:
+            raise ValueError(f"Unsupported stop bits {stop_bits}, use one of {list(STOP_BITS)}")
+        if isinstance(parity, str) and parity.lower() not in PARITY:
+            raise ValueError(f"Unknown parity {parity}, use one of {list(PARITY)}")
+        if isinstance(flow_control, str) and flow_control.lower() not in FLOW_CONTROL:
+            raise ValueError(f"Unknown flow control {flow_control}, use one of {list(FLOW_CONTROL)}")
+        self.device = device
+        self.baud = baud
+        self.data_bits = data_bits
+        self.stop_bits = stop_bits
+        self.parity = PARITY[parity.lower()] if isinstance(parity, str) else parity
+        self.flow_control = FLOW_CONTROL[flow_control.lower()] if isinstance(flow_control, str) else flow_control
+        self.async_open_delay = async_open_delay
+
+    @property
+    def name(self) -> str:
+        return f"serial-{self.device}"
+
+    @property
+    def endpoint(self) -> Tuple[str, int]:
+        return self.device, 0
+
+    def settings(self) -> asiopal.SerialSettings:
+        settings = asiopal.SerialSettings()
+        settings.deviceName = self.device
+        settings.baud = self.baud
+        settings.dataBits = self.data_bits
+        settings.stopBits = STOP_BITS[self.stop_bits]
+        settings.parity = self.parity
+        settings.flowType = self.flow_control
+        settings.asyncOpenDelay = openpal.TimeDuration().Milliseconds(int(self.async_open_delay * 1000))
+        return settings
+
+    def create_channel(self, manager, id, levels, retry, listener):
+        return manager.AddSerial(id=id, levels=levels, retry=retry, settings=self.settings(), listener=listener)
+
+
+class TLSClientTransport(TCPClientTransport):
+    kind = "tls_client"
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 20000, config: asiopal.TLSConfig = None,
+                 local: str = "0.0.0.0"):
+        """
+        :param config: certificates and TLS versions, see tls_config
+        """
+        if config is None:
+            raise ValueError("TLSClientTransport requires a TLS config, see tls_config")
+        super().__init__(host=host, port=port, local=local)
+        self.config = config
+
+    @property
+    def name(self) -> str:
+        return f"tls-{self.host}-{self.port}"
+
+    def create_channel(self, manager, id, levels, retry, listener):
+        return manager.AddTLSClient(id=id, levels=levels, retry=retry, host=self.host, local=self.local,
+                                    port=self.port, config=self.config, listener=listener)
+
+
+class TLSServerTransport(TCPServerTransport):
+    kind = "tls_server"
+
+    def __init__(self, address: str = "0.0.0.0", port: int = 20000, config: asiopal.TLSConfig = None):
+        """
+        :param config: certificates and TLS versions, see tls_config
+        """
+        if config is None:
+            raise ValueError("TLSServerTransport requires a TLS config, see tls_config")
+        super().__init__(address=address, port=port)
+        self.config = config
+
+    @property
+    def name(self) -> str:
+        return f"tls-{self.address}-{self.port}"
+
+    def create_channel(self, manager, id, levels, retry, listener):
+        return manager.AddTLSServer(id=id, levels=levels, retry=retry, endpoint=self.address, port=self.port,
+                                    config=self.config, listener=listener)
+
+
+TRANSPORTS = {transport.kind: transport for transport in (TCPClientTransport, TCPServerTransport, SerialTransport,
+                                                          TLSClientTransport, TLSServerTransport)}
@@ -9,81 +9,99 @@ class VisitorIndexedBinary(opendnp3.IVisitorIndexedBinary):
     def __init__(self):
         super(VisitorIndexedBinary, self).__init__()
         self.index_and_value = []
+        self.flags_and_time = []
 
     def OnValue(self, indexed_instance):
         self.index_and_value.append((indexed_instance.index, indexed_instance.value.value))
+        self.flags_and_time.append((indexed_instance.value.flags.value, indexed_instance.value.time.value))
 
 
 class VisitorIndexedDoubleBitBinary(opendnp3.IVisitorIndexedDoubleBitBinary):
     def __init__(self):
         super(VisitorIndexedDoubleBitBinary, self).__init__()
         self.index_and_value = []
+        self.flags_and_time = []
 
     def OnValue(self, indexed_instance):
         self.index_and_value.append((indexed_instance.index, indexed_instance.value.value))
+        self.flags_and_time.append((indexed_instance.value.flags.value, indexed_instance.value.time.value))
 
 
 class VisitorIndexedCounter(opendnp3.IVisitorIndexedCounter):
     def __init__(self):
         super(VisitorIndexedCounter, self).__init__()
         self.index_and_value = []
+        self.flags_and_time = []
 
     def OnValue(self, indexed_instance):
         self.index_and_value.append((indexed_instance.index, indexed_instance.value.value))
+        self.flags_and_time.append((indexed_instance.value.flags.value, indexed_instance.value.time.value))
 
 
 class VisitorIndexedFrozenCounter(opendnp3.IVisitorIndexedFrozenCounter):
     def __init__(self):
         super(VisitorIndexedFrozenCounter, self).__init__()
         self.index_and_value = []
+        self.flags_and_time = []
 
     def OnValue(self, indexed_instance):
         self.index_and_value.append((indexed_instance.index, indexed_instance.value.value))
+        self.flags_and_time.append((indexed_instance.value.flags.value, indexed_instance.value.time.value))
 
 
 class VisitorIndexedAnalog(opendnp3.IVisitorIndexedAnalog):
     def __init__(self):
         super(VisitorIndexedAnalog, self).__init__()
         self.index_and_value = []
+        self.flags_and_time = []
 
     def OnValue(self, indexed_instance):
         self.index_and_value.append((indexed_instance.index, indexed_instance.value.value))
+        self.flags_and_time.append((indexed_instance.value.flags.value, indexed_instance.value.time.value))
 
 
 class VisitorIndexedAnalogInt(VisitorIndexedAnalog):
     def __init__(self):
         super(VisitorIndexedAnalogInt, self).__init__()
         self.index_and_value = []
+        self.flags_and_time = []
 
     def OnValue(self, indexed_instance):
         self.index_and_value.append((indexed_instance.index, int(indexed_instance.value.value)))
+        self.flags_and_time.append((indexed_instance.value.flags.value, indexed_instance.value.time.value))
 
 
 class VisitorIndexedBinaryOutputStatus(opendnp3.IVisitorIndexedBinaryOutputStatus):
     def __init__(self):
         super(VisitorIndexedBinaryOutputStatus, self).__init__()
         self.index_and_value = []
+        self.flags_and_time = []
 
     def OnValue(self, indexed_instance):
         self.index_and_value.append((indexed_instance.index, indexed_instance.value.value))
+        self.flags_and_time.append((indexed_instance.value.flags.value, indexed_instance.value.time.value))
 
 
 class VisitorIndexedAnalogOutputStatus(opendnp3.IVisitorIndexedAnalogOutputStatus):
     def __init__(self):
         super(VisitorIndexedAnalogOutputStatus, self).__init__()
         self.index_and_value = []
+        self.flags_and_time = []
 
     def OnValue(self, indexed_instance):
         self.index_and_value.append((indexed_instance.index, indexed_instance.value.value))
+        self.flags_and_time.append((indexed_instance.value.flags.value, indexed_instance.value.time.value))
 
 
 class VisitorIndexedAnalogOutputStatusInt(VisitorIndexedAnalogOutputStatus):
     def __init__(self):
         super(VisitorIndexedAnalogOutputStatusInt, self).__init__()
         self.index_and_value = []
+        self.flags_and_time = []
 
     def OnValue(self, indexed_instance):
         self.index_and_value.append((indexed_instance.index, int(indexed_instance.value.value)))
+        self.flags_and_time.append((indexed_instance.value.flags.value, indexed_instance.value.time.value))
 
 
 class VisitorIndexedTimeAndInterval(opendnp3.IVisitorIndexedTimeAndInterval):
@@ -32,9 +32,11 @@
 #define PYDNP3_OPENDNP3_APP_PARSING_ICOLLECTION_H
 
 #include <pybind11/pybind11.h>
+#include <pybind11/numpy.h>
 #include <Python.h>
 
 #include <opendnp3/app/Indexed.h>
+#include <opendnp3/app/MeasurementTypes.h>
 #include <opendnp3/app/parsing/ICollection.h>
 
 #ifdef PYDNP3_OPENDNP3
@@ -144,17 +146,18 @@ void declareFunctorVisitor(py::module &m, string const & type)
 
 
 template <class T>
-void declareICollection(py::module &m, string const & type)
+py::class_<opendnp3::ICollection<T>, opendnp3::PyICollection<T>> declareICollection(py::module &m, string const & type)
 {
     typedef std::function<void(const T&)> Fun;
 
     declareIVisitor<T>(m, type);
 
     // ----- class: opendnp3::ICollection<T> -----
-    py::class_<opendnp3::ICollection<T>, opendnp3::PyICollection<T>>(m, ("ICollection" + type).c_str(),
+    py::class_<opendnp3::ICollection<T>, opendnp3::PyICollection<T>> cls(m, ("ICollection" + type).c_str(),
         "An interface representing an abstract immutable collection of things of type T. \n"
-        "The user can only read these values via callback to receive each element.")
+        "The user can only read these values via callback to receive each element.");
 
+    cls
         .def(py::init<>())
 
         .def(
@@ -187,17 +190,75 @@ void declareICollection(py::module &m, string const & type)
             "Visit all of the elements of a collection.",
             py::arg("callback")
         );
+
+    return cls;
+}
+
+/**
+* Collect an indexed measurement collection into numpy arrays in a single call,
+* i.e., without a Python callback (and GIL acquisition) per element.
+* V is the numpy dtype of the measurement values.
+*/
+template <class T, class V>
+void declareICollectionToArrays(py::class_<opendnp3::ICollection<opendnp3::Indexed<T>>,
+                                           opendnp3::PyICollection<opendnp3::Indexed<T>>> &cls)
+{
+    cls.def(
+        "ToArrays",
+        [](const opendnp3::ICollection<opendnp3::Indexed<T>>& self) -> py::tuple
+        {
+            const size_t count = self.Count();
+            py::array_t<uint16_t> indices(count);
+            py::array_t<V> values(count);
+            py::array_t<uint8_t> flags(count);
+            py::array_t<int64_t> times(count);
+
+            uint16_t* pIndices = indices.mutable_data();
+            V* pValues = values.mutable_data();
+            uint8_t* pFlags = flags.mutable_data();
+            int64_t* pTimes = times.mutable_data();
+            {
+                // the collection is a view on the parsed APDU, no Python object is touched while visiting it
+                py::gil_scoped_release release;
+                size_t i = 0;
+                auto collect = [&](const opendnp3::Indexed<T>& item)
+                {
+                    if (i < count)
+                    {
+                        pIndices[i] = item.index;
+                        pValues[i] = static_cast<V>(item.value.value);
+                        pFlags[i] = item.value.flags.value;
+                        pTimes[i] = static_cast<int64_t>(item.value.time.value);
+                        ++i;
+                    }
+                };
+                opendnp3::FunctorVisitor<opendnp3::Indexed<T>, decltype(collect)> visitor(collect);
+                self.Foreach(visitor);
+            }
+            return py::make_tuple(indices, values, flags, times);
+        },
+        "   Collect all the elements of the collection in a single call. \n"
+        ":return: tuple of numpy arrays (index, value, flags, time), \n"
+        "   time is the DNP3 timestamp in milliseconds since epoch (0 if the object carries no time)."
+    );
 }
 
 void bind_ICollection(py::module &m)
 {
-    declareICollection<opendnp3::Indexed<opendnp3::Binary>>(m, "IndexedBinary");
-    declareICollection<opendnp3::Indexed<opendnp3::DoubleBitBinary>>(m, "IndexedDoubleBitBinary");
-    declareICollection<opendnp3::Indexed<opendnp3::Analog>>(m, "IndexedAnalog");
-    declareICollection<opendnp3::Indexed<opendnp3::Counter>>(m, "IndexedCounter");
-    declareICollection<opendnp3::Indexed<opendnp3::FrozenCounter>>(m, "IndexedFrozenCounter");
-    declareICollection<opendnp3::Indexed<opendnp3::BinaryOutputStatus>>(m, "IndexedBinaryOutputStatus");
-    declareICollection<opendnp3::Indexed<opendnp3::AnalogOutputStatus>>(m, "IndexedAnalogOutputStatus");
+    auto binaries = declareICollection<opendnp3::Indexed<opendnp3::Binary>>(m, "IndexedBinary");
+    declareICollectionToArrays<opendnp3::Binary, bool>(binaries);
+    auto doubleBitBinaries = declareICollection<opendnp3::Indexed<opendnp3::DoubleBitBinary>>(m, "IndexedDoubleBitBinary");
+    declareICollectionToArrays<opendnp3::DoubleBitBinary, uint8_t>(doubleBitBinaries);
+    auto analogs = declareICollection<opendnp3::Indexed<opendnp3::Analog>>(m, "IndexedAnalog");
+    declareICollectionToArrays<opendnp3::Analog, double>(analogs);
+    auto counters = declareICollection<opendnp3::Indexed<opendnp3::Counter>>(m, "IndexedCounter");
+    declareICollectionToArrays<opendnp3::Counter, uint32_t>(counters);
+    auto frozenCounters = declareICollection<opendnp3::Indexed<opendnp3::FrozenCounter>>(m, "IndexedFrozenCounter");
+    declareICollectionToArrays<opendnp3::FrozenCounter, uint32_t>(frozenCounters);
+    auto boStatuses = declareICollection<opendnp3::Indexed<opendnp3::BinaryOutputStatus>>(m, "IndexedBinaryOutputStatus");
+    declareICollectionToArrays<opendnp3::BinaryOutputStatus, bool>(boStatuses);
+    auto aoStatuses = declareICollection<opendnp3::Indexed<opendnp3::AnalogOutputStatus>>(m, "IndexedAnalogOutputStatus");
+    declareICollectionToArrays<opendnp3::AnalogOutputStatus, double>(aoStatuses);
     declareICollection<opendnp3::Indexed<opendnp3::OctetString>>(m, "IndexedOctetString");
     declareICollection<opendnp3::Indexed<opendnp3::TimeAndInterval>>(m, "IndexedTimeAndInterval");
     declareICollection<opendnp3::Indexed<opendnp3::BinaryCommandEvent>>(m, "IndexedBinaryCommandEvent");
@@ -34,15 +34,68 @@
 #include <pybind11/pybind11.h>
 #include <pybind11/stl.h>
 #include <pybind11/functional.h>
+#include <pybind11/numpy.h>
 #include <Python.h>
 
 #include <opendnp3/master/CommandSet.h>
 
+#include "../../NumpyArrays.h"
+
 #ifdef PYDNP3_OPENDNP3
 
 namespace py = pybind11;
 using namespace std;
 
+/**
+* Add a header of analog output commands from numpy arrays (or sequences) of indexes and values.
+* Indexes and values are range checked (ValueError) like the scalar WithIndex path, then the commands are built
+* while the GIL is released.
+*/
+template <class T, class V>
+void AddAnalogOutputArray(opendnp3::CommandSet& self, py::object indexes, py::object values)
+{
+    const std::vector<uint16_t> index = pydnp3::CheckedArray<uint16_t>(indexes, "indexes");
+    const std::vector<V> value = pydnp3::CheckedArray<V>(values, "values");
+    if (index.size() != value.size())
+    {
+        throw py::value_error("indexes and values must be 1-dimensional arrays of the same length");
+    }
+
+    py::gil_scoped_release release;
+    std::vector<opendnp3::Indexed<T>> items;
+    items.reserve(index.size());
+    for (size_t i = 0; i < index.size(); ++i)
+    {
+        items.push_back(opendnp3::WithIndex(T(value[i]), index[i]));
+    }
+    self.Add<T>(items);
+}
+
+/**
+* Add a header of CROB from numpy arrays (or sequences) of indexes and boolean values,
+* i.e., LATCH_ON for True and LATCH_OFF for False.
+*/
+inline void AddCROBArray(opendnp3::CommandSet& self, py::object indexes, py::object values)
+{
+    const std::vector<uint16_t> index = pydnp3::CheckedArray<uint16_t>(indexes, "indexes");
+    const std::vector<bool> value = pydnp3::CheckedArray<bool>(values, "values");
+    if (index.size() != value.size())
+    {
+        throw py::value_error("indexes and values must be 1-dimensional arrays of the same length");
+    }
+
+    py::gil_scoped_release release;
+    std::vector<opendnp3::Indexed<opendnp3::ControlRelayOutputBlock>> items;
+    items.reserve(index.size());
+    for (size_t i = 0; i < index.size(); ++i)
+    {
+        items.push_back(opendnp3::WithIndex(
+            opendnp3::ControlRelayOutputBlock(value[i] ? opendnp3::ControlCode::LATCH_ON : opendnp3::ControlCode::LATCH_OFF),
+            index[i]));
+    }
+    self.Add<opendnp3::ControlRelayOutputBlock>(items);
+}
+
 void bind_CommandSet(py::module &m)
 {
     // ----- class: opendnp3::CommandSet -----
@@ -177,6 +230,41 @@ void bind_CommandSet(py::module &m)
             "StartHeader",
             &opendnp3::CommandSet::StartHeader<opendnp3::AnalogOutputDouble64>,
             "Begin a header of the parameterized type."
+        )
+
+        .def(
+            "AddCROBArray",
+            &AddCROBArray,
+            "Add a header of CROB (LATCH_ON for True, LATCH_OFF for False) from arrays of indexes and values.",
+            py::arg("indexes"), py::arg("values")
+        )
+
+        .def(
+            "AddAOInt16Array",
+            &AddAnalogOutputArray<opendnp3::AnalogOutputInt16, int16_t>,
+            "Add a header of AOInt16 from arrays of indexes and values.",
+            py::arg("indexes"), py::arg("values")
+        )
+
+        .def(
+            "AddAOInt32Array",
+            &AddAnalogOutputArray<opendnp3::AnalogOutputInt32, int32_t>,
+            "Add a header of AOInt32 from arrays of indexes and values.",
+            py::arg("indexes"), py::arg("values")
+        )
+
+        .def(
+            "AddAOFloat32Array",
+            &AddAnalogOutputArray<opendnp3::AnalogOutputFloat32, float>,
+            "Add a header of AOFloat32 from arrays of indexes and values.",
+            py::arg("indexes"), py::arg("values")
+        )
+
+        .def(
+            "AddAODouble64Array",
+            &AddAnalogOutputArray<opendnp3::AnalogOutputDouble64, double>,
+            "Add a header of AODouble64 from arrays of indexes and values.",
+            py::arg("indexes"), py::arg("values")
         );
 }
 
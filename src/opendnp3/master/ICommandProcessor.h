@@ -37,6 +37,8 @@
 
 #include <opendnp3/master/ICommandProcessor.h>
 
+#include "../../GILSafeCallback.h"
+
 #ifdef PYDNP3_OPENDNP3
 
 namespace py = pybind11;
@@ -99,6 +101,43 @@ namespace opendnp3 {
     };
 }
 
+/**
+* Bind SelectAndOperate / DirectOperate of a single command taking a Python callable,
+* the stack is entered with the GIL released (see pydnp3::GILSafeCallback).
+* Note: declare these before the CommandCallbackT overloads, so that Python callables pick them first.
+*/
+template <class T, class Class>
+void declareGILSafeCommand(Class &cls)
+{
+    cls.def(
+        "SelectAndOperate",
+        [](opendnp3::ICommandProcessor &self,
+           const T& command,
+           uint16_t index,
+           py::function callback,
+           const opendnp3::TaskConfig& config) -> void {
+            auto safeCallback = pydnp3::GILSafeCallback<const opendnp3::ICommandTaskResult&>(std::move(callback));
+            py::gil_scoped_release release;
+            self.SelectAndOperate(command, index, safeCallback, config);
+        },
+        py::arg("command"), py::arg("index"), py::arg("callback"), py::arg("config") = opendnp3::TaskConfig::Default()
+    );
+
+    cls.def(
+        "DirectOperate",
+        [](opendnp3::ICommandProcessor &self,
+           const T& command,
+           uint16_t index,
+           py::function callback,
+           const opendnp3::TaskConfig& config) -> void {
+            auto safeCallback = pydnp3::GILSafeCallback<const opendnp3::ICommandTaskResult&>(std::move(callback));
+            py::gil_scoped_release release;
+            self.DirectOperate(command, index, safeCallback, config);
+        },
+        py::arg("command"), py::arg("index"), py::arg("callback"), py::arg("config") = opendnp3::TaskConfig::Default()
+    );
+}
+
 void bind_ICommandProcessor(py::module &m)
 {
     // ----- class: opendnp3::ICommandProcessor -----
@@ -109,6 +148,41 @@ void bind_ICommandProcessor(py::module &m)
 
     cls.def(py::init<>());
 
+    // Python callables: GIL-safe overloads, checked first
+    declareGILSafeCommand<opendnp3::ControlRelayOutputBlock>(cls);
+    declareGILSafeCommand<opendnp3::AnalogOutputInt16>(cls);
+    declareGILSafeCommand<opendnp3::AnalogOutputInt32>(cls);
+    declareGILSafeCommand<opendnp3::AnalogOutputFloat32>(cls);
+    declareGILSafeCommand<opendnp3::AnalogOutputDouble64>(cls);
+
+    cls.def(
+        "SelectAndOperate",
+        [](opendnp3::ICommandProcessor &self,
+           opendnp3::CommandSet& commands,
+           py::function callback,
+           const opendnp3::TaskConfig& config) -> void {
+            auto safeCallback = pydnp3::GILSafeCallback<const opendnp3::ICommandTaskResult&>(std::move(callback));
+            py::gil_scoped_release release;
+            self.SelectAndOperate(std::move(commands), safeCallback, config);
+        },
+        py::arg("commands"), py::arg("callback"), py::arg("config") = opendnp3::TaskConfig::Default()
+    );
+
+    cls.def(
+        "DirectOperate",
+        [](opendnp3::ICommandProcessor &self,
+           opendnp3::CommandSet& commands,
+           py::function callback,
+           const opendnp3::TaskConfig& config) -> void {
+            auto safeCallback = pydnp3::GILSafeCallback<const opendnp3::ICommandTaskResult&>(std::move(callback));
+            py::gil_scoped_release release;
+            self.DirectOperate(std::move(commands), safeCallback, config);
+        },
+        py::arg("commands"), py::arg("callback"), py::arg("config") = opendnp3::TaskConfig::Default()
+    );
+
+    // native callbacks (e.g., asiodnp3.PrintingCommandCallback.Get()), copied by the stack without the GIL
+
     const char* selectAndOperate_singleCommand =
     "   Select and operate a single command. \n"
     ":param command: Command to operate \n"
@@ -123,6 +197,7 @@ void bind_ICommandProcessor(py::module &m)
                                                const opendnp3::CommandCallbackT &,
                                                const opendnp3::TaskConfig &))
         &opendnp3::ICommandProcessor::SelectAndOperate<opendnp3::ControlRelayOutputBlock>,
+        py::call_guard<py::gil_scoped_release>(),
         py::arg("command"), py::arg("index"), py::arg("callback"), py::arg("config") = opendnp3::TaskConfig::Default()
     );
 
@@ -133,6 +208,7 @@ void bind_ICommandProcessor(py::module &m)
                                                const opendnp3::CommandCallbackT &,
                                                const opendnp3::TaskConfig &))
         &opendnp3::ICommandProcessor::SelectAndOperate<opendnp3::AnalogOutputInt16>,
+        py::call_guard<py::gil_scoped_release>(),
         py::arg("command"), py::arg("index"), py::arg("callback"), py::arg("config") = opendnp3::TaskConfig::Default()
     );
 
@@ -143,6 +219,7 @@ void bind_ICommandProcessor(py::module &m)
                                                const opendnp3::CommandCallbackT &,
                                                const opendnp3::TaskConfig &))
         &opendnp3::ICommandProcessor::SelectAndOperate<opendnp3::AnalogOutputInt32>,
+        py::call_guard<py::gil_scoped_release>(),
         py::arg("command"), py::arg("index"), py::arg("callback"), py::arg("config") = opendnp3::TaskConfig::Default()
     );
 
@@ -153,6 +230,7 @@ void bind_ICommandProcessor(py::module &m)
                                                const opendnp3::CommandCallbackT &,
                                                const opendnp3::TaskConfig &))
         &opendnp3::ICommandProcessor::SelectAndOperate<opendnp3::AnalogOutputFloat32>,
+        py::call_guard<py::gil_scoped_release>(),
         py::arg("command"), py::arg("index"), py::arg("callback"), py::arg("config") = opendnp3::TaskConfig::Default()
     );
 
@@ -163,6 +241,7 @@ void bind_ICommandProcessor(py::module &m)
                                                const opendnp3::CommandCallbackT &,
                                                const opendnp3::TaskConfig &))
         &opendnp3::ICommandProcessor::SelectAndOperate<opendnp3::AnalogOutputDouble64>,
+        py::call_guard<py::gil_scoped_release>(),
         selectAndOperate_singleCommand,
         py::arg("command"), py::arg("index"), py::arg("callback"), py::arg("config") = opendnp3::TaskConfig::Default()
     );
@@ -181,6 +260,7 @@ void bind_ICommandProcessor(py::module &m)
                                                const opendnp3::CommandCallbackT &,
                                                const opendnp3::TaskConfig &))
         &opendnp3::ICommandProcessor::DirectOperate<opendnp3::ControlRelayOutputBlock>,
+        py::call_guard<py::gil_scoped_release>(),
         py::arg("command"), py::arg("index"), py::arg("callback"), py::arg("config") = opendnp3::TaskConfig::Default()
     );
 
@@ -191,6 +271,7 @@ void bind_ICommandProcessor(py::module &m)
                                                const opendnp3::CommandCallbackT &,
                                                const opendnp3::TaskConfig &))
         &opendnp3::ICommandProcessor::DirectOperate<opendnp3::AnalogOutputInt16>,
+        py::call_guard<py::gil_scoped_release>(),
         py::arg("command"), py::arg("index"), py::arg("callback"), py::arg("config") = opendnp3::TaskConfig::Default()
     );
 
@@ -201,6 +282,7 @@ void bind_ICommandProcessor(py::module &m)
                                                const opendnp3::CommandCallbackT &,
                                                const opendnp3::TaskConfig &))
         &opendnp3::ICommandProcessor::DirectOperate<opendnp3::AnalogOutputInt32>,
+        py::call_guard<py::gil_scoped_release>(),
         py::arg("command"), py::arg("index"), py::arg("callback"), py::arg("config") = opendnp3::TaskConfig::Default()
     );
 
@@ -211,6 +293,7 @@ void bind_ICommandProcessor(py::module &m)
                                                const opendnp3::CommandCallbackT &,
                                                const opendnp3::TaskConfig &))
         &opendnp3::ICommandProcessor::DirectOperate<opendnp3::AnalogOutputFloat32>,
+        py::call_guard<py::gil_scoped_release>(),
         py::arg("command"), py::arg("index"), py::arg("callback"), py::arg("config") = opendnp3::TaskConfig::Default()
     );
 
@@ -221,6 +304,7 @@ void bind_ICommandProcessor(py::module &m)
                                                const opendnp3::CommandCallbackT &,
                                                const opendnp3::TaskConfig &))
         &opendnp3::ICommandProcessor::DirectOperate<opendnp3::AnalogOutputDouble64>,
+        py::call_guard<py::gil_scoped_release>(),
         directOperate_singleCommand,
         py::arg("command"), py::arg("index"), py::arg("callback"), py::arg("config") = opendnp3::TaskConfig::Default()
     );
@@ -240,6 +324,7 @@ void bind_ICommandProcessor(py::module &m)
             return self.SelectAndOperate(std::move(commands), callback, config);
         },
         selectAndOperate_commandSet,
+        py::call_guard<py::gil_scoped_release>(),
         py::arg("commands"), py::arg("callback"), py::arg("config") = opendnp3::TaskConfig::Default()
     );
 
@@ -258,36 +343,10 @@ void bind_ICommandProcessor(py::module &m)
             return self.DirectOperate(std::move(commands), callback, config);
         },
         directOperate_commandSet,
+        py::call_guard<py::gil_scoped_release>(),
         py::arg("commands"), py::arg("callback"), py::arg("config") = opendnp3::TaskConfig::Default()
     );
 }
 
-// @todo This code is a work-around for pybind11 issue related to 'const ref' arguments. However,
-// it is seg faulting on the callback.  For now, the workaround is to reply on the pybind11 patch
-// that ignores the copy constructor/non-copyable error and seems to work without issue.
-//
-//    cls.def(
-//            "DirectOperate",
-//            [](opendnp3::ICommandProcessor &self,
-//               opendnp3::CommandSet& commands,
-//               py::function callback,
-//               const opendnp3::TaskConfig& config) {
-//                return self.DirectOperate(
-//                    std::move(commands),
-//                    [callback](const opendnp3::ICommandTaskResult& result) -> void {
-//                        std::cout << "In lambda callback" << std::endl ;
-//                        auto py_result = py::cast(result, py::return_value_policy::reference);
-//                        callback(py_result);
-//                    },
-//                    config
-//                );
-//            },
-//            directOperate_commandSet,
-//            py::call_guard<py::gil_scoped_release>(),
-//            py::arg("commands"), py::arg("callback"), py::arg("config") = opendnp3::TaskConfig::Default(),
-//            py::return_value_policy::reference
-//        );
-//}
-
 #endif // PYDNP3_OPENDNP3
 #endif
@@ -55,11 +55,15 @@ void init_asiodnp3(py::module &asiodnp3)
     bind_IChannel(asiodnp3);                    // GIL release: AddMaster, AddOutstation
     bind_IChannelListener(asiodnp3);
     bind_IMasterSession(asiodnp3);
-    bind_ISessionAcceptor(asiodnp3);
+    bind_ISessionAcceptor(asiodnp3);            // GIL release: AcceptSession
     bind_X509Info(asiodnp3);
     bind_IListenCallbacks(asiodnp3);
-    bind_DNP3Manager(asiodnp3);                 // GIL release: AddTCPClient, AddTCPServer, Shutdown
+    bind_DNP3Manager(asiodnp3);                 // GIL release: AddTCPClient, AddTCPServer, AddSerial, AddTLSClient,
+                                                //              AddTLSServer, CreateListener, Shutdown
     bind_PrintingSOEHandler(asiodnp3);
+    bind_RingBufferSOEHandler(asiodnp3);        // GIL release: Drain, Wait
+    bind_RingBufferLogHandler(asiodnp3);        // GIL release: Drain, Wait
+    bind_StatisticsCollector(asiodnp3);         // GIL release: CollectStatistics
     bind_DefaultMasterApplication(asiodnp3);
     bind_DefaultListenCallbacks(asiodnp3);
     bind_ErrorCodes(asiodnp3);                  //@todo: referenced unknown base type "std::error_category"
@@ -45,6 +45,7 @@ void init_asiopal(py::module &asiopal)
     bind_SerialTypes(asiopal);
     bind_ASIOSerialHelpers(asiopal);
     bind_IOpenDelayStrategy(asiopal);
+    bind_JitteredBackoffStrategy(asiopal);
     bind_ChannelRetry(asiopal);
     bind_IO(asiopal);
     bind_SteadyClock(asiopal);
@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*- {{{
+# vim: set fenc=utf-8 ft=python sw=4 ts=4 sts=4 et:
+#
+# Copyright 2018, Kisensum.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# Neither Kisensum, nor any of its employees, nor any jurisdiction or 
+# organization that has cooperated in the development of these materials, 
+# makes any warranty, express or implied, or assumes any legal liability 
+# or responsibility for the accuracy, completeness, or usefulness or any 
+# information, apparatus, product, software, or process disclosed, or 
+# represents that its use would not infringe privately owned rights. 
+# Reference herein to any specific commercial product, process, or service 
+# by trade name, trademark, manufacturer, or otherwise does not necessarily 
+# constitute or imply its endorsement, recommendation, or favoring by Kisensum.
+# }}}
+
+import numpy as np
+
+from dnp3_python.dnp3station.change_filter import ChangeFilter
+
+
+class TestChangeFilter():
+
+    def test_select(self):
+        change_filter = ChangeFilter({"Analog": 3})
+        change_filter.set_deadband("Analog", indices=[0], absolute=0.5)
+        change_filter.set_deadband("Analog", indices=[1], percent=2)
+        assert change_filter.select("Analog", [0, 1, 2], [4.8, 14.1, 27.2]).tolist() == [True, True, True]
+        assert change_filter.select("Analog", [0, 1, 2], [5.2, 14.3, 27.2]).tolist() == [False, False, False]
+        assert change_filter.select("Analog", [0, 1, 2], [5.4, 14.5, 27.3]).tolist() == [True, True, True]
+        assert (change_filter.passed, change_filter.suppressed) == (6, 3)
+
+    def test_select_one_matches_select(self):
+        rng = np.random.default_rng(0)
+        for report_on_change in (True, False):
+            vectorized = ChangeFilter({"Analog": 4}, report_on_change=report_on_change)
+            scalar = ChangeFilter({"Analog": 4}, report_on_change=report_on_change)
+            for change_filter in (vectorized, scalar):
+                change_filter.set_deadband("Analog", indices=[0], absolute=0.5)
+                change_filter.set_deadband("Analog", indices=[1], percent=5)
+            for _ in range(200):
+                index = int(rng.integers(0, 6))  # Note: beyond the initial size as well
+                value = float(rng.choice([1.0, 1.2, 2.0, 10.0]))
+                flags = int(rng.choice([0x01, 0x01, 0x02]))
+                assert scalar.select_one("Analog", index, value, flags) == \
+                    bool(vectorized.select("Analog", [index], [value], [flags])[0])
+            assert (scalar.passed, scalar.suppressed) == (vectorized.passed, vectorized.suppressed)
+
+    def test_force(self):
+        change_filter = ChangeFilter({"AnalogOutputStatus": 1})
+        change_filter.set_deadband("AnalogOutputStatus", absolute=1.0)
+        assert change_filter.select_one("AnalogOutputStatus", 0, 10.0)
+        assert not change_filter.select_one("AnalogOutputStatus", 0, 10.5)
+        # e.g., an Operate within the deadband: applied, and recorded as the last applied value
+        assert change_filter.select_one("AnalogOutputStatus", 0, 10.5, force=True)
+        assert not change_filter.select_one("AnalogOutputStatus", 0, 11.0)
+        assert change_filter.select("AnalogOutputStatus", [0], [11.0], force=True).tolist() == [True]
@@ -0,0 +1,194 @@
+# -*- coding: utf-8 -*- {{{
+# vim: set fenc=utf-8 ft=python sw=4 ts=4 sts=4 et:
+#
+# Copyright 2018, Kisensum.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# Neither Kisensum, nor any of its employees, nor any jurisdiction or 
+# organization that has cooperated in the development of these materials, 
+# makes any warranty, express or implied, or assumes any legal liability 
+# or responsibility for the accuracy, completeness, or usefulness or any 
+# information, apparatus, product, software, or process disclosed, or 
+# represents that its use would not infringe privately owned rights. 
+# Reference herein to any specific commercial product, process, or service 
+# by trade name, trademark, manufacturer, or otherwise does not necessarily 
+# constitute or imply its endorsement, recommendation, or favoring by Kisensum.
+# }}}
+
+from pydnp3 import opendnp3
+
+from dnp3_python.dnp3station.command_queue import CommandQueue
+
+
+class FakeCommandTaskResult:
+    """Stands in for opendnp3.ICommandTaskResult: ForeachItem yields the given (header index, point index) items."""
+
+    def __init__(self, items, summary=opendnp3.TaskCompletion.SUCCESS,
+                 status=opendnp3.CommandStatus.SUCCESS):
+        self.summary = summary
+        self.items = [opendnp3.CommandPointResult(header_index, index, opendnp3.CommandPointState.SUCCESS, status)
+                      for header_index, index in items]
+
+    def ForeachItem(self, fun):
+        for item in self.items:
+            fun(item)
+
+
+class FakeMaster:
+    """Records the requests, i.e., (command set, callback), the test completes them."""
+
+    def __init__(self):
+        self.requests = []
+
+    def DirectOperate(self, command_set, callback, config):
+        self.requests.append((command_set, callback))
+
+    def SelectAndOperate(self, command_set, callback, config):
+        self.requests.append((command_set, callback))
+
+
+class FakeStation:
+
+    def __init__(self):
+        self.master = FakeMaster()
+
+
+class TestCommandQueue():
+
+    def test_split_at_max_controls_per_request(self):
+        """
+            Test if commands are packed into CommandSet requests of at most max_controls_per_request controls,
+            one request in flight at a time, the next one sent when the previous completes.
+        """
+        station = FakeStation()
+        queue = CommandQueue(station, max_controls_per_request=4, max_in_flight=1)
+        futures = queue.submit_many((opendnp3.AnalogOutputDouble64(float(i)), i) for i in range(10))
+        assert len(station.master.requests) == 1
+        assert queue.in_flight == 1 and queue.pending == 6
+
+        station.master.requests[0][1](FakeCommandTaskResult([(0, i) for i in range(4)]))
+        assert [future.result(timeout=0).ok for future in futures[:4]] == [True] * 4
+        assert len(station.master.requests) == 2 and queue.pending == 2
+
+        station.master.requests[1][1](FakeCommandTaskResult([(0, i) for i in range(4, 8)]))
+        station.master.requests[2][1](FakeCommandTaskResult([(0, i) for i in range(8, 10)]))
+        assert len(station.master.requests) == 3
+        assert [future.result(timeout=0).index for future in futures] == list(range(10))
+        assert queue.in_flight == 0 and queue.pending == 0
+
+    def test_max_in_flight(self):
+        """
+            Test if up to max_in_flight requests are sent before any completes.
+        """
+        station = FakeStation()
+        queue = CommandQueue(station, max_controls_per_request=2, max_in_flight=2)
+        queue.submit_many((opendnp3.AnalogOutputInt16(i), i) for i in range(6))
+        assert len(station.master.requests) == 2 and queue.pending == 2
+        station.master.requests[1][1](FakeCommandTaskResult([(0, 2), (0, 3)]))
+        assert len(station.master.requests) == 3 and queue.pending == 0
+
+    def test_header_per_type_run(self):
+        """
+            Test if each run of same-type commands gets a header of its own, i.e., results are matched
+            by (headerIndex, index) and the same index in another header resolves another future.
+        """
+        station = FakeStation()
+        queue = CommandQueue(station, max_controls_per_request=16)
+        futures = queue.submit_many([(opendnp3.AnalogOutputInt16(1), 0),
+                                     (opendnp3.AnalogOutputInt16(2), 1),
+                                     (opendnp3.AnalogOutputDouble64(3.0), 0),
+                                     (opendnp3.AnalogOutputInt16(4), 0)])
+        assert len(station.master.requests) == 1  # a single request, three headers
+
+        # results in another order than submitted, each resolves the future of its own header
+        station.master.requests[0][1](FakeCommandTaskResult(
+            [(2, 0), (1, 0), (0, 1), (0, 0)], status=opendnp3.CommandStatus.SUCCESS))
+        assert all(future.result(timeout=0).ok for future in futures)
+
+        # a result of the second header resolves the AnalogOutputDouble64 command only
+        futures = queue.submit_many([(opendnp3.AnalogOutputInt16(1), 0),
+                                     (opendnp3.AnalogOutputDouble64(2.0), 0)])
+        station.master.requests[1][1](FakeCommandTaskResult([(1, 0)]))
+        assert futures[1].result(timeout=0).ok
+        assert futures[0].exception(timeout=0) is not None
+
+    def test_unmatched_results(self):
+        """
+            Test if a command without a result (e.g., a wrong header index, or the task failed)
+            fails its future with the task summary, and if a rejected command resolves as not ok.
+        """
+        station = FakeStation()
+        queue = CommandQueue(station)
+        futures = queue.submit_many([(opendnp3.AnalogOutputInt16(1), 0),
+                                     (opendnp3.AnalogOutputInt16(2), 1),
+                                     (opendnp3.AnalogOutputDouble64(3.0), 2)])
+        result = FakeCommandTaskResult([(0, 0), (0, 2)], summary=opendnp3.TaskCompletion.FAILURE_RESPONSE_TIMEOUT,
+                                       status=opendnp3.CommandStatus.NOT_SUPPORTED)
+        station.master.requests[0][1](result)
+
+        first = futures[0].result(timeout=0)
+        assert not first.ok and first.status == opendnp3.CommandStatus.NOT_SUPPORTED
+        assert first.summary == opendnp3.TaskCompletion.FAILURE_RESPONSE_TIMEOUT
+        for future in futures[1:]:  # index 1 got no result, index 2 was reported under the wrong header
+            try:
+                future.result(timeout=0)
+                assert False
+            except RuntimeError:
+                pass
+        assert queue.in_flight == 0
+
+    def test_cancelled_future(self):
+        """
+            Test if a cancelled future is skipped when its result comes back, i.e., the slot is released
+            and the next request is still sent.
+        """
+        station = FakeStation()
+        queue = CommandQueue(station, max_controls_per_request=2, max_in_flight=1)
+        futures = queue.submit_many((opendnp3.AnalogOutputInt16(i), i) for i in range(4))
+        assert futures[0].cancel() and futures[1].cancel()
+
+        station.master.requests[0][1](FakeCommandTaskResult([(0, 0)]))  # no result for index 1 either
+        assert futures[0].cancelled() and futures[1].cancelled()
+        assert len(station.master.requests) == 2 and queue.in_flight == 1
+
+        assert futures[2].cancel()
+        station.master.requests[1][1](FakeCommandTaskResult([(0, 2), (0, 3)]))
+        assert futures[3].result(timeout=0).ok
+        assert queue.in_flight == 0 and queue.pending == 0
+
+    def test_send_failure(self):
+        """
+            Test if an exception raised when sending fails the futures of the request and frees its slot.
+        """
+        station = FakeStation()
+
+        def fail(command_set, callback, config):
+            raise RuntimeError("Master is shut down")
+
+        station.master.DirectOperate = fail
+        queue = CommandQueue(station)
+        future = queue.submit(opendnp3.AnalogOutputInt16(1), 0)
+        try:
+            future.result(timeout=0)
+            assert False
+        except RuntimeError:
+            pass
+        assert queue.in_flight == 0
+
+    def test_invalid_max_controls_per_request(self):
+        try:
+            CommandQueue(FakeStation(), max_controls_per_request=0)
+            assert False
+        except ValueError:
+            pass
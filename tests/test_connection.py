@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*- {{{
+# vim: set fenc=utf-8 ft=python sw=4 ts=4 sts=4 et:
+#
+# Copyright 2018, Kisensum.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# Neither Kisensum, nor any of its employees, nor any jurisdiction or 
+# organization that has cooperated in the development of these materials, 
+# makes any warranty, express or implied, or assumes any legal liability 
+# or responsibility for the accuracy, completeness, or usefulness or any 
+# information, apparatus, product, software, or process disclosed, or 
+# represents that its use would not infringe privately owned rights. 
+# Reference herein to any specific commercial product, process, or service 
+# by trade name, trademark, manufacturer, or otherwise does not necessarily 
+# constitute or imply its endorsement, recommendation, or favoring by Kisensum.
+# }}}
+
+from pydnp3 import opendnp3
+from dnp3_python.dnp3station.connection import ConnectionTracker, RetryPolicy, backoff_strategy
+
+
+class TestRetryPolicy():
+
+    def test_validation(self):
+        for config in ({"min_retry": 0}, {"min_retry": 10, "max_retry": 5}, {"multiplier": 0.5}, {"jitter": 1.5}):
+            try:
+                RetryPolicy(**config)
+                assert False, f"expected ValueError for {config}"
+            except ValueError:
+                pass
+
+    def test_from_dict(self):
+        policy = RetryPolicy.from_dict({"min_retry": 2, "max_retry": 120, "multiplier": 1.5, "jitter": 0.3})
+        assert (policy.min_retry, policy.max_retry, policy.multiplier, policy.jitter) == (2, 120, 1.5, 0.3)
+        assert repr(policy) == "RetryPolicy(min_retry=2, max_retry=120, multiplier=1.5, jitter=0.3)"
+
+    def test_channel_retry(self):
+        policy = RetryPolicy(min_retry=2, max_retry=60, jitter=0.5)
+        first_delays = set()
+        for _ in range(50):
+            retry = policy.channel_retry()
+            assert retry.maxOpenRetry.GetMilliseconds() == 60000
+            first_delays.add(retry.minOpenRetry.GetMilliseconds())
+        assert all(1000 <= delay <= 2000 for delay in first_delays)
+        assert len(first_delays) > 1
+        assert backoff_strategy(2.0, 0.5) is backoff_strategy(2, 0.5)
+
+    def test_fixed(self):
+        policy = RetryPolicy.fixed(10, jitter=0.2)
+        assert (policy.min_retry, policy.max_retry, policy.multiplier) == (10, 10, 1)
+        retry = policy.channel_retry()
+        delay = retry.minOpenRetry
+        delays = set()
+        for _ in range(100):
+            delay = retry.NextDelay(delay)
+            delays.add(delay.GetMilliseconds())
+        assert all(8000 <= delay <= 10000 for delay in delays)
+        assert len(delays) > 1
+
+        deterministic = RetryPolicy.fixed(5).channel_retry()
+        assert deterministic.NextDelay(deterministic.minOpenRetry).GetMilliseconds() == 5000
+
+
+class TestConnectionTracker():
+
+    def test_counters(self):
+        states = []
+        tracker = ConnectionTracker(on_state_change=states.append)
+        assert not tracker.is_connected and tracker.uptime() is None
+        for state in (opendnp3.ChannelState.OPENING, opendnp3.ChannelState.OPEN,
+                      opendnp3.ChannelState.OPENING, opendnp3.ChannelState.OPENING, opendnp3.ChannelState.OPEN):
+            tracker.OnStateChange(state)
+        assert tracker.is_connected and tracker.wait_connected(0)
+        assert (tracker.attempts, tracker.opens, tracker.closes) == (3, 2, 1)
+        assert tracker.uptime() >= 0
+        assert len(states) == 5 and len(tracker.history) == 5
+        snapshot = tracker.snapshot()
+        assert snapshot["state"] == "OPEN"
+        assert (snapshot["attempts"], snapshot["opens"], snapshot["closes"]) == (3, 2, 1)
+
+        tracker.OnStateChange(opendnp3.ChannelState.CLOSED)
+        assert not tracker.is_connected and not tracker.wait_connected(0.01)
+        assert tracker.closes == 2 and tracker.uptime() is None
+
+    def test_flaps(self):
+        tracker = ConnectionTracker()
+        for _ in range(3):
+            tracker.OnStateChange(opendnp3.ChannelState.OPEN)
+            tracker.OnStateChange(opendnp3.ChannelState.OPENING)
+        assert tracker.flaps(window=60) == 3
+        assert tracker.flaps(window=0) == 0
+
+    def test_inner_listener(self):
+        inner = ConnectionTracker()
+        tracker = ConnectionTracker(inner=inner)
+        tracker.OnStateChange(opendnp3.ChannelState.OPEN)
+        assert inner.is_connected and inner.opens == 1
@@ -301,3 +301,35 @@ class TestConstructors():
         crob = opendnp3.ControlRelayOutputBlock(opendnp3.ControlCode.LATCH_ON)
         assert opendnp3.CommandSet(items=[opendnp3.WithIndex(crob, 0),
                                           opendnp3.WithIndex(crob, 1)]) is not None
+
+        # CommandSet built from arrays
+        command_set = opendnp3.CommandSet()
+        command_set.AddAODouble64Array([0, 1, 2], [4.8, 14.1, 0.0])
+        command_set.AddCROBArray([3, 4], [True, False])
+        assert command_set is not None
+
+        # out of range indexes and values are rejected, not wrapped (e.g., 70000 to 4464, -1 to 65535)
+        invalid = [("AddAODouble64Array", [70000], [1.0]),
+                   ("AddAODouble64Array", [-1], [1.0]),
+                   ("AddAODouble64Array", [0.5], [1.0]),
+                   ("AddAODouble64Array", [0, 1], [1.0]),
+                   ("AddAOInt16Array", [0], [32768]),
+                   ("AddAOInt16Array", [0], [1.5]),
+                   ("AddAOInt32Array", [0], [2 ** 31]),
+                   ("AddAOFloat32Array", [0], [1e39]),
+                   ("AddCROBArray", [0], [2])]
+        for method, indexes, values in invalid:
+            try:
+                getattr(opendnp3.CommandSet(), method)(indexes, values)
+                assert False, method
+            except ValueError:
+                pass
+        opendnp3.CommandSet().AddAOInt16Array([0, 65535], [-32768, 32767])  # bounds are valid
+
+        # DatabaseConfig configured by range
+        db_config = asiodnp3.DatabaseConfig(opendnp3.DatabaseSizes.AllTypes(10))
+        db_config.ConfigureAnalog(2, 9, opendnp3.PointClass.Class2, opendnp3.StaticAnalogVariation.Group30Var5,
+                                  opendnp3.EventAnalogVariation.Group32Var7, deadband=0.5)
+        assert db_config.analog[9].clazz == opendnp3.PointClass.Class2
+        assert db_config.analog[2].deadband == 0.5
+        assert db_config.analog[1].clazz != opendnp3.PointClass.Class2
@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*- {{{
+# vim: set fenc=utf-8 ft=python sw=4 ts=4 sts=4 et:
+#
+# Copyright 2018, Kisensum.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# Neither Kisensum, nor any of its employees, nor any jurisdiction or 
+# organization that has cooperated in the development of these materials, 
+# makes any warranty, express or implied, or assumes any legal liability 
+# or responsibility for the accuracy, completeness, or usefulness or any 
+# information, apparatus, product, software, or process disclosed, or 
+# represents that its use would not infringe privately owned rights. 
+# Reference herein to any specific commercial product, process, or service 
+# by trade name, trademark, manufacturer, or otherwise does not necessarily 
+# constitute or imply its endorsement, recommendation, or favoring by Kisensum.
+# }}}
+
+import time
+
+from pydnp3 import opendnp3
+from dnp3_python.dnp3station.event_telemetry import EventTelemetry
+
+
+class FakeApplication:
+    """Stands in for the wrapped IMasterApplication, records the delegated calls."""
+
+    def __init__(self):
+        self.calls = []
+
+    def __getattr__(self, name):
+        return lambda *args: self.calls.append(name)
+
+
+def iin(*bits):
+    field = opendnp3.IINField(0, 0)
+    for bit in bits:
+        field.SetBit(bit)
+    return field
+
+
+class TestEventTelemetry():
+
+    def test_overflow_episodes(self):
+        application = FakeApplication()
+        telemetry = EventTelemetry(application)
+        for overflow in (True, True, False, True, False, False):
+            telemetry.OnReceiveIIN(iin(opendnp3.IINBit.EVENT_BUFFER_OVERFLOW) if overflow else iin())
+        snapshot = telemetry.snapshot()
+        assert snapshot["responses"] == 6
+        assert snapshot["overflow_responses"] == 3
+        assert snapshot["overflows"] == 2
+        assert not snapshot["overflow_active"]
+        assert application.calls.count("OnReceiveIIN") == 6
+
+    def test_pending_classes(self):
+        telemetry = EventTelemetry(FakeApplication())
+        telemetry.OnReceiveIIN(iin(opendnp3.IINBit.CLASS1_EVENTS, opendnp3.IINBit.CLASS3_EVENTS))
+        telemetry.OnReceiveIIN(iin(opendnp3.IINBit.CLASS1_EVENTS))
+        assert telemetry.snapshot()["pending_responses"] == {1: 2, 2: 0, 3: 1}
+
+    def test_events_per_response(self):
+        telemetry = EventTelemetry(FakeApplication())
+        telemetry.record_events("Analog", count=3)
+        telemetry.record_events("Binary", count=2)
+        telemetry.OnReceiveIIN(iin())
+        telemetry.record_events("Analog", count=1)
+        telemetry.OnReceiveIIN(iin())
+        snapshot = telemetry.snapshot()
+        assert snapshot["events"] == 6
+        assert snapshot["events_by_type"] == {"Analog": 4, "Binary": 2}
+        assert snapshot["last_events_per_response"] == 1
+        assert snapshot["max_events_per_response"] == 5
+
+    def test_solicited_unsolicited_split(self):
+        telemetry = EventTelemetry(FakeApplication())
+        now = time.time()
+        now_ms = now * 1000
+        telemetry.record_events("Analog", times=[now_ms - 100, 0], received=now)  # Note: 0, i.e., no timestamp
+        telemetry.OnTaskStart(None, None)
+        telemetry.record_events("Analog", times=[now_ms - 20, now_ms - 40], received=now)
+        telemetry.OnTaskComplete(None)
+        telemetry.record_events("Analog", times=[now_ms - 300], received=now)
+        telemetry.OnTaskStart(None, None)
+        telemetry.OnClose()  # Note: no OnTaskComplete for a task cut short by the channel closing
+        telemetry.record_events("Analog", times=[now_ms - 500], received=now)
+
+        latency = telemetry.snapshot()["latency_ms"]
+        assert latency["solicited"]["count"] == 2
+        assert abs(latency["solicited"]["mean"] - 30) < 1
+        assert latency["unsolicited"]["count"] == 3
+        assert abs(latency["unsolicited"]["max"] - 500) < 1
+
+    def test_reset(self):
+        telemetry = EventTelemetry(FakeApplication())
+        telemetry.record_events("Analog", count=3)
+        telemetry.OnReceiveIIN(iin(opendnp3.IINBit.EVENT_BUFFER_OVERFLOW))
+        telemetry.reset()
+        snapshot = telemetry.snapshot()
+        assert (snapshot["events"], snapshot["responses"], snapshot["overflows"]) == (0, 0, 0)
@@ -26,6 +26,8 @@
 # constitute or imply its endorsement, recommendation, or favoring by Kisensum.
 # }}}
 
+import threading
+
 from pydnp3 import asiodnp3 as asiodnp3
 from pydnp3 import asiopal as asiopal
 from pydnp3 import opendnp3 as opendnp3
@@ -273,3 +275,210 @@ class TestInterfaceClasses():
         assert outstationApplication.OnKeepAliveInitiated() is None
         assert outstationApplication.OnKeepAliveFailure() is None
         assert outstationApplication.OnKeepAliveSuccess() is None
+
+    def test_collection_to_arrays(self):
+        """
+            Collect a measurement collection with ToArrays and test if indexes, values, flags and times match.
+        """
+
+        class AnalogCollection(opendnp3.ICollectionIndexedAnalog):
+            def __init__(self, items):
+                super(AnalogCollection, self).__init__()
+                self.items = items
+
+            def Count(self):
+                return len(self.items)
+
+            def Foreach(self, visitor):
+                for item in self.items:
+                    visitor.OnValue(item)
+
+        collection = AnalogCollection([
+            opendnp3.WithIndex(opendnp3.Analog(4.8, opendnp3.Flags(0x01), opendnp3.DNPTime(1000)), 0),
+            opendnp3.WithIndex(opendnp3.Analog(14.1, opendnp3.Flags(0x03), opendnp3.DNPTime(2000)), 5),
+        ])
+        indexes, values, flags, times = collection.ToArrays()
+        assert indexes.tolist() == [0, 5]
+        assert values.tolist() == [4.8, 14.1]
+        assert flags.tolist() == [0x01, 0x03]
+        assert times.tolist() == [1000, 2000]
+
+    def test_ring_buffer_soe_handler(self):
+        """
+            Process a measurement collection with RingBufferSOEHandler, then test if Drain returns it
+            and if records beyond the capacity are counted as overflow.
+        """
+
+        class AnalogCollection(opendnp3.ICollectionIndexedAnalog):
+            def __init__(self, items):
+                super(AnalogCollection, self).__init__()
+                self.items = items
+
+            def Count(self):
+                return len(self.items)
+
+            def Foreach(self, visitor):
+                for item in self.items:
+                    visitor.OnValue(item)
+
+        collection = AnalogCollection([
+            opendnp3.WithIndex(opendnp3.Analog(4.8, opendnp3.Flags(0x01), opendnp3.DNPTime(1000)), 0),
+            opendnp3.WithIndex(opendnp3.Analog(14.1, opendnp3.Flags(0x03), opendnp3.DNPTime(2000)), 5),
+            opendnp3.WithIndex(opendnp3.Analog(27.2, opendnp3.Flags(0x01), opendnp3.DNPTime(3000)), 7),
+        ])
+        info = opendnp3.HeaderInfo(opendnp3.GroupVariation.Group30Var6, opendnp3.QualifierCode.UINT16_START_STOP,
+                                   opendnp3.TimestampMode.INVALID, 0)
+        handler = asiodnp3.RingBufferSOEHandler(2)
+        handler.Process(info, collection)
+        assert handler.Size() == 2
+        assert handler.GetOverflowCount() == 1
+
+        gvs, types, indexes, values, flags, times = handler.Drain(0)
+        assert gvs.tolist() == [int(opendnp3.GroupVariation.Group30Var6)] * 2
+        assert types.tolist() == [int(asiodnp3.RingBufferPointType.ANALOG)] * 2
+        assert indexes.tolist() == [0, 5]
+        assert values.tolist() == [4.8, 14.1]
+        assert flags.tolist() == [0x01, 0x03]
+        assert times.tolist() == [1000, 2000]
+        assert handler.Size() == 0
+
+        # concurrent consumers must not deadlock on the drain lock and the GIL
+        def drain():
+            for _ in range(2000):
+                handler.Drain(1)
+
+        threads = [threading.Thread(target=drain, daemon=True) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for _ in range(2000):
+            handler.Process(info, collection)  # single producer
+        for thread in threads:
+            thread.join(timeout=30)
+            assert not thread.is_alive()
+
+    def test_ring_buffer_log_handler(self):
+        """
+            Test if RingBufferLogHandler can be configured and drained without any log entry.
+        """
+        handler = asiodnp3.RingBufferLogHandler(4, 128)
+        handler.SetPolicy("tcpclient", sampleEvery=10, maxPerSecond=100)
+        handler.SetDefaultPolicy(maxPerSecond=1000)
+        handler.SetExemptFilters(opendnp3.flags.ERR)
+        assert handler.Capacity() == 4
+        assert handler.Size() == 0
+        assert handler.GetStatistics() == {"received": 0, "dropped": 0, "overflow": 0}
+
+        times, filters, loggerids, locations, messages = handler.Drain(0)
+        assert times.tolist() == [] and filters.tolist() == []
+        assert loggerids == [] and locations == [] and messages == []
+        assert handler.Wait(1) is False
+
+    def test_create_listener(self):
+        """
+            Create a TCP listener with Python listen callbacks, without an error code argument, then shut it down.
+        """
+
+        class ListenCallbacks(asiodnp3.IListenCallbacks):
+            def AcceptConnection(self, sessionid, ipaddress):
+                return False
+
+            def AcceptCertificate(self, sessionid, info):
+                return False
+
+            def GetFirstFrameTimeout(self):
+                return openpal.TimeDuration().Seconds(1)
+
+            def OnFirstFrame(self, sessionid, header, acceptor):
+                pass
+
+            def OnConnectionClose(self, sessionid, session):
+                pass
+
+            def OnCertificateError(self, sessionid, info, error):
+                pass
+
+        manager = asiodnp3.DNP3Manager(1)
+        callbacks = ListenCallbacks()
+        listener = manager.CreateListener("listener", openpal.LogFilters(opendnp3.levels.NOTHING),
+                                          asiopal.IPEndpoint("127.0.0.1", 20099), callbacks)
+        assert listener is not None
+        listener.Shutdown()
+        del manager
+
+    def test_add_serial(self):
+        """
+            Add a serial channel on a device that does not exist, i.e., the channel keeps retrying to open it,
+            then shut it down.
+        """
+        manager = asiodnp3.DNP3Manager(1)
+        settings = asiopal.SerialSettings()
+        settings.deviceName = "/dev/pydnp3-missing"
+        settings.baud = 19200
+        settings.parity = opendnp3.Parity.Even
+        channel = manager.AddSerial("serial", opendnp3.levels.NOTHING, asiopal.ChannelRetry().Default(),
+                                    settings, None)
+        assert channel is not None
+        channel.Shutdown()
+        del manager
+
+    def test_jittered_backoff_strategy(self):
+        """
+            Test if JitteredBackoffStrategy delays grow within [current, current * multiplier * (1 + jitter)],
+            are jittered within [max * (1 - jitter), max] at the cap, and if ChannelRetry accepts it.
+        """
+        seconds = openpal.TimeDuration().Seconds
+        strategy = asiopal.JitteredBackoffStrategy(2.0, 0.5)
+        assert strategy.multiplier == 2.0 and strategy.jitter == 0.5
+        delays = {strategy.GetNextDelay(seconds(1), seconds(60)).GetMilliseconds() for _ in range(100)}
+        assert all(1000 <= delay <= 3000 for delay in delays)
+        assert len(delays) > 1
+        delays = {strategy.GetNextDelay(seconds(50), seconds(60)).GetMilliseconds() for _ in range(100)}
+        assert all(30000 <= delay <= 60000 for delay in delays)
+        assert len(delays) > 1
+
+        # a fixed delay (multiplier 1, min == max) neither decays nor sticks to the cap
+        fixed = asiopal.JitteredBackoffStrategy(1.0, 0.2)
+        delay = seconds(10)
+        delays = set()
+        for _ in range(200):
+            delay = fixed.GetNextDelay(delay, seconds(10))
+            delays.add(delay.GetMilliseconds())
+        assert all(8000 <= delay <= 10000 for delay in delays)
+        assert len(delays) > 1
+        assert asiopal.JitteredBackoffStrategy(2.0, 0).GetNextDelay(seconds(40), seconds(60)).GetMilliseconds() == 60000
+
+        retry = asiopal.ChannelRetry(seconds(1), seconds(60), strategy)
+        assert retry.minOpenRetry.GetMilliseconds() == 1000
+
+        for multiplier, jitter in ((0.5, 0.5), (2.0, 1.5)):
+            try:
+                asiopal.JitteredBackoffStrategy(multiplier, jitter)
+                assert False, "expected ValueError"
+            except ValueError as err:
+                assert "must be" in str(err)
+
+    def test_collect_statistics(self):
+        """
+            Test if CollectStatistics returns one row of STATISTICS_FIELDS counters per channel,
+            zeros for a missing stack, the same channel counters for a shared channel,
+            and rejects stacks of another length.
+        """
+        assert "numTransportRx" in asiodnp3.STATISTICS_FIELDS
+        assert "numUnknownDestination" in asiodnp3.STATISTICS_FIELDS
+        assert asiodnp3.CollectStatistics([], []).shape == (0, len(asiodnp3.STATISTICS_FIELDS))
+
+        manager = asiodnp3.DNP3Manager(1)
+        channel = manager.AddTCPClient("client", opendnp3.levels.NOTHING, asiopal.ChannelRetry().Default(),
+                                       "127.0.0.1", "0.0.0.0", 20000, None)
+        statistics = asiodnp3.CollectStatistics([channel, None], [None, None])
+        assert statistics.shape == (2, len(asiodnp3.STATISTICS_FIELDS))
+        assert not statistics[1].any()
+        statistics = asiodnp3.CollectStatistics([channel, None, channel], [])
+        assert (statistics[0] == statistics[2]).all()
+        try:
+            asiodnp3.CollectStatistics([channel], [None, None])
+            assert False, "expected ValueError"
+        except ValueError as err:
+            assert "stacks" in str(err)
+        channel.Shutdown()
+        del manager
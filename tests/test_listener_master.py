@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*- {{{
+# vim: set fenc=utf-8 ft=python sw=4 ts=4 sts=4 et:
+#
+# Copyright 2018, Kisensum.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# Neither Kisensum, nor any of its employees, nor any jurisdiction or 
+# organization that has cooperated in the development of these materials, 
+# makes any warranty, express or implied, or assumes any legal liability 
+# or responsibility for the accuracy, completeness, or usefulness or any 
+# information, apparatus, product, software, or process disclosed, or 
+# represents that its use would not infringe privately owned rights. 
+# Reference herein to any specific commercial product, process, or service 
+# by trade name, trademark, manufacturer, or otherwise does not necessarily 
+# constitute or imply its endorsement, recommendation, or favoring by Kisensum.
+# }}}
+
+import time
+
+from pydnp3 import opendnp3, openpal, asiopal, asiodnp3
+
+from dnp3_python.dnp3station.listener_master import ListenerMaster
+from dnp3_python.dnp3station.scan_plan import ScanPlan
+
+HOST = "127.0.0.1"
+LOCAL = "0.0.0.0"
+PORT = 20011
+MASTER_ID = 2
+FILTERS = opendnp3.levels.NORMAL
+
+
+def wait_until(predicate, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+def dial_in(manager, address, name, retry_seconds=1):
+    """An outstation on a TCP client channel, i.e., an RTU dialing in to the listener.
+    Unsolicited responses are allowed, so that its null unsolicited response is the first frame.
+    """
+    retry = openpal.TimeDuration().Seconds(retry_seconds)
+    channel = manager.AddTCPClient(name,
+                                   FILTERS,
+                                   asiopal.ChannelRetry(retry, retry),
+                                   HOST,
+                                   LOCAL,
+                                   PORT,
+                                   asiodnp3.PrintingChannelListener().Create())
+    config = asiodnp3.OutstationStackConfig(opendnp3.DatabaseSizes.AllTypes(10))
+    config.outstation.eventBufferConfig = opendnp3.EventBufferConfig().AllTypes(10)
+    config.outstation.params.allowUnsolicited = True
+    config.link.LocalAddr = address
+    config.link.RemoteAddr = MASTER_ID
+    config.link.KeepAliveTimeout = openpal.TimeDuration().Max()
+    outstation = channel.AddOutstation("outstation-" + name,
+                                       opendnp3.SuccessCommandHandler().Create(),
+                                       opendnp3.DefaultOutstationApplication().Create(),
+                                       config)
+    outstation.Enable()
+    return channel
+
+
+class TestListenerMaster():
+
+    def test_loopback(self):
+        """
+            Test if an outstation dialing in is identified from its first frame, if a reconnect of the same address
+            replaces its session, if a closed connection removes the session, and if an address not allowed
+            is rejected.
+        """
+        opened, closed = [], []
+        listener_master = ListenerMaster(port=PORT, local_ip=HOST, master_id=MASTER_ID, concurrency_hint=1,
+                                         allowed_addresses=[10], scan_plan=ScanPlan(),
+                                         on_session_open=opened.append, on_session_close=closed.append)
+        manager = asiodnp3.DNP3Manager(1, asiodnp3.ConsoleLogger().Create())
+        channels = {}
+        try:
+            listener_master.start()
+
+            # accept, identify from the first frame
+            channels["first"] = dial_in(manager, 10, "first", retry_seconds=60)
+            assert wait_until(lambda: 10 in listener_master)
+            first = listener_master.get_session(10)
+            assert first.address == 10 and first.ip == HOST
+            assert listener_master.accepted == 1 and listener_master.replaced == 0
+            assert opened == [first]
+
+            # replace on reconnect, e.g., before the master noticed the connection drop
+            channels["second"] = dial_in(manager, 10, "second")
+            assert wait_until(lambda: listener_master.replaced == 1)
+            second = listener_master.get_session(10)
+            assert second is not first and second.session_id != first.session_id
+            assert second.soe_handler is first.soe_handler  # taken from the pool
+            assert len(listener_master) == 1 and listener_master.accepted == 2
+            channels.pop("first").Shutdown()  # the first outstation does not reconnect
+            time.sleep(0.5)
+            assert listener_master.get_session(10) is second
+
+            # close
+            channels.pop("second").Shutdown()
+            assert wait_until(lambda: 10 not in listener_master)
+            assert wait_until(lambda: second in closed)
+            assert first not in closed  # replaced, not reported as the outstation's session close
+            assert len(listener_master) == 0
+
+            # address not in allowed_addresses
+            rejected = listener_master.rejected
+            channels["other"] = dial_in(manager, 11, "other")
+            assert wait_until(lambda: listener_master.rejected > rejected)
+            assert 11 not in listener_master
+            assert listener_master.accepted == 2
+        finally:
+            for channel in channels.values():
+                channel.Shutdown()
+            listener_master.shutdown()
+            del manager
@@ -28,9 +28,12 @@
 
 from pydnp3 import asiodnp3, asiopal, opendnp3, openpal
 
+import threading
 import time
 import pytest
 
+from dnp3_python.dnp3station.master_new import MyMasterNew
+
 
 FILTERS = opendnp3.levels.NORMAL | opendnp3.levels.ALL_COMMS
 HOST = "127.0.0.1"
@@ -321,3 +324,209 @@ class TestMaster:
     def test_cold_restart(self, run_outstation):
         """Test cold restart."""
         self.run_master("r")
+
+    def test_DirectOperate_python_callback(self, run_outstation):
+        """
+            Test if a Python callable receives the ICommandTaskResult of DirectOperate (on the stack's thread,
+            by reference) with the per-point results, and if an exception it raises does not reach the stack.
+        """
+        self.config_master()
+        received = threading.Event()
+        results = []
+
+        def callback(result):
+            points = []
+            result.ForeachItem(lambda point: points.append((point.headerIndex, point.index, point.status)))
+            results.append((result.summary, points))
+            received.set()
+            raise ValueError("raised on purpose, must be printed, not propagated")
+
+        self.master.DirectOperate(opendnp3.ControlRelayOutputBlock(opendnp3.ControlCode.LATCH_ON), 4, callback)
+        assert received.wait(timeout=10)
+        assert results == [(opendnp3.TaskCompletion.SUCCESS, [(0, 4, opendnp3.CommandStatus.SUCCESS)])]
+
+        # the master keeps working after the exception
+        received.clear()
+        self.master.DirectOperate(opendnp3.ControlRelayOutputBlock(opendnp3.ControlCode.LATCH_OFF), 5, callback)
+        assert received.wait(timeout=10)
+        assert results[1] == (opendnp3.TaskCompletion.SUCCESS, [(0, 5, opendnp3.CommandStatus.SUCCESS)])
+        self.shutdown()
+
+    def test_Restart_python_callback(self, run_outstation):
+        """
+            Test if the RestartOperationResult given to a Python callable is a copy, i.e., still valid
+            after the callback returns.
+        """
+        self.config_master()
+        received = threading.Event()
+        results = []
+
+        def callback(result):
+            results.append(result)
+            received.set()
+
+        self.master.Restart(opendnp3.RestartType.COLD, callback)
+        assert received.wait(timeout=10)
+        assert results[0].summary == opendnp3.TaskCompletion.SUCCESS
+        assert results[0].restartTime.GetMilliseconds() >= 0
+        self.shutdown()
+
+
+class RecordingCommandHandler(opendnp3.ICommandHandler):
+    """
+        Outstation command handler recording the operated commands, i.e., what the master actually sent.
+    """
+
+    def __init__(self):
+        super(RecordingCommandHandler, self).__init__()
+        self.operated = []
+
+    def Start(self):
+        pass
+
+    def End(self):
+        pass
+
+    def Select(self, command, index):
+        return opendnp3.CommandStatus.SUCCESS
+
+    def Operate(self, command, index, op_type):
+        value = command.functionCode if isinstance(command, opendnp3.ControlRelayOutputBlock) else command.value
+        self.operated.append((type(command).__name__, index, value))
+        return opendnp3.CommandStatus.SUCCESS
+
+
+class TestCommandSetArrays:
+
+    PORT = 20012
+
+    def setup_method(self):
+        self.manager = asiodnp3.DNP3Manager(1, asiodnp3.ConsoleLogger().Create())
+        server = self.manager.AddTCPServer("server", FILTERS, asiopal.ChannelRetry().Default(), LOCAL, self.PORT,
+                                           asiodnp3.PrintingChannelListener().Create())
+        config = asiodnp3.OutstationStackConfig(opendnp3.DatabaseSizes.AllTypes(10))
+        config.link.LocalAddr = 10
+        config.link.KeepAliveTimeout = openpal.TimeDuration().Max()
+        self.command_handler = RecordingCommandHandler()
+        self.outstation = server.AddOutstation("outstation", self.command_handler,
+                                               opendnp3.DefaultOutstationApplication().Create(), config)
+        self.outstation.Enable()
+
+        client = self.manager.AddTCPClient("tcpclient", FILTERS, asiopal.ChannelRetry(), HOST, LOCAL, self.PORT,
+                                           asiodnp3.PrintingChannelListener().Create())
+        stack_config = asiodnp3.MasterStackConfig()
+        stack_config.master.responseTimeout = openpal.TimeDuration().Seconds(2)
+        stack_config.link.RemoteAddr = 10
+        self.master = client.AddMaster("master", asiodnp3.PrintingSOEHandler().Create(),
+                                       asiodnp3.DefaultMasterApplication().Create(), stack_config)
+        self.master.Enable()
+
+    def teardown_method(self):
+        del self.master
+        del self.outstation
+        self.manager.Shutdown()
+
+    def operate(self, command_set):
+        received = threading.Event()
+        results = []
+
+        def callback(result):
+            result.ForeachItem(lambda point: results.append((point.headerIndex, point.index, point.status)))
+            results.append(result.summary)
+            received.set()
+
+        self.master.DirectOperate(command_set, callback)
+        assert received.wait(timeout=10)
+        return results
+
+    def test_headers(self):
+        """
+            Test if each array method adds one header with the given indexes and values, in order.
+        """
+        command_set = opendnp3.CommandSet()
+        command_set.AddAOInt16Array([3, 1], [-7, 32767])
+        command_set.AddAODouble64Array([0, 1, 2], [4.8, 14.1, 0.0])
+        command_set.AddCROBArray([4, 5], [True, False])
+        command_set.AddAOFloat32Array([9], [1.5])
+
+        results = self.operate(command_set)
+        assert results[-1] == opendnp3.TaskCompletion.SUCCESS
+        assert [point[:2] for point in results[:-1]] == [(0, 3), (0, 1), (1, 0), (1, 1), (1, 2),
+                                                          (2, 4), (2, 5), (3, 9)]
+        assert all(point[2] == opendnp3.CommandStatus.SUCCESS for point in results[:-1])
+        assert self.command_handler.operated == [
+            ("AnalogOutputInt16", 3, -7), ("AnalogOutputInt16", 1, 32767),
+            ("AnalogOutputDouble64", 0, 4.8), ("AnalogOutputDouble64", 1, 14.1), ("AnalogOutputDouble64", 2, 0.0),
+            ("ControlRelayOutputBlock", 4, opendnp3.ControlCode.LATCH_ON),
+            ("ControlRelayOutputBlock", 5, opendnp3.ControlCode.LATCH_OFF),
+            ("AnalogOutputFloat32", 9, 1.5),
+        ]
+
+
+class TestReadAsync:
+    """MyMasterNew.read_async against the run_outstation fixture (link address 10, 10 points of each type)."""
+
+    def setup_method(self):
+        self.master = MyMasterNew(port=PORT, outstation_id=10, enable_default_scans=False)
+        self.master.start()
+        assert self.master.connection.wait_connected(timeout=10)
+
+    def teardown_method(self):
+        self.master.shutdown(sleep_before_master_shutdown=0)
+
+    def test_read_async(self, run_outstation):
+        """
+            Test if the future resolves on task completion, with the values of the group-variation.
+        """
+        future = self.master.read_async(opendnp3.GroupVariationID(30, 6))
+        result = future.result(timeout=10)
+        assert list(result) == [opendnp3.GroupVariation.Group30Var6]
+        assert sorted(result[opendnp3.GroupVariation.Group30Var6]) == list(range(10))
+
+    def test_read_async_failure(self, run_outstation):
+        """
+            Test if the future raises RuntimeError when the task fails, e.g., no outstation on the port.
+        """
+        master = MyMasterNew(port=PORT + 19, outstation_id=10, enable_default_scans=False)
+        try:
+            master.start()
+            future = master.read_async(opendnp3.GroupVariationID(30, 6))
+            try:
+                future.result(timeout=10)
+                assert False
+            except RuntimeError:
+                pass
+        finally:
+            master.shutdown(sleep_before_master_shutdown=0)
+
+    def test_requested_at(self, run_outstation):
+        """
+            Test if values received before the request are reported as None, i.e., a scan whose response
+            does not carry the group-variation does not return its cached values.
+        """
+        analog = opendnp3.GroupVariation.Group30Var6
+        self.master.read_async(opendnp3.GroupVariationID(30, 6)).result(timeout=10)
+        assert self.master.soe_handler.gv_index_value_nested_dict.get(analog)  # cached
+
+        # a scan of binaries only, waiting for analogs
+        future = self.master._scan_async(
+            issue_scan=lambda task_config: self.master.master.ScanAllObjects(opendnp3.GroupVariationID(1, 2),
+                                                                             task_config),
+            gv_clss=[analog])
+        assert future.result(timeout=10) == {analog: None}
+        assert self.master.soe_handler.gv_index_value_nested_dict.get(analog)  # still cached
+
+    def test_read_many_async(self, run_outstation):
+        """
+            Test if a single read of several group-variations fills the values of each of them,
+            and if retrieve_db_by_gvids returns them all.
+        """
+        analog, binary = opendnp3.GroupVariation.Group30Var6, opendnp3.GroupVariation.Group1Var2
+        gv_ids = [opendnp3.GroupVariationID(30, 6), opendnp3.GroupVariationID(1, 2)]
+        result = self.master.read_many_async(gv_ids).result(timeout=10)
+        assert set(result) == {analog, binary}
+        assert sorted(result[analog]) == list(range(10)) and sorted(result[binary]) == list(range(10))
+        assert all(isinstance(value, bool) for value in result[binary].values())
+
+        db = self.master.retrieve_db_by_gvids(gv_ids)
+        assert sorted(db[analog]) == list(range(10)) and sorted(db[binary]) == list(range(10))
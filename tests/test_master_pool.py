@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*- {{{
+# vim: set fenc=utf-8 ft=python sw=4 ts=4 sts=4 et:
+#
+# Copyright 2018, Kisensum.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# Neither Kisensum, nor any of its employees, nor any jurisdiction or 
+# organization that has cooperated in the development of these materials, 
+# makes any warranty, express or implied, or assumes any legal liability 
+# or responsibility for the accuracy, completeness, or usefulness or any 
+# information, apparatus, product, software, or process disclosed, or 
+# represents that its use would not infringe privately owned rights. 
+# Reference herein to any specific commercial product, process, or service 
+# by trade name, trademark, manufacturer, or otherwise does not necessarily 
+# constitute or imply its endorsement, recommendation, or favoring by Kisensum.
+# }}}
+
+from dnp3_python.dnp3station.master_pool import MasterPool
+
+HOST = "127.0.0.1"
+PORT = 20016
+
+
+class TestMasterPool():
+
+    def test_add_remove(self):
+        """
+            Test if masters of the same endpoint share a channel, which is shut down with its last master,
+            and if a duplicate master is rejected.
+        """
+        pool = MasterPool(concurrency_hint=1, integrity_period=None, event_period=None)
+        try:
+            first = pool.add_master(outstation_ip=HOST, port=PORT, outstation_id=1, start=False)
+            second = pool.add_master(outstation_ip=HOST, port=PORT, outstation_id=2, start=False)
+            other = pool.add_master(outstation_ip=HOST, port=PORT + 1, outstation_id=1, start=False)
+            assert len(pool) == 3
+            assert first.channel is second.channel and other.channel is not first.channel
+            assert len(pool._channels) == 2
+            assert (HOST, PORT, 2) in pool and pool.get_master(HOST, PORT, 2) is second
+            assert set(pool) == {first, second, other}
+
+            try:
+                pool.add_master(outstation_ip=HOST, port=PORT, outstation_id=1, start=False)
+                assert False
+            except ValueError:
+                pass
+            assert pool.get_master(HOST, PORT, 1) is first
+
+            pool.remove_master(HOST, PORT, 1)
+            assert (HOST, PORT, 1) not in pool
+            assert pool.channel_state(HOST, PORT) is not None  # still used by the second master
+            pool.remove_master(HOST, PORT, 2)
+            assert pool.channel_state(HOST, PORT) is None
+            assert len(pool) == 1 and len(pool._channels) == 1
+
+            try:
+                pool.remove_master(HOST, PORT, 2)
+                assert False
+            except KeyError:
+                pass
+        finally:
+            pool.shutdown()
+        assert len(pool) == 0 and len(pool._channels) == 0
+
+    def test_failed_master(self):
+        """
+            Test if a channel created for a master that fails to construct (i.e., AddMaster raises) is shut down.
+        """
+        pool = MasterPool(concurrency_hint=1, integrity_period=None, event_period=None)
+        try:
+            try:
+                pool.add_master(outstation_ip=HOST, port=PORT, outstation_id=1, start=False,
+                                stack_config="not a MasterStackConfig")
+                assert False
+            except TypeError:
+                pass
+            assert len(pool) == 0 and pool.channel_state(HOST, PORT) is None
+        finally:
+            pool.shutdown()
+
+    def test_stats(self):
+        """
+            Test if stats has one row per master, and if a table is reused within max_age
+            until a master is added or removed.
+        """
+        pool = MasterPool(concurrency_hint=1, integrity_period=None, event_period=None)
+        try:
+            pool.add_master(outstation_ip=HOST, port=PORT, outstation_id=1, start=False)
+            pool.add_master(outstation_ip=HOST, port=PORT, outstation_id=2, start=False)
+            table = pool.stats(max_age=60)
+            assert table.keys == [(HOST, PORT, 1), (HOST, PORT, 2)]
+            assert table[(HOST, PORT, 1)].numTransportRx == 0
+            assert pool.stats(max_age=60) is table
+            assert pool.stats() is not table  # max_age=0 reads fresh counters
+
+            pool.add_master(outstation_ip=HOST, port=PORT, outstation_id=3, start=False)
+            table = pool.stats(max_age=60)
+            assert len(table) == 3 and (HOST, PORT, 3) in table
+            pool.remove_master(HOST, PORT, 1)
+            assert pool.stats(max_age=60).keys == [(HOST, PORT, 2), (HOST, PORT, 3)]
+        finally:
+            pool.shutdown()
+
+    def test_scan_plan(self):
+        """
+            Test if the masters of the pool get the pool's periods by default, and are driven by its ScanTimer.
+        """
+        pool = MasterPool(concurrency_hint=1, integrity_period=600, event_period=None)
+        try:
+            station = pool.add_master(outstation_ip=HOST, port=PORT, outstation_id=1, start=False,
+                                      event_period=30)
+            assert sorted(station.scans) == ["event", "integrity"]
+            assert station.scans["integrity"].entry.period == 600 and station.scans["event"].entry.period == 30
+            assert station.scan_timer is pool.scan_timer
+        finally:
+            pool.shutdown()
@@ -27,7 +27,10 @@
 # }}}
 
 from pydnp3 import asiodnp3, asiopal, opendnp3, openpal
+from dnp3_python.dnp3station.outstation_new import MyOutStationNew, MyOutstationCommandHandler
+from dnp3_python.dnp3station.station_utils import DBHandler
 
+import numpy as np
 import time
 import pytest
 
@@ -120,7 +123,7 @@ def run_master():
 
 class TestOutstation:
 
-    def run_outstation(self, value=None, index=0):
+    def run_outstation(self, value=None, index=0, arrays=None):
         # Callback interface for log messages
         self.handler = LogHandler()
 
@@ -154,13 +157,17 @@ class TestOutstation:
         # If the master is running, the channel listener state is OPENING
         assert self.channel_listener.state == opendnp3.ChannelState.OPENING
 
-        if value is not None:
+        if value is not None or arrays is not None:
             # reset the logger id server to False before sending the cmd, if the cmd is sent successful,
             # the log handler should catch the logger id "server"
             self.handler.server = False
 
             builder = asiodnp3.UpdateBuilder()
-            builder.Update(value, index)
+            if value is not None:
+                builder.Update(value, index)
+            else:
+                method, indexes, values = arrays
+                getattr(builder, method)(indexes, values)
             outstation.Apply(builder.Build())
 
             # If the message sent successful, the log handler should catch loggerid "server"
@@ -188,3 +195,159 @@ class TestOutstation:
     def test_send_double_bit_binary(self, run_master):
         self.run_outstation(value=opendnp3.DoubleBitBinary(opendnp3.DoubleBit.DETERMINED_ON))
 
+    def test_send_analog_array(self, run_master):
+        self.run_outstation(arrays=("UpdateAnalogArray", [0, 1, 2], [2.0, 4.8, 14.1]))
+
+    def test_send_binary_array(self, run_master):
+        self.run_outstation(arrays=("UpdateBinaryArray", [0, 1], [True, False]))
+
+
+class FakeOutstation:
+    """Stands in for MyOutStationNew: records the commands applied by MyOutstationCommandHandler."""
+
+    def __init__(self, fail=False):
+        self.db_handler = DBHandler(stack_config=asiodnp3.OutstationStackConfig(opendnp3.DatabaseSizes.AllTypes(10)))
+        self.fail = fail
+        self.applied = []
+
+    def process_point_value(self, command_type, command, index, op_type):
+        if self.fail:
+            raise RuntimeError("outstation is shut down")
+        self.applied.append((command_type, index))
+
+    def process_point_values(self, command_type, commands, op_type=None):
+        if self.fail:
+            raise RuntimeError("outstation is shut down")
+        self.applied.extend((command_type, index) for _, index in commands)
+
+
+class TestOutstationCommandHandler:
+
+    @staticmethod
+    def command_handler(outstation, batch_commands):
+        handler = MyOutstationCommandHandler()
+        handler.post_init(outstation_id="test", outstation_app=outstation, batch_commands=batch_commands)
+        return handler
+
+    def test_commands_applied_before_status(self):
+        outstation = FakeOutstation()
+        handler = self.command_handler(outstation, batch_commands=False)
+        handler.Start()
+        status = handler.Operate(opendnp3.AnalogOutputInt16(7), 1, opendnp3.OperateType.DirectOperate)
+        assert status == opendnp3.CommandStatus.SUCCESS
+        assert outstation.applied == [("Operate", 1)]
+        assert handler.Operate(opendnp3.AnalogOutputInt16(7), 10, opendnp3.OperateType.DirectOperate) \
+            == opendnp3.CommandStatus.OUT_OF_RANGE
+        assert handler.Select(opendnp3.ControlRelayOutputBlock(opendnp3.ControlCode.PULSE_ON), 0) \
+            == opendnp3.CommandStatus.NOT_SUPPORTED
+        handler.End()
+        assert outstation.applied == [("Operate", 1)]
+
+        outstation.fail = True
+        assert handler.Operate(opendnp3.AnalogOutputInt16(7), 2, opendnp3.OperateType.DirectOperate) \
+            == opendnp3.CommandStatus.HARDWARE_ERROR
+
+    def test_batch_commands_applied_at_end(self):
+        outstation = FakeOutstation()
+        handler = self.command_handler(outstation, batch_commands=True)
+        handler.Start()
+        assert handler.Operate(opendnp3.AnalogOutputInt16(7), 1, opendnp3.OperateType.DirectOperate) \
+            == opendnp3.CommandStatus.SUCCESS
+        assert handler.Operate(opendnp3.ControlRelayOutputBlock(opendnp3.ControlCode.LATCH_ON), 2,
+                               opendnp3.OperateType.DirectOperate) == opendnp3.CommandStatus.SUCCESS
+        # invalid commands are rejected right away, and never queued
+        assert handler.Operate(opendnp3.AnalogOutputInt16(7), 10, opendnp3.OperateType.DirectOperate) \
+            == opendnp3.CommandStatus.OUT_OF_RANGE
+        assert outstation.applied == []
+        handler.End()
+        assert outstation.applied == [("Operate", 1), ("Operate", 2)]
+        assert handler.failed_commands == 0
+
+        outstation.fail = True
+        handler.Start()
+        assert handler.Operate(opendnp3.AnalogOutputInt16(7), 3, opendnp3.OperateType.DirectOperate) \
+            == opendnp3.CommandStatus.SUCCESS
+        handler.End()
+        assert handler.failed_commands == 1
+
+
+def set_points(db: dict, point_type: str) -> dict:
+    """Points of db_handler.db that were set, i.e., without the None placeholders of DBHandler.config_db"""
+    return {index: value for index, value in db.get(point_type, {}).items() if value is not None}
+
+
+class TestApplyUpdates:
+    """
+        MyOutStationNew.apply_updates: the (measurement, index) and arrays paths, recorded in db_handler.db.
+    """
+
+    def setup_method(self):
+        self.outstation = MyOutStationNew(port=20013, outstation_id=10)
+        self.outstation.start()
+
+    def teardown_method(self):
+        self.outstation.shutdown(sleep_before_shutdown=0)
+
+    def test_arrays(self):
+        self.outstation.apply_updates(
+            updates=[(opendnp3.Counter(7), 3)],
+            arrays={"Analog": (np.arange(3), np.array([4.8, 14.1, 0.0])),
+                    "Binary": ([0, 1], [True, False]),
+                    "AnalogOutputStatus": ([9], [1.5], [0x01])})
+        db = self.outstation.db_handler.db
+        assert set_points(db, "Counter") == {3: 7}
+        assert set_points(db, "Analog") == {0: 4.8, 1: 14.1, 2: 0.0}
+        assert set_points(db, "Binary") == {0: True, 1: False}
+        assert set_points(db, "AnalogOutputStatus") == {9: 1.5}
+
+        # later updates merge into the existing points
+        self.outstation.apply_updates(arrays={"Analog": (np.array([1]), np.array([2.5]))})
+        assert set_points(self.outstation.db_handler.db, "Analog") == {0: 4.8, 1: 2.5, 2: 0.0}
+
+    def test_invalid_arrays(self):
+        """
+            Test if an out of range index (e.g., 70000, which would wrap to point 4464), value or flag,
+            or an unsupported point type raises ValueError and leaves db_handler.db untouched.
+        """
+        self.outstation.apply_updates(arrays={"Analog": ([0], [1.0])})
+        before = {point_type: dict(points) for point_type, points in self.outstation.db_handler.db.items()}
+        invalid = [{"Analog": ([70000], [2.0])},
+                   {"Analog": ([-1], [2.0])},
+                   {"Counter": ([0], [-5])},
+                   {"Analog": ([0], [2.0], [256])},
+                   {"Analog": ([0, 1], [2.0])},
+                   {"Analog": ([1], [2.0]), "Counter": ([0], [2 ** 32])},
+                   {"Analog": ([1], [2.0]), "TimeAndInterval": ([0], [1])}]
+        for arrays in invalid:
+            try:
+                self.outstation.apply_updates(updates=[(opendnp3.Binary(True), 0)], arrays=arrays)
+                assert False, arrays
+            except ValueError:
+                pass
+        assert self.outstation.db_handler.db == before
+        assert set_points(before, "Analog") == {0: 1.0} and set_points(before, "Binary") == {}
+
+    def test_process_point_values(self):
+        """
+            Test if a batch of master commands is recorded as output statuses, see process_point_values.
+        """
+        self.outstation.process_point_values("Operate", [
+            (opendnp3.AnalogOutputDouble64(3.5), 2),
+            (opendnp3.AnalogOutputInt16(7), 4),
+            (opendnp3.ControlRelayOutputBlock(opendnp3.ControlCode.LATCH_ON), 1),
+        ], opendnp3.OperateType.DirectOperate)
+        db = self.outstation.db_handler.db
+        assert set_points(db, "AnalogOutputStatus") == {2: 3.5, 4: 7}
+        assert set_points(db, "BinaryOutputStatus") == {1: True}
+
+
+class TestDBHandler:
+
+    def test_process_many(self):
+        db_handler = DBHandler(stack_config=asiodnp3.OutstationStackConfig(opendnp3.DatabaseSizes.AllTypes(10)))
+        db_handler.process_many("Analog", [0, 1], [4.8, 14.1])
+        db_handler.process_many("Analog", np.array([1, 2]), np.array([2.5, 3.5]))
+        db_handler.process(opendnp3.Analog(9.0), 5)
+        assert set_points(db_handler.db, "Analog") == {0: 4.8, 1: 2.5, 2: 3.5, 5: 9.0}
+        assert all(type(index) is int and type(value) is float
+                   for index, value in set_points(db_handler.db, "Analog").items())
@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*- {{{
+# vim: set fenc=utf-8 ft=python sw=4 ts=4 sts=4 et:
+#
+# Copyright 2018, Kisensum.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# Neither Kisensum, nor any of its employees, nor any jurisdiction or 
+# organization that has cooperated in the development of these materials, 
+# makes any warranty, express or implied, or assumes any legal liability 
+# or responsibility for the accuracy, completeness, or usefulness or any 
+# information, apparatus, product, software, or process disclosed, or 
+# represents that its use would not infringe privately owned rights. 
+# Reference herein to any specific commercial product, process, or service 
+# by trade name, trademark, manufacturer, or otherwise does not necessarily 
+# constitute or imply its endorsement, recommendation, or favoring by Kisensum.
+# }}}
+
+from pydnp3 import opendnp3
+
+from dnp3_python.dnp3station.outstation_farm import OutstationFarm
+
+HOST = "127.0.0.1"
+PORT = 20018
+
+
+class TestOutstationFarm():
+
+    def test_shared_endpoint(self):
+        """
+            Test if outstations of the same endpoint share a TCP server channel, which is kept while an outstation
+            uses it and shut down with the last one, and if a duplicate outstation is rejected.
+        """
+        farm = OutstationFarm(concurrency_hint=1)
+        try:
+            first = farm.add_outstation(outstation_ip=HOST, port=PORT, outstation_id=10)
+            second = farm.add_outstation(outstation_ip=HOST, port=PORT, outstation_id=11)
+            other = farm.add_outstation(outstation_ip=HOST, port=PORT + 1, outstation_id=10)
+            assert len(farm) == 3 and set(farm) == {first, second, other}
+            assert first.channel is second.channel and other.channel is not first.channel
+            assert len(farm._channels) == 2
+            assert farm.get_outstation(PORT, 11, outstation_ip=HOST) is second
+
+            try:
+                farm.add_outstation(outstation_ip=HOST, port=PORT, outstation_id=10)
+                assert False
+            except ValueError:
+                pass
+            assert farm.get_outstation(PORT, 10, outstation_ip=HOST) is first
+
+            second.apply_update(opendnp3.Analog(4.8), 0)  # the remaining outstation keeps working
+            farm.remove_outstation(PORT, 10, outstation_ip=HOST)
+            assert (HOST, PORT, 10) not in farm
+            assert farm.channel_state(PORT, outstation_ip=HOST) is not None
+            second.apply_update(opendnp3.Analog(4.9), 0)
+
+            farm.remove_outstation(PORT, 11, outstation_ip=HOST)
+            assert farm.channel_state(PORT, outstation_ip=HOST) is None
+            assert len(farm) == 1 and len(farm._channels) == 1
+
+            try:
+                farm.remove_outstation(PORT, 11, outstation_ip=HOST)
+                assert False
+            except KeyError:
+                pass
+        finally:
+            farm.shutdown()
+        assert len(farm) == 0 and len(farm._channels) == 0
+
+    def test_failed_outstation(self):
+        """
+            Test if a channel created for an outstation that fails to construct is shut down, while a channel
+            used by other outstations is kept.
+        """
+        farm = OutstationFarm(concurrency_hint=1)
+        try:
+            try:
+                farm.add_outstation(outstation_ip=HOST, port=PORT, outstation_id=10, no_such_argument=1)
+                assert False
+            except TypeError:
+                pass
+            assert len(farm) == 0
+            assert farm.channel_state(PORT, outstation_ip=HOST) is None
+
+            station = farm.add_outstation(outstation_ip=HOST, port=PORT, outstation_id=10)
+            try:
+                farm.add_outstation(outstation_ip=HOST, port=PORT, outstation_id=11, no_such_argument=1)
+                assert False
+            except TypeError:
+                pass
+            assert len(farm) == 1 and farm._channels[(HOST, PORT)][0] is station.channel
+        finally:
+            farm.shutdown()
+        assert len(farm._channels) == 0
+
+    def test_stats(self):
+        """
+            Test if stats has one row per outstation, and if a table is reused within max_age.
+        """
+        farm = OutstationFarm(concurrency_hint=1)
+        try:
+            farm.add_outstation(outstation_ip=HOST, port=PORT, outstation_id=10)
+            farm.add_outstation(outstation_ip=HOST, port=PORT, outstation_id=11)
+            table = farm.stats(max_age=60)
+            assert table.keys == [(HOST, PORT, 10), (HOST, PORT, 11)]
+            assert farm.stats(max_age=60) is table
+            farm.remove_outstation(PORT, 10, outstation_ip=HOST)
+            assert farm.stats(max_age=60).keys == [(HOST, PORT, 11)]
+        finally:
+            farm.shutdown()
@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*- {{{
+# vim: set fenc=utf-8 ft=python sw=4 ts=4 sts=4 et:
+#
+# Copyright 2018, Kisensum.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# Neither Kisensum, nor any of its employees, nor any jurisdiction or 
+# organization that has cooperated in the development of these materials, 
+# makes any warranty, express or implied, or assumes any legal liability 
+# or responsibility for the accuracy, completeness, or usefulness or any 
+# information, apparatus, product, software, or process disclosed, or 
+# represents that its use would not infringe privately owned rights. 
+# Reference herein to any specific commercial product, process, or service 
+# by trade name, trademark, manufacturer, or otherwise does not necessarily 
+# constitute or imply its endorsement, recommendation, or favoring by Kisensum.
+# }}}
+
+import json
+
+import pytest
+
+from pydnp3 import opendnp3, asiodnp3
+
+from dnp3_python.dnp3station.point_schema import PointRange, PointSchema, event_buffer_config
+
+CONFIG = {
+    "Analog": [
+        {"start": 0, "stop": 9, "class": 2, "svariation": "Group30Var5", "evariation": "Group32Var7",
+         "deadband": 0.5},
+        {"count": 5, "class": 3},  # starts right after the previous range
+    ],
+    "Binary": {"count": 8, "class": 1, "svariation": "Group1Var2"},  # a single range, without the list
+    "sizes": {"Counter": 4},
+}
+
+
+class TestPointSchema():
+
+    def test_from_dict(self):
+        """
+            Test if ranges are parsed from start/stop or count, in order, and variations from their names.
+        """
+        schema = PointSchema.from_dict(CONFIG)
+        analog, analog_next, binary = schema.ranges
+        assert (analog.start, analog.stop, analog.count) == (0, 9, 10)
+        assert analog.clazz == 2 and analog.deadband == 0.5
+        assert analog.svariation == opendnp3.StaticAnalogVariation.Group30Var5
+        assert analog.evariation == opendnp3.EventAnalogVariation.Group32Var7
+        assert (analog_next.start, analog_next.stop) == (10, 14)
+        assert analog_next.svariation is None and analog_next.deadband is None
+        assert binary.point_type == "Binary" and (binary.start, binary.stop) == (0, 7)
+
+    def test_from_files(self, tmp_path):
+        """
+            Test if a JSON and a YAML file give the same schema as the dict.
+        """
+        path = tmp_path / "points.json"
+        path.write_text(json.dumps(CONFIG))
+        assert [repr(point_range) for point_range in PointSchema.from_json(str(path)).ranges] == \
+            [repr(point_range) for point_range in PointSchema.from_dict(CONFIG).ranges]
+
+        yaml = pytest.importorskip("yaml")
+        path = tmp_path / "points.yaml"
+        path.write_text(yaml.safe_dump(CONFIG))
+        assert [repr(point_range) for point_range in PointSchema.from_yaml(str(path)).ranges] == \
+            [repr(point_range) for point_range in PointSchema.from_dict(CONFIG).ranges]
+
+    def test_sizes(self):
+        """
+            Test if sizes default to the last index + 1 of each point type, and if explicit sizes win.
+        """
+        schema = PointSchema.from_dict(CONFIG)
+        assert schema.size("Analog") == 15 and schema.size("Binary") == 8
+        assert schema.size("Counter") == 4 and schema.size("FrozenCounter") == 0
+        sizes = schema.sizes()
+        assert (sizes.numAnalog, sizes.numBinary, sizes.numCounter, sizes.numDoubleBinary) == (15, 8, 4, 0)
+
+        schema.set_size("Analog", 100)  # reserve points left out of the ranges
+        assert schema.sizes().numAnalog == 100
+        schema.set_size("Analog", 12)
+        try:
+            schema.sizes()  # [10, 14] exceeds the explicit size
+            assert False
+        except ValueError:
+            pass
+
+        uniform = PointSchema.uniform({"Analog": 20, "TimeAndInterval": 2, "Counter": 0}, clazz=2)
+        assert [(point_range.point_type, point_range.count, point_range.clazz) for point_range in uniform.ranges] == \
+            [("Analog", 20, 2), ("TimeAndInterval", 2, None)]
+
+    def test_apply(self):
+        """
+            Test if the ranges configure the database, later ranges win and fields left out keep the defaults.
+        """
+        schema = PointSchema.from_dict({"Analog": [{"count": 10, "class": 2, "evariation": "Group32Var7",
+                                                    "deadband": 0.5},
+                                                   {"start": 5, "stop": 6, "class": 3}]})
+        stack_config = asiodnp3.OutstationStackConfig(schema.sizes())
+        default_svariation = stack_config.dbConfig.analog[0].svariation
+        schema.apply(stack_config.dbConfig)
+
+        analog = stack_config.dbConfig.analog
+        assert analog[0].clazz == opendnp3.PointClass.Class2 and analog[0].deadband == 0.5
+        assert analog[0].evariation == opendnp3.EventAnalogVariation.Group32Var7
+        assert analog[0].svariation == default_svariation
+        assert analog[5].clazz == opendnp3.PointClass.Class3 and analog[6].clazz == opendnp3.PointClass.Class3
+        assert analog[5].deadband == 0.5  # left out, taken from the first point of the range
+        assert analog[7].clazz == opendnp3.PointClass.Class2
+
+    def test_errors(self):
+        """
+            Test if invalid point types, keys, ranges, classes, variations and fields are rejected.
+        """
+        invalid = [
+            {"Analogue": [{"count": 1}]},
+            {"Analog": [{"count": 1, "period": 1}]},
+            {"Analog": [{"start": 0}]},  # neither stop nor count
+            {"Analog": [{"start": 5, "stop": 4}]},
+            {"Analog": [{"count": 65536}]},
+            {"Analog": [{"count": 1, "class": 4}]},
+            {"Analog": [{"count": 1, "svariation": "Group1Var2"}]},
+            {"Binary": [{"count": 1, "deadband": 1}]},
+            {"TimeAndInterval": [{"count": 1, "class": 1}]},
+            {"Analog": [{"count": 1}], "sizes": {"Analog": 65536}},
+        ]
+        for config in invalid:
+            try:
+                PointSchema.from_dict(config)
+                assert False, config
+            except ValueError:
+                pass
+        try:
+            PointRange("Analog", 0, 0, evariation=opendnp3.StaticAnalogVariation.Group30Var1)
+            assert False
+        except ValueError:
+            pass
+
+
+class TestEventBufferConfig():
+
+    def test_event_buffer_config(self):
+        config = event_buffer_config({"Analog": 1000, "Binary": 100})
+        assert config.maxAnalogEvents == 1000 and config.maxBinaryEvents == 100
+        assert config.maxCounterEvents == 0  # left out, no event buffered
+        assert event_buffer_config(10).maxDoubleBinaryEvents == 10
+
+        for max_events in ({"TimeAndInterval": 10}, {"Analogue": 10}, {"Analog": -1}):
+            try:
+                event_buffer_config(max_events)
+                assert False
+            except ValueError:
+                pass
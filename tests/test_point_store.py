@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*- {{{
+# vim: set fenc=utf-8 ft=python sw=4 ts=4 sts=4 et:
+#
+# Copyright 2018, Kisensum.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# Neither Kisensum, nor any of its employees, nor any jurisdiction or 
+# organization that has cooperated in the development of these materials, 
+# makes any warranty, express or implied, or assumes any legal liability 
+# or responsibility for the accuracy, completeness, or usefulness or any 
+# information, apparatus, product, software, or process disclosed, or 
+# represents that its use would not infringe privately owned rights. 
+# Reference herein to any specific commercial product, process, or service 
+# by trade name, trademark, manufacturer, or otherwise does not necessarily 
+# constitute or imply its endorsement, recommendation, or favoring by Kisensum.
+# }}}
+
+import numpy as np
+
+from pydnp3.opendnp3 import GroupVariation
+from dnp3_python.dnp3station.point_store import PointStore
+from dnp3_python.dnp3station.station_utils import SOEHandler
+
+
+def analog_arrays(indices, values, flags=0x01, time=0):
+    """(index, value, flags, time) arrays of one header, as returned by ICollection.ToArrays"""
+    count = len(indices)
+    return (np.asarray(indices, dtype=np.uint16), np.asarray(values, dtype=np.float64),
+            np.full(count, flags, dtype=np.uint8), np.full(count, time, dtype=np.uint64))
+
+
+class TestPointStore():
+
+    def test_changes(self):
+        store = PointStore({"Analog": 2})
+        store.update("Analog", indices=[0, 1], values=[4.8, 14.1])
+        seq = store.update("Analog", indices=[3], values=[27.2], received=100.0)
+        indices, columns = store.changes("Analog", seq - 1)
+        assert indices.tolist() == [3]
+        assert columns.value.tolist() == [27.2]
+        assert store.updated_since(seq - 1) == ["Analog"]
+        assert store.updated_since(seq) == []
+        assert store.last_update("Analog") == (seq, 100.0)
+
+    def test_other_keys(self):
+        store = PointStore()
+        assert GroupVariation.Group30Var1 not in store
+        store.update(GroupVariation.Group30Var1, indices=[2], values=np.asarray([7], dtype=np.int64))
+        assert GroupVariation.Group30Var1 in store
+        assert store.snapshot(GroupVariation.Group30Var1).value.dtype == np.int64
+        assert store.to_dict(GroupVariation.Group30Var1) == {2: 7}
+
+
+class TestSOEHandlerViews():
+
+    def test_array_path_writes_columns_only(self):
+        handler = SOEHandler()
+        handler._post_process(info_gv=GroupVariation.Group30Var6, point_type="Analog",
+                              arrays=analog_arrays([0, 1, 2], [4.8, 14.1, 27.2]))
+        assert handler._gv_index_value_nested_dict == {}
+        assert handler._gv_point_received == {}
+        assert handler.gv_index_value_nested_dict[GroupVariation.Group30Var6] == {0: 4.8, 1: 14.1, 2: 27.2}
+        assert GroupVariation.Group30Var6 in handler.gv_last_poll_dict
+
+        vals = handler.gv_index_value_nested_dict[GroupVariation.Group30Var6]
+        handler._post_process(info_gv=GroupVariation.Group30Var6, point_type="Analog",
+                              arrays=analog_arrays([1], [15.0], flags=0x02, time=1000))
+        assert handler.gv_index_value_nested_dict[GroupVariation.Group30Var6] is vals
+        assert vals == {0: 4.8, 1: 15.0, 2: 27.2}
+        point = handler.get_point(GroupVariation.Group30Var6, 1)
+        assert (point.value, point.flags, point.time) == (15.0, 0x02, 1000)
+        assert handler.point_received(GroupVariation.Group30Var6, 5) is None
+
+    def test_failed_poll_resets_view(self):
+        handler = SOEHandler()
+        handler._post_process(info_gv=GroupVariation.Group30Var6, point_type="Analog",
+                              arrays=analog_arrays([0, 1], [4.8, 14.1]))
+        handler.gv_index_value_nested_dict[GroupVariation.Group30Var6] = None  # see MyMasterNew
+        assert handler.get_point(GroupVariation.Group30Var6, 0) is None
+        handler._post_process(info_gv=GroupVariation.Group30Var6, point_type="Analog",
+                              arrays=analog_arrays([1], [15.0]))
+        assert handler.gv_index_value_nested_dict[GroupVariation.Group30Var6] == {1: 15.0}
+
+    def test_subscribers_get_pairs(self):
+        handler = SOEHandler()
+        batches = []
+        handler.subscriptions.subscribe("Analog", callback=batches.append)
+        handler._post_process(info_gv=GroupVariation.Group30Var6, point_type="Analog",
+                              arrays=analog_arrays([0, 1], [4.8, 14.1]))
+        assert batches == [{0: 4.8, 1: 14.1}]
+
+    def test_oldest_received(self):
+        handler = SOEHandler()
+        gv = GroupVariation.Group30Var6
+        assert handler.gv_oldest_received(gv) is None
+        handler._post_process(info_gv=gv, point_type="Analog", arrays=analog_arrays([0, 1], [4.8, 14.1]))
+        oldest = handler.gv_oldest_received(gv)
+        assert oldest == handler.point_received(gv, 0)
+        # a header with only some of the points keeps the oldest, a full one moves it
+        handler._post_process(info_gv=gv, point_type="Analog", arrays=analog_arrays([1], [15.0]))
+        assert handler.gv_oldest_received(gv) == oldest
+        handler._post_process(info_gv=gv, point_type="Analog", arrays=analog_arrays([0, 1], [4.9, 15.1]))
+        assert handler.gv_oldest_received(gv) > oldest
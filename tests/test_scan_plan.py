@@ -0,0 +1,295 @@
+# -*- coding: utf-8 -*- {{{
+# vim: set fenc=utf-8 ft=python sw=4 ts=4 sts=4 et:
+#
+# Copyright 2018, Kisensum.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# Neither Kisensum, nor any of its employees, nor any jurisdiction or 
+# organization that has cooperated in the development of these materials, 
+# makes any warranty, express or implied, or assumes any legal liability 
+# or responsibility for the accuracy, completeness, or usefulness or any 
+# information, apparatus, product, software, or process disclosed, or 
+# represents that its use would not infringe privately owned rights. 
+# Reference herein to any specific commercial product, process, or service 
+# by trade name, trademark, manufacturer, or otherwise does not necessarily 
+# constitute or imply its endorsement, recommendation, or favoring by Kisensum.
+# }}}
+
+import concurrent.futures
+import gc
+import time
+import weakref
+
+from pydnp3 import opendnp3, openpal
+
+from dnp3_python.dnp3station.master_new import MyMasterNew
+from dnp3_python.dnp3station.scan_plan import ScanEntry, ScanPlan, ScheduledScan, ScanTimer
+
+
+def wait_until(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.005)
+    return True
+
+
+class StubMaster:
+    """Stands in for MyMasterNew: issue returns a future the test resolves, i.e., a scan task in flight."""
+
+    def __init__(self):
+        self.issued = []  # (scan name, future)
+
+    def issue(self, entry: ScanEntry) -> concurrent.futures.Future:
+        future = concurrent.futures.Future()
+        self.issued.append((entry.name, future))
+        return future
+
+
+class StubScan:
+    """Stands in for asiodnp3.IMasterScan: records the times Demand is called."""
+
+    def __init__(self):
+        self.demands = []
+
+    def Demand(self):
+        self.demands.append(time.monotonic())
+
+
+class StubIMaster:
+    """Stands in for asiodnp3.IMaster: records the native period (in milliseconds) of the registered scans."""
+
+    def __init__(self):
+        self.periods = []
+
+    def AddClassScan(self, field, period, config):
+        self.periods.append(period.GetMilliseconds())
+        return StubScan()
+
+
+class TestScanPlan():
+
+    def test_from_dict(self):
+        """
+            Test if classes sharing a period are combined into one scan, and if periods, jitter (plan-wide,
+            overridden per item) and names are parsed.
+        """
+        plan = ScanPlan.from_dict({
+            "class0": 1800,
+            "class1": 60, "class2": 60, "class3": None,
+            "jitter": 2,
+            "range": [{"gv": [30, 6], "start": 0, "stop": 9, "period": 10, "jitter": 1}],
+            "gv": [{"gv": [1, 2], "period": 5, "name": "binaries"}],
+        })
+        assert sorted(plan.entries) == ["binaries", "class0", "class12", "range-30-6-0-9"]
+
+        integrity, events = plan.entries["class0"], plan.entries["class12"]
+        assert integrity.kind == "class" and integrity.period == 1800 and integrity.jitter == 2
+        assert integrity.field.GetBitfield() == opendnp3.ClassField.CLASS_0
+        assert events.period == 60
+        assert events.field.GetBitfield() == opendnp3.ClassField.CLASS_1 | opendnp3.ClassField.CLASS_2
+
+        ranged = plan.entries["range-30-6-0-9"]
+        assert ranged.kind == "range" and (ranged.start, ranged.stop) == (0, 9)
+        assert (ranged.gv_id.group, ranged.gv_id.variation) == (30, 6)
+        assert ranged.period == 10 and ranged.jitter == 1
+
+        binaries = plan.entries["binaries"]
+        assert binaries.kind == "all_objects" and binaries.period == 5 and binaries.jitter == 2
+
+    def test_from_dict_errors(self):
+        """
+            Test if unknown keys and duplicate scan names are rejected.
+        """
+        for config in ({"class4": 60},
+                       {"gv": [{"gv": [1, 2], "period": 5}, {"gv": [1, 2], "period": 10}]}):
+            try:
+                ScanPlan.from_dict(config)
+                assert False
+            except ValueError:
+                pass
+        try:
+            ScanEntry("a", "poll", period=1)
+            assert False
+        except ValueError:
+            pass
+
+    def test_next_delay(self):
+        """
+            Test if the delays stay within [period - jitter, period + jitter], and if a scan without period
+            is on-demand only.
+        """
+        entry = ScanEntry("a", "class", period=10, jitter=2)
+        delays = [entry.next_delay() for _ in range(1000)]
+        assert all(8 <= delay <= 12 for delay in delays)
+        assert max(delays) - min(delays) > 1  # randomized
+        assert ScanEntry("b", "class", period=10).next_delay() == 10
+        assert ScanEntry("c", "class", period=None).next_delay() is None
+        assert ScanEntry("d", "class", period=0).next_delay() is None
+        assert ScanEntry("e", "class", period=0.5, jitter=1).next_delay() >= 0
+
+    def test_register(self):
+        """
+            Test if a scan is registered with an infinite native period by default, and with its own period
+            (or an infinite one if on-demand only) given native_period.
+        """
+        master = StubIMaster()
+        ScanEntry("a", "class", period=2.5).register(master)
+        ScanEntry("b", "class", period=2.5).register(master, native_period=True)
+        ScanEntry("c", "class", period=None).register(master, native_period=True)
+        infinite = openpal.TimeDuration().Max().GetMilliseconds()
+        assert master.periods == [infinite, 2500, infinite]
+
+
+class TestMasterScans():
+    PORT = 20017
+
+    def test_native_periods(self):
+        """
+            Test if a standalone master has its scans performed natively, i.e., without any ScanTimer,
+            and if changing a period requires one.
+        """
+        master = MyMasterNew(port=self.PORT, scan_plan=ScanPlan.event_only(event_period=30))
+        try:
+            assert master.scan_timer is None
+            master.start()
+            try:
+                master.set_scan_period("class123", 10)
+                assert False
+            except ValueError:
+                pass
+            assert master.scans["class123"].entry.period == 30
+        finally:
+            master.shutdown(sleep_before_master_shutdown=0)
+
+    def test_scan_timer(self):
+        """
+            Test if a master given a ScanTimer has its scans scheduled (and cancelled) by the timer.
+        """
+        timer = ScanTimer()
+        master = MyMasterNew(port=self.PORT, scan_plan=ScanPlan.event_only(event_period=30), scan_timer=timer)
+        try:
+            master.start()
+            with timer._cond:
+                assert len(timer._heap) == 1
+            master.set_scan_period("class123", 10)
+            assert master.scans["class123"].entry.period == 10
+        finally:
+            master.shutdown(sleep_before_master_shutdown=0)
+            timer.stop()
+
+
+class TestScanTimer():
+
+    def test_demand(self):
+        """
+            Test if an uncapped timer demands the scans periodically, and if an on-demand only scan is not scheduled.
+        """
+        timer = ScanTimer()
+        scan, on_demand = StubScan(), StubScan()
+        try:
+            timer.schedule(ScheduledScan(ScanEntry("a", "class", period=0.02), scan=scan))
+            timer.schedule(ScheduledScan(ScanEntry("b", "class", period=None), scan=on_demand))
+            assert wait_until(lambda: len(scan.demands) >= 3)
+            with timer._cond:
+                assert len(timer._heap) == 1  # the periodic scan only
+            assert on_demand.demands == []
+        finally:
+            timer.stop()
+
+    def test_cancel_and_reschedule(self):
+        """
+            Test if cancel bumps the generation so that a pending item is ignored, and if schedule restarts
+            the period of a scan, e.g., after its period changed.
+        """
+        timer = ScanTimer()
+        scan = StubScan()
+        scheduled = ScheduledScan(ScanEntry("a", "class", period=0.02), scan=scan)
+        try:
+            timer.schedule(scheduled)
+            assert scheduled.generation == 1
+            assert wait_until(lambda: len(scan.demands) >= 2)
+
+            timer.cancel(scheduled)
+            assert scheduled.generation == 2 and timer._heap == []
+            count = len(scan.demands)
+            time.sleep(0.1)
+            assert len(scan.demands) == count
+
+            # a stale item, e.g., left in the heap by an earlier schedule, is skipped
+            with timer._cond:
+                timer._push(scheduled, time.monotonic())
+                scheduled.generation += 1
+            time.sleep(0.05)
+            assert len(scan.demands) == count
+
+            scheduled.entry.period = 60
+            timer.schedule(scheduled)
+            assert len(timer._heap) == 1 and timer._heap[0][3] == scheduled.generation
+            assert timer._heap[0][0] - time.monotonic() > 59
+            scheduled.entry.period = 0.02
+            timer.schedule(scheduled)  # replaces the pending item, from now
+            assert len(timer._heap) == 1
+            assert wait_until(lambda: len(scan.demands) > count)
+        finally:
+            timer.stop()
+
+    def test_caps(self):
+        """
+            Test if a ScanTimer with caps keeps at most max_in_flight_per_channel scans in flight per channel,
+            and if a resolved (or failed, e.g., destroyed task) future releases the slot.
+        """
+        timer = ScanTimer(max_in_flight=2, max_in_flight_per_channel=1)
+        master = StubMaster()
+        scans = [ScheduledScan(ScanEntry(name, "class", period=0.01), issue=master.issue, channel_key=channel)
+                 for name, channel in (("a", "c1"), ("b", "c1"), ("c", "c2"))]
+        try:
+            for scheduled in scans:
+                timer.schedule(scheduled)
+            assert wait_until(lambda: len(master.issued) == 2)
+            time.sleep(0.1)  # many periods elapse, nothing else is issued while the slots are taken
+            assert len(master.issued) == 2
+            assert timer.in_flight == 2
+            assert sorted(name for name, _ in master.issued) in (["a", "c"], ["b", "c"])
+            waiting = [scheduled for scheduled, _ in timer._deferred]
+            assert len(waiting) == len(set(waiting))  # a waiting scan is not queued twice
+
+            c1 = next(future for name, future in master.issued if name != "c")
+            c1.set_exception(RuntimeError("Scan ended without completion"))
+            assert wait_until(lambda: len(master.issued) == 3)
+            assert master.issued[2][0] in ("a", "b")
+            assert timer.in_flight == 2
+        finally:
+            timer.stop()
+
+    def test_cancel_drops_references(self):
+        """
+            Test if cancel removes the pending items of a scan, i.e., the timer keeps no reference to its master.
+        """
+        timer = ScanTimer(max_in_flight=1)
+        master = StubMaster()
+        scheduled = ScheduledScan(ScanEntry("a", "class", period=60), issue=master.issue, channel_key="c1")
+        timer.schedule(scheduled)
+        assert len(timer._heap) == 1
+        timer.schedule(scheduled)  # rescheduling replaces the pending item
+        assert len(timer._heap) == 1
+
+        timer.cancel(scheduled)
+        assert timer._heap == [] and len(timer._deferred) == 0
+        reference = weakref.ref(master)
+        del scheduled, master
+        gc.collect()
+        assert reference() is None
+        timer.stop()
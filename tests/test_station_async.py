@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*- {{{
+# vim: set fenc=utf-8 ft=python sw=4 ts=4 sts=4 et:
+#
+# Copyright 2018, Kisensum.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# Neither Kisensum, nor any of its employees, nor any jurisdiction or 
+# organization that has cooperated in the development of these materials, 
+# makes any warranty, express or implied, or assumes any legal liability 
+# or responsibility for the accuracy, completeness, or usefulness or any 
+# information, apparatus, product, software, or process disclosed, or 
+# represents that its use would not infringe privately owned rights. 
+# Reference herein to any specific commercial product, process, or service 
+# by trade name, trademark, manufacturer, or otherwise does not necessarily 
+# constitute or imply its endorsement, recommendation, or favoring by Kisensum.
+# }}}
+
+import asyncio
+import time
+
+from pydnp3 import opendnp3, asiodnp3
+
+from dnp3_python.dnp3station.station_async import AsyncMaster, AsyncOutstation
+
+PORT = 20014
+
+
+class RecordingListener(asiodnp3.IChannelListener):
+    """Channel listener given by the caller, i.e., to be chained behind the state tracking."""
+
+    def __init__(self):
+        super(RecordingListener, self).__init__()
+        self.states = []
+
+    def OnStateChange(self, state):
+        self.states.append(state)
+
+
+class TestAsyncStations():
+
+    def test_loopback(self):
+        """
+            Test wait_connected, a read, a class scan and a command of an AsyncMaster against an AsyncOutstation,
+            if a listener given by the caller is still notified, and if shutdown does not block the event loop.
+        """
+        listener = RecordingListener()
+
+        async def main():
+            outstation = AsyncOutstation(port=PORT)
+            master = AsyncMaster(port=PORT, listener=listener)
+            try:
+                outstation.start()
+                master.start()
+                await master.wait_connected(timeout=10)
+                await outstation.wait_connected(timeout=10)
+                assert master.is_connected and outstation.is_connected
+                assert opendnp3.ChannelState.OPEN in listener.states
+
+                outstation.apply_update(opendnp3.Analog(4.8), 0)
+                result = await master.read(opendnp3.GroupVariationID(30, 6))
+                assert result[opendnp3.GroupVariation.Group30Var6][0] == 4.8
+
+                await master.scan_classes()
+
+                summary = await master.send_direct_point_command(group=40, variation=4, index=1, val_to_set=7.5)
+                assert summary == opendnp3.TaskCompletion.SUCCESS
+                assert outstation.db["AnalogOutputStatus"][1] == 7.5
+            finally:
+                # the event loop keeps running while the stacks are released
+                ticks = 0
+
+                async def tick():
+                    nonlocal ticks
+                    while True:
+                        ticks += 1
+                        await asyncio.sleep(0.01)
+
+                ticker = asyncio.ensure_future(tick())
+                started = time.monotonic()
+                await asyncio.gather(master.shutdown(sleep_before_shutdown=0.3),
+                                     outstation.shutdown(sleep_before_shutdown=0.3))
+                ticker.cancel()
+                assert ticks >= 0.3 / 0.01 / 2
+                assert time.monotonic() - started < 10
+
+        asyncio.run(main())
+
+    def test_wait_connected_timeout(self):
+        """
+            Test if wait_connected raises asyncio.TimeoutError when nothing listens on the port.
+        """
+        async def main():
+            master = AsyncMaster(port=PORT + 1)
+            master.start()
+            try:
+                await master.wait_connected(timeout=0.5)
+                assert False
+            except asyncio.TimeoutError:
+                pass
+            finally:
+                await master.shutdown(sleep_before_shutdown=0)
+
+        asyncio.run(main())
+
+    def test_shared_channel_rejected(self):
+        """
+            Test if a shared channel is rejected, its listener could not report the state to the async station.
+        """
+        async def main():
+            for cls in (AsyncMaster, AsyncOutstation):
+                try:
+                    cls(port=PORT, channel=object())
+                    assert False
+                except ValueError:
+                    pass
+
+        asyncio.run(main())
+
+    def test_no_running_loop(self):
+        try:
+            AsyncMaster(port=PORT)
+            assert False
+        except ValueError:
+            pass
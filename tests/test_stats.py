@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*- {{{
+# vim: set fenc=utf-8 ft=python sw=4 ts=4 sts=4 et:
+#
+# Copyright 2018, Kisensum.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# Neither Kisensum, nor any of its employees, nor any jurisdiction or 
+# organization that has cooperated in the development of these materials, 
+# makes any warranty, express or implied, or assumes any legal liability 
+# or responsibility for the accuracy, completeness, or usefulness or any 
+# information, apparatus, product, software, or process disclosed, or 
+# represents that its use would not infringe privately owned rights. 
+# Reference herein to any specific commercial product, process, or service 
+# by trade name, trademark, manufacturer, or otherwise does not necessarily 
+# constitute or imply its endorsement, recommendation, or favoring by Kisensum.
+# }}}
+
+import time
+
+from pydnp3 import opendnp3
+from dnp3_python.dnp3station.connection import ConnectionTracker
+from dnp3_python.dnp3station.stats import FIELDS, StatsCache, StatsTable
+
+
+class TestStatsCache():
+
+    def test_max_age(self):
+        cache = StatsCache(None, None, max_age=10)
+        snapshot = cache.get()
+        assert snapshot.as_dict() == dict.fromkeys(FIELDS, 0)
+        assert cache.get() is snapshot
+        assert cache.get(max_age=0) is not snapshot
+        snapshot = cache.get()
+        cache.invalidate()
+        assert cache.get() is not snapshot
+
+    def test_state_change_invalidates(self):
+        connection = ConnectionTracker()
+        cache = StatsCache(None, None, connection=connection, max_age=10)
+        snapshot = cache.get()
+        assert cache.get() is snapshot
+        time.sleep(0.001)
+        connection.OnStateChange(opendnp3.ChannelState.OPEN)
+        refreshed = cache.get()
+        assert refreshed is not snapshot
+        assert cache.get() is refreshed
+
+
+class TestStatsTable():
+
+    def test_reuse(self):
+        keys = [("127.0.0.1", 20000, 1), ("127.0.0.1", 20000, 2)]
+        connection = ConnectionTracker()
+        table = StatsTable.collect(keys, [None, None], [None, None])
+        assert table.is_fresh(10, keys, [connection])
+        assert not table.is_fresh(0, keys, [connection])  # Note: 0 always reads fresh counters
+        assert not table.is_fresh(10, keys[:1], [connection])  # a station removed
+        assert not table.is_fresh(10, keys + [("127.0.0.1", 20001, 1)], [connection])  # a station added
+        assert not table.is_fresh(10, keys[::-1], [connection])  # rows no longer match the keys
+        time.sleep(0.001)
+        connection.OnStateChange(opendnp3.ChannelState.OPENING)
+        assert not table.is_fresh(10, keys, [connection])
+        assert StatsTable.collect(keys, [None, None]).is_fresh(10, keys, [connection])
+
+    def test_expired(self):
+        keys = ["a"]
+        table = StatsTable.collect(keys, [None])
+        table.time -= 20
+        assert not table.is_fresh(10, keys)
+
+    def test_columns(self):
+        keys = ["a", "b"]
+        table = StatsTable.collect(keys, [None, None], [None, None])
+        assert len(table) == 2 and "a" in table and list(table) == keys
+        assert table.column("numOpenFail").tolist() == [0, 0]
+        assert table["b"].numTransportRx == 0
+        assert table.total().as_dict() == dict.fromkeys(FIELDS, 0)
+        assert table.as_dict()["a"] == dict.fromkeys(FIELDS, 0)
+        try:
+            table.column("numUnknown")
+            assert False, "expected ValueError"
+        except ValueError:
+            pass
@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*- {{{
+# vim: set fenc=utf-8 ft=python sw=4 ts=4 sts=4 et:
+#
+# Copyright 2018, Kisensum.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# Neither Kisensum, nor any of its employees, nor any jurisdiction or 
+# organization that has cooperated in the development of these materials, 
+# makes any warranty, express or implied, or assumes any legal liability 
+# or responsibility for the accuracy, completeness, or usefulness or any 
+# information, apparatus, product, software, or process disclosed, or 
+# represents that its use would not infringe privately owned rights. 
+# Reference herein to any specific commercial product, process, or service 
+# by trade name, trademark, manufacturer, or otherwise does not necessarily 
+# constitute or imply its endorsement, recommendation, or favoring by Kisensum.
+# }}}
+
+import threading
+import time
+
+from pydnp3.opendnp3 import GroupVariation
+from dnp3_python.dnp3station.subscriptions import FlushTimer, SubscriptionRegistry
+
+
+def wait_until(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.005)
+    return True
+
+
+class TestSubscriptions():
+
+    def test_coalesce(self):
+        registry = SubscriptionRegistry()
+        batches = []
+        registry.subscribe("Analog", callback=batches.append, indices=[0, 1], coalesce_ms=50)
+        threads = threading.active_count()
+        registry.dispatch(GroupVariation.Group32Var5, "Analog", [(0, 4.8), (2, 14.1)])
+        registry.dispatch(GroupVariation.Group32Var5, "Analog", [(0, 4.9), (1, 27.2)])
+        assert batches == []
+        assert wait_until(lambda: batches)
+        assert batches == [{0: 4.9, 1: 27.2}]
+        # Note: one FlushTimer thread at most, however many windows
+        assert threading.active_count() <= threads + 1
+
+    def test_flush_closes_window(self):
+        registry = SubscriptionRegistry()
+        batches = []
+        subscription = registry.subscribe(GroupVariation.Group30Var6, callback=batches.append, coalesce_ms=50)
+        registry.dispatch(GroupVariation.Group30Var6, "Analog", [(0, 4.8)])
+        subscription.flush()
+        assert batches == [{0: 4.8}]
+        time.sleep(0.1)  # the deadline of the flushed window passes without a second delivery
+        assert batches == [{0: 4.8}]
+        registry.dispatch(GroupVariation.Group30Var6, "Analog", [(0, 4.9)])
+        assert wait_until(lambda: len(batches) == 2)
+        assert batches[1] == {0: 4.9}
+
+    def test_cancel_drops_pending(self):
+        registry = SubscriptionRegistry()
+        batches = []
+        subscription = registry.subscribe("Analog", callback=batches.append, coalesce_ms=20)
+        registry.dispatch(GroupVariation.Group30Var6, "Analog", [(0, 4.8)])
+        subscription.cancel()
+        time.sleep(0.1)
+        assert batches == []
+        assert len(registry) == 0
+
+    def test_changes_only(self):
+        registry = SubscriptionRegistry()
+        batches = []
+        registry.subscribe("Binary", callback=batches.append, changes_only=True)
+        registry.dispatch(GroupVariation.Group1Var2, "Binary", [(0, True), (1, False)])
+        registry.dispatch(GroupVariation.Group1Var2, "Binary", [(0, True), (1, True)])
+        registry.dispatch(GroupVariation.Group1Var2, "Binary", [(0, True)])
+        assert batches == [{0: True, 1: False}, {1: True}]
+
+    def test_shared_flush_timer(self):
+        assert FlushTimer.shared() is FlushTimer.shared()
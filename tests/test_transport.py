@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*- {{{
+# vim: set fenc=utf-8 ft=python sw=4 ts=4 sts=4 et:
+#
+# Copyright 2018, Kisensum.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# Neither Kisensum, nor any of its employees, nor any jurisdiction or 
+# organization that has cooperated in the development of these materials, 
+# makes any warranty, express or implied, or assumes any legal liability 
+# or responsibility for the accuracy, completeness, or usefulness or any 
+# information, apparatus, product, software, or process disclosed, or 
+# represents that its use would not infringe privately owned rights. 
+# Reference herein to any specific commercial product, process, or service 
+# by trade name, trademark, manufacturer, or otherwise does not necessarily 
+# constitute or imply its endorsement, recommendation, or favoring by Kisensum.
+# }}}
+
+from pydnp3 import opendnp3
+
+from dnp3_python.dnp3station.transport import (Transport, TCPClientTransport, TCPServerTransport, SerialTransport,
+                                               TLSClientTransport, TLSServerTransport, tls_config)
+
+
+class TestTransport():
+
+    def test_abstract(self):
+        """
+            Test if the base class and an incomplete transport cannot be instantiated.
+        """
+        class NoEndpoint(Transport):
+            def create_channel(self, manager, id, levels, retry, listener):
+                return None
+
+            @property
+            def name(self):
+                return "none"
+
+        for cls in (Transport, NoEndpoint):
+            try:
+                cls()
+                assert False
+            except TypeError:
+                pass
+
+    def test_from_dict(self):
+        """
+            Test if each type builds its transport, with the defaults of the constructor for keys left out.
+        """
+        client = Transport.from_dict({"type": "tcp_client", "host": "10.0.0.5", "port": 20001})
+        assert isinstance(client, TCPClientTransport)
+        assert client.endpoint == ("10.0.0.5", 20001) and client.local == "0.0.0.0"
+        assert client.name == "10.0.0.5-20001"
+
+        server = Transport.from_dict({"type": "tcp_server", "port": 20002})
+        assert isinstance(server, TCPServerTransport) and server.endpoint == ("0.0.0.0", 20002)
+
+        serial = Transport.from_dict({"type": "serial", "device": "/dev/ttyUSB0", "baud": 19200, "parity": "even"})
+        assert isinstance(serial, SerialTransport)
+        assert serial.endpoint == ("/dev/ttyUSB0", 0) and serial.name == "serial-/dev/ttyUSB0"
+        assert serial.baud == 19200 and serial.parity == opendnp3.Parity.Even
+
+        tls = Transport.from_dict({"type": "tls_server", "port": 20003, "peer_cert": "ca.pem",
+                                   "local_cert": "rtu.pem"})
+        assert isinstance(tls, TLSServerTransport) and tls.name == "tls-0.0.0.0-20003"
+        assert tls.config.peerCertFilePath == "ca.pem" and tls.config.localCertFilePath == "rtu.pem"
+        assert tls.config.privateKeyFilePath == "rtu.pem"
+
+        config = {"type": "tls_client", "host": "10.0.0.5", "peer_cert": "ca.pem", "local_cert": "master.pem",
+                  "private_key": "master.key", "max_verify_depth": 2}
+        tls = Transport.from_dict(config)
+        assert isinstance(tls, TLSClientTransport) and tls.endpoint == ("10.0.0.5", 20000)
+        assert tls.config.privateKeyFilePath == "master.key" and tls.config.maxVerifyDepth == 2
+        assert config["type"] == "tls_client" and "peer_cert" in config  # the config is not modified
+
+        try:
+            Transport.from_dict({"type": "udp"})
+            assert False
+        except ValueError:
+            pass
+
+    def test_tls_required(self):
+        for cls in (TLSClientTransport, TLSServerTransport):
+            try:
+                cls(port=20001)
+                assert False
+            except ValueError:
+                pass
+
+    def test_serial(self):
+        """
+            Test if serial options are validated, accepted as names or opendnp3 enums, and copied to the settings.
+        """
+        serial = SerialTransport("COM1", baud=19200, data_bits=7, stop_bits=2, parity="ODD",
+                                 flow_control=opendnp3.FlowControl.Hardware, async_open_delay=0.5)
+        settings = serial.settings()
+        assert settings.deviceName == "COM1" and settings.baud == 19200 and settings.dataBits == 7
+        assert settings.stopBits == opendnp3.StopBits.Two
+        assert settings.parity == opendnp3.Parity.Odd
+        assert settings.flowType == opendnp3.FlowControl.Hardware
+        assert settings.asyncOpenDelay.GetMilliseconds() == 500
+
+        default = SerialTransport("/dev/ttyS1")
+        assert default.parity == getattr(opendnp3.Parity, "None")
+        assert default.flow_control == getattr(opendnp3.FlowControl, "None")
+
+        for kwargs in ({"stop_bits": 3}, {"parity": "mark"}, {"flow_control": "rts"}):
+            try:
+                SerialTransport("/dev/ttyS1", **kwargs)
+                assert False
+            except ValueError:
+                pass
+
+
+class TestTLSConfig():
+
+    def test_tls_config(self):
+        """
+            Test if TLS 1.2 only is allowed by default, and if the private key defaults to the local certificate.
+        """
+        config = tls_config(peer_cert="ca.pem", local_cert="master.pem")
+        assert config.peerCertFilePath == "ca.pem" and config.localCertFilePath == "master.pem"
+        assert config.privateKeyFilePath == "master.pem"
+        assert config.maxVerifyDepth == 0
+        assert (config.allowTLSv10, config.allowTLSv11, config.allowTLSv12) == (False, False, True)
+
+        config = tls_config("ca.pem", "master.pem", private_key="master.key", max_verify_depth=3, allow_tls_v11=True,
+                            cipher_list="HIGH")
+        assert config.privateKeyFilePath == "master.key" and config.maxVerifyDepth == 3
+        assert config.allowTLSv11 and config.cipherList == "HIGH"